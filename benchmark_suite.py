@@ -0,0 +1,216 @@
+"""
+Benchmarks de rendimiento de Crypto Bot Pro v35.
+Uso: python benchmark_suite.py [nombre_benchmark ...]
+"""
+import sys
+import os
+import time
+import tempfile
+
+# Setup path
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pandas as pd
+from crypto_bot_pro_v35 import (
+    AdvancedTradingConfig, OptimizedNeuralTrader, OptimizedTechnicalAnalyzer,
+    get_shared_technical_analyzer, SignalChartGenerator, SignalType,
+    PLOTTING_AVAILABLE, TORCH_AVAILABLE, torch
+)
+
+WINDOW_ROWS = 60  # Ventana de inferencia usada por predict_optimized
+
+
+def _time_calls(fn, repeats=300, warmup=30):
+    """Ejecuta fn() y devuelve latencias en ms (media, p50, p95)"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    samples = np.array(samples)
+    return {
+        'mean_ms': float(samples.mean()),
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p95_ms': float(np.percentile(samples, 95)),
+    }
+
+
+def _print_row(label, stats):
+    print(f"  {label:<28} media={stats['mean_ms']:.3f}ms  p50={stats['p50_ms']:.3f}ms  p95={stats['p95_ms']:.3f}ms", flush=True)
+
+
+_export_dir = None
+
+
+def _bench_config():
+    """Config de benchmark: el TorchScript exportado va a un directorio temporal, nunca a MODELS_DIR"""
+    global _export_dir
+    if _export_dir is None:
+        _export_dir = tempfile.TemporaryDirectory(prefix="cryptobot_bench_")
+    config = AdvancedTradingConfig()
+    config.NN_EXPORT_PATH = os.path.join(_export_dir.name, os.path.basename(config.NN_EXPORT_PATH))
+    return config
+
+
+def _get_trader(config):
+    trader = OptimizedNeuralTrader(config)
+    if trader.model is None:
+        trader.model = trader._build_optimized_model(config.NEURAL_INPUT_SIZE)
+    trader.is_trained = True
+    return trader
+
+
+def bench_neural_export():
+    """Latencia eager vs TorchScript exportado sobre la ventana de 60 filas"""
+    if not TORCH_AVAILABLE:
+        print("  PyTorch no disponible - benchmark omitido")
+        return {}
+    config = _bench_config()
+    trader = _get_trader(config)
+    if trader.inference_model is None:
+        trader._export_inference_model()
+    X = torch.randn(WINDOW_ROWS, config.NEURAL_INPUT_SIZE)
+    eager = trader.model.cpu().eval()
+
+    def run_eager():
+        with torch.no_grad():
+            eager(X)
+
+    results = {'eager': _time_calls(run_eager)}
+    _print_row("eager (nn.Module)", results['eager'])
+    if trader.inference_model is not None:
+        exported = trader.inference_model
+
+        def run_exported():
+            with torch.inference_mode():
+                exported(X)
+
+        results['torchscript'] = _time_calls(run_exported)
+        _print_row("torchscript (BN plegado)", results['torchscript'])
+        speedup = results['eager']['p50_ms'] / max(results['torchscript']['p50_ms'], 1e-9)
+        print(f"  Aceleración p50: x{speedup:.2f} | hilos intra-op: {torch.get_num_threads()}", flush=True)
+    else:
+        print("  Export TorchScript no disponible", flush=True)
+    return results
+
+
+def bench_quantized_inference():
+    """Latencia, tamaño y paridad float32 vs int8 dinámico"""
+    if not TORCH_AVAILABLE:
+        print("  PyTorch no disponible - benchmark omitido")
+        return {}
+    config = _bench_config()
+    trader = _get_trader(config)
+    if not os.path.exists(config.NN_MODEL_PATH):
+        print("  Sin modelo guardado (.pth) - benchmark omitido")
+        return {}
+    float_model, quantized_model = trader._build_quantized_model()
+    X = torch.randn(WINDOW_ROWS, config.NEURAL_INPUT_SIZE)
+
+    def run_float():
+        with torch.inference_mode():
+            float_model(X)
+
+    def run_quantized():
+        with torch.inference_mode():
+            quantized_model(X)
+
+    results = {'float32': _time_calls(run_float), 'int8_dynamic': _time_calls(run_quantized)}
+    _print_row("float32 (eager)", results['float32'])
+    _print_row("int8 dinámico", results['int8_dynamic'])
+
+    X_val, y_val = trader._load_validation_holdout()
+    holdout_available = X_val is not None
+    if not holdout_available:
+        # Sin set retenido: entradas sintéticas en el rango del MinMaxScaler (solo concordancia)
+        print("  Sin set de validación retenido - usando entradas sintéticas", flush=True)
+        X_val, y_val = np.random.rand(3000, config.NEURAL_INPUT_SIZE).astype(np.float32), None
+    report = trader.evaluate_quantization_parity(X_val, y_val, models=(float_model, quantized_model),
+                                                 save_report=holdout_available)
+    results['parity'] = report
+    if report:
+        print(f"  Memoria: {report['float_size_kb']:.1f}KB → {report['quantized_size_kb']:.1f}KB", flush=True)
+        print(f"  Concordancia: {report['agreement']:.4f} | Δprob máx: {report['max_prob_diff']:.4f}", flush=True)
+        if 'float_accuracy' in report:
+            print(f"  Precisión: float={report['float_accuracy']:.4f} int8={report['quantized_accuracy']:.4f}", flush=True)
+    return results
+
+
+def bench_shared_indicators():
+    """Ciclo de escaneo: analizador nuevo por llamada vs analizador compartido con caché"""
+    config = AdvancedTradingConfig()
+    rng = np.random.default_rng(7)
+    frames = [pd.DataFrame({'close': 100 + rng.standard_normal(200).cumsum()}) for _ in range(20)]
+    calls_per_symbol = 5  # estrategia, validador, señal, similaridad, gráfico
+
+    def run_cycle(get_analyzer):
+        for df in frames:
+            for _ in range(calls_per_symbol):
+                analyzer = get_analyzer()
+                analyzer.calculate_ema(df['close'], 9)
+                analyzer.calculate_ema(df['close'], 21)
+                analyzer.calculate_rsi(df['close'], 14)
+
+    shared = get_shared_technical_analyzer(config)
+    shared.clear_cache()
+    shared.pop_cycle_stats()
+    results = {
+        'per_call': _time_calls(lambda: run_cycle(lambda: OptimizedTechnicalAnalyzer(config)), repeats=20, warmup=2),
+        'shared': _time_calls(lambda: run_cycle(lambda: shared), repeats=20, warmup=2),
+    }
+    _print_row("analizador por llamada", results['per_call'])
+    _print_row("analizador compartido", results['shared'])
+    stats = shared.get_cache_stats()
+    print(f"  Aciertos de caché: {stats['hit_rate']:.1%} | entradas: {stats['entries']}", flush=True)
+    return results
+
+
+def bench_chart_render():
+    """Tiempo por gráfico de SignalChartGenerator.generate_signal_chart (80 velas)"""
+    if not PLOTTING_AVAILABLE:
+        print("  Matplotlib no disponible - benchmark omitido")
+        return {}
+    rng = np.random.default_rng(42)
+    close = 100 + rng.standard_normal(120).cumsum()
+    open_ = np.r_[close[0], close[:-1]]
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=120, freq='15min'),
+        'open': open_, 'high': np.maximum(open_, close) + rng.random(120),
+        'low': np.minimum(open_, close) - rng.random(120), 'close': close,
+        'volume': rng.integers(1_000, 5_000_000, 120).astype(float)
+    })
+    last = float(close[-1])
+    signal = {'entry_price': last * 0.995, 'stop_loss': last * 0.98, 'take_profit': last * 1.02,
+              'combined_signal': SignalType.STRONG_BUY, 'status': 'DESTACADA'}
+    generator = SignalChartGenerator(disable_websocket=True)
+    results = {'render': _time_calls(lambda: generator.generate_signal_chart('BENCHUSDT', df, signal, {}),
+                                     repeats=10, warmup=2)}
+    _print_row("generate_signal_chart", results['render'])
+    temp_chart = os.path.join(generator.directorio_graficos, 'temp_BENCHUSDT.png')
+    if os.path.exists(temp_chart):
+        os.remove(temp_chart)
+    return results
+
+
+BENCHMARKS = {
+    'neural_export': bench_neural_export,
+    'quantized_inference': bench_quantized_inference,
+    'shared_indicators': bench_shared_indicators,
+    'chart_render': bench_chart_render,
+}
+
+
+def main(selected=None):
+    names = selected or list(BENCHMARKS)
+    results = {}
+    for name in names:
+        print(f"\n=== {name} ===", flush=True)
+        results[name] = BENCHMARKS[name]()
+    return results
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
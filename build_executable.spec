@@ -144,6 +144,7 @@ hiddenimports = [
     'sklearn.preprocessing',
     'sklearn.model_selection',
     'sklearn.metrics',
+    'sklearn.metrics.pairwise',
     'sklearn.decomposition',
     'sklearn.neighbors',
     'sklearn.tree',
@@ -162,6 +163,7 @@ hiddenimports = [
     'matplotlib.pyplot',
     'matplotlib.backends.backend_qt5agg',
     'matplotlib.backends.backend_qt5',
+    'matplotlib.backends.backend_agg',
     'matplotlib.figure',
     'matplotlib.gridspec',
     'matplotlib.patches',
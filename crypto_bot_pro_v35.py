@@ -85,26 +85,49 @@ def is_desktop_environment():
 # Permitir ejecucion en Replit con VNC
 print("Iniciando Crypto Bot Pro v35.0.0.0 - Version Mejorada con Senales Precisas", flush=True)
 # Importaciones estándar
+import time
+_IMPORT_STARTED = time.perf_counter()
+IMPORT_PROFILE = {}  # {etapa: ms} del import del módulo; 'lazy:<módulo>' al cargarse en el primer uso
+_import_mark_at = _IMPORT_STARTED
+
+
+def _import_mark(stage: str):
+    """Registra el tiempo de import de una etapa (estilo -X importtime, por bloques)"""
+    global _import_mark_at
+    now = time.perf_counter()
+    IMPORT_PROFILE[stage] = (now - _import_mark_at) * 1000.0
+    _import_mark_at = now
+
+
 import asyncio
 import threading
 import pickle
 import logging
 import json
 import random
-import time
 import hashlib
 import hmac
 import queue
-print("Imports estandar completados", flush=True)
-from collections import defaultdict
+import copy
+import shutil
+import io
+import re
+import heapq
+import math
+import bisect
+import abc
+import importlib
+import importlib.util
+import urllib.parse
+from collections import defaultdict, deque, OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Callable, List, Optional, Tuple, Any, NamedTuple
+from typing import Dict, Callable, List, Optional, Tuple, Any, NamedTuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import ssl
 import certifi
 import urllib3
-print("Imports red completados", flush=True)
+_import_mark('stdlib/red')
 
 # ========== FUNCIÓN DE AYUDA PARA RUTAS DE RECURSOS (DEBE DEFINIRSE ANTES DE USAR) ==========
 def resource_path(relative_path):
@@ -220,60 +243,131 @@ def is_internet_available(host="8.8.8.8", port=53, timeout=3):
         return True
     except Exception:
         return False
-# Solo registra fallos (WARNING, ERROR, CRITICAL)
-print("Configurando logger completado", flush=True)
+_import_mark('logging')
+
+# ========== IMPORTACIÓN DIFERIDA DE STACKS PESADOS ==========
+_LAZY_IMPORT_LOCK = threading.RLock()
+
+
+def _module_available(name: str) -> bool:
+    """¿Está instalado? (find_spec no ejecuta el módulo: microsegundos frente a segundos)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class _LazyImport:
+    """
+    Módulo (o atributo de un módulo) que se importa en el primer uso. torch, sklearn, scipy,
+    matplotlib y aiohttp suman varios segundos al arranque y solo hacen falta al inferir,
+    entrenar, dibujar o enviar: el backend llega antes al primer escaneo y el modelo los
+    carga en su hilo de fondo. Atributos y llamadas se delegan al objeto real.
+    """
+    def __init__(self, module_name: str, attr: Optional[str] = None, before: Optional[Callable] = None,
+                 on_error: Optional[Callable] = None):
+        self._module_name = module_name
+        self._attr = attr
+        self._before = before  # Preparación previa al import (p. ej. backend Agg de matplotlib)
+        self._on_error = on_error  # Instalado pero no importable (p. ej. DLL rota): degradar la función
+        self._target = None
+
+    def _resolve(self):
+        target = self._target
+        if target is None:
+            with _LAZY_IMPORT_LOCK:
+                if self._target is None:
+                    started = time.perf_counter()
+                    if self._before is not None:
+                        self._before()
+                    try:
+                        module = importlib.import_module(self._module_name)
+                    except Exception as e:  # ImportError, OSError de DLL, ...
+                        if self._on_error is not None:
+                            self._on_error(e)
+                        raise
+                    self._target = getattr(module, self._attr) if self._attr else module
+                    IMPORT_PROFILE.setdefault(f"lazy:{self._module_name.split('.')[0]}",
+                                              (time.perf_counter() - started) * 1000.0)
+                target = self._target
+        return target
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        name = f"{self._module_name}.{self._attr}" if self._attr else self._module_name
+        return f"<import diferido {name} ({'cargado' if self._target is not None else 'pendiente'})>"
+
+
 # Importaciones numéricas y científicas
 import numpy as np
 import pandas as pd
 import glob
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.metrics import accuracy_score, classification_report, precision_recall_fscore_support
-from sklearn.model_selection import train_test_split
-import joblib
-print("Imports sklearn completados", flush=True)
+_import_mark('numpy/pandas')
+cosine_similarity = _LazyImport('sklearn.metrics.pairwise', 'cosine_similarity')
+MinMaxScaler = _LazyImport('sklearn.preprocessing', 'MinMaxScaler')
+accuracy_score = _LazyImport('sklearn.metrics', 'accuracy_score')
+classification_report = _LazyImport('sklearn.metrics', 'classification_report')
+precision_recall_fscore_support = _LazyImport('sklearn.metrics', 'precision_recall_fscore_support')
+train_test_split = _LazyImport('sklearn.model_selection', 'train_test_split')
+joblib = _LazyImport('joblib')
 # Importaciones de red neuronal
-try:
-    print("Intentando importar torch...", flush=True)
-    import torch
-    import torch.nn as nn
-    import torch.optim as optim
-    TORCH_AVAILABLE = True
-    print("PyTorch disponible - Red Neuronal habilitada", flush=True)
-except ImportError as e:
-    TORCH_AVAILABLE = False
-    torch = None
-    nn = None
-    optim = None
-    print(f"PyTorch no disponible: {e} - Funcionalidad de IA limitada", flush=True)
-except Exception as e:
-    TORCH_AVAILABLE = False
+def _torch_import_failed(error: Exception):
+    """torch está instalado pero no carga (DLL/CUDA rota): la IA queda deshabilitada como antes"""
+    global TORCH_AVAILABLE, torch, nn, optim
+    if TORCH_AVAILABLE:
+        TORCH_AVAILABLE = False
+        torch = nn = optim = None
+        print(f"PyTorch no disponible: {error} - Funcionalidad de IA limitada", flush=True)
+        logger.warning(f"⚠️ PyTorch no disponible: {error} - Funcionalidad de IA limitada")
+
+
+def ensure_torch() -> bool:
+    """Resuelve el import diferido de torch; False (y TORCH_AVAILABLE=False) si falla"""
+    if TORCH_AVAILABLE:
+        try:
+            torch._resolve()
+            nn._resolve()
+            optim._resolve()
+        except Exception:
+            pass  # _torch_import_failed ya degradó el estado
+    return TORCH_AVAILABLE
+
+
+TORCH_AVAILABLE = _module_available('torch')
+if TORCH_AVAILABLE:
+    torch = _LazyImport('torch', on_error=_torch_import_failed)
+    nn = _LazyImport('torch.nn', on_error=_torch_import_failed)
+    optim = _LazyImport('torch.optim', on_error=_torch_import_failed)
+else:
     torch = None
     nn = None
     optim = None
-    print(f"Error general en torch: {e}", flush=True)
+    print("PyTorch no disponible - Funcionalidad de IA limitada", flush=True)
 
 # Importaciones para detección de patrones
-try:
-    print("Intentando importar scipy...", flush=True)
-    from scipy.signal import argrelextrema
-    SCIPY_AVAILABLE = True
-    print("✅ SciPy disponible - Detección de patrones avanzada", flush=True)
-except ImportError as e:
-    SCIPY_AVAILABLE = False
-    print(f"⚠️ SciPy no disponible: {e} - Detección de patrones limitada", flush=True)
-except Exception as e:
-    print(f"Error general en scipy: {e}", flush=True)
+SCIPY_AVAILABLE = _module_available('scipy')
+argrelextrema = _LazyImport('scipy.signal', 'argrelextrema')
+if not SCIPY_AVAILABLE:
+    print("⚠️ SciPy no disponible - Detección de patrones limitada", flush=True)
 # Importaciones para requests
 try:
     import requests
     from requests.adapters import HTTPAdapter
     from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
-    print("✅ Requests disponible - Conexión API habilitada")
 except ImportError as e:
     REQUESTS_AVAILABLE = False
     print(f"⚠️ Requests no disponible: {e} - Conexión API deshabilitada")
+AIOHTTP_AVAILABLE = _module_available('aiohttp')
+aiohttp = _LazyImport('aiohttp')
+if not AIOHTTP_AVAILABLE:
+    print("⚠️ aiohttp no disponible - Telegram usará requests en hilos")
+_import_mark('requests')
 # Importaciones de WebSocket
 
 
@@ -289,7 +383,6 @@ except ImportError:
 try:
     import websocket
     WEBSOCKET_AVAILABLE = True
-    print("✅ WebSocket disponible - Datos en tiempo real habilitados")
 except ImportError as e:
     WEBSOCKET_AVAILABLE = False
     print(f"⚠️ WebSocket no disponible: {e} - Datos en tiempo real deshabilitados")
@@ -336,15 +429,19 @@ try:
             return False
     MULTI_EXCHANGE_AVAILABLE = True
     DYNAMIC_THRESHOLDS_AVAILABLE = True
-    print("✅ Multi-Exchange disponible - Múltiples exchanges habilitados")
-    print("✅ Dynamic Thresholds disponible - Umbrales dinámicos habilitados")
 except ImportError as e:
     MULTI_EXCHANGE_AVAILABLE = False
     DYNAMIC_THRESHOLDS_AVAILABLE = False
     print(f"⚠️ Multi-Exchange no disponible: {e} - Solo Binance habilitado")
     print(f"⚠️ Dynamic Thresholds no disponible: {e} - Umbrales fijos")
+_import_mark('websocket')
+# Modo de ejecución: --backend/--headless o CRYPTOBOT_HEADLESS=1 arrancan sin Qt (stubs de consola)
+HEADLESS_MODE = (any(arg in ('--backend', '--headless') for arg in sys.argv[1:])
+                 or os.environ.get('CRYPTOBOT_HEADLESS', '').strip().lower() in ('1', 'true', 'yes'))
 # Importaciones de GUI
 try:
+    if HEADLESS_MODE:
+        raise ImportError("modo backend solicitado")
     from PyQt5 import QtWidgets, QtCore, QtGui
     from PyQt5.QtWidgets import (
         QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
@@ -355,15 +452,15 @@ try:
     from PyQt5.QtCore import QTimer, Qt, QMetaObject, Q_ARG, pyqtSlot
     from PyQt5.QtGui import QFont, QColor, QPalette
     PYQT_AVAILABLE = True
-    print("✅ PyQt5 disponible - Interfaz gráfica habilitada")
     try:
         QtCore.qRegisterMetaType(QtGui.QTextCursor)
     except Exception:
         pass
 except ImportError as e:
     PYQT_AVAILABLE = False
-    print(f"❌ PyQt5 no disponible: {e} - Modo consola activado")
-    print("ℹ️ Para GUI en Windows instala: pip install pyqt5")
+    if not HEADLESS_MODE:
+        print(f"❌ PyQt5 no disponible: {e} - Modo consola activado")
+        print("ℹ️ Para GUI en Windows instala: pip install pyqt5")
 
     # ========== STUBS PARA MODO CONSOLA (sin GUI) ==========
     class _QtStubClass:
@@ -376,6 +473,7 @@ except ImportError as e:
         Horizontal = 0
         Vertical = 1
         AlignCenter = 0
+        UserRole = 256
         def __getattr__(self, name): return _QtStubClass
 
     class QtWidgetsStub:
@@ -458,38 +556,38 @@ except ImportError as e:
         def decorator(func): return func
         return decorator
 
-# Importaciones para QWebEngineView (TradingView Charts)
-try:
-    from PyQt5.QtWebEngineWidgets import QWebEngineView
-    from PyQt5.QtWebChannel import QWebChannel
-    from PyQt5.QtCore import QUrl
-    WEBENGINE_AVAILABLE = True
-    print("✅ PyQtWebEngine disponible - Gráficos TradingView habilitados")
-except ImportError as e:
-    WEBENGINE_AVAILABLE = False
-    print(f"⚠️ PyQtWebEngine no disponible: {e} - Usando matplotlib")
-# Importaciones para gráficos
-try:
+_import_mark('PyQt5')
+# QWebEngineView (TradingView Charts): solo se comprueba la instalación
+WEBENGINE_AVAILABLE = PYQT_AVAILABLE and _module_available('PyQt5.QtWebEngineWidgets')
+
+
+def _use_agg_backend():
     import matplotlib
-    matplotlib.use('Agg')  # Backend no-GUI por defecto
-    import matplotlib.pyplot as plt
-    import mplfinance as mpf
-    from matplotlib.figure import Figure
-    from matplotlib.patches import Rectangle
-    from matplotlib.gridspec import GridSpec  # ✅ Importar GridSpec aquí
+    matplotlib.use('Agg')  # Backend no-GUI por defecto (antes de pyplot)
+
+
+# Importaciones para gráficos: diferidas hasta el primer render
+PLOTTING_AVAILABLE = _module_available('matplotlib') and _module_available('mplfinance')
+if PLOTTING_AVAILABLE:
+    plt = _LazyImport('matplotlib.pyplot', before=_use_agg_backend)
+    mpf = _LazyImport('mplfinance', before=_use_agg_backend)
+    Figure = _LazyImport('matplotlib.figure', 'Figure', before=_use_agg_backend)
+    Rectangle = _LazyImport('matplotlib.patches', 'Rectangle', before=_use_agg_backend)
+    GridSpec = _LazyImport('matplotlib.gridspec', 'GridSpec', before=_use_agg_backend)
+    LineCollection = _LazyImport('matplotlib.collections', 'LineCollection', before=_use_agg_backend)
+    PolyCollection = _LazyImport('matplotlib.collections', 'PolyCollection', before=_use_agg_backend)
+    FigureCanvasAgg = _LazyImport('matplotlib.backends.backend_agg', 'FigureCanvasAgg', before=_use_agg_backend)
     # Solo importar backend Qt5 si PyQt5 está disponible
     if PYQT_AVAILABLE:
-        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        FigureCanvas = _LazyImport('matplotlib.backends.backend_qt5agg', 'FigureCanvasQTAgg',
+                                   before=_use_agg_backend)
     else:
         # Stub para FigureCanvas en modo consola
         class FigureCanvas:
             def __init__(self, *args, **kwargs): pass
             def draw(self): pass
-    PLOTTING_AVAILABLE = True
-    print("✅ Matplotlib disponible - Gráficos habilitados")
-except ImportError as e:
-    PLOTTING_AVAILABLE = False
-    print(f"⚠️ Matplotlib no disponible: {e} - Gráficos deshabilitados")
+else:
+    print("⚠️ Matplotlib/mplfinance no disponible - Gráficos deshabilitados")
     # Stubs para modo sin gráficos
     class FigureCanvas:
         def __init__(self, *args, **kwargs): pass
@@ -565,11 +663,115 @@ class StrategySignal:
             f"R/R: {self.risk_reward_ratio:.2f}"
         )
 
+# ==============================================================================
+# AJUSTES COMPILADOS (snapshot inmutable de la configuración)
+# ==============================================================================
+class TradingSettings(NamedTuple):
+    """
+    Snapshot tipado e inmutable de los ajustes que leen los bucles calientes (generación de
+    señal, validación, scheduler del escáner). Se compila una vez por cambio de configuración
+    y se publica sustituyendo la referencia entera: una evaluación en curso lee siempre un
+    snapshot coherente, sin getattr ni conversiones por llamada.
+    """
+    # Generación de señal
+    MIN_SIGNAL_ROBUSTNESS: float = 76.0
+    MIN_STOP_LOSS_PERCENT: float = 0.3
+    TAKE_PROFIT_PERCENT: float = 1.0
+    MIN_RISK_REWARD_RATIO: float = 1.75
+    MIN_VOLATILITY_PERCENT: float = 0.5
+    # Validación
+    MIN_ENTRY_PATTERN_CONFIDENCE: float = 60.0
+    MIN_TECH_VALIDATION: float = 85.0
+    MIN_NEURAL_VALIDATION: float = 88.0
+    MIN_VOLUME_RATIO: float = 1.2
+    REQUIRE_ENTRY_SETUP: bool = False
+    REQUIRE_CANDLE_PATTERN: bool = False
+    # Umbrales DESTACADA / CONFIRMADA y pesos
+    MIN_NEURAL_DESTACADA: float = 92.0
+    MIN_TECHNICAL_DESTACADA: float = 92.0
+    MIN_ALIGNMENT_DESTACADA: float = 92.0
+    MIN_NEURAL_CONFIRMADA: float = 92.0
+    MIN_TECHNICAL_CONFIRMADA: float = 92.0
+    MIN_ALIGNMENT_CONFIRMADA: float = 92.0
+    NEURAL_WEIGHT: float = 0.5
+    TECHNICAL_WEIGHT: float = 0.5
+    MILESTONE_1: float = 1.0
+    MILESTONE_2: float = 2.0
+    MILESTONE_3: float = 3.0
+    MAX_DAILY_SIGNALS: int = 5
+    # Escáner
+    SCAN_INTERVAL: float = 60.0
+    SCAN_BATCH_SIZE: int = 10
+    SCAN_BATCH_DELAY: float = 0.5
+    # Derivados precalculados
+    min_sl_fraction: float = 0.003
+    min_tp_fraction: float = 0.01
+    entry_required: bool = False
+    version: int = 0
+
+    @classmethod
+    def compile(cls, config, version: int = 0) -> 'TradingSettings':
+        """Lee, convierte y valida cada ajuste de `config`; ValueError si alguno es inválido"""
+        values = {}
+        for name in _SETTINGS_SOURCE_FIELDS:
+            raw = getattr(config, name, cls._field_defaults[name])
+            kind = cls.__annotations__[name]
+            try:
+                if kind is bool:
+                    if not isinstance(raw, (bool, int)):
+                        raise TypeError(type(raw).__name__)
+                    value = bool(raw)
+                else:
+                    value = kind(raw)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{name}={raw!r}: se esperaba {kind.__name__} ({e})") from None
+            if kind is float and not math.isfinite(value):
+                raise ValueError(f"{name}={raw!r}: valor no finito")
+            values[name] = value
+        if values['SCAN_INTERVAL'] <= 0 or values['SCAN_BATCH_SIZE'] < 1 or values['SCAN_BATCH_DELAY'] < 0:
+            raise ValueError(f"Escáner inválido: SCAN_INTERVAL={values['SCAN_INTERVAL']}, "
+                             f"SCAN_BATCH_SIZE={values['SCAN_BATCH_SIZE']}, SCAN_BATCH_DELAY={values['SCAN_BATCH_DELAY']}")
+        return cls(**values,
+                   min_sl_fraction=values['MIN_STOP_LOSS_PERCENT'] / 100,
+                   min_tp_fraction=values['TAKE_PROFIT_PERCENT'] / 100,
+                   entry_required=values['REQUIRE_ENTRY_SETUP'] or values['REQUIRE_CANDLE_PATTERN'],
+                   version=version)
+
+    def changes(self, other: 'TradingSettings') -> Dict[str, Tuple[Any, Any]]:
+        """{ajuste: (antes, después)} de los ajustes de origen que difieren de `other`"""
+        return {name: (getattr(other, name), getattr(self, name)) for name in _SETTINGS_SOURCE_FIELDS
+                if getattr(other, name) != getattr(self, name)}
+
+
+# Ajustes que vienen de la configuración (los campos en minúscula son derivados)
+_SETTINGS_SOURCE_FIELDS = tuple(name for name in TradingSettings._fields if name.isupper())
+
+
+def current_settings(config) -> TradingSettings:
+    """Snapshot vigente de `config`; las configs sin snapshot (p. ej. SimpleNamespace) se compilan al vuelo"""
+    settings = getattr(config, 'settings', None)
+    return settings if isinstance(settings, TradingSettings) else TradingSettings.compile(config)
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, tamaño) de un archivo, o None si no existe"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
 # ==============================================================================
 # CLASE DE CONFIGURACIÓN AVANZADA
 # ==============================================================================
 class AdvancedTradingConfig:
     """Configuración centralizada para el bot de trading"""
+    # Solo se aplican al arrancar: cambiarlas en caliente desviaría órdenes y trades ya abiertos
+    RESTART_ONLY_KEYS = ('MARKET_TYPE', 'TRADING_SYMBOLS', 'PERPETUALS_SYMBOLS', 'SPOT_SYMBOLS', 'USE_TESTNET',
+                         'AUTOTRADER_MODE', 'binance_api_key', 'binance_secret_key', 'telegram_bot_token',
+                         'telegram_chat_id', 'telegram_enabled')
+
     def __init__(self):
         # Símbolos de trading
         self.PERPETUALS_SYMBOLS = [
@@ -624,6 +826,23 @@ class AdvancedTradingConfig:
         self.MIN_DAILY_SIGNALS = 2
         self.SCAN_BATCH_SIZE = 10      # Símbolos por lote para evitar rate limits
         self.SCAN_BATCH_DELAY = 0.5    # Segundos de delay entre lotes
+        # ⚙️ Pool acotado para análisis disparados por cierre de vela (WebSocket)
+        self.ANALYSIS_WORKERS = 4
+        self.ANALYSIS_MAX_PENDING = 200
+        # 🖼️ Render de gráficos fuera del hilo de monitoreo
+        self.CHART_RENDER_PROCESS_ENABLED = True  # False = hilo dedicado en este proceso
+        self.CHART_RENDER_TIMEOUT = 20  # Segundos máximos esperando un gráfico
+        self.CHART_CACHE_SIZE = 32
+        # PNG en memoria hacia Telegram; en disco solo las CONFIRMADA (archivo histórico)
+        self.CHART_PERSIST_CONFIRMED = True
+        self.CHART_DIR_MAX_MB = 200  # Retención: tamaño máximo del directorio de gráficos
+        self.CHART_DIR_MAX_FILES = 500
+        # 🖥️ Bus de eventos hacia la GUI (estado fusionado, logs en lote, críticos sin pérdida)
+        self.GUI_BUS_LOG_MAXLEN = 1000  # Líneas de log pendientes antes de descartar las más antiguas
+        self.GUI_BUS_DETACHED_BACKLOG = 200  # Eventos críticos retenidos sin GUI conectada
+        self.GUI_FRAME_MS = 50  # Intervalo de drenado del bus en la GUI
+        self.GUI_LOG_CAPACITY = 5000  # Líneas en el buffer circular de la terminal
+        self.GUI_LOG_FLUSH_MS = 100  # Volcado por lotes de la terminal (10 fps)
 
         # Validation parameters
         self.MIN_TECH_VALIDATION = 85.0
@@ -686,6 +905,26 @@ class AdvancedTradingConfig:
         # ✅ CORREGIDO: Rutas unificadas en CryptoBotPro_Data/models/
         self.NN_MODEL_PATH = os.path.join(MODELS_DIR, "neural_net_model_v20_optimized.pth")
         self.SCALER_PATH = os.path.join(MODELS_DIR, "scaler_v20_optimized.pkl")
+        # ⚡ Artefacto de inferencia TorchScript (BatchNorm plegado en las Linear)
+        self.NN_EXPORT_PATH = os.path.join(MODELS_DIR, "neural_net_model_v20_optimized.ts")
+        self.NEURAL_EXPORT_ENABLED = True
+        self.NEURAL_INTRAOP_THREADS = 0  # 0 = automático (mitad de los núcleos, máx. 4)
+        # ⚡ Inferencia cuantizada int8 dinámica (opt-in, solo CPU)
+        self.NEURAL_QUANTIZED_INFERENCE = False
+        self.NEURAL_QUANTIZED_MIN_AGREEMENT = 0.98  # Concordancia mínima con el modelo float
+        self.NN_VALIDATION_HOLDOUT_PATH = os.path.join(MODELS_DIR, "validation_holdout_v20.npz")
+        self.NN_QUANTIZATION_REPORT_PATH = os.path.join(MODELS_DIR, "quantization_report_v20.json")
+        # 🔄 Reentrenamiento en segundo plano (proceso aparte + hot-swap atómico)
+        self.RETRAIN_AFTER_N_TRADES = 5
+        self.RETRAIN_MIN_SUCCESSFUL_TRADES = 5
+        self.RETRAIN_MAX_SYMBOLS = 20
+        self.RETRAIN_FINETUNE_EPOCHS = 3
+        self.RETRAIN_KEEP_VERSIONS = 3
+        self.DAILY_RETRAIN_ENABLED = False
+        self.RETRAIN_HOUR = 3  # Hora UTC del reentrenamiento diario
+        # 🚀 Registro de modelo: carga en segundo plano + warm-up antes del primer análisis
+        self.NEURAL_WARMUP_PASSES = 3
+        self.MODEL_READY_TIMEOUT = 60  # Segundos máximos que el escáner espera al modelo
 
         # Data requirements
         self.MIN_NN_DATA_REQUIRED = 360
@@ -701,6 +940,9 @@ class AdvancedTradingConfig:
         self.TRAILING_STOP_ACTIVATION = 0.5   # Activar trailing despues de 0.5% de profit
         self.TRAILING_STOP_DISTANCE = 0.3     # Distancia del trailing stop (0.3%)
         self.TRAILING_STOP_BREAKEVEN = 0.8    # Mover SL a breakeven despues de 0.8%
+        # Auto-trading: el trailing se evalúa en cada tick; las enmiendas al exchange se limitan
+        self.TRAILING_STEP = 0.1  # % mínimo (sobre la entrada) que debe mejorar el SL para enmendarlo
+        self.TRAILING_AMEND_MIN_INTERVAL_S = 5.0  # Intervalo mínimo entre enmiendas por símbolo (breakeven no espera)
         
         self.USE_TESTNET = True  # Default: Testnet para seguridad
 
@@ -735,6 +977,8 @@ class AdvancedTradingConfig:
         self.CONFIRMADA_TIMEOUT_MINUTES = 180
         self.PROMOTION_WAIT_MINUTES = 3
         self.MIN_PROMOTION_TIME_SECONDS = 3 * 60  # 3 minutos mínimo para promoción
+        self.MAX_TRACKED_SIGNALS = 3  # Señales en seguimiento simultáneo; el escaneo sigue con el resto
+        self.SIGNAL_TICK_STALE_S = 5.0  # Sin ticks del stream en este tiempo → precio por REST en el ciclo
 
         # Directorios (usando las constantes globales definidas al inicio)
         self.DATA_ROOT = DATA_ROOT
@@ -751,6 +995,23 @@ class AdvancedTradingConfig:
         self.telegram_bot_token = os.environ.get('TELEGRAM_BOT_TOKEN', '')
         self.telegram_chat_id = os.environ.get('TELEGRAM_CHAT_ID', '')
         self.telegram_enabled = bool(self.telegram_bot_token and self.telegram_chat_id)
+        # Emisor asíncrono de Telegram (límites oficiales: ~30 msg/s global, ~1 msg/s por chat, 20/min en grupos)
+        self.TELEGRAM_API_BASE = "https://api.telegram.org"
+        self.TELEGRAM_GLOBAL_RATE = 30.0  # Mensajes/s para todo el bot
+        self.TELEGRAM_GLOBAL_BURST = 30
+        self.TELEGRAM_CHAT_RATE = 1.0  # Mensajes/s por chat privado
+        self.TELEGRAM_CHAT_BURST = 3
+        self.TELEGRAM_GROUP_RATE_PER_MIN = 20  # Chats con id negativo (grupos/canales)
+        self.TELEGRAM_MAX_IN_FLIGHT = 4  # Peticiones HTTP concurrentes
+        self.TELEGRAM_MAX_PENDING = 200  # Por encima se descartan mensajes de prioridad normal
+        self.TELEGRAM_REQUEST_TIMEOUT = 15
+        self.TELEGRAM_PHOTO_TIMEOUT = 30
+        self.TELEGRAM_SEND_TIMEOUT = 60  # Espera máxima de los envíos síncronos (_send_message_direct)
+        # Edición en sitio: promoción/avances/cierre editan el post de la señal en vez de enviar uno nuevo
+        self.TELEGRAM_EDIT_IN_PLACE = False
+        self.TELEGRAM_EDIT_MIN_INTERVAL = 3.0  # Segundos entre ediciones de un post; las intermedias se fusionan
+        self.TELEGRAM_EDIT_CLOSURE_REPLY = True  # Respuesta corta al cerrar (las ediciones no notifican)
+        self.TELEGRAM_LIVE_POSTS_MAX = 100
         self.TELEGRAM_SIGNAL_TEMPLATE = """
 {emoji_prefix} {direction} {signal_level_text}
 ━━━━━━━━━━━━━━━━━━━━
@@ -776,14 +1037,110 @@ class AdvancedTradingConfig:
         self.BINANCE_TESTNET_URL = "https://testnet.binance.vision"
         self.BINANCE_TESTNET_SPOT_URL = "https://testnet.binance.vision"
         self.BINANCE_TESTNET_FUTURES_URL = "https://testnet.binancefuture.com"
+        self.EXCHANGE_INFO_TTL = 6 * 3600  # Refresco en segundo plano de exchangeInfo (s)
+        # Gateway de órdenes: sesión keep-alive precalentada y entrada+SL en un solo viaje
+        self.ORDER_GATEWAY_POOL = 4  # Conexiones keep-alive por endpoint
+        self.ORDER_GATEWAY_KEEPALIVE_S = 30  # Ping periódico para mantener las conexiones calientes
+        self.ORDER_GATEWAY_FUTURES_BATCH = True  # Futuros: entrada+SL por batchOrders; False = en paralelo
+        self.ORDER_RECV_WINDOW_MS = 5000
+        self.ORDER_REQUEST_TIMEOUT = 10
+        # Stream de usuario (listenKey): fills, stops y liquidaciones empujados por Binance
+        self.BINANCE_TESTNET_SPOT_WS_URL = "wss://testnet.binance.vision/ws"
+        self.BINANCE_TESTNET_FUTURES_WS_URL = "wss://stream.binancefuture.com/ws"
+        self.USER_STREAM_ENABLED = True
+        self.USER_STREAM_KEEPALIVE_S = 1800  # Binance expira el listenKey a los 60 min sin PUT
+        # Diario de estado (WAL + snapshots): señales y trades sobreviven a un reinicio
+        self.STATE_JOURNAL_ENABLED = True
+        self.STATE_DIR = os.path.join(DATA_ROOT, 'state')
+        self.STATE_SNAPSHOT_EVERY = 200  # Entradas del WAL entre snapshots (compactación)
+        self.STATE_JOURNAL_FSYNC = True  # fsync por transición: sobrevive también a un corte de luz
+        # Recarga en caliente del JSON: snapshot TradingSettings nuevo sin reiniciar el bot
+        self.CONFIG_WATCH_ENABLED = True
+        self.CONFIG_WATCH_INTERVAL_S = 2.0  # Sondeo de mtime/tamaño del archivo
+        # Modo backend (sin GUI): un event loop asyncio + executor acotado en lugar de un hilo por servicio
+        self.BACKEND_ASYNC_RUNTIME = True
+        self.BACKEND_EXECUTOR_WORKERS = 6  # Análisis (CPU) y E/S bloqueante (REST, diario, monitor)
+        self.BACKEND_STREAMS_PER_CONNECTION = 200  # Velas por WebSocket combinado (límite de futures)
+        self.BACKEND_STATUS_INTERVAL_S = 10  # Estado por consola
+        self.settings = None  # TradingSettings vigente (se sustituye entero en cada cambio)
+        self.file_signature = None  # Firma del archivo en la última lectura/escritura propia
+        self._settings_listeners = []  # callback(anterior, nuevo)
+        self._config_lock = threading.RLock()
 
         # Cargar configuración desde archivo si existe
         self.load_config()
 
+    def config_path(self) -> str:
+        return resource_path('config_v20_optimized.json')
+
     def load_config(self):
         """Cargar configuración COMPLETA desde archivo JSON - Formato unificado"""
+        with self._config_lock:
+            self._read_config_file()
+            try:
+                self.compile_settings()
+            except ValueError as e:
+                logger.error(f"❌ Ajustes inválidos en la configuración: {e}")
+                if self.settings is None:
+                    self.settings = TradingSettings(version=1)
+
+    def compile_settings(self) -> TradingSettings:
+        """Compila y publica el snapshot de ajustes (una asignación: nunca se ve uno a medias)"""
+        with self._config_lock:
+            previous = self.settings
+            settings = TradingSettings.compile(self, previous.version + 1 if previous is not None else 1)
+            self.settings = settings
+            listeners = list(self._settings_listeners)
+        if previous is not None and settings.changes(previous):
+            for listener in listeners:
+                try:
+                    listener(previous, settings)
+                except Exception as e:
+                    logger.error(f"❌ Error en listener de ajustes: {e}")
+        return settings
+
+    def add_settings_listener(self, callback: Callable[[TradingSettings, TradingSettings], None]):
+        self._settings_listeners.append(callback)
+
+    def reload_from_file(self) -> bool:
+        """
+        Recarga en caliente: relee el JSON, valida y publica un snapshot nuevo.
+        Si el archivo no se puede leer o algún ajuste es inválido se restauran los valores
+        previos y el snapshot vigente no cambia. RESTART_ONLY_KEYS esperan al próximo arranque.
+        """
+        with self._config_lock:
+            backup = dict(self.__dict__)
+            try:
+                self._read_config_file(strict=True)
+                pending_restart = [key for key in self.RESTART_ONLY_KEYS
+                                   if key in backup and getattr(self, key, None) != backup[key]]
+                for key in pending_restart:
+                    setattr(self, key, backup[key])
+                previous = self.settings
+                settings = self.compile_settings()
+            except Exception as e:
+                signature = self.file_signature
+                for key in [key for key in self.__dict__ if key not in backup]:
+                    delattr(self, key)
+                self.__dict__.update(backup)
+                self.file_signature = signature  # No reintentar el mismo archivo inválido
+                logger.error(f"❌ Recarga de configuración rechazada, se mantiene la vigente: {e}")
+                return False
+        changes = settings.changes(previous)
+        if changes:
+            summary = ", ".join(f"{name} {old}→{new}" for name, (old, new) in changes.items())
+            logger.info(f"🔄 Configuración recargada (v{settings.version}): {summary}")
+        else:
+            logger.info("🔄 Configuración recargada sin cambios en los ajustes en caliente")
+        if pending_restart:
+            logger.warning(f"⚠️ Requieren reinicio (no aplicados): {', '.join(pending_restart)}")
+        return True
+
+    def _read_config_file(self, strict: bool = False):
+        """Vuelca el JSON sobre los atributos; con strict=True los errores se propagan"""
         try:
-            config_path = resource_path('config_v20_optimized.json')
+            config_path = self.config_path()
+            self.file_signature = _file_signature(config_path)
             if os.path.exists(config_path):
                 with open(config_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
@@ -802,9 +1159,10 @@ class AdvancedTradingConfig:
                     'MAX_ENTRY_DISTANCE_ATR', 'MAX_ENTRY_CANDLE_RANGE_ATR', 'MAX_ENTRY_CANDLE_BODY_ATR',
                     'ENTRY_PULLBACK_REQUIRED', 'ENTRY_CONFLUENCE_BYPASS',
                     'MIN_VOLATILITY_PERCENT', 'EMA_FAST', 'EMA_SLOW',
-                    'ADVANCED_SIGNAL_FILTER_ENABLED', 'MIN_SIGNAL_SCORE', 'MIN_CONFLUENCE', 'MIN_RISK_REWARD', 'MIN_WIN_PROBABILITY', 'MAX_CONCURRENT_TRADES'
+                    'ADVANCED_SIGNAL_FILTER_ENABLED', 'MIN_SIGNAL_SCORE', 'MIN_CONFLUENCE', 'MIN_RISK_REWARD', 'MIN_WIN_PROBABILITY', 'MAX_CONCURRENT_TRADES',
+                    'NEURAL_QUANTIZED_INFERENCE'
                 ]
-                for key in direct_keys:
+                for key in dict.fromkeys(direct_keys + list(_SETTINGS_SOURCE_FIELDS)):
                     if key in data and data[key] is not None:
                         setattr(self, key, data[key])
 
@@ -881,12 +1239,14 @@ class AdvancedTradingConfig:
                 print(f"📊 Milestones: {self.MILESTONES} | TP: {self.PROFIT_TARGET_PERCENT}%")
                 print(f"📈 Mercado: {self.MARKET_TYPE} | Símbolos: {len(self.TRADING_SYMBOLS)}")
         except Exception as e:
+            if strict:
+                raise
             logger.warning(f"No se pudo cargar config: {e}")
 
     def save_config(self):
         """Guardar configuración COMPLETA a archivo JSON (formato unificado GUI↔JSON)"""
         try:
-            config_path = resource_path('config_v20_optimized.json')
+            config_path = self.config_path()
             data = {
                 # Mercado
                 "MARKET_TYPE": self.MARKET_TYPE,
@@ -945,6 +1305,7 @@ class AdvancedTradingConfig:
                 "MIN_VOLATILITY_PERCENT": getattr(self, 'MIN_VOLATILITY_PERCENT', 0.5),
                 "MIN_VOLUME_24H_USD": getattr(self, 'MIN_VOLUME_24H_USD', 1_000_000),
                 "FIX_API_ENABLED": getattr(self, 'FIX_API_ENABLED', False),  # ← ¡CRÍTICO!
+                "NEURAL_QUANTIZED_INFERENCE": getattr(self, 'NEURAL_QUANTIZED_INFERENCE', False),
                  # Símbolos
                 "PERPETUALS_SYMBOLS": self.PERPETUALS_SYMBOLS,
                 "SPOT_SYMBOLS": self.SPOT_SYMBOLS,
@@ -954,11 +1315,23 @@ class AdvancedTradingConfig:
                 "telegram_bot_token": self.telegram_bot_token if not os.environ.get('TELEGRAM_BOT_TOKEN') else "",
                 "telegram_chat_id": self.telegram_chat_id if not os.environ.get('TELEGRAM_CHAT_ID') else "",
             }
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            # Todos los ajustes en caliente quedan en el archivo (editables sin reiniciar)
+            for name in _SETTINGS_SOURCE_FIELDS:
+                data.setdefault(name, getattr(self, name, TradingSettings._field_defaults[name]))
+            with self._config_lock:
+                # Escritura atómica: el watcher (o una caída) nunca ve un JSON a medias
+                tmp_path = config_path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_path, config_path)
+                self.file_signature = _file_signature(config_path)  # Escritura propia: sin recarga
             logger.info(f"✅ Configuración guardada: {len(data)} parámetros")
         except Exception as e:
             logger.error(f"Error guardando config: {e}")
+        try:
+            self.compile_settings()  # Cambios desde la GUI: snapshot nuevo
+        except ValueError as e:
+            logger.error(f"❌ Ajustes inválidos, se mantiene el snapshot vigente: {e}")
 
     def get_commission_rate(self) -> float:
         """Obtener tasa de comisión según tipo de mercado"""
@@ -988,6 +1361,62 @@ class AdvancedTradingConfig:
             self.TRADING_SYMBOLS = self.SPOT_SYMBOLS.copy()
         logger.info(f"📈 Símbolos actualizados para {self.MARKET_TYPE}: {len(self.TRADING_SYMBOLS)} pares")
 
+
+class ConfigWatcher:
+    """
+    Vigila el JSON de configuración y lo recarga en caliente al cambiar.
+    Sondeo de (mtime_ns, tamaño) cada CONFIG_WATCH_INTERVAL_S: portable (Windows/.exe incluido)
+    y sin dependencias; un os.stat por vuelta. Las escrituras propias (save_config) registran
+    su firma y no provocan recarga.
+    """
+    SETTLE_S = 0.05  # Editores que escriben en varios pasos: la firma debe estabilizarse
+
+    def __init__(self, config: AdvancedTradingConfig):
+        self.config = config
+        self.interval = max(0.05, float(getattr(config, 'CONFIG_WATCH_INTERVAL_S', 2.0)))
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {'checks': 0, 'reloads': 0, 'rejected': 0, 'last_reload_ms': 0.0}
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="ConfigWatcher")
+        self._thread.start()
+        logger.info(f"👁️ Recarga en caliente de configuración activa (cada {self.interval:.1f}s)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def check(self) -> bool:
+        """Una comprobación; True si se aplicó una configuración nueva"""
+        self.stats['checks'] += 1
+        path = self.config.config_path()
+        signature = _file_signature(path)
+        if signature is None or signature == self.config.file_signature:
+            return False
+        time.sleep(self.SETTLE_S)
+        if _file_signature(path) != signature:
+            return False  # Aún se está escribiendo: siguiente vuelta
+        started = time.perf_counter()
+        if not self.config.reload_from_file():
+            self.stats['rejected'] += 1
+            return False
+        self.stats['reloads'] += 1
+        self.stats['last_reload_ms'] = (time.perf_counter() - started) * 1000.0
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"❌ Error vigilando la configuración: {e}")
+
 # ==============================================================================
 # CLIENTE BINANCE AVANZADO
 # ==============================================================================
@@ -1099,11 +1528,8 @@ class AdvancedBinanceClient:
         """Validar lista de símbolos contra Binance"""
         validated = []
         try:
-            url = f"{self._get_endpoint()}/api/v3/exchangeInfo"
-            response = self.session.get(url, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
-                available = {s['symbol'] for s in data.get('symbols', []) if s.get('status') == 'TRADING'}
+            available = get_exchange_metadata(self.config, self._get_endpoint(), "/api/v3").tradable_symbols()
+            if available:
                 validated = [s for s in symbols if s in available]
         except Exception as e:
             logger.debug(f"Error validando símbolos: {e}")
@@ -1723,7 +2149,9 @@ class UnifiedMarketAnalyzer:
             ).to(self.device)
 
             # 3. Cargar Pesos (State Dict)
-            checkpoint = torch.load(model_path, map_location=self.device)
+            # Checkpoint y scaler compartidos con el registro: se leen de disco una sola vez por proceso
+            registry = get_model_registry(self.config)
+            checkpoint = registry.load_artifact(model_path, lambda p: torch.load(p, map_location='cpu'))
             if isinstance(checkpoint, dict) and 'model_state_dict' in checkpoint:
                 config_data = checkpoint.get('config', {})
                 saved_input_size = config_data.get('input_size', self.config.NEURAL_INPUT_SIZE)
@@ -1758,7 +2186,7 @@ class UnifiedMarketAnalyzer:
                 return
 
             # 4. Cargar Scaler
-            self.scaler = joblib.load(scaler_path)
+            self.scaler = registry.load_artifact(scaler_path, joblib.load)
             self.is_neural_ready = True
 
         except Exception as e:
@@ -1768,9 +2196,10 @@ class UnifiedMarketAnalyzer:
     def check_limit_and_generate_signal(self, df: pd.DataFrame, symbol: str) -> Optional[Dict]:
         if self.active_signal is not None:
             return None
+        settings = current_settings(self.config)  # Un snapshot por evaluación
 
         # === 🔥 FAST-FAIL REAL: ANTES DE CUALQUIER CÁLCULO PESADO ===
-        fast = self._fast_engine_lightweight(df, symbol)
+        fast = self._fast_engine_lightweight(df, symbol, settings)
         if not fast:
             return None
 
@@ -1803,13 +2232,12 @@ class UnifiedMarketAnalyzer:
             float(tech_score) * 0.30 +
             float(align_score) * 0.25
         )
-        min_robustness = float(getattr(self.config, 'MIN_SIGNAL_ROBUSTNESS', 76.0))
-        if robustness_score < min_robustness:
+        if robustness_score < settings.MIN_SIGNAL_ROBUSTNESS:
             return None
 
         # === 📏 Niveles con pisos mínimos ===
-        min_sl_percent = getattr(self.config, 'MIN_STOP_LOSS_PERCENT', 0.3) / 100
-        min_tp_percent = getattr(self.config, 'TAKE_PROFIT_PERCENT', 1.0) / 100
+        min_sl_percent = settings.min_sl_fraction
+        min_tp_percent = settings.min_tp_fraction
         atr_regime = float((atr / current_price) * 100) if current_price > 0 else 0.0
 
         # ✅ Ajuste adaptativo por volatilidad y calidad de señal (menos SL por ruido)
@@ -1828,8 +2256,7 @@ class UnifiedMarketAnalyzer:
         tp_dist = max(atr * tp_mult, current_price * min_tp_percent)
 
         rr_ratio = (tp_dist / sl_dist) if sl_dist > 0 else 0.0
-        min_rr_ratio = float(getattr(self.config, 'MIN_RISK_REWARD_RATIO', 1.75))
-        if rr_ratio < min_rr_ratio:
+        if rr_ratio < settings.MIN_RISK_REWARD_RATIO:
             return None
 
         if buy_confluence:
@@ -1860,9 +2287,11 @@ class UnifiedMarketAnalyzer:
         )
         return signal_data
 
-    def _fast_engine_lightweight(self, df: pd.DataFrame, symbol: str) -> Optional[Dict[str, Any]]:
+    def _fast_engine_lightweight(self, df: pd.DataFrame, symbol: str,
+                                 settings: Optional[TradingSettings] = None) -> Optional[Dict[str, Any]]:
         if df is None or len(df) < 70:
             return None
+        settings = settings or current_settings(self.config)
 
         try:
             latest = df.iloc[-1]
@@ -1923,7 +2352,7 @@ class UnifiedMarketAnalyzer:
             
             # ATR % Mínimo
             atr_pct = (atr / price) * 100
-            if atr_pct < float(getattr(self.config, 'MIN_VOLATILITY_PERCENT', 0.5)):
+            if atr_pct < settings.MIN_VOLATILITY_PERCENT:
                 return None
 
             # ✅ ADX > 20 para asegurar tendencia
@@ -1996,7 +2425,7 @@ class UnifiedMarketAnalyzer:
             return {'neural_bias': 'NEUTRAL', 'neural_label': 'NEUTRAL', 'neural_confidence': 0.0}
 
         try:
-            analyzer = OptimizedTechnicalAnalyzer(self.config)
+            analyzer = get_shared_technical_analyzer(self.config)
             features, _ = self._extract_optimized_features(df, analyzer)
             if not features:
                 return {'neural_bias': 'NEUTRAL', 'neural_label': 'NEUTRAL', 'neural_confidence': 0.0}
@@ -2292,7 +2721,7 @@ class UnifiedMarketAnalyzer:
 
     def _compute_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         try:
-            analyzer = OptimizedTechnicalAnalyzer(self.config)
+            analyzer = get_shared_technical_analyzer(self.config)
             df['ema_50'] = analyzer.calculate_ema(df['close'], 50)
             df['ema_200'] = analyzer.calculate_ema(df['close'], 200)
             tdi_out = analyzer.calculate_tdi(df)
@@ -2328,6 +2757,38 @@ def get_unified_analyzer(config):
         return _unified_analyzer_instance
 
 
+class ChartImage(NamedTuple):
+    """PNG renderizado en memoria; path solo si además se guardó en disco"""
+    png: bytes
+    filename: str
+    path: Optional[str] = None
+
+
+def prune_chart_directory(directory: str, max_mb: float = 200, max_files: int = 500) -> int:
+    """Retención por tamaño: borra los PNG más antiguos hasta quedar bajo ambos límites"""
+    try:
+        entries = [e for e in os.scandir(directory) if e.is_file() and e.name.endswith('.png')]
+    except OSError:
+        return 0
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    total = sum(e.stat().st_size for e in entries)
+    max_bytes = max_mb * 1024 * 1024
+    removed = 0
+    for entry in entries:
+        if total <= max_bytes and len(entries) - removed <= max_files:
+            break
+        try:
+            size = entry.stat().st_size
+            os.remove(entry.path)
+            total -= size
+            removed += 1
+        except OSError:
+            continue
+    if removed:
+        logger.info(f"🧹 Retención de gráficos: {removed} PNG antiguos eliminados ({total / 1024 / 1024:.1f}MB en disco)")
+    return removed
+
+
 class SignalChartGenerator:
     """Generador de gráficos de señales optimizado con manejo eficiente de WebSocket"""
 
@@ -2355,6 +2816,41 @@ class SignalChartGenerator:
         self.cache_graficos = {}
         self.tamano_max_cache = 10
 
+        # Figura y ejes reutilizados entre renders (Figure + Agg, sin estado global de pyplot)
+        self._chart_fig = None
+        self._chart_axes = None
+        self._render_lock = threading.Lock()
+
+        # Retención del directorio (se revisa como mucho una vez por intervalo)
+        self.retention_max_mb = 200
+        self.retention_max_files = 500
+        self._retention_interval = 60.0
+        self._last_retention_check = 0.0
+
+    def _get_chart_axes(self):
+        """Devuelve (fig, ax_main, ax_volume, ax_tdi, ax_progress) limpios y con estilo aplicado"""
+        if self._chart_fig is None:
+            fig = Figure(figsize=(14, 9), facecolor='#0f0f23')
+            FigureCanvasAgg(fig)
+            gs = GridSpec(4, 1, height_ratios=[3, 1, 0.8, 0.6], hspace=0.04)
+            ax_main = fig.add_subplot(gs[0])
+            ax_volume = fig.add_subplot(gs[1], sharex=ax_main)
+            ax_tdi = fig.add_subplot(gs[2], sharex=ax_main)
+            ax_progress = fig.add_subplot(gs[3])
+            self._chart_fig = fig
+            self._chart_axes = (ax_main, ax_volume, ax_tdi, ax_progress)
+        for ax in self._chart_axes:
+            ax.cla()
+        # Estilo profesional
+        for ax in self._chart_axes:
+            ax.set_facecolor('#0f0f23')
+            ax.tick_params(colors='#b0b0b0', labelsize=9, length=4)
+            ax.grid(True, alpha=0.15, color='#1a2a4c', linestyle='--', linewidth=0.5)
+            for spine in ax.spines.values():
+                spine.set_color('#1a2a4c')
+                spine.set_linewidth(1)
+        return (self._chart_fig,) + self._chart_axes
+
     def generate_signal_chart(self, symbol: str, df: pd.DataFrame, signal_data: dict, analysis_result: dict) -> Optional[str]:
         """
         Genera gráfico PROFESIONAL con velas, volumen, EMAs, TDI y niveles.
@@ -2368,10 +2864,28 @@ class SignalChartGenerator:
             - Métricas de confianza (IA, Técnico, Alineación)
             - Barra de progreso hacia TP
         """
+        image = self.render_chart_image(symbol, df, signal_data, persist=True)
+        return image.path if image else None
+
+    def render_chart_image(self, symbol: str, df: pd.DataFrame, signal_data: dict, persist: bool = False) -> Optional[ChartImage]:
+        """Renderiza el gráfico a un buffer PNG en memoria; persist=True además lo guarda en disco"""
         if not PLOTTING_AVAILABLE:
             logger.warning("Matplotlib no disponible para generar gráficos")
             return None
+        with self._render_lock:
+            image = self._render_signal_chart(symbol, df, signal_data, persist)
+        if image and image.path:
+            self._enforce_retention()
+        return image
+
+    def _enforce_retention(self):
+        now = time.time()
+        if now - self._last_retention_check < self._retention_interval:
+            return
+        self._last_retention_check = now
+        prune_chart_directory(self.directorio_graficos, self.retention_max_mb, self.retention_max_files)
 
+    def _render_signal_chart(self, symbol: str, df: pd.DataFrame, signal_data: dict, persist: bool) -> Optional[ChartImage]:
         try:
             if df is None or df.empty or len(df) < 5:
                 logger.warning(f"Datos insuficientes para gráfico de {symbol}")
@@ -2393,39 +2907,29 @@ class SignalChartGenerator:
             tdi_rsi = 100 - (100 / (1 + rs))
             tdi_rsi = tdi_rsi.fillna(50)
 
-            # --- Crear figura con layout profesional ---
-            fig = plt.figure(figsize=(14, 9), facecolor='#0f0f23')
-            gs = GridSpec(4, 1, height_ratios=[3, 1, 0.8, 0.6], hspace=0.04)
-
-            ax_main   = fig.add_subplot(gs[0])
-            ax_volume = fig.add_subplot(gs[1], sharex=ax_main)
-            ax_tdi    = fig.add_subplot(gs[2], sharex=ax_main)
-            ax_progress = fig.add_subplot(gs[3])
-
-            # Estilo profesional
-            for ax in [ax_main, ax_volume, ax_tdi, ax_progress]:
-                ax.set_facecolor('#0f0f23')
-                ax.tick_params(colors='#b0b0b0', labelsize=9, length=4)
-                ax.grid(True, alpha=0.15, color='#1a2a4c', linestyle='--', linewidth=0.5)
-                for spine in ax.spines.values():
-                    spine.set_color('#1a2a4c')
-                    spine.set_linewidth(1)
-
-            # --- VELAS JAPONESAS PROFESIONALES ---
-            colors = ['#00d4aa' if df_plot.iloc[i]['close'] >= df_plot.iloc[i]['open'] else '#ff6b6b'
-                      for i in range(len(df_plot))]
-
-            for i in range(len(df_plot)):
-                row = df_plot.iloc[i]
-                o, h, l, c = row['open'], row['high'], row['low'], row['close']
-                color = colors[i]
-                # Sombra (wick)
-                ax_main.plot([i, i], [l, h], color=color, linewidth=1.2, alpha=0.8)
-                # Cuerpo (body)
-                height = abs(c - o)
-                bottom = min(o, c)
-                ax_main.bar(i, height if height > 0 else 1e-8, bottom=bottom, width=0.65, 
-                          color=color, alpha=0.95, edgecolor='none')
+            # --- Figura reutilizada con layout profesional ---
+            fig, ax_main, ax_volume, ax_tdi, ax_progress = self._get_chart_axes()
+
+            # --- VELAS JAPONESAS PROFESIONALES (capas vectorizadas) ---
+            o = df_plot['open'].to_numpy(dtype=float)
+            h = df_plot['high'].to_numpy(dtype=float)
+            l = df_plot['low'].to_numpy(dtype=float)
+            c = df_plot['close'].to_numpy(dtype=float)
+            idx = np.arange(len(df_plot), dtype=float)
+            colors = np.where(c >= o, '#00d4aa', '#ff6b6b').tolist()
+
+            # Sombras (wicks): una sola LineCollection
+            wicks = np.stack([np.column_stack([idx, l]), np.column_stack([idx, h])], axis=1)
+            ax_main.add_collection(LineCollection(wicks, colors=colors, linewidths=1.2, alpha=0.8,
+                                                  capstyle='projecting'))
+            # Cuerpos (bodies): una sola PolyCollection
+            bottom = np.minimum(o, c)
+            top = bottom + np.where(np.abs(c - o) > 0, np.abs(c - o), 1e-8)
+            left, right = idx - 0.325, idx + 0.325
+            bodies = np.stack([np.column_stack([left, bottom]), np.column_stack([left, top]),
+                               np.column_stack([right, top]), np.column_stack([right, bottom])], axis=1)
+            ax_main.add_collection(PolyCollection(bodies, facecolors=colors, edgecolors='none',
+                                                  linewidths=0, alpha=0.95, zorder=1))
 
             # --- EMAs ---
             ax_main.plot(x_vals, ema_50, color='#FFD700', linewidth=2, label='EMA 50', alpha=0.85, linestyle='-')
@@ -2539,17 +3043,24 @@ class SignalChartGenerator:
             else:
                 filename = f"temp_{symbol}.png"
 
-            filepath = os.path.join(self.directorio_graficos, filename)
-            plt.savefig(filepath, dpi=150, facecolor='#0f0f23', edgecolor='none', bbox_inches='tight')
-            plt.close(fig)
-            plt.close('all')
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', dpi=150, facecolor='#0f0f23', edgecolor='none', bbox_inches='tight')
+            png = buffer.getvalue()
+
+            filepath = None
+            if persist:
+                filepath = os.path.join(self.directorio_graficos, filename)
+                with open(filepath, 'wb') as f:
+                    f.write(png)
 
-            logger.info(f"✅ Gráfico PROFESIONAL generado ({status}): {filepath}")
-            return filepath
+            logger.info(f"✅ Gráfico PROFESIONAL generado ({status}): {filepath or f'{len(png) // 1024}KB en memoria'}")
+            return ChartImage(png=png, filename=filename, path=filepath)
 
         except Exception as e:
             logger.error(f"Error generando gráfico para {symbol}: {e}", exc_info=True)
-            plt.close('all')
+            # Figura en estado desconocido: se recrea en el próximo render
+            self._chart_fig = None
+            self._chart_axes = None
             return None
             
     def iniciar_actualizaciones_tiempo_real(self, symbol: str, df_inicial: pd.DataFrame, 
@@ -2709,6 +3220,200 @@ class SignalChartGenerator:
         return chart_path
 
 
+# ========== RENDER DE GRÁFICOS EN SEGUNDO PLANO ==========
+
+# Generador propio del proceso worker (matplotlib no es thread-safe)
+_chart_worker_generator = None
+
+# Únicos campos de signal_data que lee el renderizado
+CHART_SIGNAL_FIELDS = ('entry_price', 'stop_loss', 'take_profit', 'combined_signal', 'status')
+
+def run_chart_render_job(job: dict) -> Optional[ChartImage]:
+    """Punto de entrada del worker de gráficos (debe ser picklable: nivel de módulo)"""
+    global _chart_worker_generator
+    if job.get('warmup'):
+        return None
+    if _chart_worker_generator is None:
+        _chart_worker_generator = SignalChartGenerator(disable_websocket=True)
+    _chart_worker_generator.retention_max_mb = job.get('retention_max_mb', 200)
+    _chart_worker_generator.retention_max_files = job.get('retention_max_files', 500)
+    return _chart_worker_generator.render_chart_image(job['symbol'], job['df'], job['signal_data'],
+                                                      persist=job.get('persist', False))
+
+
+class ChartRenderService:
+    """
+    Render de gráficos fuera del hilo de monitoreo: los jobs van a un proceso worker
+    y se devuelven futures con un ChartImage (PNG en memoria, listo para sendPhoto).
+    Caché por (símbolo, última vela, estado de la señal): un milestone con la vela
+    sin cambios reutiliza la imagen.
+    """
+    def __init__(self, config: "AdvancedTradingConfig"):
+        self.config = config
+        self._executor = None
+        self._delivery = None  # Hilos para callbacks (Telegram) fuera del hilo del pool
+        self._delivery_tails = {}  # {clave de cadena: Future de la última entrega encolada}
+        self._lock = threading.RLock()
+        self._cache = OrderedDict()  # {clave: Future[ChartImage]}
+        self.cache_size = max(1, int(getattr(config, 'CHART_CACHE_SIZE', 32)))
+        self.stats = {'submitted': 0, 'cache_hits': 0, 'rendered': 0, 'failed': 0}
+
+    def _get_executor(self):
+        if self._executor is None:
+            import concurrent.futures
+            if getattr(self.config, 'CHART_RENDER_PROCESS_ENABLED', True):
+                import multiprocessing
+                # spawn: el hijo no hereda hilos/locks del proceso con GUI y WebSocket
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ChartRender")
+        return self._executor
+
+    def start(self):
+        """Arranca el worker por adelantado para que el primer gráfico no pague el import"""
+        if not PLOTTING_AVAILABLE:
+            return
+        try:
+            with self._lock:
+                self._get_executor().submit(run_chart_render_job, {'warmup': True})
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo iniciar el worker de gráficos: {e}")
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            delivery, self._delivery = self._delivery, None
+            self._cache.clear()
+            self._delivery_tails.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if delivery is not None:
+            delivery.shutdown(wait=False)
+
+    @staticmethod
+    def _cache_key(symbol: str, df: pd.DataFrame, signal_data: dict) -> tuple:
+        last_candle = df['timestamp'].iloc[-1] if 'timestamp' in df.columns else df.index[-1]
+        state = tuple(str(signal_data.get(field)) for field in CHART_SIGNAL_FIELDS)
+        return (symbol, str(last_candle), len(df)) + state
+
+    def submit(self, symbol: str, df: pd.DataFrame, signal_data: dict):
+        """Encola un gráfico; retorna un Future con el ChartImage (o None)"""
+        import concurrent.futures
+        if not PLOTTING_AVAILABLE or df is None or df.empty or len(df) < 5:
+            future = concurrent.futures.Future()
+            future.set_result(None)
+            return future
+        key = self._cache_key(symbol, df, signal_data)
+        with self._lock:
+            self.stats['submitted'] += 1
+            cached = self._cache.get(key)
+            if cached is not None:
+                # En curso o ya renderizado: el PNG en memoria no cambia
+                self._cache.move_to_end(key)
+                self.stats['cache_hits'] += 1
+                return cached
+            future = concurrent.futures.Future()
+            self._cache[key] = future
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            # El render solo usa las últimas 80 velas y unos pocos campos de la señal
+            job = {
+                'symbol': symbol,
+                'df': df.tail(80)[[c for c in ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+                                   if c in df.columns]].copy(),
+                'signal_data': {k: signal_data[k] for k in CHART_SIGNAL_FIELDS if k in signal_data},
+                'persist': (getattr(self.config, 'CHART_PERSIST_CONFIRMED', True)
+                            and signal_data.get('status') == 'CONFIRMADA'),
+                'retention_max_mb': getattr(self.config, 'CHART_DIR_MAX_MB', 200),
+                'retention_max_files': getattr(self.config, 'CHART_DIR_MAX_FILES', 500),
+            }
+            try:
+                render_future = self._get_executor().submit(run_chart_render_job, job)
+            except Exception as e:
+                self._executor = None  # Pool roto: se recrea en el próximo envío
+                self._finish(key, future, None, e)
+                return future
+        render_future.add_done_callback(lambda f: self._on_rendered(key, future, f))
+        return future
+
+    def _on_rendered(self, key, future, render_future):
+        try:
+            self._finish(key, future, render_future.result(), None)
+        except Exception as e:
+            self._finish(key, future, None, e)
+
+    def _finish(self, key, future, image, error):
+        if error is not None or image is None:
+            self.stats['failed'] += 1
+            if error is not None:
+                logger.error(f"❌ Error en worker de gráficos ({key[0]}): {error}")
+            with self._lock:
+                if self._cache.get(key) is future:
+                    del self._cache[key]
+            future.set_result(None)
+            return
+        self.stats['rendered'] += 1
+        future.set_result(image)
+
+    def render(self, symbol: str, df: pd.DataFrame, signal_data: dict, timeout: Optional[float] = None) -> Optional[ChartImage]:
+        """Versión bloqueante (con límite de espera) para quien necesita la ruta ya"""
+        timeout = timeout if timeout is not None else getattr(self.config, 'CHART_RENDER_TIMEOUT', 20)
+        try:
+            return self.submit(symbol, df, signal_data).result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"⚠️ Gráfico de {symbol} no disponible a tiempo: {e}")
+            return None
+
+    def render_then(self, symbol: str, df: pd.DataFrame, signal_data: dict, callback: Callable,
+                    chain_key: Optional[str] = None):
+        """
+        Renderiza en segundo plano y llama callback(chart_image) al terminar (None si falla).
+        Las entregas con la misma chain_key (signal_hash) se hacen en orden de llamada y de
+        una en una: un milestone nunca adelanta a la promoción ni el cierre a un milestone.
+        """
+        self._chain_delivery(chain_key or symbol, self.submit(symbol, df, signal_data), callback)
+
+    def deliver_after(self, chain_key: str, callback: Callable):
+        """callback(None) sin gráfico, pero detrás de las entregas pendientes de la misma cadena"""
+        import concurrent.futures
+        no_chart = concurrent.futures.Future()
+        no_chart.set_result(None)
+        self._chain_delivery(chain_key, no_chart, callback)
+
+    def _chain_delivery(self, key, source, callback: Callable):
+        import concurrent.futures
+        delivered = concurrent.futures.Future()
+        with self._lock:
+            if self._delivery is None:
+                self._delivery = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="ChartDelivery")
+            delivery = self._delivery
+            previous = self._delivery_tails.get(key)
+            self._delivery_tails[key] = delivered
+
+        def _deliver(chart_image):
+            try:
+                callback(chart_image)
+            except Exception as e:
+                logger.error(f"❌ Error entregando gráfico de {key}: {e}")
+            finally:
+                with self._lock:
+                    if self._delivery_tails.get(key) is delivered:
+                        del self._delivery_tails[key]
+                delivered.set_result(None)
+
+        def _when_ready(_):
+            # Gráfico listo: esperar (sin ocupar un hilo) a que termine la entrega anterior
+            if previous is not None and not previous.done():
+                previous.add_done_callback(_when_ready)
+                return
+            try:
+                delivery.submit(_deliver, source.result())
+            except RuntimeError:
+                delivered.set_result(None)  # Servicio cerrado: no bloquear al resto de la cadena
+
+        source.add_done_callback(_when_ready)
+
 # ==============================================================================
 # MÓDULO COMPLETO Y CORREGIDO: SignalChartDialog (Visualización en Tiempo Real)
 # ==============================================================================
@@ -2733,6 +3438,11 @@ class SignalChartDialog(QtWidgets.QDialog):
         self.update_timer = None
         self.current_profit_pct = None  # ✅ Sincronización con SignalTracker
 
+        # Artistas persistentes para blitting (solo la vela viva cambia cada segundo)
+        self._background = None
+        self._live_artists = {}
+        self._chart_signature = None
+
         # Configuración de ventana
         self.setWindowTitle(f"📊 Señal Activa: {self.symbol}")
         self.resize(900, 650)
@@ -2831,6 +3541,9 @@ class SignalChartDialog(QtWidgets.QDialog):
             self.ax_progress = self.figure.add_subplot(gs[1])
             self.ax_progress.set_facecolor('#0f0f23')
 
+            # Cada redibujado completo (incluido resize) renueva el fondo para blitting
+            self.canvas.mpl_connect('draw_event', self._on_canvas_draw)
+
             self.main_layout.addWidget(self.canvas, stretch=1)
 
             # Dibujo inicial
@@ -2915,16 +3628,12 @@ class SignalChartDialog(QtWidgets.QDialog):
                     # Actualizar UI Header
                     self._update_header_labels()
 
-                # Actualizar DataFrame local
+                # Actualizar DataFrame local (solo la vela viva)
                 if self.df is not None and not self.df.empty:
-                    last_row = self.df.iloc[-1].copy()
-                    last_row['close'] = current_price
-                    last_row['high'] = max(last_row['high'], current_price)
-                    last_row['low'] = min(last_row['low'], current_price)
-                    self.df.iloc[-1] = last_row
+                    self._apply_live_price(current_price)
 
-                    # Redibujar gráfico
-                    self._update_chart_visuals()
+                    # Redibujar gráfico (incremental salvo vela nueva)
+                    self._refresh_chart()
 
                     # Actualizar etiquetas con datos REALES
                     self._update_pnl_label(current_price, real_profit_pct=profit_percent)
@@ -2932,19 +3641,45 @@ class SignalChartDialog(QtWidgets.QDialog):
                 # Fallback: Simulación si no está en tracking activo
                 self.current_profit_pct = None # Reset
                 if self.df is not None and not self.df.empty:
-                    last_row = self.df.iloc[-1].copy()
                     import random
                     variation = random.uniform(-0.0005, 0.0005)
-                    last_row['close'] = last_row['close'] * (1 + variation)
-                    last_row['high'] = max(last_row['high'], last_row['close'])
-                    last_row['low'] = min(last_row['low'], last_row['close'])
-                    self.df.iloc[-1] = last_row
-                    self._update_chart_visuals()
-                    self._update_pnl_label(last_row['close'])
+                    simulated_price = float(self.df['close'].iat[-1]) * (1 + variation)
+                    self._apply_live_price(simulated_price)
+                    self._refresh_chart()
+                    self._update_pnl_label(simulated_price)
 
         except Exception as e:
             logger.debug(f"Error en timer tick: {e}")
 
+    def _apply_live_price(self, price: float):
+        """Escribe el precio en la última vela sin reconstruir la fila completa"""
+        last_idx = self.df.index[-1]
+        self.df.at[last_idx, 'close'] = price
+        self.df.at[last_idx, 'high'] = max(self.df.at[last_idx, 'high'], price)
+        self.df.at[last_idx, 'low'] = min(self.df.at[last_idx, 'low'], price)
+
+    def _get_chart_signature(self):
+        """Identifica lo que obliga a un redibujado completo: vela nueva o niveles/estado distintos"""
+        return (len(self.df), self.df.index[-1],
+                self.signal_data.get('entry_price', 0), self.signal_data.get('stop_loss', 0),
+                self.signal_data.get('take_profit', 0), self.signal_data.get('status', 'DESTACADA'))
+
+    def _refresh_chart(self):
+        """Redibujado completo solo con vela nueva; el resto de ticks actualiza la vela viva con blitting"""
+        if not PLOTTING_AVAILABLE or self.df is None or self.df.empty:
+            return
+        if (not self._live_artists or self._background is None
+                or self._get_chart_signature() != self._chart_signature):
+            self._update_chart_visuals()
+            return
+        # Si la vela viva sale del rango visible hay que reescalar el eje
+        y_min, y_max = self.ax_main.get_ylim()
+        if self.df['low'].iat[-1] < y_min or self.df['high'].iat[-1] > y_max:
+            self._update_chart_visuals()
+            return
+        self._update_live_artists()
+        self._blit_live_artists()
+
     def _update_header_labels(self):
         """Actualiza etiquetas del header cuando cambian los datos (Promoción)"""
         try:
@@ -3002,40 +3737,88 @@ class SignalChartDialog(QtWidgets.QDialog):
 
     def _update_chart_static(self):
         """Dibujo inicial estático"""
+        if self.df is not None and not self.df.empty:
+            # Copia propia: los ticks escriben en la última vela
+            self.df = self.df.copy()
         self._update_chart_visuals()
 
+    def _get_progress_state(self, current_price: float, entry: float, is_buy: bool):
+        """Profit actual, progreso hacia el objetivo final (MILESTONE_3) y color de barra"""
+        # ✅ Usar config si está disponible, sino fallback a valores fijos
+        if hasattr(self, 'config') and hasattr(self.config, 'MILESTONE_3'):
+            target_pct = self.config.MILESTONE_3  # Objetivo final = MILESTONE_3
+        else:
+            target_pct = 3.0  # fallback
+
+        # Calcular profit actual en %
+        if hasattr(self, 'current_profit_pct') and self.current_profit_pct is not None:
+            profit_percent = self.current_profit_pct
+        elif is_buy:
+            profit_percent = ((current_price - entry) / entry) * 100
+        else:
+            profit_percent = ((entry - current_price) / entry) * 100
+
+        progress = min(100, max(0, (profit_percent / target_pct) * 100)) if target_pct > 0 else 0
+        bar_color = '#00ff00' if profit_percent >= 0 else '#ff0044'
+        return target_pct, progress, bar_color
+
+    @staticmethod
+    def _candle_color(open_price: float, close_price: float) -> str:
+        # Velas alcistas: Verde neón, Velas bajistas: Rojo brillante
+        return '#00ff00' if close_price >= open_price else '#ff0044'
+
+    @staticmethod
+    def _body_bounds(open_price: float, close_price: float, high: float, low: float):
+        body_bottom = min(open_price, close_price)
+        body_height = abs(close_price - open_price)
+        # Si el cuerpo es muy pequeño, dibujar al menos una línea
+        if body_height == 0:
+            body_height = (high - low) * 0.05
+        return body_bottom, body_height
+
     def _update_chart_visuals(self):
-        """Redibuja todo el gráfico basado en self.df actual - MEJORADO"""
+        """Redibujado completo: velas cerradas en colecciones y artistas vivos animados para blitting"""
         try:
             if self.df is None or self.df.empty:
                 return
 
             # Preparar datos (últimas 50 velas)
-            df_plot = self.df.tail(50).copy()
-            x_vals = range(len(df_plot))
+            df_plot = self.df.tail(50)
+            n = len(df_plot)
+            opens = df_plot['open'].to_numpy(dtype=float)
+            highs = df_plot['high'].to_numpy(dtype=float)
+            lows = df_plot['low'].to_numpy(dtype=float)
+            closes = df_plot['close'].to_numpy(dtype=float)
             self.ax_main.clear()
             self.ax_progress.clear()
-
-            # 1. Dibujar Velas - Estilo Profesional
-            # Velas alcistas: Verde neón, Velas bajistas: Rojo brillante
-            up_color = '#00ff00' 
-            down_color = '#ff0044'
-
-            colors = [up_color if row['close'] >= row['open'] else down_color for _, row in df_plot.iterrows()]
-
-            for idx, (i, row) in enumerate(df_plot.iterrows()):
-                # Mecha (High-Low)
-                self.ax_main.plot([idx, idx], [row['low'], row['high']], color=colors[idx], linewidth=1.2, alpha=0.9)
-                # Cuerpo (Open-Close)
-                body_bottom = min(row['open'], row['close'])
-                body_height = abs(row['close'] - row['open'])
-                # Si el cuerpo es muy pequeño, dibujar al menos una línea
-                if body_height == 0:
-                    body_height = (row['high'] - row['low']) * 0.05
-
-                self.ax_main.bar(idx, body_height,
-                                bottom=body_bottom,
-                                width=0.6, color=colors[idx], alpha=0.9)
+            self._live_artists = {}
+            self._background = None
+
+            # 1. Velas cerradas (todas menos la última) en dos colecciones
+            colors = np.where(closes >= opens, '#00ff00', '#ff0044')
+            bottoms = np.minimum(opens, closes)
+            heights = np.abs(closes - opens)
+            heights = np.where(heights == 0, (highs - lows) * 0.05, heights)
+            closed = np.arange(n - 1)
+            if len(closed):
+                wicks = np.stack([np.column_stack([closed, lows[:-1]]),
+                                  np.column_stack([closed, highs[:-1]])], axis=1)
+                left, right = closed - 0.3, closed + 0.3
+                tops = bottoms[:-1] + heights[:-1]
+                bodies = np.stack([np.column_stack([left, bottoms[:-1]]), np.column_stack([left, tops]),
+                                   np.column_stack([right, tops]), np.column_stack([right, bottoms[:-1]])], axis=1)
+                self.ax_main.add_collection(LineCollection(wicks, colors=colors[:-1], linewidths=1.2, alpha=0.9))
+                self.ax_main.add_collection(PolyCollection(bodies, facecolors=colors[:-1], edgecolors='none', alpha=0.9))
+
+            # Vela viva: mecha y cuerpo propios, actualizados por blitting
+            last = n - 1
+            live_color = colors[-1]
+            self._live_artists['wick'] = self.ax_main.plot([last, last], [lows[-1], highs[-1]], color=live_color,
+                                                           linewidth=1.2, alpha=0.9, animated=True)[0]
+            body_bottom, body_height = self._body_bounds(opens[-1], closes[-1], highs[-1], lows[-1])
+            self._live_artists['body'] = self.ax_main.add_patch(
+                Rectangle((last - 0.3, body_bottom), 0.6, body_height, facecolor=live_color,
+                          edgecolor='none', alpha=0.9, animated=True))
 
             # 2. Dibujar Líneas de Señal
             entry = self.signal_data.get('entry_price', 0)
@@ -3043,7 +3826,7 @@ class SignalChartDialog(QtWidgets.QDialog):
             tp = self.signal_data.get('take_profit', 0)
             status = self.signal_data.get('status', 'DESTACADA')
 
-            current_price = df_plot.iloc[-1]['close']
+            current_price = closes[-1]
             is_buy = 'BUY' in str(self.signal_data.get('signal_type', '')).upper() or 'COMPRA' in str(self.signal_data.get('signal_type', ''))
 
             # Solo mostrar líneas "reales" si está confirmada o como referencia punteada si es destacada
@@ -3053,20 +3836,24 @@ class SignalChartDialog(QtWidgets.QDialog):
             if entry > 0:
                 self.ax_main.axhline(entry, color='#2196F3', linewidth=1.5, alpha=alpha_val, linestyle=line_style)
                 label_text = ' ENTRY' if status == 'CONFIRMADA' else ' REF ENTRY'
-                self.ax_main.text(len(df_plot)-1, entry, label_text, color='#2196F3', fontsize=8, va='bottom', fontweight='bold')
+                self.ax_main.text(n-1, entry, label_text, color='#2196F3', fontsize=8, va='bottom', fontweight='bold')
 
             if sl > 0:
                 self.ax_main.axhline(sl, color='#D32F2F', linewidth=1.5, alpha=alpha_val, linestyle='--')
-                self.ax_main.text(len(df_plot)-1, sl, ' SL', color='#D32F2F', fontsize=8, va='top')
+                self.ax_main.text(n-1, sl, ' SL', color='#D32F2F', fontsize=8, va='top')
 
             if tp > 0:
                 tp_color = '#4CAF50' if is_buy else '#FF5252'
                 self.ax_main.axhline(tp, color=tp_color, linewidth=1.5, alpha=alpha_val, linestyle=line_style)
-                self.ax_main.text(len(df_plot)-1, tp, ' TP', color=tp_color, fontsize=8, va='bottom')
+                self.ax_main.text(n-1, tp, ' TP', color=tp_color, fontsize=8, va='bottom')
 
             # ✅ Línea de Precio Actual (sincronizada con progres bar y PnL)
-            self.ax_main.axhline(y=current_price, color='#FFD700', linestyle=':', linewidth=1.5, alpha=0.9)
-            self.ax_main.text(len(df_plot)-1, current_price, f' ${current_price:.6f}', color='#FFD700', fontsize=9, va='center', fontweight='bold')
+            self._live_artists['price_line'] = self.ax_main.axhline(
+                y=current_price, color='#FFD700', linestyle=':', linewidth=1.5, alpha=0.9, animated=True)
+            self._live_artists['price_text'] = self.ax_main.text(
+                n-1, current_price, f' ${current_price:.6f}', color='#FFD700', fontsize=9, va='center',
+                fontweight='bold', animated=True)
+            self.ax_main.autoscale_view()
 
             # 3. Estilo del Eje Principal - Fondo más oscuro y Grid sutil
             self.ax_main.set_title(f"{self.symbol} - Timeframe: 15m ({status})", color='white', fontsize=10, fontweight='bold')
@@ -3083,7 +3870,6 @@ class SignalChartDialog(QtWidgets.QDialog):
             self.ax_main.spines['left'].set_color('#2c3e50')
 
             # 4. Barra de Progreso (Visual) — ✅ SINCRONIZADA CON PRECIO REAL Y MILESTONES DINÁMICOS
-            progress = 0
             if entry > 0 and tp > 0:
                 # Si es DESTACADA, el progreso es "simulado" o 0 hasta confirmación
                 # El usuario dijo: "solo cuando es confimada alli recien debe tomar loa valores ... y calcular el progreso"
@@ -3094,30 +3880,14 @@ class SignalChartDialog(QtWidgets.QDialog):
                      self.ax_progress.set_facecolor('#0b0b1a')
                      self.ax_progress.set_xticks([])
                      self.ax_progress.set_yticks([])
-                     self.canvas.draw()
+                     self._finish_full_redraw()
                      return
 
-                # ✅ Usar config si está disponible, sino fallback a valores fijos
-                if hasattr(self, 'config') and hasattr(self.config, 'MILESTONE_3'):
-                    target_pct = self.config.MILESTONE_3  # Objetivo final = MILESTONE_3
-                else:
-                    target_pct = 3.0  # fallback
-
-                # Calcular profit actual en %
-                if hasattr(self, 'current_profit_pct') and self.current_profit_pct is not None:
-                    profit_percent = self.current_profit_pct
-                elif is_buy:
-                    profit_percent = ((current_price - entry) / entry) * 100
-                else:
-                    profit_percent = ((entry - current_price) / entry) * 100
+                target_pct, progress, bar_color = self._get_progress_state(current_price, entry, is_buy)
 
-                # Progreso hacia el objetivo final (MILESTONE_3)
-                progress = min(100, max(0, (profit_percent / target_pct) * 100)) if target_pct > 0 else 0
-
-                # Color según estado
-                bar_color = '#00ff00' if profit_percent >= 0 else '#ff0044'
-
-                self.ax_progress.barh(0, progress, height=0.6, color=bar_color, alpha=0.9, edgecolor='none')
+                self._live_artists['progress_bar'] = self.ax_progress.barh(
+                    0, progress, height=0.6, color=bar_color, alpha=0.9, edgecolor='none')[0]
+                self._live_artists['progress_bar'].set_animated(True)
                 # Fondo de barra
                 self.ax_progress.barh(0, 100, height=0.6, color='#1a2a4c', alpha=0.3, zorder=-1)
 
@@ -3140,10 +3910,14 @@ class SignalChartDialog(QtWidgets.QDialog):
                 self.ax_progress.set_xticklabels(['0%', '50%', '100%'], fontsize=8, color='#a0a0a0')
 
                 # Texto de progreso
-                self.ax_progress.text(50, 0, f"{progress:.1f}%", ha='center', va='center', color='white', fontweight='bold', fontsize=9)
+                self._live_artists['progress_text'] = self.ax_progress.text(
+                    50, 0, f"{progress:.1f}%", ha='center', va='center', color='white', fontweight='bold',
+                    fontsize=9, animated=True)
 
                 # ✅ Mostrar precio actual debajo de la barra de progreso
-                self.ax_progress.text(50, -0.4, f"${current_price:.6f}", ha='center', va='top', color='#FFD700', fontsize=9, fontweight='bold')
+                self._live_artists['progress_price'] = self.ax_progress.text(
+                    50, -0.4, f"${current_price:.6f}", ha='center', va='top', color='#FFD700', fontsize=9,
+                    fontweight='bold', animated=True)
                 self.ax_progress.set_facecolor('#0b0b1a')
 
                 # Quitar bordes
@@ -3152,11 +3926,67 @@ class SignalChartDialog(QtWidgets.QDialog):
                 self.ax_progress.spines['left'].set_visible(False)
                 self.ax_progress.spines['bottom'].set_visible(False)
 
-            self.canvas.draw()
+            self._finish_full_redraw()
 
         except Exception as e:
             logger.error(f"Error actualizando visuales: {e}")
 
+    def _finish_full_redraw(self):
+        """Dibuja la parte estática; _on_canvas_draw captura el fondo y pinta los artistas vivos"""
+        self._chart_signature = self._get_chart_signature()
+        self.canvas.draw()
+
+    def _on_canvas_draw(self, event):
+        """draw_event: guarda el fondo sin artistas animados para los ticks siguientes"""
+        if not self._live_artists:
+            return
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_live_artists()
+
+    def _draw_live_artists(self):
+        for artist in self._live_artists.values():
+            artist.axes.draw_artist(artist)
+
+    def _update_live_artists(self):
+        """Mueve mecha, cuerpo, línea/texto de precio y barra de progreso de la vela viva"""
+        n = min(len(self.df), 50)
+        last = n - 1
+        open_price = float(self.df['open'].iat[-1])
+        high = float(self.df['high'].iat[-1])
+        low = float(self.df['low'].iat[-1])
+        current_price = float(self.df['close'].iat[-1])
+        color = self._candle_color(open_price, current_price)
+
+        self._live_artists['wick'].set_data([last, last], [low, high])
+        self._live_artists['wick'].set_color(color)
+        body_bottom, body_height = self._body_bounds(open_price, current_price, high, low)
+        body = self._live_artists['body']
+        body.set_y(body_bottom)
+        body.set_height(body_height)
+        body.set_facecolor(color)
+        self._live_artists['price_line'].set_ydata([current_price, current_price])
+        self._live_artists['price_text'].set_y(current_price)
+        self._live_artists['price_text'].set_text(f' ${current_price:.6f}')
+
+        if 'progress_bar' in self._live_artists:
+            entry = self.signal_data.get('entry_price', 0)
+            is_buy = 'BUY' in str(self.signal_data.get('signal_type', '')).upper() or 'COMPRA' in str(self.signal_data.get('signal_type', ''))
+            _, progress, bar_color = self._get_progress_state(current_price, entry, is_buy)
+            self._live_artists['progress_bar'].set_width(progress)
+            self._live_artists['progress_bar'].set_color(bar_color)
+            self._live_artists['progress_text'].set_text(f"{progress:.1f}%")
+            self._live_artists['progress_price'].set_text(f"${current_price:.6f}")
+
+    def _blit_live_artists(self):
+        """Restaura el fondo guardado y repinta solo los artistas vivos"""
+        try:
+            self.canvas.restore_region(self._background)
+            self._draw_live_artists()
+            self.canvas.blit(self.figure.bbox)
+        except Exception as e:
+            logger.debug(f"Blitting no disponible, redibujado completo: {e}")
+            self._update_chart_visuals()
+
     def closeEvent(self, event):
         """Limpieza al cerrar"""
         self.is_running = False
@@ -3176,6 +4006,8 @@ class BinanceFIXClient:
         self.rest_client = AdvancedBinanceClient(config)
         self.fix_enabled = False  # ✅ NUEVO: Flag para indicador GUI
         self.disable_websocket = False
+        # Runtime backend: las llamadas ya corren en su executor acotado, sin hilo extra por petición
+        self.inline_requests = False
         self.fix_session = None
         self.last_fix_check = 0
         self.fix_check_interval = 300  # Verificar FIX cada 5 min
@@ -3239,7 +4071,7 @@ class BinanceFIXClient:
     def _get_price_with_timeout(self, symbol: str, timeout_sec: int) -> float:
         """Obtener precio - En Replit sin threads para evitar límites"""
         # ✅ En Replit: llamada síncrona para evitar "can't start new thread"
-        if IN_REPLIT:
+        if IN_REPLIT or self.inline_requests:
             try:
                 with self.connection_lock:
                     return self.rest_client.get_ticker_price(symbol)
@@ -3271,7 +4103,7 @@ class BinanceFIXClient:
         """Obtener velas - En Replit sin threads para evitar límites"""
         try:
             # ✅ En Replit: llamada síncrona para evitar "can't start new thread"
-            if IN_REPLIT:
+            if IN_REPLIT or self.inline_requests:
                 with self.connection_lock:
                     return self.rest_client.get_klines(symbol, interval, limit)
 
@@ -3429,7 +4261,7 @@ class TrendAlignmentValidator:
     def _get_tdi_trend(self, df: pd.DataFrame) -> TrendDirection:
         try:
             from core.technical import OptimizedTechnicalAnalyzer   # ajusta import
-            analyzer = OptimizedTechnicalAnalyzer(self.config)
+            analyzer = get_shared_technical_analyzer(self.config)
             rsi, green, red, _, _ = analyzer.calculate_tdi(df)
             if rsi.empty or green.empty or red.empty:
                 return TrendDirection.NEUTRAL
@@ -3455,7 +4287,7 @@ class TrendAlignmentValidator:
     def _get_market_cycle(self, df: pd.DataFrame) -> dict:
         try:
             from core.technical import OptimizedTechnicalAnalyzer
-            analyzer = OptimizedTechnicalAnalyzer(self.config)
+            analyzer = get_shared_technical_analyzer(self.config)
             cycle_info = analyzer.analyze_market_cycles(df)
             strength = cycle_info.get('strength', 0.0)  # 0-1
             cycle      = cycle_info.get('cycle', 'NEUTRAL')
@@ -3470,7 +4302,7 @@ class TrendAlignmentValidator:
     def _get_price_action_score(self, df: pd.DataFrame) -> float:
         try:
             from core.technical import OptimizedTechnicalAnalyzer
-            analyzer = OptimizedTechnicalAnalyzer(self.config)
+            analyzer = get_shared_technical_analyzer(self.config)
 
             candle  = analyzer.analyze_candlestick_pattern(df.tail(5))
             w_m     = analyzer.detect_w_m_pattern(df)
@@ -3516,9 +4348,12 @@ class OptimizedTechnicalAnalyzer:
     def __init__(self, config: "AdvancedTradingConfig"): # <-- Nota las comillas
         self.config = config
         self.indicator_cache = {}
-        self.cache_max_size = 100
+        self.cache_max_size = getattr(config, 'INDICATOR_CACHE_MAX_SIZE', 1000)
         self.cache_access_times = {}
         self.cache_lock = threading.RLock()  # 🔒 LOCK AÑADIDO
+        # Contadores de memoización: totales y del ciclo de escaneo en curso
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self._cycle_stats = {'hits': 0, 'misses': 0}
         # Contador diario de señales validadas
         self.daily_signal_count = 0
         self.daily_signal_date = datetime.now().date()
@@ -3541,40 +4376,96 @@ class OptimizedTechnicalAnalyzer:
         with self.cache_lock:
             if len(self.indicator_cache) > self.cache_max_size:
                 sorted_items = sorted(self.cache_access_times.items(), key=lambda x: x[1])
-                for key, _ in sorted_items[:20]:
+                for key, _ in sorted_items[:max(20, self.cache_max_size // 10)]:
                     if key in self.indicator_cache:
                         del self.indicator_cache[key]
                     if key in self.cache_access_times:
                         del self.cache_access_times[key]
 
-    def _get_cache_key(self, data_id: str, indicator: str, params: str = "") -> str:
-        return f"{data_id}_{indicator}_{params}"
+    def clear_cache(self):
+        with self.cache_lock:
+            self.indicator_cache.clear()
+            self.cache_access_times.clear()
+
+    @staticmethod
+    def _series_fingerprint(series) -> str:
+        """
+        Huella del contenido completo de la serie (valores + índice). Con la caché compartida,
+        data_id vacío o repetido entre símbolos ya no colisiona, ni tampoco dos series que solo
+        difieran en velas intermedias o en sus timestamps.
+        """
+        try:
+            if isinstance(series, (pd.Series, pd.DataFrame)):
+                digest = int(pd.util.hash_pandas_object(series, index=True).sum())
+                return f"{len(series)}:{digest:x}"
+            values = np.ascontiguousarray(series)
+            return f"{len(values)}:{hashlib.blake2b(values.tobytes(), digest_size=8).hexdigest()}"
+        except Exception:
+            return str(id(series))
+
+    @staticmethod
+    def _copy_cached(result):
+        """Copia de un resultado de la caché compartida: quien lo modifique no altera a los demás"""
+        if isinstance(result, tuple):
+            return tuple(item.copy() for item in result)
+        return result.copy()
+
+    def _get_cache_key(self, data_id: str, indicator: str, params: str = "", fingerprint: str = "") -> str:
+        return f"{data_id}_{indicator}_{params}_{fingerprint}"
+
+    def _record_cache_access(self, hit: bool):
+        key = 'hits' if hit else 'misses'
+        with self.cache_lock:
+            self.cache_stats[key] += 1
+            self._cycle_stats[key] += 1
+
+    def get_cache_stats(self) -> dict:
+        with self.cache_lock:
+            total = self.cache_stats['hits'] + self.cache_stats['misses']
+            return {
+                'hits': self.cache_stats['hits'],
+                'misses': self.cache_stats['misses'],
+                'hit_rate': self.cache_stats['hits'] / total if total else 0.0,
+                'entries': len(self.indicator_cache)
+            }
+
+    def pop_cycle_stats(self) -> dict:
+        """Devuelve y reinicia los contadores del ciclo de escaneo actual"""
+        with self.cache_lock:
+            stats = dict(self._cycle_stats)
+            self._cycle_stats = {'hits': 0, 'misses': 0}
+        stats['computations_saved'] = stats['hits']
+        return stats
 
     def calculate_ema(self, prices: pd.Series, period: int, data_id: str = "") -> pd.Series:
-        cache_key = self._get_cache_key(data_id, "ema", str(period))
+        cache_key = self._get_cache_key(data_id, "ema", str(period), self._series_fingerprint(prices))
         current_time = time.time()
         with self.cache_lock:
             if cache_key in self.indicator_cache:
                 cached_result, cache_time = self.indicator_cache[cache_key]
                 if current_time - cache_time < 30:
                     self.cache_access_times[cache_key] = current_time
-                    return cached_result
+                    self._record_cache_access(True)
+                    return self._copy_cached(cached_result)
+        self._record_cache_access(False)
         result = prices.ewm(span=period, adjust=False).mean()
         with self.cache_lock:
-            self.indicator_cache[cache_key] = (result, current_time)
+            self.indicator_cache[cache_key] = (self._copy_cached(result), current_time)
             self.cache_access_times[cache_key] = current_time
             self._manage_cache_size()
         return result
 
     def calculate_rsi(self, prices: pd.Series, period: int = 14, data_id: str = "") -> pd.Series:
-        cache_key = self._get_cache_key(data_id, "rsi", str(period))
+        cache_key = self._get_cache_key(data_id, "rsi", str(period), self._series_fingerprint(prices))
         current_time = time.time()
         with self.cache_lock:
             if cache_key in self.indicator_cache:
                 cached_result, cache_time = self.indicator_cache[cache_key]
                 if current_time - cache_time < 30:
                     self.cache_access_times[cache_key] = current_time
-                    return cached_result
+                    self._record_cache_access(True)
+                    return self._copy_cached(cached_result)
+        self._record_cache_access(False)
         delta = prices.diff()
         gain = delta.where(delta > 0, 0)
         loss = -delta.where(delta < 0, 0)
@@ -3583,20 +4474,23 @@ class OptimizedTechnicalAnalyzer:
         rs = avg_gain / (avg_loss + 1e-10)
         rsi = 100 - (100 / (1 + rs))
         with self.cache_lock:
-            self.indicator_cache[cache_key] = (rsi, current_time)
+            self.indicator_cache[cache_key] = (self._copy_cached(rsi), current_time)
             self.cache_access_times[cache_key] = current_time
             self._manage_cache_size()
         return rsi
 
     def calculate_tdi(self, df: pd.DataFrame, data_id: str = "") -> Tuple[pd.Series, pd.Series, pd.Series, pd.Series, pd.Series]:
-        cache_key = self._get_cache_key(data_id, "tdi", f"{self.config.TDI_RSI_PERIOD}_{self.config.TDI_PRICE_PERIOD}_{self.config.TDI_SIGNAL_PERIOD}")
+        cache_key = self._get_cache_key(data_id, "tdi", f"{self.config.TDI_RSI_PERIOD}_{self.config.TDI_PRICE_PERIOD}_{self.config.TDI_SIGNAL_PERIOD}",
+                                        self._series_fingerprint(df['close']))
         current_time = time.time()
         with self.cache_lock:
             if cache_key in self.indicator_cache:
                 cached_result, cache_time = self.indicator_cache[cache_key]
                 if current_time - cache_time < 30:
                     self.cache_access_times[cache_key] = current_time
-                    return cached_result
+                    self._record_cache_access(True)
+                    return self._copy_cached(cached_result)
+        self._record_cache_access(False)
         rsi_line = self.calculate_rsi(df['close'], self.config.TDI_RSI_PERIOD, data_id)
         ma_rsi_green = self.calculate_ema(rsi_line, self.config.TDI_PRICE_PERIOD, data_id)
         ma_green_red = self.calculate_ema(ma_rsi_green, self.config.TDI_SIGNAL_PERIOD, data_id)
@@ -3605,7 +4499,7 @@ class OptimizedTechnicalAnalyzer:
         lower_band = ma_rsi_green - (2 * std_dev_rsi)
         result = (rsi_line, ma_rsi_green, ma_green_red, upper_band, lower_band)
         with self.cache_lock:
-            self.indicator_cache[cache_key] = (result, current_time)
+            self.indicator_cache[cache_key] = (self._copy_cached(result), current_time)
             self.cache_access_times[cache_key] = current_time
             self._manage_cache_size()
         return result
@@ -4680,7 +5574,7 @@ class OptimizedTechnicalAnalyzer:
         + Patrones W/M/HCH/LCL como bonus
         + Alineación 15m/30m SOLO para promoción y seguimiento
         """
-        config = self.config
+        settings = current_settings(self.config)  # Umbrales de la GUI/JSON, un snapshot por validación
 
         # ✅ INICIALIZAR LISTAS FUERA DEL TRY (evita error de variable no definida)
         criteria_list = []  # Los 7 criterios técnicos
@@ -4829,7 +5723,7 @@ class OptimizedTechnicalAnalyzer:
             # ✅ VALIDACIÓN DE PATRÓN (sin bloqueo para mostrar criterios)
             pattern_valid = True
             pattern_fail_reason = ""
-            min_entry_pat = float(getattr(config, 'MIN_ENTRY_PATTERN_CONFIDENCE', 60.0))
+            min_entry_pat = settings.MIN_ENTRY_PATTERN_CONFIDENCE
             if pattern_type == 'NEUTRAL' or pattern_confidence < min_entry_pat:
                 pattern_valid = False
                 pattern_fail_reason = f"Patrón débil: {pattern_name} ({pattern_confidence:.0f}% < {min_entry_pat:.0f}%)"
@@ -5132,10 +6026,10 @@ class OptimizedTechnicalAnalyzer:
 
             # ✅ 11. DECISIÓN FINAL (UMBRALES DINÁMICOS - VINCULADOS A GUI)
             # v32.0.22.4: Validación flexible - solo criterios esenciales son obligatorios
-            min_tech = config.MIN_TECH_VALIDATION
-            min_neural = config.MIN_NEURAL_VALIDATION
-            min_rr = config.MIN_RISK_REWARD_RATIO
-            min_volume_ratio = config.MIN_VOLUME_RATIO
+            min_tech = settings.MIN_TECH_VALIDATION
+            min_neural = settings.MIN_NEURAL_VALIDATION
+            min_rr = settings.MIN_RISK_REWARD_RATIO
+            min_volume_ratio = settings.MIN_VOLUME_RATIO
 
             # === VALIDACIÓN PRINCIPAL (Solo criterios ESENCIALES son obligatorios) ===
             # Criterios ESENCIALES: Técnico, Neural, R/R, Dirección clara
@@ -5147,7 +6041,7 @@ class OptimizedTechnicalAnalyzer:
                 market_direction != 'NEUTRAL'
             )
 
-            entry_required = bool(getattr(config, 'REQUIRE_ENTRY_SETUP', False)) or bool(getattr(config, 'REQUIRE_CANDLE_PATTERN', False))
+            entry_required = settings.entry_required
             entry_setup_valid = bool(entry_setup.get('valid', True)) if isinstance(entry_setup, dict) else True
             if entry_required and not entry_setup_valid:
                 essential_criteria_met = False
@@ -5223,6 +6117,19 @@ class OptimizedTechnicalAnalyzer:
             validation_result['reason'] = f'❌ Error interno: {e}'
             validation_result['criteria_list'] = criteria_list[:]  # Guardar criterios parciales
             return validation_result
+
+
+_shared_technical_analyzer = None
+_shared_technical_analyzer_lock = threading.Lock()
+
+def get_shared_technical_analyzer(config):
+    """Factory Singleton para OptimizedTechnicalAnalyzer - una caché de indicadores por proceso"""
+    global _shared_technical_analyzer
+    with _shared_technical_analyzer_lock:
+        if _shared_technical_analyzer is None:
+            _shared_technical_analyzer = OptimizedTechnicalAnalyzer(config)
+            logger.info("📐 OptimizedTechnicalAnalyzer compartido creado")
+        return _shared_technical_analyzer
 # ============================================================================
 # MÓDULO SIMILARITY ENGINE - PARA COMPARACIÓN DE CONDICIONES CON SEÑALES EXITOSAS
 # ============================================================================
@@ -5411,7 +6318,7 @@ class SimilarityEngine:
         try:
             # Extraer datos actuales
             current_price = df_entry['close'].iloc[-1]
-            analyzer = OptimizedTechnicalAnalyzer(self.config)
+            analyzer = get_shared_technical_analyzer(self.config)
             data_id = f"{symbol}_current_{int(time.time())}"
 
             # Calcular indicadores
@@ -5600,16 +6507,13 @@ class SimilarityEngine:
         try:
             # Buscar referencia al bot para acceder al neural_trader
             if hasattr(self, '_bot_ref') and self._bot_ref:
-                neural_trader = getattr(self._bot_ref, 'neural_trader', None)
-                if neural_trader and hasattr(neural_trader, 'train_with_successful_only'):
-                    success = neural_trader.train_with_successful_only()
-                    if success:
-                        logger.info("✅ [AUTO-RETRAIN] Reentrenamiento completado exitosamente")
-                        print("✅ [APRENDIZAJE] Red neuronal reentrenada con últimos trades exitosos")
-                    else:
-                        logger.warning("⚠️ [AUTO-RETRAIN] Reentrenamiento omitido: insuficientes datos")
+                retrain_service = getattr(self._bot_ref, 'retrain_service', None)
+                if retrain_service is not None:
+                    # No bloquea el cierre de la señal: entrena en otro proceso y hace hot-swap
+                    if retrain_service.submit(reason='auto'):
+                        print("🔄 [APRENDIZAJE] Reentrenamiento lanzado en segundo plano")
                 else:
-                    logger.debug("⚠️ [AUTO-RETRAIN] neural_trader no disponible")
+                    logger.debug("⚠️ [AUTO-RETRAIN] retrain_service no disponible")
             else:
                 logger.debug("⚠️ [AUTO-RETRAIN] _bot_ref no disponible")
         except Exception as e:
@@ -5701,11 +6605,48 @@ class SimilarityEngine:
 
 # ========== RED NEURONAL OPTIMIZADA ==========
 
+# Los hilos intra-op de PyTorch se fijan una sola vez por proceso
+_torch_threads_configured = False
+
+class ServingModel(NamedTuple):
+    """Modelo en servicio: se reemplaza entero (read-copy-update), nunca se muta"""
+    model: Any
+    inference_model: Any
+    scaler: Any
+    performance_metrics: dict
+    version: str
+
+def configure_torch_threads(config) -> int:
+    """Fija los hilos intra-op/inter-op de PyTorch para inferencia en CPU (idempotente)"""
+    global _torch_threads_configured
+    if not TORCH_AVAILABLE or torch is None:
+        return 0
+    if _torch_threads_configured:
+        return torch.get_num_threads()
+    num_threads = int(getattr(config, 'NEURAL_INTRAOP_THREADS', 0) or 0)
+    if num_threads <= 0:
+        num_threads = max(1, min(4, (os.cpu_count() or 2) // 2))
+    try:
+        torch.set_num_threads(num_threads)
+        try:
+            # Solo puede fijarse antes del primer trabajo paralelo
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass
+        _torch_threads_configured = True
+        logger.info(f"🧵 PyTorch intra-op threads fijados en {num_threads}")
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudieron fijar hilos de PyTorch: {e}")
+    return torch.get_num_threads()
+
 class OptimizedNeuralTrader:
     def __init__(self, config: "AdvancedTradingConfig", force_retrain=False):
         self.config = config
         self.scaler = MinMaxScaler()
         self.model = None
+        self.inference_model = None  # TorchScript congelado (preferido para inferencia en CPU)
+        self.serving = None  # ServingModel publicado: lo único que lee la inferencia
+        self._swap_lock = threading.Lock()  # Serializa a los escritores (hot-swap)
         self.criterion = nn.CrossEntropyLoss() if TORCH_AVAILABLE else None
         self.optimizer = None
         self.scheduler = None
@@ -5722,6 +6663,7 @@ class OptimizedNeuralTrader:
 
         if TORCH_AVAILABLE:
             logger.info(f"🖥️ Dispositivo de entrenamiento: {self.device}")
+            configure_torch_threads(config)
 
         self._clear_corrupted_model_files()
 
@@ -5857,7 +6799,8 @@ class OptimizedNeuralTrader:
 
             # DataLoader
             dataset = torch.utils.data.TensorDataset(X_tensor, y_tensor)
-            dataloader = torch.utils.data.DataLoader(dataset, batch_size=batch_size, shuffle=True)
+            dataloader = torch.utils.data.DataLoader(dataset, batch_size=batch_size, shuffle=True,
+                                                     drop_last=len(dataset) > batch_size)  # BatchNorm no admite lotes de 1
 
             # Modo entrenamiento (pero con bajo LR)
             self.model.train()
@@ -5929,10 +6872,13 @@ class OptimizedNeuralTrader:
 
     def _clear_model_files(self):
         try:
-            files_to_remove = [self.config.NN_MODEL_PATH, self.config.SCALER_PATH]
+            files_to_remove = [self.config.NN_MODEL_PATH, self.config.SCALER_PATH,
+                               getattr(self.config, 'NN_EXPORT_PATH', '')]
+            self.inference_model = None
+            self.serving = None
             removed_files = []
             for file_path in files_to_remove:
-                if os.path.exists(file_path):
+                if file_path and os.path.exists(file_path):
                     os.remove(file_path)
                     removed_files.append(file_path)
             if removed_files:
@@ -6154,7 +7100,7 @@ class OptimizedNeuralTrader:
         logger.info(f"🧠 Entrenando IA optimizada con {len(symbols)} símbolos y {days} días")
         all_X, all_y = [], []
         client = AdvancedBinanceClient(self.config)
-        analyzer = OptimizedTechnicalAnalyzer(self.config)
+        analyzer = get_shared_technical_analyzer(self.config)
         class_counts = {0: 0, 1: 0, 2: 0}
         max_samples_per_class = 5000
         for i, symbol in enumerate(symbols):
@@ -6181,6 +7127,7 @@ class OptimizedNeuralTrader:
         logger.info(f"Distribución de clases: {class_counts}")
         input_size = len(all_X[0])
         self.config.NEURAL_INPUT_SIZE = input_size
+        self.inference_model = None  # Se re-exporta en _save_model_and_scaler
         self.model = self._build_optimized_model(input_size)
         self.model = self.model.to(self.device)
         logger.info(f"🚀 Modelo movido a {self.device} para entrenamiento")
@@ -6206,6 +7153,7 @@ class OptimizedNeuralTrader:
         X_train, X_val, y_train, y_val = train_test_split(
             X_scaled, y, test_size=0.2, random_state=42, stratify=y
         )
+        self._save_validation_holdout(X_val, y_val)
         train_dataset = torch.utils.data.TensorDataset(
             torch.tensor(X_train, dtype=torch.float32),
             torch.tensor(y_train, dtype=torch.long)
@@ -6419,11 +7367,13 @@ class OptimizedNeuralTrader:
 
     def predict_optimized(self, df_entry: pd.DataFrame) -> dict:
         # ✅ v32.0.22.4: FALLBACK TÉCNICO cuando no hay modelo entrenado
-        if not TORCH_AVAILABLE or not self.is_trained or self.model is None:
+        # Una sola lectura de la referencia: un hot-swap concurrente nunca se ve a medias
+        serving = self.serving
+        if not TORCH_AVAILABLE or not self.is_trained or serving is None:
             # Usar análisis técnico simple como fallback para generar predicciones
             return self._predict_fallback_technical(df_entry)
         try:
-            analyzer = OptimizedTechnicalAnalyzer(self.config)
+            analyzer = get_shared_technical_analyzer(self.config)
             features, _ = self._extract_optimized_features(df_entry, analyzer)
             if not features:
                 return {
@@ -6436,12 +7386,17 @@ class OptimizedNeuralTrader:
                 }
             # Usar múltiples predicciones de 60 velas (60 min en 1m) para reducir ruido
             X = np.array(features[-60:]) if len(features) >= 60 else np.array(features[-max(1, len(features)):])
-            X_scaled = self.scaler.transform(X)
-            X_tensor = torch.tensor(X_scaled, dtype=torch.float32).to(self.device)
-            self.model.eval()
-            with torch.no_grad():
-                outputs = self.model(X_tensor)
-                probabilities = torch.mean(outputs, dim=0).cpu().numpy()
+            X_scaled = serving.scaler.transform(X)
+            if serving.inference_model is not None:
+                X_tensor = torch.tensor(X_scaled, dtype=torch.float32)
+                with torch.inference_mode():
+                    outputs = serving.inference_model(X_tensor)
+                    probabilities = torch.mean(outputs, dim=0).numpy()
+            else:
+                X_tensor = torch.tensor(X_scaled, dtype=torch.float32).to(self.device)
+                with torch.no_grad():
+                    outputs = serving.model(X_tensor)
+                    probabilities = torch.mean(outputs, dim=0).cpu().numpy()
 
             sell_prob = float(probabilities[0])  # Convertir a float nativo
             neutral_prob = float(probabilities[1])
@@ -6474,16 +7429,17 @@ class OptimizedNeuralTrader:
 
             # Confianza ajustada por métricas de rendimiento
             base_confidence = max_prob * 100
-            if self.performance_metrics:
+            metrics = serving.performance_metrics
+            if metrics:
                 if buy_prob == max_prob:
-                    precision_c = self.performance_metrics.get('precision_buy', 0.5)
-                    recall_c = self.performance_metrics.get('recall_buy', 0.5)
+                    precision_c = metrics.get('precision_buy', 0.5)
+                    recall_c = metrics.get('recall_buy', 0.5)
                 elif sell_prob == max_prob:
-                    precision_c = self.performance_metrics.get('precision_sell', 0.5)
-                    recall_c = self.performance_metrics.get('recall_sell', 0.5)
+                    precision_c = metrics.get('precision_sell', 0.5)
+                    recall_c = metrics.get('recall_sell', 0.5)
                 else:
-                    precision_c = self.performance_metrics.get('precision_neutral', 0.5)
-                    recall_c = self.performance_metrics.get('recall_neutral', 0.5)
+                    precision_c = metrics.get('precision_neutral', 0.5)
+                    recall_c = metrics.get('recall_neutral', 0.5)
                 performance_factor = (precision_c + recall_c) / 2.0
                 adjusted_confidence = base_confidence * (0.5 + performance_factor)
             else:
@@ -6531,47 +7487,364 @@ class OptimizedNeuralTrader:
                     pickle.dump(self.scaler, f)
                 logger.info("Modelo optimizado y scaler guardados correctamente")
                 logger.info(f"[CHART] Arquitectura guardada: {self.config.NEURAL_INPUT_SIZE} características de entrada")
+                self._export_inference_model()
+                self._activate_quantized_inference()
+                self._publish_serving_model()
         except Exception as e:
             logger.error(f"Error guardando modelo optimizado: {e}")
 
-    def _load_model_and_scaler(self):
-        try:
-            if TORCH_AVAILABLE and os.path.exists(self.config.NN_MODEL_PATH):
-                checkpoint = torch.load(self.config.NN_MODEL_PATH, map_location='cpu')
-                if isinstance(checkpoint, dict) and 'model_state_dict' in checkpoint:
-                    config_data = checkpoint.get('config', {})
-                    saved_input_size = config_data.get('input_size', self.config.NEURAL_INPUT_SIZE)
-                    if saved_input_size != self.config.NEURAL_INPUT_SIZE:
-                        logger.warning(f"[WARN] Incompatibilidad de arquitectura detectada:")
-                        logger.warning(f"  Modelo guardado: {saved_input_size} características")
-                        logger.warning(f"  Arquitectura actual: {self.config.NEURAL_INPUT_SIZE} características")
-                        logger.warning("🔄 Eliminando modelo incompatible y se creará uno nuevo")
-                        try:
-                            os.remove(self.config.NN_MODEL_PATH)
-                            if os.path.exists(self.config.SCALER_PATH):
-                                os.remove(self.config.SCALER_PATH)
-                            logger.info("✅ Archivos de modelo incompatibles eliminados")
-                        except Exception as e:
-                            logger.error(f"Error eliminando archivos: {e}")
-                        self.is_trained = False
-                        # ✅ CREAR NUEVO MODELO AUTOMÁTICAMENTE CON LA ARQUITECTURA CORRECTA
-                        self.model = self._build_optimized_model(self.config.NEURAL_INPUT_SIZE)
-                        logger.info(f"[OK] Nuevo modelo creado con {self.config.NEURAL_INPUT_SIZE} características")
-                        return
-                    if self.config.NEURAL_INPUT_SIZE > 0:
-                        self.model = self._build_optimized_model(self.config.NEURAL_INPUT_SIZE)
-                        self.model.load_state_dict(checkpoint['model_state_dict'])
-                        self.model.eval()
-                        self.is_trained = True
-                        loaded_metrics = checkpoint.get('performance_metrics', {})
-                        self.performance_metrics = self._clean_numpy_types(loaded_metrics)
-                        loaded_history = checkpoint.get('training_history', [])
-                        self.training_history = self._clean_numpy_types(loaded_history)
-                        logger.info("Modelo optimizado cargado con metadatos")
-                else:
-                    logger.warning("⚠️ Modelo en formato antiguo detectado")
-                    logger.warning("🔄 Eliminando modelo antiguo y se creará uno nuevo")
-                    try:
+    def _publish_serving_model(self, version: str = None):
+        """
+        Publica una copia inmutable (modelo eval + scaler + métricas) como modelo en servicio.
+        La asignación de la referencia es atómica: la inferencia ve el modelo viejo o el nuevo.
+        """
+        if not TORCH_AVAILABLE or self.model is None or not self.is_trained or not self.scaler_fitted:
+            return None
+        serving = ServingModel(
+            model=copy.deepcopy(self.model).eval(),
+            inference_model=self.inference_model,
+            scaler=copy.deepcopy(self.scaler),
+            performance_metrics=dict(self.performance_metrics or {}),
+            version=version or datetime.now().strftime('%Y%m%d_%H%M%S')
+        )
+        self.serving = serving
+        return serving
+
+    def train_with_successful_only(self, trades: list = None, progress_callback=None) -> bool:
+        """
+        Reentrena con los símbolos de los trades exitosos guardados.
+        Con modelo entrenado hace fine-tuning incremental; sin modelo, entrenamiento completo.
+        """
+        if not TORCH_AVAILABLE:
+            return False
+        if trades is None:
+            trades = []
+            for path in glob.glob(os.path.join(self.config.TRAINING_SUCCESS_DIR, "*.json")):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        trades.append(json.load(f))
+                except Exception:
+                    continue
+        min_trades = getattr(self.config, 'RETRAIN_MIN_SUCCESSFUL_TRADES', 5)
+        if len(trades) < min_trades:
+            logger.info(f"ℹ️ Reentrenamiento omitido: {len(trades)}/{min_trades} trades exitosos")
+            return False
+        trades = sorted(trades, key=lambda t: str(t.get('timestamp', '')), reverse=True)
+        symbols = list(dict.fromkeys(t['symbol'] for t in trades if t.get('symbol') and t['symbol'] != 'N/A'))
+        symbols = symbols[:getattr(self.config, 'RETRAIN_MAX_SYMBOLS', 20)]
+        if not symbols:
+            return False
+        if not self.is_trained or not self.scaler_fitted or self.model is None:
+            return self.train_with_optimized_data(symbols=symbols, progress_callback=progress_callback)
+
+        client = AdvancedBinanceClient(self.config)
+        analyzer = get_shared_technical_analyzer(self.config)
+        all_X, all_y = [], []
+        for i, symbol in enumerate(symbols):
+            try:
+                df = client.get_klines(symbol, self.config.PRIMARY_TIMEFRAME, limit=1000)
+                if df is None or len(df) < self.config.MIN_NN_DATA_REQUIRED:
+                    continue
+                features, targets = self._extract_optimized_features(df, analyzer)
+                all_X.extend(features)
+                all_y.extend(targets)
+            except Exception as e:
+                logger.error(f"Error preparando reentrenamiento con {symbol}: {e}")
+            if progress_callback:
+                progress_callback(int((i + 1) / len(symbols) * 50))
+        if not all_X:
+            logger.warning("No hay datos suficientes para reentrenar")
+            return False
+        return self.finetune_incremental(np.array(all_X), np.array(all_y),
+                                         epochs=getattr(self.config, 'RETRAIN_FINETUNE_EPOCHS', 3))
+
+    def hot_swap(self, model_path: str, scaler_path: str, version: str) -> bool:
+        """
+        Carga un par modelo+scaler versionado, lo promueve a las rutas canónicas
+        y publica el nuevo ServingModel en una sola asignación.
+        """
+        if not TORCH_AVAILABLE:
+            return False
+        with self._swap_lock:
+            try:
+                checkpoint = torch.load(model_path, map_location='cpu')
+                input_size = checkpoint.get('config', {}).get('input_size', self.config.NEURAL_INPUT_SIZE)
+                if input_size != self.config.NEURAL_INPUT_SIZE:
+                    logger.error(f"❌ Hot-swap rechazado: {input_size} características vs {self.config.NEURAL_INPUT_SIZE}")
+                    return False
+                new_model = self._build_optimized_model(input_size).to(self.device)
+                new_model.load_state_dict(checkpoint['model_state_dict'])
+                new_model.eval()
+                with open(scaler_path, 'rb') as f:
+                    new_scaler = pickle.load(f)
+
+                # Promover a rutas canónicas (copia + os.replace = sin archivos a medias)
+                for src, dst in ((model_path, self.config.NN_MODEL_PATH), (scaler_path, self.config.SCALER_PATH)):
+                    shutil.copy2(src, dst + '.tmp')
+                    os.replace(dst + '.tmp', dst)
+
+                self.model = new_model
+                self.scaler = new_scaler
+                self.scaler_fitted = True
+                self.is_trained = True
+                self.performance_metrics = self._clean_numpy_types(checkpoint.get('performance_metrics', {}))
+                self.training_history = self._clean_numpy_types(checkpoint.get('training_history', []))
+                self._load_inference_model()
+                self._publish_serving_model(version)
+                logger.info(f"🔁 Modelo en servicio reemplazado por versión {version}")
+                return True
+            except Exception as e:
+                logger.error(f"[ERROR] Hot-swap de modelo {version} falló: {e}", exc_info=True)
+                return False
+
+    def _save_validation_holdout(self, X_val, y_val):
+        """Persiste el split de validación (ya escalado) para los informes de paridad"""
+        holdout_path = getattr(self.config, 'NN_VALIDATION_HOLDOUT_PATH', None)
+        if not holdout_path:
+            return
+        try:
+            np.savez_compressed(holdout_path, X=np.asarray(X_val, dtype=np.float32),
+                                y=np.asarray(y_val, dtype=np.int64))
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo guardar el set de validación: {e}")
+
+    def _load_validation_holdout(self):
+        holdout_path = getattr(self.config, 'NN_VALIDATION_HOLDOUT_PATH', None)
+        if not holdout_path or not os.path.exists(holdout_path):
+            return None, None
+        try:
+            data = np.load(holdout_path)
+            return data['X'], data['y']
+        except Exception as e:
+            logger.warning(f"⚠️ Set de validación ilegible: {e}")
+            return None, None
+
+    def _build_quantized_model(self):
+        """
+        Construye (modelo_float, modelo_int8) desde el .pth guardado.
+        El int8 usa cuantización dinámica en las Linear tras plegar BatchNorm.
+        """
+        checkpoint = torch.load(self.config.NN_MODEL_PATH, map_location='cpu')
+        float_model = self._build_optimized_model(self.config.NEURAL_INPUT_SIZE)
+        float_model.load_state_dict(checkpoint['model_state_dict'])
+        float_model.eval()
+        supported = torch.backends.quantized.supported_engines
+        if torch.backends.quantized.engine not in supported or torch.backends.quantized.engine == 'none':
+            for engine in ('x86', 'fbgemm', 'qnnpack'):
+                if engine in supported:
+                    torch.backends.quantized.engine = engine
+                    break
+        quantized_model = torch.ao.quantization.quantize_dynamic(
+            self._fold_batchnorm(float_model), {nn.Linear}, dtype=torch.qint8
+        )
+        quantized_model.eval()
+        return float_model, quantized_model
+
+    @staticmethod
+    def _serialized_size_kb(model) -> float:
+        import io
+        buffer = io.BytesIO()
+        torch.save(model.state_dict(), buffer)
+        return buffer.tell() / 1024.0
+
+    def evaluate_quantization_parity(self, X_val=None, y_val=None, models=None, save_report=True) -> dict:
+        """
+        Informe de paridad float vs int8 sobre el set de validación retenido:
+        precisión de ambos, concordancia de clase y desviación de probabilidades.
+        Se guarda en NN_QUANTIZATION_REPORT_PATH.
+        """
+        if not TORCH_AVAILABLE or not os.path.exists(self.config.NN_MODEL_PATH):
+            return {}
+        if X_val is None:
+            X_val, y_val = self._load_validation_holdout()
+        if X_val is None or len(X_val) == 0:
+            logger.info("ℹ️ Sin set de validación retenido - informe de paridad omitido")
+            return {}
+        try:
+            float_model, quantized_model = models or self._build_quantized_model()
+            X_tensor = torch.tensor(np.asarray(X_val), dtype=torch.float32)
+            with torch.inference_mode():
+                float_probs = float_model(X_tensor)
+                quant_probs = quantized_model(X_tensor)
+            float_pred = float_probs.argmax(dim=1).numpy()
+            quant_pred = quant_probs.argmax(dim=1).numpy()
+            prob_diff = (float_probs - quant_probs).abs()
+            report = {
+                'samples': int(len(X_val)),
+                'agreement': float(np.mean(float_pred == quant_pred)),
+                'max_prob_diff': float(prob_diff.max()),
+                'mean_prob_diff': float(prob_diff.mean()),
+                'float_size_kb': round(self._serialized_size_kb(float_model), 1),
+                'quantized_size_kb': round(self._serialized_size_kb(quantized_model), 1),
+                'model_mtime': os.path.getmtime(self.config.NN_MODEL_PATH),
+                'timestamp': datetime.now().isoformat()
+            }
+            if y_val is not None:
+                y_arr = np.asarray(y_val)
+                report['float_accuracy'] = float(accuracy_score(y_arr, float_pred))
+                report['quantized_accuracy'] = float(accuracy_score(y_arr, quant_pred))
+            report_path = getattr(self.config, 'NN_QUANTIZATION_REPORT_PATH', None)
+            if save_report and report_path:
+                with open(report_path, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2)
+            logger.info(f"📏 Paridad int8: concordancia={report['agreement']:.4f} | "
+                        f"Δprob máx={report['max_prob_diff']:.4f} | "
+                        f"{report['float_size_kb']:.0f}KB → {report['quantized_size_kb']:.0f}KB")
+            return report
+        except Exception as e:
+            logger.error(f"Error evaluando paridad de cuantización: {e}")
+            return {}
+
+    def _activate_quantized_inference(self) -> bool:
+        """Usa el modelo int8 para inferencia si está habilitado y supera la paridad mínima"""
+        if not TORCH_AVAILABLE or not getattr(self.config, 'NEURAL_QUANTIZED_INFERENCE', False):
+            return False
+        if not self.is_trained or str(self.device) != 'cpu' or not os.path.exists(self.config.NN_MODEL_PATH):
+            return False
+        try:
+            models = self._build_quantized_model()
+            report = self.evaluate_quantization_parity(models=models)
+            min_agreement = getattr(self.config, 'NEURAL_QUANTIZED_MIN_AGREEMENT', 0.98)
+            if not report or 'agreement' not in report:
+                # Sin datos de validación no hay paridad demostrada: se queda el modelo float
+                logger.warning("⚠️ Modelo int8 descartado: sin informe de paridad")
+                return False
+            if report['agreement'] < min_agreement:
+                logger.warning(f"⚠️ Modelo int8 descartado: concordancia {report['agreement']:.4f} < {min_agreement}")
+                return False
+            self.inference_model = models[1]
+            logger.info("⚡ Inferencia cuantizada int8 (dinámica) activa")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo activar inferencia int8: {e}")
+            return False
+
+    def _fold_batchnorm(self, model):
+        """
+        Devuelve una copia en modo eval con cada BatchNorm1d plegado en la Linear previa
+        (Sequential Linear→BN y pares linearN/bnN de los bloques residuales).
+        Los Dropout se sustituyen por Identity: en inferencia no aportan nada.
+        """
+        from torch.nn.utils.fusion import fuse_linear_bn_eval
+        fused = copy.deepcopy(model).cpu().eval()
+        for module in list(fused.modules()):
+            if isinstance(module, nn.Sequential):
+                children = list(module.children())
+                for idx in range(len(children) - 1):
+                    if isinstance(children[idx], nn.Linear) and isinstance(children[idx + 1], nn.BatchNorm1d):
+                        module[idx] = fuse_linear_bn_eval(children[idx], children[idx + 1])
+                        module[idx + 1] = nn.Identity()
+                for idx, child in enumerate(module.children()):
+                    if isinstance(child, nn.Dropout):
+                        module[idx] = nn.Identity()
+            for linear_name, bn_name in (('linear1', 'bn1'), ('linear2', 'bn2')):
+                linear = getattr(module, linear_name, None)
+                bn = getattr(module, bn_name, None)
+                if isinstance(linear, nn.Linear) and isinstance(bn, nn.BatchNorm1d):
+                    setattr(module, linear_name, fuse_linear_bn_eval(linear, bn))
+                    setattr(module, bn_name, nn.Identity())
+            if isinstance(getattr(module, 'dropout', None), nn.Dropout):
+                module.dropout = nn.Identity()
+        return fused
+
+    def _export_inference_model(self) -> bool:
+        """
+        Exporta el modelo a TorchScript congelado (BN plegado) en NN_EXPORT_PATH.
+        Se valida contra el modelo eager antes de reemplazar el artefacto.
+        """
+        if not TORCH_AVAILABLE or self.model is None or not self.is_trained:
+            return False
+        if not getattr(self.config, 'NEURAL_EXPORT_ENABLED', True) or str(self.device) != 'cpu':
+            self.inference_model = None
+            return False
+        export_path = getattr(self.config, 'NN_EXPORT_PATH', None)
+        if not export_path:
+            return False
+        try:
+            example = torch.randn(60, self.config.NEURAL_INPUT_SIZE)
+            reference_model = copy.deepcopy(self.model).cpu().eval()
+            with torch.no_grad():
+                traced = torch.jit.trace(self._fold_batchnorm(self.model), example)
+                traced = torch.jit.freeze(traced.eval())
+                expected = reference_model(example)
+                exported = traced(example)
+            if not torch.allclose(expected, exported, atol=1e-5):
+                max_diff = float((expected - exported).abs().max())
+                logger.warning(f"⚠️ Export TorchScript descartado: desviación {max_diff:.2e} vs modelo eager")
+                self.inference_model = None
+                return False
+            tmp_path = export_path + '.tmp'
+            torch.jit.save(traced, tmp_path)
+            os.replace(tmp_path, export_path)
+            self.inference_model = traced
+            logger.info(f"⚡ Modelo de inferencia TorchScript exportado: {export_path}")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo exportar modelo TorchScript: {e}")
+            self.inference_model = None
+            return False
+
+    def _load_inference_model(self) -> bool:
+        """Carga el artefacto TorchScript si es más reciente que el .pth; si no, lo regenera"""
+        self.inference_model = None
+        if not TORCH_AVAILABLE or not self.is_trained or self.model is None:
+            return False
+        if self._activate_quantized_inference():
+            return True
+        if not getattr(self.config, 'NEURAL_EXPORT_ENABLED', True) or str(self.device) != 'cpu':
+            return False
+        export_path = getattr(self.config, 'NN_EXPORT_PATH', None)
+        try:
+            if (export_path and os.path.exists(export_path) and
+                    os.path.getmtime(export_path) >= os.path.getmtime(self.config.NN_MODEL_PATH)):
+                self.inference_model = torch.jit.load(export_path, map_location='cpu')
+                self.inference_model.eval()
+                logger.info("⚡ Modelo de inferencia TorchScript cargado")
+                return True
+        except Exception as e:
+            logger.warning(f"⚠️ Artefacto TorchScript inválido, se regenera: {e}")
+        return self._export_inference_model()
+
+    def _load_model_and_scaler(self):
+        try:
+            if TORCH_AVAILABLE and os.path.exists(self.config.NN_MODEL_PATH):
+                checkpoint = get_model_registry(self.config).load_artifact(
+                    self.config.NN_MODEL_PATH, lambda p: torch.load(p, map_location='cpu'))
+                if isinstance(checkpoint, dict) and 'model_state_dict' in checkpoint:
+                    config_data = checkpoint.get('config', {})
+                    saved_input_size = config_data.get('input_size', self.config.NEURAL_INPUT_SIZE)
+                    if saved_input_size != self.config.NEURAL_INPUT_SIZE:
+                        logger.warning(f"[WARN] Incompatibilidad de arquitectura detectada:")
+                        logger.warning(f"  Modelo guardado: {saved_input_size} características")
+                        logger.warning(f"  Arquitectura actual: {self.config.NEURAL_INPUT_SIZE} características")
+                        logger.warning("🔄 Eliminando modelo incompatible y se creará uno nuevo")
+                        try:
+                            os.remove(self.config.NN_MODEL_PATH)
+                            if os.path.exists(self.config.SCALER_PATH):
+                                os.remove(self.config.SCALER_PATH)
+                            logger.info("✅ Archivos de modelo incompatibles eliminados")
+                        except Exception as e:
+                            logger.error(f"Error eliminando archivos: {e}")
+                        self.is_trained = False
+                        # ✅ CREAR NUEVO MODELO AUTOMÁTICAMENTE CON LA ARQUITECTURA CORRECTA
+                        self.model = self._build_optimized_model(self.config.NEURAL_INPUT_SIZE)
+                        logger.info(f"[OK] Nuevo modelo creado con {self.config.NEURAL_INPUT_SIZE} características")
+                        return
+                    if self.config.NEURAL_INPUT_SIZE > 0:
+                        self.model = self._build_optimized_model(self.config.NEURAL_INPUT_SIZE)
+                        self.model.load_state_dict(checkpoint['model_state_dict'])
+                        self.model.eval()
+                        self.is_trained = True
+                        loaded_metrics = checkpoint.get('performance_metrics', {})
+                        self.performance_metrics = self._clean_numpy_types(loaded_metrics)
+                        loaded_history = checkpoint.get('training_history', [])
+                        self.training_history = self._clean_numpy_types(loaded_history)
+                        logger.info("Modelo optimizado cargado con metadatos")
+                        self._load_inference_model()
+                else:
+                    logger.warning("⚠️ Modelo en formato antiguo detectado")
+                    logger.warning("🔄 Eliminando modelo antiguo y se creará uno nuevo")
+                    try:
                         os.remove(self.config.NN_MODEL_PATH)
                         if os.path.exists(self.config.SCALER_PATH):
                             os.remove(self.config.SCALER_PATH)
@@ -6593,6 +7866,7 @@ class OptimizedNeuralTrader:
                         self.scaler_fitted = False
                 else:
                     self.scaler_fitted = False
+                self._publish_serving_model()
             elif not os.path.exists(self.config.NN_MODEL_PATH):
                 logger.info("ℹ️ No existe archivo de modelo. Se entrenará uno nuevo cuando esté disponible.")
                 self.is_trained = False
@@ -6600,12 +7874,289 @@ class OptimizedNeuralTrader:
             logger.error(f"Error cargando modelo optimizado: {e}")
             logger.info("🔄 Se creará un nuevo modelo cuando se entrene")
             self.is_trained = False
+# ========== REGISTRO DE MODELO (CARGA ÚNICA POR PROCESO) ==========
+
+class ModelRegistry:
+    """
+    Carga modelo + scaler una sola vez por proceso, en segundo plano, mientras se
+    descargan datos. Tras la carga hace pasadas de warm-up y activa la bandera
+    de disponibilidad que espera el escáner.
+    """
+    def __init__(self, config):
+        self.config = config
+        self._trader = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._load_thread = None
+        self._artifact_cache = {}  # {(ruta, mtime): objeto deserializado}
+        self._created_at = time.time()
+        self._first_analysis_logged = False
+        self.metrics = {
+            'load_ms': None,
+            'warmup_ms': None,
+            'ready_after_s': None,
+            'time_to_first_analysis_s': None
+        }
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start_loading(self):
+        """Lanza la carga en segundo plano (idempotente)"""
+        with self._lock:
+            if self._load_thread is not None or self._ready.is_set():
+                return
+            self._load_thread = threading.Thread(target=self._load, daemon=True, name="ModelRegistryLoader")
+            self._load_thread.start()
+
+    def _load(self):
+        try:
+            started = time.perf_counter()
+            ensure_torch()  # Un torch roto se detecta aquí y el trader arranca sin IA
+            trader = OptimizedNeuralTrader(self.config)
+            self.metrics['load_ms'] = (time.perf_counter() - started) * 1000.0
+            self.metrics['warmup_ms'] = self._warm_up(trader)
+            self._trader = trader
+        except Exception as e:
+            logger.error(f"❌ Error cargando modelo en el registro: {e}", exc_info=True)
+        finally:
+            self.metrics['ready_after_s'] = time.time() - self._created_at
+            self._ready.set()
+            logger.info(f"🚀 Modelo listo en {self.metrics['ready_after_s']:.2f}s "
+                        f"(carga={self.metrics['load_ms'] or 0:.0f}ms, warm-up={self.metrics['warmup_ms'] or 0:.0f}ms)")
+
+    def _warm_up(self, trader) -> float:
+        """Pasadas en vacío por el mismo camino que predict_optimized (JIT/allocator ya calientes)"""
+        serving = trader.serving
+        if not TORCH_AVAILABLE or not trader.is_trained or serving is None:
+            return 0.0
+        started = time.perf_counter()
+        try:
+            X = np.zeros((60, self.config.NEURAL_INPUT_SIZE), dtype=np.float32)
+            X_scaled = serving.scaler.transform(X)
+            model = serving.inference_model if serving.inference_model is not None else serving.model
+            X_tensor = torch.tensor(X_scaled, dtype=torch.float32)
+            if serving.inference_model is None:
+                X_tensor = X_tensor.to(trader.device)
+            with torch.inference_mode():
+                for _ in range(max(1, int(getattr(self.config, 'NEURAL_WARMUP_PASSES', 3)))):
+                    model(X_tensor)
+        except Exception as e:
+            logger.warning(f"⚠️ Warm-up del modelo falló: {e}")
+        return (time.perf_counter() - started) * 1000.0
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        self.start_loading()
+        return self._ready.wait(timeout)
+
+    def get_trader(self, timeout: Optional[float] = None):
+        """Trader neuronal compartido; bloquea hasta que termine la carga"""
+        self.wait_ready(timeout)
+        return self._trader
+
+    def peek_trader(self):
+        """Trader si ya está cargado, sin bloquear"""
+        return self._trader
+
+    def set_trader(self, trader):
+        """Sustituye el trader (p.ej. reentrenamiento forzado desde la GUI)"""
+        with self._lock:
+            self._trader = trader
+            self._ready.set()
+
+    def load_artifact(self, path: str, loader):
+        """Deserializa un artefacto de disco una sola vez por (ruta, mtime)"""
+        try:
+            key = (path, os.path.getmtime(path))
+        except OSError:
+            return loader(path)
+        with self._lock:
+            if key not in self._artifact_cache:
+                self._artifact_cache = {k: v for k, v in self._artifact_cache.items() if k[0] != path}
+                self._artifact_cache[key] = loader(path)
+            return self._artifact_cache[key]
+
+    def record_first_analysis(self):
+        if self._first_analysis_logged:
+            return
+        with self._lock:
+            if self._first_analysis_logged:
+                return
+            self._first_analysis_logged = True
+        self.metrics['time_to_first_analysis_s'] = time.time() - self._created_at
+        logger.info(f"⏱️ Tiempo hasta el primer análisis: {self.metrics['time_to_first_analysis_s']:.2f}s "
+                    f"(modelo listo en {self.metrics['ready_after_s'] or 0:.2f}s)")
+
+
+_model_registry_instance = None
+_model_registry_lock = threading.Lock()
+
+def get_model_registry(config):
+    """Factory Singleton para ModelRegistry - un modelo cargado por proceso"""
+    global _model_registry_instance
+    with _model_registry_lock:
+        if _model_registry_instance is None:
+            _model_registry_instance = ModelRegistry(config)
+        return _model_registry_instance
+
+# ========== REENTRENAMIENTO EN SEGUNDO PLANO ==========
+
+def run_retrain_job(job: dict) -> dict:
+    """
+    Punto de entrada del proceso de reentrenamiento (debe ser picklable: nivel de módulo).
+    Trabaja sobre la instantánea del job y escribe un par modelo+scaler versionado;
+    nunca toca los archivos en servicio.
+    """
+    started = time.time()
+    result = {'success': False, 'version': job['version'], 'model_path': job['model_path'],
+              'scaler_path': job['scaler_path'], 'reason': job.get('reason', 'manual')}
+    try:
+        config = AdvancedTradingConfig()
+        config.NN_MODEL_PATH = job['snapshot_model_path']
+        config.SCALER_PATH = job['snapshot_scaler_path']
+        config.NN_VALIDATION_HOLDOUT_PATH = job['holdout_path']
+        config.NEURAL_EXPORT_ENABLED = False
+        config.NEURAL_QUANTIZED_INFERENCE = False
+        trader = OptimizedNeuralTrader(config)
+        # A partir de aquí todo lo que se guarde va a las rutas versionadas
+        config.NN_MODEL_PATH = job['model_path']
+        config.SCALER_PATH = job['scaler_path']
+        result['success'] = bool(trader.train_with_successful_only(trades=job['trades']))
+        result['success'] = result['success'] and os.path.exists(job['model_path']) and os.path.exists(job['scaler_path'])
+        result['metrics'] = trader._clean_numpy_types(trader.performance_metrics)
+    except Exception as e:
+        result['error'] = str(e)
+    result['duration_s'] = time.time() - started
+    return result
+
+
+class BackgroundRetrainService:
+    """
+    Reentrenamiento no bloqueante: un proceso worker entrena sobre una instantánea
+    (copias del modelo/scaler en servicio + trades exitosos) y, al terminar, el modelo
+    versionado se publica con OptimizedNeuralTrader.hot_swap.
+    """
+    def __init__(self, config: "AdvancedTradingConfig", get_trader: Callable):
+        self.config = config
+        self._get_trader = get_trader
+        self.versions_dir = os.path.join(config.MODELS_DIR, 'versions')
+        self._executor = None
+        self._future = None
+        self._lock = threading.Lock()
+        self.stats = {'submitted': 0, 'skipped_busy': 0, 'swapped': 0, 'failed': 0,
+                      'last_version': None, 'last_duration_s': 0.0}
+        os.makedirs(self.versions_dir, exist_ok=True)
+
+    def is_running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def _get_executor(self):
+        if self._executor is None:
+            import concurrent.futures
+            import multiprocessing
+            # spawn: el hijo no hereda hilos/locks del proceso con GUI y WebSocket
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def _snapshot(self, version: str, reason: str) -> dict:
+        """Copia el estado actual a un directorio propio del job"""
+        snapshot_dir = os.path.join(self.config.TEMP_DIR, f"retrain_{version}")
+        os.makedirs(snapshot_dir, exist_ok=True)
+        job = {
+            'version': version,
+            'reason': reason,
+            'snapshot_dir': snapshot_dir,
+            'snapshot_model_path': os.path.join(snapshot_dir, os.path.basename(self.config.NN_MODEL_PATH)),
+            'snapshot_scaler_path': os.path.join(snapshot_dir, os.path.basename(self.config.SCALER_PATH)),
+            'holdout_path': os.path.join(self.versions_dir, f"validation_holdout_v20.{version}.npz"),
+            'model_path': os.path.join(self.versions_dir, f"neural_net_model_v20_optimized.{version}.pth"),
+            'scaler_path': os.path.join(self.versions_dir, f"scaler_v20_optimized.{version}.pkl"),
+            'trades': [],
+        }
+        for src, dst in ((self.config.NN_MODEL_PATH, job['snapshot_model_path']),
+                         (self.config.SCALER_PATH, job['snapshot_scaler_path'])):
+            if os.path.exists(src):
+                shutil.copy2(src, dst)
+        for path in glob.glob(os.path.join(self.config.TRAINING_SUCCESS_DIR, "*.json")):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    job['trades'].append(json.load(f))
+            except Exception:
+                continue
+        return job
+
+    def submit(self, reason: str = 'manual') -> bool:
+        """Encola un reentrenamiento; retorna de inmediato (False si ya hay uno en curso)"""
+        with self._lock:
+            if self.is_running():
+                self.stats['skipped_busy'] += 1
+                logger.info(f"⏭️ [RETRAIN] Ya hay un reentrenamiento en curso - '{reason}' omitido")
+                return False
+            job = None
+            try:
+                version = datetime.now().strftime('%Y%m%d_%H%M%S')
+                job = self._snapshot(version, reason)
+                self._future = self._get_executor().submit(run_retrain_job, job)
+                self._future.add_done_callback(lambda fut, job=job: self._on_done(fut, job))
+                self.stats['submitted'] += 1
+                logger.info(f"🔄 [RETRAIN] Reentrenamiento {version} lanzado en segundo plano ({reason})")
+                return True
+            except Exception as e:
+                if job:
+                    shutil.rmtree(job['snapshot_dir'], ignore_errors=True)
+                self.stats['failed'] += 1
+                logger.error(f"[ERROR] No se pudo lanzar el reentrenamiento: {e}")
+                return False
+
+    def _on_done(self, future, job: dict):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {'success': False, 'error': str(e), 'version': job['version']}
+        try:
+            self.stats['last_duration_s'] = float(result.get('duration_s', 0.0))
+            trader = self._get_trader()
+            if result.get('success') and trader is not None and \
+                    trader.hot_swap(result['model_path'], result['scaler_path'], result['version']):
+                self.stats['swapped'] += 1
+                self.stats['last_version'] = result['version']
+                if os.path.exists(job['holdout_path']):
+                    shutil.copy2(job['holdout_path'], self.config.NN_VALIDATION_HOLDOUT_PATH)
+                logger.info(f"✅ [RETRAIN] Versión {result['version']} en servicio "
+                            f"({self.stats['last_duration_s']:.1f}s en segundo plano)")
+            else:
+                self.stats['failed'] += 1
+                logger.warning(f"⚠️ [RETRAIN] Versión {job['version']} descartada: "
+                               f"{result.get('error', 'sin datos suficientes')}")
+            self._prune_versions()
+        finally:
+            shutil.rmtree(job['snapshot_dir'], ignore_errors=True)
+
+    def _prune_versions(self):
+        """Conserva solo las últimas RETRAIN_KEEP_VERSIONS versiones"""
+        keep = max(1, int(getattr(self.config, 'RETRAIN_KEEP_VERSIONS', 3)))
+        for pattern in ("neural_net_model_v20_optimized.*.pth", "scaler_v20_optimized.*.pkl",
+                        "validation_holdout_v20.*.npz"):
+            files = sorted(glob.glob(os.path.join(self.versions_dir, pattern)))
+            for old in files[:-keep]:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
 # ========== IMPLEMENTACIÓN DE ESTRATEGIAS OPTIMIZADA ==========
 
 class OptimizedStrategyImplementation:
     def __init__(self, config: "AdvancedTradingConfig"):  # <-- Nota las comillas
         self.config = config
-        self.technical_analyzer = OptimizedTechnicalAnalyzer(config)
+        self.technical_analyzer = get_shared_technical_analyzer(config)
         self.signal_history = []
         self.performance_tracker = {}
         self.signal_quality_cache = {}
@@ -7302,26 +8853,31 @@ class OptimizedSignalProcessor:
                 if profit_percent >= milestone and updates_sent <= i:
                     # Actualizar contador
                     self.bot.signal_tracker.tracked_signals[signal_hash]['telegram_updates_sent'] = i + 1
-                    # Generar gráfico de velas en tiempo real
-                    chart_path = None
+                    # Notificación con gráfico: el render va al worker y el envío ocurre al terminar
+                    def _send_milestone(chart_image, symbol=symbol, milestone=milestone, profit=profit_percent,
+                                        signal_hash=signal_hash):
+                        if self.bot.telegram_client and self.bot.config.telegram_enabled:
+                            self.bot.telegram_client.send_milestone_update(
+                                symbol=symbol,
+                                milestone=milestone,
+                                profit=profit,
+                                chart_image=chart_image,
+                                signal_hash=signal_hash
+                            )
+                    chart_queued = False
                     try:
                         df_chart = market_data.get(symbol, {}).get('df_entry')
                         if df_chart is not None and not df_chart.empty:
                             signal_data = self.bot.signal_tracker.tracked_signals[signal_hash]['signal_data']
                             analysis = self.bot._analyze_async_with_timeout(symbol, 3)
                             if analysis:
-                                chart_path = self.bot.chart_generator.generate_signal_chart(symbol, df_chart, signal_data, analysis)
+                                self.bot.chart_service.render_then(symbol, df_chart, signal_data, _send_milestone,
+                                                                   chain_key=signal_hash)
+                                chart_queued = True
                     except Exception as e:
                         logger.debug(f"⚠️ Error generando gráfico para milestone {milestone}%: {e}")
-
-                    # Enviar notificación con gráfico
-                    if self.bot.telegram_client and self.bot.config.telegram_enabled:
-                        self.bot.telegram_client.send_milestone_update(
-                            symbol=symbol,
-                            milestone=milestone,
-                            profit=profit_percent,
-                            chart_path=chart_path
-                        )
+                    if not chart_queued:
+                        self.bot.chart_service.deliver_after(signal_hash, _send_milestone)
                     # Log interno
                     logger.info(f"📊 {symbol} +{milestone}% (Profit: {profit_percent:+.2f}%) – Notificación + Gráfico enviados")
         else:
@@ -7389,6 +8945,359 @@ class OptimizedSignalProcessor:
         }
 
 
+# ========== ENVÍO ASÍNCRONO A TELEGRAM (TOKEN BUCKET + PRIORIDADES) ==========
+class TokenBucket:
+    """Token bucket: `rate` tokens/s con ráfaga `capacity`; block() lo congela tras un 429"""
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = max(float(rate), 1e-6)
+        self.capacity = max(float(capacity), 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def delay(self, now: Optional[float] = None) -> float:
+        """Segundos hasta que haya un token disponible (0 = ya disponible)"""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 1.0:
+            wait = max(wait, (1.0 - self.tokens) / self.rate)
+        return wait
+
+    def consume(self):
+        self.tokens -= 1.0
+
+    def block(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + max(0.0, seconds))
+
+
+@dataclass(order=True)
+class TelegramJob:
+    """Petición a la Bot API; se ordena por (prioridad, secuencia)"""
+    priority: int
+    seq: int
+    method: str = field(compare=False)
+    data: dict = field(compare=False)
+    files: Optional[dict] = field(default=None, compare=False)  # {'photo': (nombre, bytes, mime)}
+    future: Any = field(default=None, compare=False)
+    max_retries: int = field(default=3, compare=False)
+    attempts: int = field(default=0, compare=False)
+    enqueued_at: float = field(default_factory=time.monotonic, compare=False)
+
+
+class TelegramAsyncSender:
+    """
+    Emisor asíncrono de la Bot API de Telegram en su propio event loop:
+    - Token bucket global (~30 msg/s) y por chat (~1 msg/s; 20/min en grupos).
+    - Carriles de prioridad: cierres/SL antes que señales, y estas antes que milestones.
+    - Varias peticiones en vuelo con pool de conexiones (aiohttp, o requests en hilos).
+    - 429 con retry_after congela el bucket del chat sin bloquear al resto de envíos.
+    submit() es thread-safe y devuelve un concurrent.futures.Future con el 'result' de la API.
+    """
+    PRIORITY_CRITICAL = 0  # Cierres, stop loss
+    PRIORITY_HIGH = 1      # Señales nuevas, promociones
+    PRIORITY_NORMAL = 2    # Milestones, avisos
+
+    def __init__(self, config, base_url: str):
+        self.config = config
+        self.base_url = base_url
+        self.max_in_flight = max(1, int(getattr(config, 'TELEGRAM_MAX_IN_FLIGHT', 4) or 4))
+        self.max_pending = max(1, int(getattr(config, 'TELEGRAM_MAX_PENDING', 200) or 200))
+        self.request_timeout = float(getattr(config, 'TELEGRAM_REQUEST_TIMEOUT', 15))
+        self.photo_timeout = float(getattr(config, 'TELEGRAM_PHOTO_TIMEOUT', 30))
+        self.global_bucket = TokenBucket(getattr(config, 'TELEGRAM_GLOBAL_RATE', 30.0),
+                                         getattr(config, 'TELEGRAM_GLOBAL_BURST', 30))
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._heap: List[TelegramJob] = []
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._attached = None  # Tarea de despacho en un loop ajeno (runtime backend)
+        self._wakeup = None
+        self._slots = None
+        self._http = None  # aiohttp.ClientSession o requests.Session
+        self._latencies_ms = deque(maxlen=500)
+        self.stats = {'submitted': 0, 'sent': 0, 'failed': 0, 'retries': 0, 'rate_limit_hits': 0,
+                      'rejected': 0, 'in_flight': 0, 'max_queue_depth': 0}
+
+    # --- Ciclo de vida ---------------------------------------------------------
+    def start(self):
+        with self._lock:
+            if self._attached is not None or (self._thread is not None and self._thread.is_alive()):
+                return
+            # El loop se publica bajo el lock antes de arrancar el hilo: un submit() concurrente
+            # nunca ve _loop a None (call_soon_threadsafe encola aunque aún no esté corriendo)
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run_loop, args=(loop, ready), daemon=True,
+                                            name="TelegramSender")
+            self._thread.start()
+        ready.wait(5)
+
+    def _run_loop(self, loop, ready: threading.Event):
+        asyncio.set_event_loop(loop)
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        dispatcher = loop.create_task(self._dispatch())
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            dispatcher.cancel()
+            loop.run_until_complete(self._close_http())
+            loop.close()
+
+    def stop(self):
+        if self._attached is not None:
+            return  # El loop es del runtime: se libera con detach()
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._loop = None
+
+    def attach_loop(self, loop) -> bool:
+        """Despachar en un event loop ya en marcha (runtime backend) en vez de en un hilo propio.
+        Debe llamarse desde ese loop; False si el emisor ya estaba arrancado."""
+        with self._lock:
+            if self._loop is not None:
+                return False
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._attached = loop.create_task(self._dispatch(), name="TelegramSender")
+        return True
+
+    async def detach(self):
+        """Contraparte de attach_loop: cancela el despacho y cierra la sesión HTTP"""
+        with self._lock:
+            dispatcher, self._attached = self._attached, None
+        if dispatcher is None:
+            return
+        dispatcher.cancel()
+        await asyncio.gather(dispatcher, return_exceptions=True)
+        await self._close_http()
+        self._loop = None
+
+    async def _close_http(self):
+        if self._http is not None and AIOHTTP_AVAILABLE and isinstance(self._http, aiohttp.ClientSession):
+            await self._http.close()
+        self._http = None
+
+    # --- Encolado --------------------------------------------------------------
+    def submit(self, method: str, data: dict, files: Optional[dict] = None,
+               priority: int = PRIORITY_NORMAL, max_retries: int = 3):
+        """Encola una petición; devuelve Future (result = 'result' de la API o None si falla)"""
+        import concurrent.futures
+        future = concurrent.futures.Future()
+        self.start()
+        with self._lock:
+            pending = len(self._heap)
+            if pending >= self.max_pending and priority >= self.PRIORITY_NORMAL:
+                # Cola saturada: se rechaza el ruido, nunca cierres ni señales
+                self.stats['rejected'] += 1
+                future.set_result(None)
+                return future
+            self._seq += 1
+            job = TelegramJob(priority, self._seq, method, data, files, future, max_retries)
+            self.stats['submitted'] += 1
+        self._loop.call_soon_threadsafe(self._push, job)
+        return future
+
+    def call_later(self, delay: float, callback: Callable):
+        """Programa callback en el loop del emisor (thread-safe)"""
+        self.start()
+        self._loop.call_soon_threadsafe(self._loop.call_later, max(0.0, delay), callback)
+
+    def _push(self, job: TelegramJob):
+        heapq.heappush(self._heap, job)
+        self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], len(self._heap))
+        self._wakeup.set()
+
+    def _chat_bucket(self, chat_id) -> TokenBucket:
+        key = str(chat_id)
+        bucket = self._chat_buckets.get(key)
+        if bucket is None:
+            if key.startswith('-'):
+                # Grupos/canales: 20 mensajes por minuto
+                rate = float(getattr(self.config, 'TELEGRAM_GROUP_RATE_PER_MIN', 20)) / 60.0
+            else:
+                rate = float(getattr(self.config, 'TELEGRAM_CHAT_RATE', 1.0))
+            bucket = self._chat_buckets[key] = TokenBucket(rate, getattr(self.config, 'TELEGRAM_CHAT_BURST', 3))
+        return bucket
+
+    # --- Despacho --------------------------------------------------------------
+    async def _dispatch(self):
+        while True:
+            await self._slots.acquire()
+            job = None
+            while job is None:
+                if not self._heap:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                # El trabajo más prioritario cuyo chat tiene token; si ninguno, esperar al primero
+                now = time.monotonic()
+                global_wait = self.global_bucket.delay(now)
+                min_wait = None
+                for candidate in sorted(self._heap):
+                    wait = max(global_wait, self._chat_bucket(candidate.data.get('chat_id')).delay(now))
+                    if wait <= 0:
+                        job = candidate
+                        break
+                    min_wait = wait if min_wait is None else min(min_wait, wait)
+                if job is None:
+                    # Un trabajo nuevo (quizá más urgente) despierta antes del timeout
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=min_wait)
+                    except asyncio.TimeoutError:
+                        pass
+            self._heap.remove(job)
+            heapq.heapify(self._heap)
+            self.global_bucket.consume()
+            self._chat_bucket(job.data.get('chat_id')).consume()
+            self.stats['in_flight'] += 1
+            asyncio.get_running_loop().create_task(self._execute(job))
+
+    async def _execute(self, job: TelegramJob):
+        retry_delay = None
+        try:
+            job.attempts += 1
+            status, body = await self._post(job)
+            try:
+                response = json.loads(body) if body else {}
+            except ValueError:
+                response = {}
+            if status == 200 and response.get('ok', True):
+                self._finish(job, response.get('result', {}))
+                return
+            error_code = int(response.get('error_code', status) or status)
+            description = response.get('description', str(body)[:100])
+            if error_code == 429:
+                retry_after = float(response.get('parameters', {}).get('retry_after', 5))
+                self.stats['rate_limit_hits'] += 1
+                self._chat_bucket(job.data.get('chat_id')).block(retry_after)
+                logger.warning(f"⏳ Telegram 429 en {job.method}: reintento en {retry_after:.0f}s (sin bloquear otros envíos)")
+                # El 429 no consume intentos: el envío se reprograma tras retry_after
+                job.attempts -= 1
+                retry_delay = 0.0
+            elif 400 <= error_code < 500:
+                logger.error(f"🛑 Telegram {job.method} rechazado [{error_code}] {description}")
+                self._finish(job, None)
+                return
+            else:
+                logger.warning(f"⚠️ Telegram {job.method} [{error_code}] {description} (intento {job.attempts}/{job.max_retries})")
+                retry_delay = 2 ** (job.attempts - 1)
+        except Exception as e:
+            logger.warning(f"⚠️ Telegram {job.method} intento {job.attempts}/{job.max_retries} fallido: {type(e).__name__}: {e}")
+            retry_delay = 2 ** (job.attempts - 1)
+        finally:
+            self.stats['in_flight'] -= 1
+            self._slots.release()
+            self._wakeup.set()
+        if job.attempts >= job.max_retries:
+            self._finish(job, None)
+            return
+        self.stats['retries'] += 1
+        asyncio.get_running_loop().call_later(retry_delay, self._push, job)
+
+    def _finish(self, job: TelegramJob, result):
+        self.stats['sent' if result is not None else 'failed'] += 1
+        self._latencies_ms.append((time.monotonic() - job.enqueued_at) * 1000.0)
+        if not job.future.done():
+            job.future.set_result(result)
+
+    # --- HTTP --------------------------------------------------------------------
+    async def _post(self, job: TelegramJob) -> Tuple[int, str]:
+        url = f"{self.base_url}/{job.method}"
+        timeout = self.photo_timeout if job.files else self.request_timeout
+        if AIOHTTP_AVAILABLE:
+            if self._http is None:
+                connector = aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=60)
+                self._http = aiohttp.ClientSession(connector=connector,
+                                                   headers={'User-Agent': 'CryptoBotPro/35.0'})
+            client_timeout = aiohttp.ClientTimeout(total=timeout)
+            if job.files:
+                form = aiohttp.FormData()
+                for key, value in job.data.items():
+                    form.add_field(key, str(value))
+                for key, (name, content, mime) in job.files.items():
+                    form.add_field(key, content, filename=name, content_type=mime)
+                request = self._http.post(url, data=form, timeout=client_timeout)
+            else:
+                request = self._http.post(url, json=job.data, timeout=client_timeout)
+            async with request as response:
+                return response.status, await response.text()
+        # Sin aiohttp: requests con pool de conexiones en el executor del loop
+        return await asyncio.get_running_loop().run_in_executor(None, self._post_blocking, url, job, timeout)
+
+    def _post_blocking(self, url: str, job: TelegramJob, timeout: float) -> Tuple[int, str]:
+        if REQUESTS_AVAILABLE:
+            if self._http is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({'Connection': 'keep-alive', 'User-Agent': 'CryptoBotPro/35.0'})
+                self._http = session
+            if job.files:
+                response = self._http.post(url, data=job.data, files=job.files, timeout=timeout)
+            else:
+                response = self._http.post(url, json=job.data, timeout=timeout)
+            return response.status_code, response.text
+        import urllib.request
+        import urllib.error
+        if job.files:
+            boundary = f'----CryptoBotPro{int(time.time() * 1000)}'
+            body = []
+            for key, value in job.data.items():
+                body.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"\r\n\r\n{value}\r\n'.encode())
+            for key, (name, content, mime) in job.files.items():
+                body.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"; filename="{name}"\r\n'
+                            f'Content-Type: {mime}\r\n\r\n'.encode())
+                body.append(content)
+                body.append(b'\r\n')
+            body.append(f'--{boundary}--\r\n'.encode())
+            payload, content_type = b''.join(body), f'multipart/form-data; boundary={boundary}'
+        else:
+            payload, content_type = json.dumps(job.data).encode('utf-8'), 'application/json'
+        req = urllib.request.Request(url, data=payload, headers={'Content-Type': content_type})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                return resp.status, resp.read().decode('utf-8')
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode('utf-8', errors='replace')
+
+    def get_metrics(self) -> dict:
+        latencies = list(self._latencies_ms)
+        metrics = dict(self.stats, queue_depth=len(self._heap))
+        if latencies:
+            metrics['latency_p50_ms'] = float(np.percentile(latencies, 50))
+            metrics['latency_p95_ms'] = float(np.percentile(latencies, 95))
+        return metrics
+
+
+@dataclass
+class TelegramLivePost:
+    """Post de una señal que se actualiza en sitio (editMessageText/Caption/Media)"""
+    key: str
+    symbol: str
+    message_id: int
+    kind: str  # 'text' | 'photo'
+    caption: str = ''
+    chart_digest: Optional[str] = None
+    pending: Optional[dict] = None  # Último estado sin aplicar: los intermedios se fusionan aquí
+    in_flight: bool = False
+    due: Optional[float] = None  # Instante (monotonic) de la próxima edición programada
+    final: bool = False
+    last_edit: float = 0.0
+
+
 # ========== CLIENTE TELEGRAM OPTIMIZADO v35.0.0.0 ==========
 class OptimizedTelegramClient:
     """
@@ -7402,17 +9311,9 @@ class OptimizedTelegramClient:
     """
     def __init__(self, config):
         self.config = config
-        self.base_url = f"https://api.telegram.org/bot{config.telegram_bot_token}"
-
-        # Configurar sesion de requests con reintentos mejorados
-        self.session = None
-        self._init_session()
+        api_base = getattr(config, 'TELEGRAM_API_BASE', 'https://api.telegram.org').rstrip('/')
+        self.base_url = f"{api_base}/bot{config.telegram_bot_token}"
 
-        # Control de rate limiting mejorado
-        self.last_message_time = 0
-        self.min_message_interval = 2  # Intervalo minimo entre mensajes
-        self.rate_limit_until = 0  # Timestamp hasta que no se puede enviar
-        
         # Control de mensajes enviados
         self.sent_signals = set()
         self.sent_promotions = set()  # Control de promociones enviadas por par
@@ -7421,10 +9322,13 @@ class OptimizedTelegramClient:
         self.sent_highlight_expired = set()  # {symbol}
         self.telegram_dedupe_lock = threading.Lock()
 
-        # Cola de mensajes para envio no bloqueante
-        self.message_queue = queue.Queue(maxsize=100)
-        self.processing_thread = None
-        self._start_message_processor()
+        # Emisor asíncrono: token bucket global/por chat, prioridades y envíos concurrentes
+        self.sender = TelegramAsyncSender(config, self.base_url)
+
+        # Edición en sitio: un post por señal (signal_hash → message_id)
+        self.live_posts: "OrderedDict[str, TelegramLivePost]" = OrderedDict()
+        self._live_by_symbol = {}
+        self._live_lock = threading.RLock()
         
         # Estadisticas de envio
         self.stats = {
@@ -7433,53 +9337,12 @@ class OptimizedTelegramClient:
             'photos_sent': 0,
             'photos_failed': 0,
             'rate_limit_hits': 0,
-            'retries_total': 0
+            'retries_total': 0,
+            'edits_sent': 0,
+            'edits_failed': 0,
+            'edits_coalesced': 0
         }
     
-    def _init_session(self):
-        """Inicializa la sesion de requests con configuracion robusta"""
-        if REQUESTS_AVAILABLE:
-            try:
-                self.session = requests.Session()
-                retry_strategy = Retry(
-                    total=5,  # Aumentado a 5 reintentos
-                    backoff_factor=1.5,  # Backoff mas agresivo
-                    status_forcelist=[429, 500, 502, 503, 504],
-                    allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE', 'HEAD', 'OPTIONS']),
-                    raise_on_status=False,
-                )
-                adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=50, pool_maxsize=100)
-                self.session.mount("https://", adapter)
-                self.session.mount("http://", adapter)
-                self.session.headers.update({
-                    'Connection': 'keep-alive',
-                    'User-Agent': 'CryptoBotPro/35.0'
-                })
-            except Exception as e:
-                logger.error(f"Error inicializando sesion Telegram: {e}")
-                self.session = None
-
-    def _reset_session(self):
-        if REQUESTS_AVAILABLE:
-            try:
-                self.session = requests.Session()
-                retry_strategy = Retry(
-                    total=3,
-                    backoff_factor=1,
-                    status_forcelist=[429, 500, 502, 503, 504],
-                    allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE', 'HEAD', 'OPTIONS']),
-                    raise_on_status=False,
-                )
-                adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=50, pool_maxsize=100)
-                self.session.mount("https://", adapter)
-                self.session.mount("http://", adapter)
-                try:
-                    self.session.headers.update({'Connection': 'keep-alive'})
-                except Exception:
-                    pass
-            except Exception:
-                self.session = None
-
     def _escape_html(self, text: str) -> str:
         """
         Escapar caracteres especiales para HTML en Telegram de forma segura.
@@ -7498,75 +9361,35 @@ class OptimizedTelegramClient:
             return text[:max_length-3] + "..."
         return text
 
-    def _start_message_processor(self):
-        """Iniciar procesador de mensajes en hilo separado"""
-        if self.processing_thread is None or not self.processing_thread.is_alive():
-            self.processing_thread = threading.Thread(target=self._process_message_queue, daemon=True)
-            self.processing_thread.start()
-            logger.info("Procesador de mensajes de Telegram iniciado")
-
-    def _process_message_queue(self):
-        """Procesar cola de mensajes con manejo de errores"""
-        while True:
-            try:
-                message_data = self.message_queue.get(timeout=5)
-                if isinstance(message_data, tuple) and len(message_data) == 2:
-                    message, parse_mode = message_data
-                    self._send_message_direct(message, parse_mode)
-                elif isinstance(message_data, dict) and 'photo_path' in message_data:
-                    self._send_photo_direct(message_data)
-                else:
-                    logger.warning(f"Formato de mensaje no reconocido: {type(message_data)}")
-
-                self.message_queue.task_done()
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.error(f"Error procesando cola de mensajes Telegram: {e}")
+    def _prepare_text(self, text: str, parse_mode: str, max_length: int) -> str:
+        """Sanitiza (HTML) y trunca el texto al límite de Telegram"""
+        if parse_mode == 'HTML':
+            text = self._escape_html(text)
+        return self._truncate_message(text, max_length)
 
-    def _rate_limit_check(self):
-        """
-        Implementar rate limiting mejorado v35:
-        - Respeta rate limits de Telegram API
-        - Maneja respuestas 429 con retry-after
-        - Backoff exponencial si hay multiples rate limits
-        """
-        current_time = time.time()
-        
-        # Verificar si estamos en periodo de rate limit
-        if self.rate_limit_until > current_time:
-            wait_time = self.rate_limit_until - current_time
-            logger.warning(f"Rate limit activo: esperando {wait_time:.1f}s")
-            time.sleep(wait_time)
-            return
-        
-        # Verificar intervalo minimo entre mensajes
-        time_since_last = current_time - self.last_message_time
-
-        if time_since_last < self.min_message_interval:
-            sleep_time = self.min_message_interval - time_since_last
-            logger.debug(f"Rate limiting: esperando {sleep_time:.2f}s")
-            time.sleep(sleep_time)
-
-        self.last_message_time = time.time()
-    
-    def _handle_rate_limit(self, retry_after: int = 30):
-        """Manejar respuesta 429 de rate limit"""
-        self.stats['rate_limit_hits'] += 1
-        self.rate_limit_until = time.time() + retry_after
-        logger.warning(f"Rate limit recibido. Esperando {retry_after}s antes de reintentar")
+    def _record_result(self, kind: str, future):
+        """Callback de los futures del emisor: actualiza estadísticas de envío"""
+        try:
+            ok = future.result() is not None
+        except Exception:
+            ok = False
+        self.stats[f"{kind}_sent" if ok else f"{kind}_failed"] += 1
     
     def get_stats(self) -> dict:
         """Retorna estadisticas de envio de mensajes"""
         total_messages = self.stats['messages_sent'] + self.stats['messages_failed']
         success_rate = (self.stats['messages_sent'] / total_messages * 100) if total_messages > 0 else 0
+        sender_metrics = self.sender.get_metrics()
         
         return {
             **self.stats,
+            'rate_limit_hits': sender_metrics['rate_limit_hits'],
+            'retries_total': sender_metrics['retries'],
             'total_messages': total_messages,
             'success_rate': f"{success_rate:.1f}%",
             'signals_tracked': len(self.sent_signals),
-            'promotions_sent': len(self.sent_promotions)
+            'promotions_sent': len(self.sent_promotions),
+            'sender': sender_metrics
         }
     
     def reset_signal_tracking(self, symbol: str = None):
@@ -7585,308 +9408,301 @@ class OptimizedTelegramClient:
             self.sent_milestones.clear()
             logger.info("Todo el tracking de Telegram reseteado")
 
-    def send_message(self, text: str, parse_mode: str = 'HTML') -> bool:
+    def _submit_message(self, message: str, parse_mode: str, priority: int, max_retries: int = 3,
+                        live_post: Optional[Tuple[str, str]] = None, extra: Optional[dict] = None):
         """
-        Encolar mensaje para envío no bloqueante
+        Encola sendMessage en el emisor asíncrono; devuelve Future o None si no es enviable.
+        live_post=(signal_hash, symbol) registra el message_id para editarlo después en sitio.
         """
         if not self.config.telegram_bot_token or not self.config.telegram_chat_id:
             logger.info("⚠️ Telegram no configurado; mensaje no enviado")
-            return False
-
-        try:
-            self.message_queue.put((text, parse_mode), timeout=1)
-            logger.debug("🕒 Mensaje encolado para Telegram")
-            return True
-        except queue.Full:
-            logger.warning("Cola de mensajes Telegram llena")
-            return False
-
-    def send_photo(self, photo_path: str, caption: str = '', parse_mode: str = 'HTML') -> bool:
-        """
-        Encolar foto para envío no bloqueante
-        """
-        if not self.config.telegram_bot_token or not self.config.telegram_chat_id or not REQUESTS_AVAILABLE:
-            logger.info("⚠️ Telegram no configurado o requests no disponible; foto no enviada")
-            return False
-
-        try:
-            photo_data = {
-                'photo_path': photo_path,
-                'caption': caption,
-                'parse_mode': parse_mode
-            }
-            self.message_queue.put(photo_data, timeout=1)
-            logger.debug("🕒 Foto encolada para Telegram")
-            return True
-        except queue.Full:
-            logger.warning("Cola de mensajes Telegram llena")
-            return False
-
-    def _send_message_direct(self, message: str, parse_mode: str = 'HTML', max_retries=3) -> bool:
-        """
-        Envía mensaje directamente con reintentos robustos y depuración detallada.
-        """
-        # Validaciones iniciales
-        if not self.config.telegram_bot_token or not self.config.telegram_chat_id:
-            logger.error("❌ Telegram: bot_token o chat_id no están configurados.")
-            return False
-
+            return None
         if not message or not message.strip():
             logger.error("❌ Telegram: el texto del mensaje está vacío.")
-            return False
-
-        # Sanitizar el texto si se usa HTML
-        if parse_mode == 'HTML':
-            message = self._escape_html(message)
-
-        # Truncar mensaje a límite de Telegram
-        message = self._truncate_message(message)
-
-        # Aplicar rate limiting
-        self._rate_limit_check()
-
-        # Preparar payload según Telegram Bot API oficial
+            return None
         payload = {
             'chat_id': str(self.config.telegram_chat_id),  # Debe ser string
-            'text': message,
+            'text': self._prepare_text(message, parse_mode, 4096),
             'parse_mode': parse_mode,
             'disable_web_page_preview': True,
-            'disable_notification': False  # Permitir notificación (pero sin sonido si el usuario lo tiene deshabilitado)
+            'disable_notification': False
         }
+        payload.update(extra or {})
+        future = self.sender.submit('sendMessage', payload, priority=priority, max_retries=max_retries)
+        future.add_done_callback(lambda f: self._record_result('messages', f))
+        if live_post:
+            future.add_done_callback(lambda f: self._register_live_post(live_post, 'text', message, None, f))
+        return future
+
+    def _submit_photo(self, photo_data: Dict, priority: int, max_retries: int = 3,
+                      live_post: Optional[Tuple[str, str]] = None):
+        """Encola sendPhoto (PNG en memoria o leído de disco); devuelve Future o None"""
+        if not self.config.telegram_bot_token or not self.config.telegram_chat_id:
+            logger.info("⚠️ Telegram no configurado; foto no enviada")
+            return None
+        photo_path = photo_data.get('photo_path', '')
+        photo_bytes = photo_data.get('photo_bytes')
+        parse_mode = photo_data.get('parse_mode', 'HTML')
+        if photo_bytes is None:
+            photo_bytes = self._read_photo(photo_path)
+            if photo_bytes is None:
+                return None
+        data = {
+            'chat_id': str(self.config.telegram_chat_id),
+            # Límite de caption de Telegram para fotos: 1024 chars
+            'caption': self._prepare_text(photo_data.get('caption', ''), parse_mode, 1024),
+            'parse_mode': parse_mode,
+            'disable_notification': False
+        }
+        files = {'photo': (os.path.basename(photo_path) or 'chart.png', photo_bytes, 'image/png')}
+        future = self.sender.submit('sendPhoto', data, files=files, priority=priority, max_retries=max_retries)
+        future.add_done_callback(lambda f: self._record_result('photos', f))
+        if live_post:
+            digest = hashlib.md5(photo_bytes).hexdigest()
+            future.add_done_callback(lambda f: self._register_live_post(
+                live_post, 'photo', photo_data.get('caption', ''), digest, f))
+        return future
 
-        # Bucle de reintentos con backoff exponencial
-        last_error = None
-        for attempt in range(1, max_retries + 1):
-            try:
-                # Timeout corto para evitar que la cola se “congele” por minutos
-                current_timeout = 15 + (attempt * 5)  # 20s, 25s, 30s
-
-                # Enviar solicitud
-                if self.session:
-                    response = self.session.post(
-                        f"{self.base_url}/sendMessage",
-                        json=payload,
-                        timeout=current_timeout
-                    )
-                    success = response.status_code == 200
-                    response_text = response.text
-                else:
-                    # Fallback a urllib
-                    import urllib.request
-                    data = json.dumps(payload).encode('utf-8')
-                    req = urllib.request.Request(
-                        f"{self.base_url}/sendMessage",
-                        data=data,
-                        headers={'Content-Type': 'application/json'}
-                    )
-                    with urllib.request.urlopen(req, timeout=current_timeout) as resp:
-                        success = resp.status == 200
-                        response_text = resp.read().decode('utf-8')
-
-                # Procesar respuesta según formato JSON de Telegram Bot API
-                if success:
-                    try:
-                        response_json = json.loads(response_text) if response_text else {}
-                        # Telegram devuelve {"ok": true, "result": {...}} cuando es exitoso
-                        if response_json.get('ok') is True:
-                            logger.info(f"✅ Mensaje enviado a Telegram exitosamente (intento {attempt})")
-                            return True
-                        else:
-                            error_code = response_json.get('error_code', 'UNKNOWN')
-                            error_desc = response_json.get('description', 'Sin descripción')
-                            logger.warning(f"⚠️ Telegram rechazó el mensaje: [{error_code}] {error_desc}")
-                    except Exception as parse_err:
-                        logger.warning(f"⚠️ Error parseando respuesta JSON: {parse_err}")
-                        # Si no podemos parsear pero status es 200, asumir éxito
-                        logger.info(f"✅ Mensaje enviado a Telegram (intento {attempt})")
-                        return True
-
-                # Extraer información de error
-                try:
-                    error_data = json.loads(response_text) if response_text else {}
-                    error_code = error_data.get('error_code', 'N/A')
-                    error_description = error_data.get('description', 'Sin descripción')
-                except:
-                    error_code = response.status_code if 'response' in locals() else 'N/A'
-                    error_description = response_text[:100] if response_text else 'Sin respuesta'
-
-                last_error = f"{error_code} - {error_description}"
-                logger.error(f"❌ [ERROR] Telegram API (intento {attempt}): {last_error}")
-
-                try:
-                    error_code_int = int(error_code)
-                except Exception:
-                    error_code_int = None
-
-                # Si es 429, respetar retry_after si viene (evita ban temporal)
-                if error_code_int == 429:
-                    retry_after = 5
-                    try:
-                        retry_after = int(error_data.get('parameters', {}).get('retry_after', retry_after))
-                    except Exception:
-                        pass
-                    if attempt < max_retries:
-                        logger.warning(f"⏳ Telegram rate limit (429). Reintentando en {retry_after}s")
-                        time.sleep(max(1, retry_after))
-                        continue
-
-                # Si es un error de cliente (4xx), reintentar no sirve. Salimos del bucle.
-                if error_code_int is not None and 400 <= error_code_int < 500:
-                    logger.error("🛑 [FATAL] Error de cliente (4xx). No se reintentará.")
-                    return False
-
-            except Exception as e:
-                last_error = f"{type(e).__name__}: {e}"
-                logger.warning(f"⚠️ Telegram intento {attempt}/{max_retries} fallido: {last_error}")
-                try:
-                    if 'ConnectionResetError' in last_error or 'Connection aborted' in last_error:
-                        self._reset_session()
-                        time.sleep(1)
-                except Exception:
-                    pass
-
-            # Esperar antes del siguiente intento (backoff exponencial)
-            if attempt < max_retries:
-                wait_time = 2 ** (attempt - 1)  # 1s, 2s, 4s
-                time.sleep(wait_time)
+    @staticmethod
+    def _read_photo(photo) -> Optional[bytes]:
+        """Bytes PNG de un ChartImage o de una ruta en disco (None si no existe)"""
+        if isinstance(photo, ChartImage):
+            return photo.png or None
+        if not photo or not os.path.exists(photo):
+            logger.error(f"❌ Foto no encontrada: {photo}")
+            return None
+        with open(photo, 'rb') as f:
+            return f.read()
 
-        logger.error(f"❌ [ERROR] Telegram: todos los intentos fallidos ({max_retries}). Último error: {last_error}")
-        return False
+    def _wait_sent(self, future, what: str) -> bool:
+        """Espera el resultado de un envío encolado (True si Telegram respondió ok)"""
+        if future is None:
+            return False
+        import concurrent.futures
+        try:
+            result = future.result(timeout=getattr(self.config, 'TELEGRAM_SEND_TIMEOUT', 60))
+        except concurrent.futures.TimeoutError:
+            logger.warning(f"⏳ Telegram: {what} sigue en cola tras el tiempo de espera")
+            return False
+        if result is None:
+            logger.error(f"❌ [ERROR] Telegram: {what} no se pudo enviar")
+            return False
+        logger.info(f"✅ {what.capitalize()} enviado a Telegram exitosamente")
+        return True
 
-    def _send_photo_direct(self, photo_data: Dict, max_retries=3) -> bool:
+    def send_message(self, text: str, parse_mode: str = 'HTML',
+                     priority: int = TelegramAsyncSender.PRIORITY_NORMAL,
+                     live_post: Optional[Tuple[str, str]] = None) -> bool:
         """
-        Envía foto directamente con reintentos robustos
+        Encolar mensaje para envío no bloqueante
         """
-        photo_path = photo_data.get('photo_path', '')
-        caption = photo_data.get('caption', '')
-        parse_mode = photo_data.get('parse_mode', 'HTML')
-
-        # Validaciones
-        if not os.path.exists(photo_path):
-            logger.error(f"❌ Foto no encontrada: {photo_path}")
+        future = self._submit_message(text, parse_mode, priority, live_post=live_post)
+        if future is None:
             return False
+        logger.debug("🕒 Mensaje encolado para Telegram")
+        return True
 
-        # Sanitizar caption si es HTML
-        if parse_mode == 'HTML':
-            caption = self._escape_html(caption)
-
-        # Truncar caption a límite de Telegram (1024 chars para fotos)
-        caption = self._truncate_message(caption, 1024)
-
-        # Aplicar rate limiting
-        self._rate_limit_check()
-
-        # Bucle de reintentos
-        for attempt in range(1, max_retries + 1):
-            try:
-                current_timeout = 30 + (attempt * 15)  # 30s, 45s, 60s para Replit
-
-                logger.debug(f"🔍 [DEBUG] Enviando foto a Telegram (intento {attempt}): {photo_path}")
-
-                if self.session:
-                    with open(photo_path, 'rb') as photo:
-                        files = {'photo': photo}
-                        data = {
-                            'chat_id': str(self.config.telegram_chat_id),  # Debe ser string según API
-                            'caption': caption,
-                            'parse_mode': parse_mode,
-                            'disable_notification': False  # Permitir notificación
-                        }
-                        response = self.session.post(
-                            f"{self.base_url}/sendPhoto",
-                            files=files,
-                            data=data,
-                            timeout=current_timeout
-                        )
-                        success = response.status_code == 200
-                        response_text = response.text
-                else:
-                    # Fallback a urllib (más complejo para archivos)
-                    with open(photo_path, 'rb') as photo:
-                        photo_data = photo.read()
-
-                    # Crear boundary multipart/form-data
-                    boundary = f'----WebKitFormBoundary{int(time.time())}'
-
-                    # Construir cuerpo multipart
-                    body = []
-
-                    # chat_id
-                    body.append(f'--{boundary}\r\n'.encode())
-                    body.append(f'Content-Disposition: form-data; name="chat_id"\r\n\r\n'.encode())
-                    body.append(f'{self.config.telegram_chat_id}\r\n'.encode())
-
-                    # caption
-                    body.append(f'--{boundary}\r\n'.encode())
-                    body.append(f'Content-Disposition: form-data; name="caption"\r\n\r\n'.encode())
-                    body.append(f'{caption}\r\n'.encode())
-
-                    # parse_mode
-                    body.append(f'--{boundary}\r\n'.encode())
-                    body.append(f'Content-Disposition: form-data; name="parse_mode"\r\n\r\n'.encode())
-                    body.append(f'{parse_mode}\r\n'.encode())
-
-                    # photo
-                    body.append(f'--{boundary}\r\n'.encode())
-                    body.append(f'Content-Disposition: form-data; name="photo"; filename="{os.path.basename(photo_path)}"\r\n'.encode())
-                    body.append(f'Content-Type: image/jpeg\r\n\r\n'.encode())
-                    body.append(photo_data)
-                    body.append(f'\r\n--{boundary}--\r\n'.encode())
-
-                    body_bytes = b''.join(body)
-
-                    req = urllib.request.Request(
-                        f"{self.base_url}/sendPhoto",
-                        data=body_bytes,
-                        headers={
-                            'Content-Type': f'multipart/form-data; boundary={boundary}',
-                            'Content-Length': str(len(body_bytes))
-                        }
-                    )
-
-                    with urllib.request.urlopen(req, timeout=current_timeout) as resp:
-                        success = resp.status == 200
-                        response_text = resp.read().decode('utf-8')
+    @staticmethod
+    def _photo_available(photo) -> bool:
+        """True si hay foto para enviar: ChartImage en memoria o ruta existente en disco"""
+        if isinstance(photo, ChartImage):
+            return bool(photo.png)
+        return bool(photo) and os.path.exists(photo)
+
+    def send_photo(self, photo_path, caption: str = '', parse_mode: str = 'HTML',
+                   priority: int = TelegramAsyncSender.PRIORITY_NORMAL,
+                   live_post: Optional[Tuple[str, str]] = None) -> bool:
+        """
+        Encolar foto para envío no bloqueante (ruta en disco o ChartImage en memoria)
+        """
+        photo_data = {
+            'photo_path': photo_path,
+            'caption': caption,
+            'parse_mode': parse_mode
+        }
+        if isinstance(photo_path, ChartImage):
+            # El PNG viaja en memoria: sin escritura ni relectura de disco
+            photo_data['photo_path'] = photo_path.path or photo_path.filename
+            photo_data['photo_bytes'] = photo_path.png
+        future = self._submit_photo(photo_data, priority, live_post=live_post)
+        if future is None:
+            return False
+        logger.debug("🕒 Foto encolada para Telegram")
+        return True
 
-                # Procesar respuesta
-                if success:
-                    logger.info(f"✅ Foto enviada a Telegram exitosamente (intento {attempt}): {photo_path}")
-                    return True
-                else:
-                    # Extraer información de error
-                    try:
-                        error_data = json.loads(response_text) if response_text else {}
-                        error_code = error_data.get('error_code', 'N/A')
-                        error_description = error_data.get('description', 'Sin descripción')
-                    except:
-                        error_code = response.status_code if 'response' in locals() else 'N/A'
-                        error_description = response_text[:100] if response_text else 'Sin respuesta'
-
-                    logger.error(f"❌ [ERROR] Telegram API Photo (intento {attempt}):")
-                    logger.error(f"   Status Code: {error_code}")
-                    logger.error(f"   Respuesta: {response_text[:200]}...")
-                    logger.error(f"   Descripción del error: '{error_description}'")
-
-                    # Si es un error de cliente (4xx), reintentar no sirve
-                    if 400 <= error_code < 500:
-                        logger.error("🛑 [FATAL] Error de cliente (4xx). No se reintentará.")
-                        return False
+    def _send_message_direct(self, message: str, parse_mode: str = 'HTML', max_retries=3,
+                             priority: int = TelegramAsyncSender.PRIORITY_HIGH,
+                             live_post: Optional[Tuple[str, str]] = None) -> bool:
+        """
+        Envía mensaje y espera la confirmación de Telegram (reintentos y 429 en el emisor)
+        """
+        return self._wait_sent(self._submit_message(message, parse_mode, priority, max_retries,
+                                                    live_post=live_post), "mensaje")
 
-            except Exception as e:
-                logger.debug(f"⚠️ [DEBUG] Intento {attempt}/{max_retries} fallido al enviar foto: {e}")
+    def _send_photo_direct(self, photo_data: Dict, max_retries=3,
+                           priority: int = TelegramAsyncSender.PRIORITY_HIGH) -> bool:
+        """
+        Envía foto y espera la confirmación de Telegram
+        """
+        return self._wait_sent(self._submit_photo(photo_data, priority, max_retries), "foto")
+
+    # ---------- Edición en sitio (TELEGRAM_EDIT_IN_PLACE) ----------
+    def _edit_in_place(self) -> bool:
+        return bool(getattr(self.config, 'TELEGRAM_EDIT_IN_PLACE', False))
+
+    def _live_post_key(self, symbol: str, signal_hash: Optional[str] = None) -> Optional[str]:
+        """signal_hash explícito o el del último post vivo del símbolo"""
+        if signal_hash:
+            return signal_hash
+        with self._live_lock:
+            return self._live_by_symbol.get(symbol)
+
+    def _register_live_post(self, live_post: Tuple[str, str], kind: str, caption: str,
+                            chart_digest: Optional[str], future):
+        """Callback de envío: guarda el message_id del post de la señal"""
+        try:
+            result = future.result()
+        except Exception:
+            result = None
+        if not isinstance(result, dict) or 'message_id' not in result:
+            return
+        key, symbol = live_post
+        with self._live_lock:
+            current = self.live_posts.get(key)
+            if current is not None and current.kind == 'photo' and kind == 'text':
+                return  # El post con gráfico manda: admite editMessageMedia
+            self.live_posts[key] = TelegramLivePost(key, symbol, result['message_id'], kind, caption,
+                                                    chart_digest, last_edit=time.monotonic())
+            self.live_posts.move_to_end(key)
+            self._live_by_symbol[symbol] = key
+            while len(self.live_posts) > getattr(self.config, 'TELEGRAM_LIVE_POSTS_MAX', 100):
+                old_key, old_post = self.live_posts.popitem(last=False)
+                if self._live_by_symbol.get(old_post.symbol) == old_key:
+                    del self._live_by_symbol[old_post.symbol]
+
+    def _drop_live_post(self, key: str):
+        with self._live_lock:
+            post = self.live_posts.pop(key, None)
+            if post is not None and self._live_by_symbol.get(post.symbol) == key:
+                del self._live_by_symbol[post.symbol]
+
+    def _update_live_post(self, key: Optional[str], caption: str, chart=None,
+                          priority: int = TelegramAsyncSender.PRIORITY_NORMAL,
+                          final: bool = False, reanchor: bool = False, reply: Optional[str] = None) -> bool:
+        """
+        Actualiza en sitio el post de la señal. Los cambios que llegan más rápido que
+        TELEGRAM_EDIT_MIN_INTERVAL se fusionan: solo se envía el último estado.
+        Devuelve False si no hay post editable (el llamador envía un mensaje nuevo);
+        con reanchor=True un post de solo texto no se edita si llega gráfico.
+        reply: respuesta corta al post tras aplicar la edición (las ediciones no notifican).
+        """
+        if not key:
+            return False
+        with self._live_lock:
+            post = self.live_posts.get(key)
+            if post is None or post.final:
+                return False
+            if reanchor and post.kind == 'text' and self._photo_available(chart):
+                return False
+            if post.pending is not None:
+                self.stats['edits_coalesced'] += 1
+                priority = min(priority, post.pending['priority'])
+                reply = reply or post.pending['reply']
+            post.pending = {'caption': caption, 'chart': chart, 'priority': priority, 'reply': reply}
+            post.final = post.final or final
+            self._schedule_live_edit(post)
+        return True
 
-            # Esperar antes del siguiente intento
-            if attempt < max_retries:
-                wait_time = 2 ** (attempt - 1)
-                logger.debug(f"🔄 Reintentando enviar foto en {wait_time} segundos...")
-                time.sleep(wait_time)
+    def _schedule_live_edit(self, post: TelegramLivePost):
+        """Programa la siguiente edición respetando el intervalo mínimo (llamar con _live_lock)"""
+        if post.in_flight or post.pending is None:
+            return
+        interval = float(getattr(self.config, 'TELEGRAM_EDIT_MIN_INTERVAL', 3.0))
+        if post.pending['priority'] <= TelegramAsyncSender.PRIORITY_CRITICAL:
+            interval = 0.0  # Cierres y stop loss no esperan
+        due = post.last_edit + interval
+        if post.due is not None and post.due <= due:
+            return  # Ya hay una edición programada a tiempo
+        post.due = due
+        key = post.key
+        self.sender.call_later(due - time.monotonic(), lambda: self._flush_live_post(key, due))
+
+    def _flush_live_post(self, key: str, due: float):
+        with self._live_lock:
+            post = self.live_posts.get(key)
+            if post is None or post.due != due:
+                return  # Reprogramada antes (p. ej. por un cierre)
+            post.due = None
+            state, post.pending = post.pending, None
+            future = self._submit_live_edit(post, state) if state else None
+            if future is None:
+                if post.final and post.pending is None:
+                    self._drop_live_post(key)
+                return
+            post.in_flight = True
+        future.add_done_callback(lambda f: self._on_live_edit_done(key, state, f))
+
+    def _submit_live_edit(self, post: TelegramLivePost, state: dict):
+        """editMessageText / editMessageCaption / editMessageMedia según el post y el cambio"""
+        caption = state['caption']
+        chart_bytes = self._read_photo(state['chart']) if post.kind == 'photo' and state['chart'] else None
+        digest = hashlib.md5(chart_bytes).hexdigest() if chart_bytes else post.chart_digest
+        if caption == post.caption and digest == post.chart_digest:
+            return None  # Telegram rechaza ediciones idénticas ('message is not modified')
+        state['digest'] = digest
+        data = {'chat_id': str(self.config.telegram_chat_id), 'message_id': post.message_id}
+        files = None
+        if post.kind == 'text':
+            method = 'editMessageText'
+            data.update(text=self._prepare_text(caption, 'HTML', 4096), parse_mode='HTML',
+                        disable_web_page_preview=True)
+        elif digest != post.chart_digest:
+            method = 'editMessageMedia'
+            data['media'] = json.dumps({'type': 'photo', 'media': 'attach://photo', 'parse_mode': 'HTML',
+                                        'caption': self._prepare_text(caption, 'HTML', 1024)})
+            files = {'photo': ('chart.png', chart_bytes, 'image/png')}
+        else:
+            method = 'editMessageCaption'
+            data.update(caption=self._prepare_text(caption, 'HTML', 1024), parse_mode='HTML')
+        return self.sender.submit(method, data, files=files, priority=state['priority'])
 
-        logger.error(f"❌ [ERROR] Telegram: todos los intentos fallidos ({max_retries}) para enviar foto.")
-        return False
+    def _on_live_edit_done(self, key: str, state: dict, future):
+        try:
+            ok = future.result() is not None
+        except Exception:
+            ok = False
+        self.stats['edits_sent' if ok else 'edits_failed'] += 1
+        fallback = None
+        with self._live_lock:
+            post = self.live_posts.get(key)
+            if post is None:
+                return
+            post.in_flight = False
+            post.last_edit = time.monotonic()
+            if ok:
+                post.caption = state['caption']
+                post.chart_digest = state.get('digest')
+                if state.get('reply'):
+                    self._submit_message(state['reply'], 'HTML', state['priority'],
+                                         extra={'reply_to_message_id': post.message_id})
+            else:
+                # Post borrado o no editable: el último estado sale como mensaje nuevo
+                fallback = post.pending or state
+                self._drop_live_post(key)
+            if ok and post.final and post.pending is None:
+                self._drop_live_post(key)
+            elif ok:
+                self._schedule_live_edit(post)
+        if fallback is not None:
+            logger.warning(f"⚠️ Edición en sitio fallida para {post.symbol}; enviando mensaje nuevo")
+            if self._photo_available(fallback['chart']):
+                self.send_photo(fallback['chart'], fallback['caption'], priority=fallback['priority'])
+            else:
+                self.send_message(fallback['caption'], priority=fallback['priority'])
 
     def send_optimized_trading_signal(self, signal_id: str, signal_dict: dict, symbol: str,
                                 neural_prediction: dict, technical_confidence: float,
-                                send_photo: bool = False) -> bool:
+                                send_photo: bool = False, chart_image: Optional[ChartImage] = None) -> bool:
         """
         Envío de señal premium con ciclo completo:
         DESTACADA (solo texto) → CONFIRMADA (notificación con gráfico) → Milestones → Cierre
@@ -7952,14 +9768,16 @@ class OptimizedTelegramClient:
             )
 
             # === ENVIAR TEXTO ===
-            text_sent = self._send_message_direct(message)
+            live_post = (signal_id, symbol) if self._edit_in_place() else None
+            text_sent = self._send_message_direct(message, live_post=live_post)
 
             # === GRÁFICO SOLO PARA CONFIRMADA ===
             if current_status == 'CONFIRMADA' and send_photo:
-                chart_path = signal_data.get('chart_path')
-                if chart_path and os.path.exists(chart_path):
+                chart_path = chart_image or signal_data.get('chart_path')
+                if self._photo_available(chart_path):
                     caption = f"📊 {self._escape_html(symbol)} {signal_level_text}\n💰 Objetivo: {tp_pct*100:.1f}% | Stop: {sl_pct*100:.1f}%"
-                    self.send_photo(chart_path, caption)
+                    self.send_photo(chart_path, caption, priority=TelegramAsyncSender.PRIORITY_HIGH,
+                                    live_post=live_post)
                 logger.info(f"✅ {symbol} CONFIRMADA enviada a Telegram con gráfico")
             else:
                 logger.info(f"⭐ {symbol} DESTACADA enviada a Telegram (sin gráfico)")
@@ -7971,7 +9789,8 @@ class OptimizedTelegramClient:
             return False
 
 
-    def send_promotion_update(self, symbol: str, profit_percent: float, chart_path: str = None, signal_data: dict = None):
+    def send_promotion_update(self, symbol: str, profit_percent: float, chart_image=None, signal_data: dict = None,
+                              signal_hash: str = None):
         """
         Enviar notificación cuando DESTACADA se promueve a CONFIRMADA
         ✅ Envía notificación CON gráfico (segunda notificación del ciclo de vida)
@@ -8028,13 +9847,20 @@ class OptimizedTelegramClient:
 
             message = self._truncate_message(message)
 
-            # SOLO UN ENVÍO: foto con caption o texto (nunca ambos)
+            # SOLO UN ENVÍO: foto con caption o texto (nunca ambos); en modo edición se actualiza el post
             sent_ok = False
-            if chart_path and os.path.exists(chart_path):
-                sent_ok = self.send_photo(chart_path, message, parse_mode='HTML')
+            live_post = None
+            if self._edit_in_place():
+                key = self._live_post_key(symbol, signal_hash)
+                sent_ok = self._update_live_post(key, message, chart_image, TelegramAsyncSender.PRIORITY_HIGH,
+                                                 reanchor=True)
+                live_post = (key or symbol, symbol)
+            if not sent_ok and self._photo_available(chart_image):
+                sent_ok = self.send_photo(chart_image, message, parse_mode='HTML',
+                                          priority=TelegramAsyncSender.PRIORITY_HIGH, live_post=live_post)
 
             if not sent_ok:
-                sent_ok = self._send_message_direct(message)
+                sent_ok = self._send_message_direct(message, live_post=live_post)
 
             if sent_ok:
                 self.sent_promotions.add(symbol)
@@ -8045,7 +9871,8 @@ class OptimizedTelegramClient:
             logger.error(f"❌ Error enviando promoción para {symbol}: {e}")
             return False
 
-    def send_closure_update(self, symbol: str, reason: str, profit_percent: float, duration_minutes: float, max_profit: float, chart_path: str = None):
+    def send_closure_update(self, symbol: str, reason: str, profit_percent: float, duration_minutes: float, max_profit: float, chart_image=None,
+                            signal_hash: str = None):
         if not self.config.telegram_enabled:
             return False
 
@@ -8120,12 +9947,24 @@ class OptimizedTelegramClient:
 
             caption = self._truncate_message(caption)
 
+            if self._edit_in_place():
+                key = self._live_post_key(symbol, signal_hash)
+                reply = None
+                if getattr(self.config, 'TELEGRAM_EDIT_CLOSURE_REPLY', True):
+                    reply = f"{emoji} {title}\n📊 {escaped_symbol}: {profit_percent:+.2f}%"
+                if self._update_live_post(key, caption, chart_image, TelegramAsyncSender.PRIORITY_CRITICAL,
+                                          final=True, reply=reply):
+                    return True
+
             # SOLO UN ENVÍO: foto con caption o texto (nunca ambos)
             sent_ok = False
-            if chart_path and os.path.exists(chart_path):
-                sent_ok = self.send_photo(chart_path, caption, parse_mode='HTML')
+            if self._photo_available(chart_image):
+                # Cierres y stop loss adelantan a cualquier otro mensaje en cola
+                sent_ok = self.send_photo(chart_image, caption, parse_mode='HTML',
+                                          priority=TelegramAsyncSender.PRIORITY_CRITICAL)
             if not sent_ok:
-                sent_ok = self.send_message(caption, parse_mode='HTML')
+                sent_ok = self.send_message(caption, parse_mode='HTML',
+                                            priority=TelegramAsyncSender.PRIORITY_CRITICAL)
             return sent_ok
         except Exception as e:
             logger.error(f"Error enviando cierre: {e}")
@@ -8157,20 +9996,16 @@ class OptimizedTelegramClient:
 
 
     def test_connection(self) -> bool:
-        """Probar conexión optimizada (requests o urllib)"""
+        """Probar conexión (getMe por el mismo emisor que el resto de envíos)"""
         try:
-            url = f"{self.base_url}/getMe"
-            if self.session:
-                response = self.session.get(url, timeout=30)  # ✅ Aumentado para alta latencia
-                return response.status_code == 200
-            else:
-                with urllib.request.urlopen(url, timeout=30) as resp:  # ✅ Aumentado para alta latencia
-                    return resp.status == 200
+            future = self.sender.submit('getMe', {}, priority=TelegramAsyncSender.PRIORITY_HIGH, max_retries=1)
+            return future.result(timeout=30) is not None  # ✅ 30s para conexiones con alta latencia
         except Exception as e:
             logger.error(f"Error probando conexión Telegram: {e}")
             return False
 
-    def send_milestone_update(self, symbol: str, milestone: float, profit: float, chart_path: str = None):
+    def send_milestone_update(self, symbol: str, milestone: float, profit: float, chart_image=None,
+                              signal_hash: str = None):
         """Enviar actualización de milestone con valores dinámicos desde config"""
         if not self.config.telegram_enabled:
             return False
@@ -8217,10 +10052,15 @@ class OptimizedTelegramClient:
             )
             text = self._truncate_message(text)
 
+            # En modo edición el avance actualiza el post de la señal (fusionando avances rápidos)
+            if self._edit_in_place():
+                if self._update_live_post(self._live_post_key(symbol, signal_hash), text, chart_image):
+                    return True
+
             # SOLO UN ENVÍO: foto con caption o texto
             sent_ok = False
-            if chart_path and os.path.exists(chart_path):
-                sent_ok = self.send_photo(photo_path=chart_path, caption=text, parse_mode='HTML')
+            if self._photo_available(chart_image):
+                sent_ok = self.send_photo(photo_path=chart_image, caption=text, parse_mode='HTML')
             if not sent_ok:
                 sent_ok = self.send_message(text, parse_mode='HTML')
             return sent_ok
@@ -8228,7 +10068,7 @@ class OptimizedTelegramClient:
             logger.error(f"Error enviando Avance {milestone}%: {e}")
             return False
 
-    def send_highlight_expired_notification(self, symbol: str, duration_minutes: float):
+    def send_highlight_expired_notification(self, symbol: str, duration_minutes: float, signal_hash: str = None):
         """Enviar notificación cuando una señal DESTACADA expira sin confirmarse"""
         if not self.config.telegram_enabled:
             return False
@@ -8248,6 +10088,9 @@ class OptimizedTelegramClient:
                 f"🕐 {datetime.now().strftime('%H:%M:%S')}"
             )
             text = self._truncate_message(text)
+            if self._edit_in_place():
+                if self._update_live_post(self._live_post_key(symbol, signal_hash), text, final=True):
+                    return True
             return self.send_message(text, parse_mode='HTML')
         except Exception as e:
             logger.error(f"Error enviando notificación HIGHLIGHT_EXPIRED: {e}")
@@ -8976,6 +10819,242 @@ class RobustWebSocketManager:
             'symbols': self.symbols
         }
 # ========== ESCÁNER DE SÍMBOLOS ==========
+class AnalysisExecutor:
+    """
+    Pool acotado para análisis disparados por cierre de vela.
+    - Cola deduplicada por símbolo: un evento repetido mientras espera se fusiona.
+    - Un símbolo en curso nunca se analiza dos veces a la vez; si llega otro cierre
+      se re-ejecuta una sola vez al terminar.
+    - Métricas: latencia de despacho (evento → inicio) y profundidad de cola.
+    """
+    def __init__(self, analyze_fn, config=None, name="AnalysisWorker"):
+        self.analyze_fn = analyze_fn
+        self.config = config
+        self.name = name
+        workers = 1 if IN_REPLIT else int(getattr(config, 'ANALYSIS_WORKERS', 4) or 4)
+        self.max_workers = max(1, workers)
+        self.max_pending = max(1, int(getattr(config, 'ANALYSIS_MAX_PENDING', 200) or 200))
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()  # {symbol: enqueue_time} en orden FIFO
+        self._in_flight = set()
+        self._rerun = {}  # {symbol: enqueue_time} cierres recibidos durante el análisis
+        self._threads = []
+        self.running = False
+        self._latencies_ms = deque(maxlen=500)
+        self.stats = {'submitted': 0, 'coalesced': 0, 'dropped': 0, 'completed': 0,
+                      'errors': 0, 'max_queue_depth': 0}
+
+    def start(self):
+        with self._cond:
+            if self.running:
+                return
+            self.running = True
+        for i in range(self.max_workers):
+            thread = threading.Thread(target=self._worker, daemon=True, name=f"{self.name}-{i}")
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"[OK] AnalysisExecutor iniciado: {self.max_workers} hilos, cola máx. {self.max_pending}")
+
+    def stop(self, wait: bool = False, timeout: float = 5.0):
+        """
+        Detiene los workers sin bloquear (como el resto de servicios en stop_optimized: la GUI
+        no espera a un análisis colgado de REST). wait=True los espera como máximo `timeout`.
+        """
+        with self._cond:
+            self.running = False
+            self._pending.clear()
+            self._rerun.clear()
+            self._cond.notify_all()
+        threads, self._threads = self._threads, []
+        if not wait:
+            return
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(max(0.0, deadline - time.monotonic()))
+
+    def submit(self, symbol: str) -> bool:
+        """Encola un análisis; devuelve False si se fusionó con uno pendiente o se descartó"""
+        now = time.perf_counter()
+        with self._cond:
+            self.stats['submitted'] += 1
+            if symbol in self._in_flight:
+                # Se analizará otra vez al terminar; conservar el instante del primer evento
+                if symbol in self._rerun:
+                    self.stats['coalesced'] += 1
+                else:
+                    self._rerun[symbol] = now
+                return False
+            if symbol in self._pending:
+                self.stats['coalesced'] += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                # Degradación ante ráfagas: se descarta el evento más antiguo
+                self._pending.popitem(last=False)
+                self.stats['dropped'] += 1
+            self._pending[symbol] = now
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], len(self._pending))
+            self._cond.notify()
+            return True
+
+    def is_in_flight(self, symbol: str) -> bool:
+        with self._cond:
+            return symbol in self._in_flight
+
+    def run_inline(self, symbol: str, fn: Optional[Callable] = None) -> bool:
+        """
+        Analiza `symbol` en el hilo llamante (p. ej. SymbolScanner) reservándolo en el mismo
+        conjunto en curso que los workers: comprobar y reservar van bajo un único lock.
+        Devuelve False si ya se estaba analizando; las excepciones se propagan al llamante.
+        """
+        with self._cond:
+            if symbol in self._in_flight:
+                self.stats['coalesced'] += 1
+                return False
+            if self._pending.pop(symbol, None) is not None:
+                self.stats['coalesced'] += 1  # El cierre encolado queda cubierto por este análisis
+            self._in_flight.add(symbol)
+        try:
+            (fn or self.analyze_fn)(symbol)
+            self._count('completed')
+        except Exception:
+            self._count('errors')
+            raise
+        finally:
+            self._release(symbol)
+        return True
+
+    def _count(self, key: str):
+        with self._cond:
+            self.stats[key] += 1
+
+    def _take_next(self):
+        """Primer símbolo pendiente que no esté ya en curso (con self._cond tomado)"""
+        for symbol in self._pending:
+            if symbol not in self._in_flight:
+                enqueued = self._pending.pop(symbol)
+                self._in_flight.add(symbol)
+                return symbol, enqueued
+        return None, None
+
+    def _next_symbol(self):
+        with self._cond:
+            while self.running:
+                symbol, enqueued = self._take_next()
+                if symbol is not None:
+                    return symbol, enqueued
+                self._cond.wait(timeout=1.0)
+            return None, None
+
+    def _release(self, symbol: str):
+        """Fin de un análisis: libera el símbolo y re-encola el cierre recibido mientras corría"""
+        with self._cond:
+            self._in_flight.discard(symbol)
+            rerun_at = self._rerun.pop(symbol, None)
+            if rerun_at is not None and self.running and symbol not in self._pending:
+                self._pending[symbol] = rerun_at
+            self._cond.notify()
+
+    def _worker(self):
+        while self.running:
+            symbol, enqueued = self._next_symbol()
+            if symbol is None:
+                return
+            self._latencies_ms.append((time.perf_counter() - enqueued) * 1000.0)
+            try:
+                self.analyze_fn(symbol)
+                self._count('completed')
+            except Exception as e:
+                self._count('errors')
+                logger.error(f"[ERROR] Análisis de {symbol} falló en AnalysisExecutor: {e}")
+            finally:
+                self._release(symbol)
+
+    def get_metrics(self) -> dict:
+        with self._cond:
+            latencies = list(self._latencies_ms)
+            metrics = dict(self.stats)
+            metrics['queue_depth'] = len(self._pending)
+            metrics['in_flight'] = len(self._in_flight)
+        if latencies:
+            metrics['dispatch_p50_ms'] = float(np.percentile(latencies, 50))
+            metrics['dispatch_p95_ms'] = float(np.percentile(latencies, 95))
+            metrics['dispatch_max_ms'] = float(max(latencies))
+        return metrics
+
+
+class AsyncAnalysisExecutor(AnalysisExecutor):
+    """
+    AnalysisExecutor para el runtime asyncio del backend: misma cola deduplicada, re-ejecución
+    y métricas, pero el despacho es una corrutina del event loop y cada análisis (CPU) corre
+    en el executor acotado del runtime, sin hilos propios. submit() sigue siendo thread-safe.
+    """
+    def __init__(self, analyze_fn, executor, config=None, name="AsyncAnalysis"):
+        super().__init__(analyze_fn, config, name)
+        self.executor = executor
+        self._loop = None
+        self._wakeup = None
+        self._slots = None
+        self._task = None
+
+    def start(self):
+        """Debe llamarse desde el event loop"""
+        with self._cond:
+            if self.running:
+                return
+            self.running = True
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._task = self._loop.create_task(self._dispatch(), name=self.name)
+        logger.info(f"[OK] {self.name} iniciado: {self.max_workers} análisis en paralelo, cola máx. {self.max_pending}")
+
+    def stop(self, wait: bool = False, timeout: float = 5.0):
+        super().stop(wait, timeout)
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # Loop ya cerrado
+
+    def submit(self, symbol: str) -> bool:
+        queued = super().submit(symbol)
+        loop = self._loop
+        if queued and loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass
+        return queued
+
+    async def _dispatch(self):
+        while self.running:
+            await self._slots.acquire()
+            # clear() antes de mirar la cola: un submit posterior vuelve a despertar
+            self._wakeup.clear()
+            with self._cond:
+                symbol, enqueued = self._take_next()
+            if symbol is None:
+                self._slots.release()
+                await self._wakeup.wait()
+                continue
+            self._loop.create_task(self._run(symbol, enqueued))
+
+    async def _run(self, symbol: str, enqueued: float):
+        self._latencies_ms.append((time.perf_counter() - enqueued) * 1000.0)
+        try:
+            await self._loop.run_in_executor(self.executor, self.analyze_fn, symbol)
+            self._count('completed')
+        except Exception as e:
+            self._count('errors')
+            logger.error(f"[ERROR] Análisis de {symbol} falló en {self.name}: {e}")
+        finally:
+            self._release(symbol)
+            self._slots.release()
+            self._wakeup.set()
+
+
 class SymbolScanner:
     def __init__(self, bot, symbols, scan_interval=3, config: "AdvancedTradingConfig" = None):
         self.bot = bot
@@ -9055,24 +11134,35 @@ class SymbolScanner:
         except Exception as e:
             logger.error(f"Error en resume_all_scanning: {e}")
 
-    def _scheduler(self):
-        batch_size = getattr(self.config, 'SCAN_BATCH_SIZE', 10) if self.config else 10
-        batch_delay = getattr(self.config, 'SCAN_BATCH_DELAY', 0.5) if self.config else 0.5
+    def scan_params(self) -> Tuple[float, int, float]:
+        """(intervalo, tamaño de lote, pausa entre lotes) del snapshot de ajustes vigente"""
+        # Snapshot por pasada: un cambio de intervalo/lotes en el JSON se aplica en la siguiente
+        if self.config:
+            settings = current_settings(self.config)
+            return settings.SCAN_INTERVAL, settings.SCAN_BATCH_SIZE, settings.SCAN_BATCH_DELAY
+        return self.scan_interval, 10, 0.5
+
+    def begin_cycle(self):
+        """Primer símbolo programado de una pasada: informe de caché y contadores de progreso a cero"""
+        self._report_cache_cycle()
+        self.bot.symbols_analyzed_count = 0
+        self.bot.symbol_analysis_counts = {sym: 0 for sym in self.symbols}
+        self.bot._safe_gui_queue_put(('update_pair_scan_progress', 0))
 
+    def _scheduler(self):
         while self.running and self.bot.running:
+            scan_interval, batch_size, batch_delay = self.scan_params()
             current_time = time.time()
             scheduled = 0
             batch_count = 0
 
             for symbol in self.symbols:
                 elapsed = current_time - self.last_scan_time[symbol]
-                if elapsed >= self.scan_interval:
+                if elapsed >= scan_interval:
                     try:
                         # ✅ Protección contra estado inconsistente: resetear si es primer símbolo
                         if scheduled == 0:
-                            self.bot.symbols_analyzed_count = 0
-                            self.bot.symbol_analysis_counts = {sym: 0 for sym in self.symbols}
-                            self.bot._safe_gui_queue_put(('update_pair_scan_progress', 0))
+                            self.begin_cycle()
 
                         # ✅ Evitar duplicados y exceso de reintentos
                         if self._retry_count.get(symbol, 0) < 3 and symbol not in self._in_queue:
@@ -9093,13 +11183,52 @@ class SymbolScanner:
                 self.bot._safe_gui_queue_put(('log_message', f"🔍 Programados {scheduled} símbolos para análisis"))
             time.sleep(1)
 
+    def _report_cache_cycle(self):
+        """Informa de los cálculos de indicadores ahorrados por la caché compartida en el ciclo anterior"""
+        try:
+            analyzer = getattr(getattr(self.bot, 'strategy_impl', None), 'technical_analyzer', None)
+            if analyzer is None or not hasattr(analyzer, 'pop_cycle_stats'):
+                return
+            stats = analyzer.pop_cycle_stats()
+            total = stats['hits'] + stats['misses']
+            if total == 0:
+                return
+            msg = (f"♻️ Ciclo de escaneo: {stats['computations_saved']}/{total} cálculos de indicadores "
+                   f"ahorrados por caché ({stats['hits'] / total:.0%})")
+            logger.info(msg)
+            self.bot._safe_gui_queue_put(('log_message', msg))
+        except Exception as e:
+            logger.debug(f"Error reportando estadísticas de caché: {e}")
+
+    def _wait_for_model(self):
+        """Los workers no analizan hasta que el modelo esté cargado y caliente"""
+        registry = getattr(self.bot, 'model_registry', None)
+        if registry is None or registry.is_ready:
+            return
+        timeout = getattr(self.config, 'MODEL_READY_TIMEOUT', 60) if self.config else 60
+        deadline = time.time() + timeout
+        while self.running and self.bot.running and time.time() < deadline:
+            if registry.wait_ready(1.0):
+                return
+        if not registry.is_ready:
+            logger.warning(f"⚠️ Modelo no listo tras {timeout}s - el escáner continúa sin esperar")
+
     def _worker(self):
+        self._wait_for_model()
         while self.running and self.bot.running:
             try:
                 symbol = self.scan_queue.get(timeout=2)
                 try:
                     self._retry_count[symbol] = 0
-                    self.bot.analyze_and_process_symbol(symbol)
+                    executor = getattr(self.bot, 'analysis_executor', None)
+                    if executor is not None:
+                        # Reserva atómica compartida con los análisis por cierre de vela:
+                        # si ya se está analizando, no se duplica
+                        executor.run_inline(symbol, self.bot.analyze_and_process_symbol)
+                    else:
+                        self.bot.analyze_and_process_symbol(symbol)
+                    if getattr(self.bot, 'model_registry', None):
+                        self.bot.model_registry.record_first_analysis()
                     self.scan_queue.task_done()
                     self._in_queue.discard(symbol)
                 except Exception as e:
@@ -9122,8 +11251,184 @@ class SymbolScanner:
                 time.sleep(1)
 
 # ========== AUTO-TRADE STATE & ORDER MANAGER ==========
+# ========== DIARIO DE ESTADO (WAL + SNAPSHOTS) ==========
+_JOURNAL_SKIP = object()
+
+
+def _journal_safe(value):
+    """Copia serializable a JSON: numpy → Python, datetime → ISO; DataFrames y objetos se omiten"""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        safe = {}
+        for key, item in value.items():
+            item = _journal_safe(item)
+            if item is not _JOURNAL_SKIP:
+                safe[str(key)] = item
+        return safe
+    if isinstance(value, (list, tuple, set)):
+        return [item for item in map(_journal_safe, value) if item is not _JOURNAL_SKIP]
+    return _JOURNAL_SKIP
+
+
+class StateJournal:
+    """
+    Estado recuperable tras un reinicio: registro write-ahead de transiciones con snapshots.
+    - put/delete/reset añaden una línea JSON al WAL (flush + fsync opcional) y actualizan la
+      vista materializada {tipo: {clave: registro}}.
+    - Cada `snapshot_every` entradas se escribe un snapshot atómico (tmp + os.replace) con la
+      vista completa y se vacía el WAL: el arranque lee un snapshot y pocas líneas.
+    - load(): snapshot + reproducción del WAL (entradas con seq posterior al snapshot); una
+      línea a medias por una caída durante la escritura se descarta.
+    """
+    def __init__(self, directory: str, snapshot_every: int = 200, fsync: bool = True):
+        self.directory = directory
+        self.wal_path = os.path.join(directory, 'state.wal')
+        self.snapshot_path = os.path.join(directory, 'state.snapshot.json')
+        self.snapshot_every = max(1, int(snapshot_every))
+        self.fsync = fsync
+        self.state = {}  # {tipo: {clave: registro}}
+        self.seq = 0
+        self.loaded = False
+        self._since_snapshot = 0
+        self._wal = None
+        self._lock = threading.RLock()
+        self.stats = {'appends': 0, 'snapshots': 0, 'replayed': 0, 'corrupt_lines': 0,
+                      'write_errors': 0, 'load_ms': 0.0}
+
+    def load(self) -> dict:
+        """Reconstruye la vista desde disco (idempotente); devuelve {tipo: {clave: registro}}"""
+        with self._lock:
+            if self.loaded:
+                return self.state
+            started = time.perf_counter()
+            os.makedirs(self.directory, exist_ok=True)
+            snapshot_seq = 0
+            try:
+                if os.path.exists(self.snapshot_path):
+                    with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                        payload = json.load(f)
+                    self.state = {kind: dict(records) for kind, records in payload.get('state', {}).items()}
+                    snapshot_seq = self.seq = int(payload.get('seq', 0))
+            except (OSError, ValueError, TypeError) as e:
+                logger.error(f"❌ Snapshot de estado ilegible ({self.snapshot_path}): {e}")
+            if os.path.exists(self.wal_path):
+                with open(self.wal_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            self.stats['corrupt_lines'] += 1
+                            continue
+                        if entry.get('seq', 0) <= snapshot_seq:
+                            continue
+                        self._apply(entry)
+                        self.seq = entry['seq']
+                        self.stats['replayed'] += 1
+            self.loaded = True
+            if self.stats['replayed'] or self.stats['corrupt_lines']:
+                self._snapshot_locked()  # WAL limpio: las siguientes líneas no se pegan a una truncada
+            self.stats['load_ms'] = (time.perf_counter() - started) * 1000.0
+            counts = ", ".join(f"{kind}={len(records)}" for kind, records in self.state.items()) or "vacío"
+            logger.info(f"♻️ Diario de estado cargado en {self.stats['load_ms']:.1f}ms ({counts}; "
+                        f"{self.stats['replayed']} entradas WAL, {self.stats['corrupt_lines']} descartadas)")
+            return self.state
+
+    def records(self, kind: str) -> dict:
+        with self._lock:
+            self.load()
+            return dict(self.state.get(kind, {}))
+
+    def put(self, kind: str, key: str, record: dict):
+        self._append('put', kind, key, record)
+
+    def delete(self, kind: str, key: str):
+        with self._lock:
+            self.load()
+            if key in self.state.get(kind, {}):
+                self._append('del', kind, key, None)
+
+    def reset(self, kind: str):
+        with self._lock:
+            self.load()
+            if self.state.get(kind):
+                self._append('reset', kind, None, None)
+
+    def _apply(self, entry: dict):
+        op, kind, key = entry.get('op'), entry.get('kind'), entry.get('key')
+        if op == 'put':
+            self.state.setdefault(kind, {})[key] = entry.get('data')
+        elif op == 'del':
+            self.state.get(kind, {}).pop(key, None)
+        elif op == 'reset':
+            self.state[kind] = {}
+
+    def _append(self, op: str, kind: str, key: Optional[str], record: Optional[dict]):
+        with self._lock:
+            self.load()
+            self.seq += 1
+            entry = {'seq': self.seq, 't': round(time.time(), 3), 'op': op, 'kind': kind, 'key': key,
+                     'data': record}
+            self._apply(entry)
+            try:
+                if self._wal is None:
+                    self._wal = open(self.wal_path, 'a', encoding='utf-8')
+                self._wal.write(json.dumps(entry, separators=(',', ':')) + '\n')
+                self._wal.flush()
+                if self.fsync:
+                    os.fsync(self._wal.fileno())
+            except (OSError, TypeError, ValueError) as e:
+                self.stats['write_errors'] += 1
+                logger.error(f"❌ No se pudo escribir el diario de estado ({op} {kind}/{key}): {e}")
+            self.stats['appends'] += 1
+            self._since_snapshot += 1
+            if self._since_snapshot >= self.snapshot_every:
+                self._snapshot_locked()
+
+    def snapshot(self):
+        with self._lock:
+            if self.loaded:
+                self._snapshot_locked()
+
+    def _snapshot_locked(self):
+        payload = {'seq': self.seq, 't': time.time(), 'state': self.state}
+        tmp_path = self.snapshot_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, separators=(',', ':'))
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            # Las entradas del WAL ya están en el snapshot (seq ≤ snapshot): se vacía
+            if self._wal is not None:
+                self._wal.close()
+            self._wal = open(self.wal_path, 'w', encoding='utf-8')
+            self._since_snapshot = 0
+            self.stats['snapshots'] += 1
+        except OSError as e:
+            self.stats['write_errors'] += 1
+            logger.error(f"❌ No se pudo escribir el snapshot de estado: {e}")
+
+    def close(self):
+        with self._lock:
+            self.snapshot()
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+
+
 class AutoTradeState:
     """Estado de una operación de auto-trading activa"""
+    # Campos persistidos en el diario de estado (además de los argumentos del constructor)
+    JOURNAL_FIELDS = ('entry_order_id', 'stop_loss_order_id', 'take_profit_order_id', 'current_sl', 'take_profit',
+                      'trailing_distance', 'trailing_step', 'milestone1_reached', 'milestone2_reached',
+                      'milestone3_reached', 'breakeven_activated', 'entry_confirmed', 'position_amount',
+                      'opened_at', 'last_sl_update', 'max_profit_reached')
     def __init__(self, symbol: str, side: str, entry_price: float, quantity: float, config):
         self.symbol = symbol
         self.side = side  # 'BUY' o 'SELL'
@@ -9155,11 +11460,31 @@ class AutoTradeState:
         self.milestone3_reached = False
         self.breakeven_activated = False
 
+        # Confirmación desde el exchange (stream de usuario)
+        self.entry_confirmed = False
+        self.position_amount = None  # Tamaño según ACCOUNT_UPDATE (0 = posición plana)
+
         # Timestamps
         self.opened_at = datetime.now()
         self.last_sl_update = datetime.now()
         self.max_profit_reached = 0.0
 
+    def to_record(self) -> dict:
+        record = {'symbol': self.symbol, 'side': self.side, 'entry_price': self.entry_price, 'quantity': self.quantity}
+        record.update((name, getattr(self, name)) for name in self.JOURNAL_FIELDS)
+        return _journal_safe(record)
+
+    @classmethod
+    def from_record(cls, record: dict, config) -> 'AutoTradeState':
+        trade = cls(record['symbol'], record['side'], float(record['entry_price']), float(record['quantity']), config)
+        for name in cls.JOURNAL_FIELDS:
+            if name in record:
+                setattr(trade, name, record[name])
+        for name in ('opened_at', 'last_sl_update'):
+            if isinstance(getattr(trade, name), str):
+                setattr(trade, name, datetime.fromisoformat(getattr(trade, name)))
+        return trade
+
     def calculate_profit_percent(self, current_price: float) -> float:
         """Calcular profit actual en %"""
         if self.side == 'BUY':
@@ -9213,12 +11538,821 @@ class AutoTradeState:
         return (False, None, None)
 
 
+# ========== METADATOS DEL EXCHANGE (exchangeInfo) ==========
+def _decimals(step: str) -> int:
+    """Decimales de un stepSize/tickSize de Binance ('0.00100000' → 3)"""
+    step = str(step)
+    return len(step.rstrip('0').split('.')[-1]) if '.' in step else 0
+
+
+class SymbolFilters(NamedTuple):
+    """Filtros LOT_SIZE / PRICE_FILTER / MIN_NOTIONAL de un símbolo"""
+    symbol: str
+    status: str
+    base_asset: str
+    quote_asset: str
+    step_size: float
+    min_qty: float
+    max_qty: float
+    tick_size: float
+    min_price: float
+    min_notional: float
+    qty_precision: int
+    price_precision: int
+
+    def floor_quantity(self, quantity: float) -> float:
+        """Cantidad ajustada hacia abajo al múltiplo de stepSize"""
+        if self.step_size > 0:
+            quantity = math.floor(quantity / self.step_size + 1e-9) * self.step_size
+        return round(quantity, self.qty_precision)
+
+    def format_quantity(self, quantity: float) -> str:
+        return f"{quantity:.{self.qty_precision}f}"
+
+    def format_price(self, price: float) -> str:
+        if self.tick_size > 0:
+            price = round(price / self.tick_size) * self.tick_size
+        return f"{price:.{self.price_precision}f}"
+
+    def check_order(self, quantity: float, price: float) -> Optional[str]:
+        """Motivo de rechazo local (LOT_SIZE / MIN_NOTIONAL) o None si la orden es válida"""
+        if quantity < self.min_qty:
+            return f"Cantidad {quantity} < minQty {self.min_qty} ({self.symbol})"
+        if self.max_qty and quantity > self.max_qty:
+            return f"Cantidad {quantity} > maxQty {self.max_qty} ({self.symbol})"
+        if price > 0 and self.min_notional and quantity * price < self.min_notional:
+            return f"Nocional {quantity * price:.4f} < mínimo {self.min_notional} ({self.symbol})"
+        return None
+
+
+class ExchangeMetadataService:
+    """
+    Caché de exchangeInfo para un endpoint (spot/futuros, real/testnet):
+    - Una única descarga masiva; índice O(1) símbolo → SymbolFilters.
+    - Copia persistida en CryptoBotPro_Data/cache: el arranque no espera a la red.
+    - Refresco por TTL en segundo plano; mientras tanto se sirve el índice vigente.
+    """
+    def __init__(self, config, base_url: str, api_prefix: str = "/api/v3"):
+        self.config = config
+        self.url = f"{base_url.rstrip('/')}{api_prefix}/exchangeInfo"
+        self.ttl = float(getattr(config, 'EXCHANGE_INFO_TTL', 6 * 3600))
+        cache_name = f"exchange_info_{hashlib.md5(self.url.encode()).hexdigest()[:10]}.json"
+        self.cache_path = path_manager.get_data_path('cache', cache_name)
+        self.session = requests.Session() if REQUESTS_AVAILABLE else None
+        self._index: Dict[str, SymbolFilters] = {}
+        self._loaded_at = 0.0  # epoch de la descarga que originó el índice
+        self._retry_at = 0.0  # Tras un fallo de red no se reintenta en cada consulta
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self.stats = {'network_loads': 0, 'disk_loads': 0, 'refresh_errors': 0, 'lookups': 0, 'misses': 0}
+
+    # --- Carga -------------------------------------------------------------------
+    def start_loading(self):
+        """Carga en segundo plano (disco y, si hace falta, red) sin bloquear el arranque"""
+        self._refresh_in_background(force=False)
+
+    def load(self) -> bool:
+        """Carga síncrona: copia en disco si existe; red si no hay copia o está caducada"""
+        if not self._index:
+            self._load_from_disk()
+        if self._index and not self.is_stale():
+            return True
+        return self.refresh() or bool(self._index)
+
+    def is_stale(self) -> bool:
+        return time.time() - self._loaded_at > self.ttl
+
+    def refresh(self) -> bool:
+        """Descarga exchangeInfo completo y reemplaza el índice de forma atómica"""
+        if self.session is None:
+            return False
+        try:
+            response = self.session.get(self.url, timeout=15)
+            response.raise_for_status()
+            symbols = response.json().get('symbols', [])
+            index = self._build_index(symbols)
+            if not index:
+                raise ValueError("exchangeInfo sin símbolos")
+            with self._lock:
+                self._index = index
+                self._loaded_at = time.time()
+            self.stats['network_loads'] += 1
+            self._save_to_disk(symbols)
+            logger.info(f"📚 exchangeInfo cargado: {len(index)} símbolos ({self.url})")
+            return True
+        except Exception as e:
+            self.stats['refresh_errors'] += 1
+            self._retry_at = time.time() + 60
+            logger.warning(f"⚠️ No se pudo refrescar exchangeInfo ({self.url}): {e}")
+            return False
+
+    def _refresh_in_background(self, force: bool = True):
+        if force and (self.session is None or time.time() < self._retry_at):
+            return
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            target = self.refresh if force else self.load
+            self._refresh_thread = threading.Thread(target=target, daemon=True, name="ExchangeInfoRefresh")
+            self._refresh_thread.start()
+
+    def _build_index(self, symbols: list) -> Dict[str, SymbolFilters]:
+        index = {}
+        for sym in symbols:
+            try:
+                filters = {f.get('filterType'): f for f in sym.get('filters', [])}
+                lot = filters.get('LOT_SIZE', {})
+                price = filters.get('PRICE_FILTER', {})
+                # Spot: NOTIONAL/MIN_NOTIONAL.minNotional | Futuros: MIN_NOTIONAL.notional
+                notional = filters.get('NOTIONAL') or filters.get('MIN_NOTIONAL') or {}
+                step = lot.get('stepSize', '0.001')
+                tick = price.get('tickSize', '0.01')
+                index[sym['symbol']] = SymbolFilters(
+                    symbol=sym['symbol'],
+                    status=sym.get('status', sym.get('contractStatus', 'TRADING')),
+                    base_asset=sym.get('baseAsset', ''),
+                    quote_asset=sym.get('quoteAsset', ''),
+                    step_size=float(step),
+                    min_qty=float(lot.get('minQty', 0)),
+                    max_qty=float(lot.get('maxQty', 0)),
+                    tick_size=float(tick),
+                    min_price=float(price.get('minPrice', 0)),
+                    min_notional=float(notional.get('minNotional', notional.get('notional', 0))),
+                    qty_precision=_decimals(step) if 'stepSize' in lot else int(sym.get('quantityPrecision', 3)),
+                    price_precision=_decimals(tick) if 'tickSize' in price else int(sym.get('pricePrecision', 2)),
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug(f"exchangeInfo: símbolo ignorado {sym.get('symbol')}: {e}")
+        return index
+
+    # --- Persistencia -------------------------------------------------------------
+    def _save_to_disk(self, symbols: list):
+        keep = ('symbol', 'status', 'contractStatus', 'baseAsset', 'quoteAsset',
+                'quantityPrecision', 'pricePrecision', 'filters')
+        payload = {'url': self.url, 'fetched_at': self._loaded_at,
+                   'symbols': [{k: s[k] for k in keep if k in s} for s in symbols]}
+        try:
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.debug(f"No se pudo persistir exchangeInfo: {e}")
+
+    def _load_from_disk(self) -> bool:
+        try:
+            if not os.path.exists(self.cache_path):
+                return False
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            index = self._build_index(payload.get('symbols', []))
+            if not index:
+                return False
+            with self._lock:
+                self._index = index
+                self._loaded_at = float(payload.get('fetched_at', 0))
+            self.stats['disk_loads'] += 1
+            logger.info(f"📚 exchangeInfo desde disco: {len(index)} símbolos "
+                        f"(antigüedad {(time.time() - self._loaded_at) / 3600:.1f}h)")
+            return True
+        except Exception as e:
+            logger.debug(f"Copia de exchangeInfo inválida ({self.cache_path}): {e}")
+            return False
+
+    # --- Consultas ------------------------------------------------------------------
+    def get(self, symbol: str) -> Optional[SymbolFilters]:
+        """Filtros del símbolo sin petición de red (salvo la primera carga si aún no hay índice)"""
+        if not self._index:
+            self.load()
+        elif self.is_stale():
+            self._refresh_in_background()
+        self.stats['lookups'] += 1
+        filters = self._index.get(symbol)
+        if filters is None:
+            self.stats['misses'] += 1
+        return filters
+
+    def tradable_symbols(self, quote_asset: Optional[str] = None) -> set:
+        if not self._index:
+            self.load()
+        elif self.is_stale():
+            self._refresh_in_background()
+        return {s.symbol for s in self._index.values()
+                if s.status == 'TRADING' and (quote_asset is None or s.quote_asset == quote_asset)}
+
+    def get_metrics(self) -> dict:
+        return dict(self.stats, symbols=len(self._index),
+                    age_s=time.time() - self._loaded_at if self._loaded_at else None)
+
+
+_exchange_metadata_services: Dict[str, ExchangeMetadataService] = {}
+_exchange_metadata_lock = threading.Lock()
+
+def get_exchange_metadata(config, base_url: str, api_prefix: str = "/api/v3") -> ExchangeMetadataService:
+    """Factory Singleton por endpoint: un único exchangeInfo compartido por proceso"""
+    key = f"{base_url.rstrip('/')}{api_prefix}"
+    with _exchange_metadata_lock:
+        service = _exchange_metadata_services.get(key)
+        if service is None:
+            service = _exchange_metadata_services[key] = ExchangeMetadataService(config, base_url, api_prefix)
+        return service
+
+
+# ========== GATEWAY DE ÓRDENES DE BAJA LATENCIA ==========
+class LatencyHistogram:
+    """Histograma de latencias (ms): cubetas fijas acumuladas + percentiles de la ventana reciente"""
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self, window: int = 1000):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.samples = deque(maxlen=window)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def record(self, ms: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+            self.samples.append(ms)
+            self.total += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts, samples, total = list(self.counts), list(self.samples), self.total
+        labels = [f"<={b}ms" for b in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+        result = {'count': total, 'buckets': dict(zip(labels, counts))}
+        if samples:
+            result.update(p50_ms=float(np.percentile(samples, 50)), p95_ms=float(np.percentile(samples, 95)),
+                          p99_ms=float(np.percentile(samples, 99)), max_ms=float(max(samples)))
+        return result
+
+
+class OrderTemplate(NamedTuple):
+    """Parte estática de una orden ya codificada y absorbida por el HMAC"""
+    prefix: str  # 'symbol=BTCUSDT&side=BUY&type=MARKET&'
+    mac: Any     # hmac con el prefijo ya procesado: por orden solo se firma el sufijo dinámico
+
+
+class BinanceOrderGateway:
+    """
+    Camino caliente de órdenes firmadas:
+    - Sesión keep-alive con pool precalentado (ping periódico) para evitar handshakes TLS por orden.
+    - Clave HMAC precomputada y plantillas por (símbolo, lado, tipo): solo se firma cantidad/precio/timestamp.
+    - Entrada + stop protector en una sola petición batchOrders (futuros) o en paralelo.
+    - Latencia orden→ack por tipo de petición en un LatencyHistogram.
+    """
+    def __init__(self, config, base_url: str, api_prefix: str, api_key: str, secret_key: str):
+        self.config = config
+        self.base_url = base_url.rstrip('/')
+        self.api_prefix = api_prefix
+        self.is_futures = api_prefix.startswith('/fapi')
+        self.recv_window = int(getattr(config, 'ORDER_RECV_WINDOW_MS', 5000))
+        self.timeout = float(getattr(config, 'ORDER_REQUEST_TIMEOUT', 10))
+        self.pool_size = max(2, int(getattr(config, 'ORDER_GATEWAY_POOL', 4)))
+        self._mac = hmac.new((secret_key or '').encode('utf-8'), digestmod=hashlib.sha256)
+        self._templates: "OrderedDict[tuple, OrderTemplate]" = OrderedDict()
+        self._templates_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({'X-MBX-APIKEY': api_key or '', 'Connection': 'keep-alive',
+                                     'User-Agent': 'CryptoBotPro/35.0'})
+        self._pool = None
+        self._keepalive_stop = threading.Event()
+        self._keepalive_thread = None
+        self.latency = defaultdict(LatencyHistogram)
+
+    # --- Firma ---------------------------------------------------------------------
+    def _template(self, static: dict) -> OrderTemplate:
+        key = tuple(static.items())
+        with self._templates_lock:
+            template = self._templates.get(key)
+            if template is None:
+                prefix = urllib.parse.urlencode(static) + '&' if static else ''
+                mac = self._mac.copy()
+                mac.update(prefix.encode('utf-8'))
+                template = self._templates[key] = OrderTemplate(prefix, mac)
+                if len(self._templates) > 256:
+                    self._templates.popitem(last=False)
+            else:
+                self._templates.move_to_end(key)
+            return template
+
+    def sign(self, static: Optional[dict] = None, dynamic: Optional[dict] = None) -> str:
+        """Query string firmada: prefijo estático precalculado + sufijo con timestamp"""
+        template = self._template(static or {})
+        suffix = urllib.parse.urlencode(dict(dynamic or {}, recvWindow=self.recv_window,
+                                             timestamp=int(time.time() * 1000)))
+        mac = template.mac.copy()
+        mac.update(suffix.encode('utf-8'))
+        return f"{template.prefix}{suffix}&signature={mac.hexdigest()}"
+
+    # --- Peticiones ------------------------------------------------------------------
+    def request(self, method: str, endpoint: str, static: Optional[dict] = None,
+                dynamic: Optional[dict] = None, label: Optional[str] = None,
+                api_prefix: Optional[str] = None) -> dict:
+        """Petición firmada; devuelve {'success', 'data'|'error', 'latency_ms'}"""
+        url = f"{self.base_url}{api_prefix or self.api_prefix}{endpoint}?{self.sign(static, dynamic)}"
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=self.timeout)
+            latency_ms = (time.perf_counter() - started) * 1000.0
+            self.latency[label or f"{method} {endpoint}"].record(latency_ms)
+            try:
+                data = response.json()
+            except ValueError:
+                data = {'msg': response.text[:200]}
+            if response.status_code == 200:
+                return {'success': True, 'data': data, 'latency_ms': latency_ms}
+            error = f"{response.status_code} [{data.get('code')}] {data.get('msg')}" if isinstance(data, dict) else str(data)
+            logger.error(f"Error en petición Binance {endpoint}: {error}")
+            return {'success': False, 'error': error, 'latency_ms': latency_ms}
+        except Exception as e:
+            logger.error(f"Error en petición Binance: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def user_stream(self, method: str, listen_key: Optional[str] = None) -> dict:
+        """listenKey del stream de usuario (solo API key, sin firma): POST crea, PUT renueva, DELETE cierra"""
+        endpoint = '/listenKey' if self.is_futures else '/userDataStream'
+        params = {'listenKey': listen_key} if listen_key else None
+        try:
+            response = self.session.request(method, f"{self.base_url}{self.api_prefix}{endpoint}",
+                                            params=params, timeout=self.timeout)
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+        if response.status_code == 200:
+            return {'success': True, 'data': data}
+        if isinstance(data, dict):
+            return {'success': False, 'error': f"{response.status_code} [{data.get('code')}] {data.get('msg')}"}
+        return {'success': False, 'error': f"{response.status_code}"}
+
+    def place_order(self, static: dict, dynamic: dict) -> dict:
+        return self.request('POST', '/order', static, dynamic, label='order')
+
+    def cancel_order(self, symbol: str, order_id) -> dict:
+        return self.request('DELETE', '/order', {'symbol': symbol}, {'orderId': order_id}, label='cancel')
+
+    def _executor(self):
+        if self._pool is None:
+            import concurrent.futures
+            self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.pool_size,
+                                                               thread_name_prefix="OrderGateway")
+        return self._pool
+
+    def place_entry_with_stop(self, entry: Tuple[dict, dict],
+                              stop: Union[Tuple[dict, dict], Callable[[dict], Tuple[dict, dict]]]) -> dict:
+        """
+        Entrada + stop protector. Futuros: una sola petición batchOrders (o ambas en paralelo
+        si ORDER_GATEWAY_FUTURES_BATCH=False). Spot: el stop necesita el saldo de la entrada
+        ya ejecutada, así que va justo después por la misma sesión caliente; si `stop` es
+        invocable se construye con la respuesta de la entrada (precio real de ejecución).
+        Devuelve también 'stop_params' con los parámetros del stop realmente enviado.
+        """
+        started = time.perf_counter()
+        if self.is_futures and getattr(self.config, 'ORDER_GATEWAY_FUTURES_BATCH', True):
+            orders = [dict(entry[0], **entry[1]), dict(stop[0], **stop[1])]
+            batch = self.request('POST', '/batchOrders', None,
+                                 {'batchOrders': json.dumps(orders, separators=(',', ':'))}, label='batchOrders')
+            if batch['success'] and isinstance(batch['data'], list) and len(batch['data']) == 2:
+                results = []
+                for item in batch['data']:
+                    if isinstance(item, dict) and 'code' in item and 'orderId' not in item:
+                        results.append({'success': False, 'error': f"[{item.get('code')}] {item.get('msg')}"})
+                    else:
+                        results.append({'success': True, 'data': item})
+                entry_result, stop_result = results
+            else:
+                entry_result = stop_result = {'success': False, 'error': batch.get('error', 'Respuesta batch inválida')}
+        elif self.is_futures:
+            pool = self._executor()
+            entry_future = pool.submit(self.place_order, *entry)
+            stop_future = pool.submit(self.place_order, *stop)
+            entry_result, stop_result = entry_future.result(), stop_future.result()
+        else:
+            entry_result = self.place_order(*entry)
+            if entry_result['success']:
+                if callable(stop):
+                    stop = stop(entry_result['data'])
+                stop_result = self.place_order(*stop)
+            else:
+                stop_result = {'success': False, 'error': 'Entrada no ejecutada'}
+        total_ms = (time.perf_counter() - started) * 1000.0
+        self.latency['entry+stop'].record(total_ms)
+        return {'entry': entry_result, 'stop': stop_result, 'latency_ms': total_ms,
+                'stop_params': None if callable(stop) else stop}
+
+    # --- Conexiones calientes ------------------------------------------------------------
+    def warm(self, connections: Optional[int] = None) -> int:
+        """Abre/renueva conexiones keep-alive con pings concurrentes; devuelve pings correctos"""
+        connections = min(self.pool_size, connections or self.pool_size)
+        url = f"{self.base_url}{self.api_prefix}/ping"
+
+        def _ping(_):
+            try:
+                return self.session.get(url, timeout=self.timeout).status_code == 200
+            except Exception:
+                return False
+
+        return sum(self._executor().map(_ping, range(connections)))
+
+    def start_keepalive(self, interval: Optional[float] = None):
+        if self._keepalive_thread is not None and self._keepalive_thread.is_alive():
+            return
+        interval = float(interval or getattr(self.config, 'ORDER_GATEWAY_KEEPALIVE_S', 30))
+
+        def _loop():
+            self.warm()
+            while not self._keepalive_stop.wait(interval):
+                self.warm(2)  # Entrada + stop concurrentes: dos sockets listos
+
+        self._keepalive_stop.clear()
+        self._keepalive_thread = threading.Thread(target=_loop, daemon=True, name="OrderGatewayKeepalive")
+        self._keepalive_thread.start()
+
+    def close(self):
+        self._keepalive_stop.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        self.session.close()
+
+    def get_metrics(self) -> dict:
+        return {label: histogram.snapshot() for label, histogram in list(self.latency.items())}
+
+
+class OrderUpdate(NamedTuple):
+    """Ejecución normalizada del stream de usuario (ORDER_TRADE_UPDATE futuros / executionReport spot)"""
+    symbol: str
+    order_id: int
+    client_order_id: str
+    side: str
+    order_type: str  # Tipo original (ot): un STOP_MARKET disparado sigue siendo STOP_MARKET
+    status: str
+    filled_qty: float
+    avg_price: float
+    reduce_only: bool
+    event_time: int
+
+    @classmethod
+    def from_event(cls, event: dict) -> Optional['OrderUpdate']:
+        if event.get('e') == 'ORDER_TRADE_UPDATE':
+            o = event.get('o', {})
+            avg_price = float(o.get('ap') or 0) or float(o.get('L') or 0)
+            return cls(o.get('s', ''), int(o.get('i', 0)), o.get('c', ''), o.get('S', ''),
+                       o.get('ot') or o.get('o', ''), o.get('X', ''), float(o.get('z') or 0), avg_price,
+                       bool(o.get('R')) or bool(o.get('cp')), int(event.get('E', 0)))
+        if event.get('e') == 'executionReport':
+            filled = float(event.get('z') or 0)
+            avg_price = float(event.get('Z') or 0) / filled if filled else float(event.get('L') or 0)
+            return cls(event.get('s', ''), int(event.get('i', 0)), event.get('c', ''), event.get('S', ''),
+                       event.get('o', ''), event.get('X', ''), filled, avg_price, False, int(event.get('E', 0)))
+        return None
+
+
+class BinanceStreamConnection(abc.ABC):
+    """
+    Conexión WebSocket persistente a Binance en un hilo propio: reconecta con retroceso
+    exponencial (0.5s → 30s, se reinicia tras una conexión estable) hasta stop().
+    Las subclases resuelven la URL en cada intento y procesan los eventos ya parseados.
+    """
+    thread_name = "BinanceStream"
+
+    def __init__(self, config):
+        self.config = config
+        self.ws = None
+        self.connected = False
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.metrics = {'events': 0, 'connections': 0, 'errors': 0, 'last_event_lag_ms': None}
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=self.thread_name)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._drop_connection()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=5)
+
+    def _drop_connection(self):
+        # Desde otro hilo: close() puede cerrar el socket con run_forever aún en select y dejarlo
+        # bloqueado; abort() hace shutdown y despierta al lector al instante
+        ws = self.ws
+        sock = ws.sock if ws is not None else None
+        if sock is not None:
+            ws.keep_running = False
+            try:
+                sock.send_close()
+                sock.abort()
+            except Exception:
+                pass
+
+    def send_json(self, payload: dict) -> bool:
+        ws = self.ws
+        if ws is None or not self.connected:
+            return False
+        try:
+            ws.send(json.dumps(payload))
+            return True
+        except Exception as e:
+            logger.debug(f"No se pudo enviar por {self.thread_name}: {e}")
+            return False
+
+    @abc.abstractmethod
+    def _connect_url(self) -> Optional[str]:
+        """URL del intento de conexión actual (None: reintentar más tarde)"""
+
+    @abc.abstractmethod
+    def _handle_event(self, ws, event):
+        """Evento JSON ya parseado"""
+
+    def _after_open(self, ws):
+        pass
+
+    def _run(self):
+        delay = 0.5
+        while not self._stop_event.is_set():
+            url = self._connect_url()
+            if not url:
+                self._stop_event.wait(delay)
+                delay = min(delay * 2, 30.0)
+                continue
+            self.ws = websocket.WebSocketApp(url, on_open=self._on_open, on_message=self._on_message,
+                                             on_error=self._on_error, on_close=self._on_close)
+            started = time.monotonic()
+            self.ws.run_forever()
+            self.connected = False
+            if self._stop_event.is_set():
+                break
+            if time.monotonic() - started > 60:
+                delay = 0.5  # Conexión estable: el retroceso vuelve a empezar
+            logger.warning(f"⚠️ {self.thread_name} desconectado. Reconectando en {delay:.1f}s")
+            self._stop_event.wait(delay)
+            delay = min(delay * 2, 30.0)
+
+    def _on_open(self, ws):
+        self.connected = True
+        self.metrics['connections'] += 1
+        self._after_open(ws)
+
+    def _on_message(self, ws, message):
+        try:
+            event = json.loads(message)
+        except ValueError:
+            self.metrics['errors'] += 1
+            return
+        self.metrics['events'] += 1
+        if isinstance(event, dict) and event.get('E'):
+            self.metrics['last_event_lag_ms'] = time.time() * 1000.0 - event['E']
+        try:
+            self._handle_event(ws, event)
+        except Exception as e:
+            self.metrics['errors'] += 1
+            logger.error(f"Error procesando evento de {self.thread_name}: {e}")
+
+    def _on_error(self, ws, error):
+        self.metrics['errors'] += 1
+        logger.debug(f"Error en {self.thread_name}: {error}")
+
+    def _on_close(self, ws, code, reason):
+        self.connected = False
+
+    def get_metrics(self) -> dict:
+        return dict(self.metrics, connected=self.connected)
+
+
+class BinanceUserDataStream(BinanceStreamConnection):
+    """
+    Stream de datos de usuario (listenKey): Binance empuja ejecuciones y cambios de posición
+    en milisegundos, sin sondear REST. El listenKey se renueva con PUT periódico; si expira o
+    cae la conexión se pide uno nuevo al reconectar.
+    """
+    thread_name = "UserDataStream"
+
+    def __init__(self, config, gateway: BinanceOrderGateway, ws_url: str, on_event: Callable[[dict], None]):
+        super().__init__(config)
+        self.gateway = gateway
+        self.ws_url = ws_url.rstrip('/')
+        self.on_event = on_event
+        self.keepalive_interval = float(getattr(config, 'USER_STREAM_KEEPALIVE_S', 1800))
+        self.listen_key = None
+        self._keepalive_thread = None
+        self.metrics.update(listen_keys=0, keepalives=0)
+
+    def start(self):
+        super().start()
+        if self._keepalive_thread is None or not self._keepalive_thread.is_alive():
+            self._keepalive_thread = threading.Thread(target=self._keepalive_loop, daemon=True,
+                                                      name="UserDataKeepalive")
+            self._keepalive_thread.start()
+
+    def stop(self):
+        super().stop()
+        if self.listen_key:
+            self.gateway.user_stream('DELETE', self.listen_key)
+            self.listen_key = None
+        logger.info("⏹️ Stream de usuario detenido")
+
+    def _connect_url(self) -> Optional[str]:
+        result = self.gateway.user_stream('POST')
+        listen_key = result.get('data', {}).get('listenKey') if result['success'] else None
+        if not listen_key:
+            logger.warning(f"⚠️ No se pudo obtener listenKey: {result.get('error')}")
+            return None
+        self.listen_key = listen_key
+        self.metrics['listen_keys'] += 1
+        return f"{self.ws_url}/{listen_key}"
+
+    def _keepalive_loop(self):
+        while not self._stop_event.wait(self.keepalive_interval):
+            if not self.listen_key or not self.connected:
+                continue
+            result = self.gateway.user_stream('PUT', self.listen_key)
+            if result['success']:
+                self.metrics['keepalives'] += 1
+            else:
+                logger.warning(f"⚠️ Keepalive de listenKey fallido ({result.get('error')}) - renovando stream")
+                self._drop_connection()
+
+    def _after_open(self, ws):
+        logger.info("✅ Stream de usuario conectado (ejecuciones y posiciones en tiempo real)")
+
+    def _handle_event(self, ws, event):
+        if event.get('e') == 'listenKeyExpired':
+            logger.warning("⚠️ listenKey expirado - renovando stream de usuario")
+            ws.close()
+            return
+        self.on_event(event)
+
+
+class BinancePriceTickStream(BinanceStreamConnection):
+    """Ticks de último precio (aggTrade) de los símbolos suscritos; altas/bajas con SUBSCRIBE en caliente"""
+    thread_name = "PriceTickStream"
+
+    def __init__(self, config, ws_url: str, on_tick: Callable[[str, float], None]):
+        super().__init__(config)
+        self.ws_url = ws_url.rstrip('/')
+        self.on_tick = on_tick
+        self.symbols = set()
+        self._request_id = 0
+        self._symbols_lock = threading.Lock()
+
+    def _send_subscription(self, method: str, symbols) -> bool:
+        if not symbols:
+            return True
+        self._request_id += 1
+        return self.send_json({'method': method, 'params': [f"{s.lower()}@aggTrade" for s in sorted(symbols)],
+                               'id': self._request_id})
+
+    def subscribe(self, symbol: str):
+        with self._symbols_lock:
+            if symbol in self.symbols:
+                return
+            self.symbols.add(symbol)
+        self._send_subscription('SUBSCRIBE', [symbol])  # Desconectado: se suscribe al reconectar
+
+    def unsubscribe(self, symbol: str):
+        with self._symbols_lock:
+            if symbol not in self.symbols:
+                return
+            self.symbols.discard(symbol)
+        self._send_subscription('UNSUBSCRIBE', [symbol])
+
+    def _connect_url(self) -> Optional[str]:
+        return self.ws_url
+
+    def _after_open(self, ws):
+        with self._symbols_lock:
+            symbols = list(self.symbols)
+        self._send_subscription('SUBSCRIBE', symbols)
+
+    def _handle_event(self, ws, event):
+        if event.get('e') == 'aggTrade':
+            self.on_tick(event['s'], float(event['p']))
+
+
+class AsyncStreamConnection(BinanceStreamConnection):
+    """
+    BinanceStreamConnection como corrutina del runtime backend (aiohttp): mismos ganchos
+    (_connect_url/_handle_event/_after_open) y retroceso 0.5s → 30s, sin hilo propio.
+    start() se llama desde el event loop; stop() y send_json() son thread-safe.
+    """
+    _loop = None
+    _task = None
+
+    def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self._stop_event.clear()
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run_async(), name=self.thread_name)
+
+    def stop(self):
+        self._stop_event.set()
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # Loop ya cerrado
+
+    def send_json(self, payload: dict) -> bool:
+        ws, loop = self.ws, self._loop
+        if ws is None or not self.connected:
+            return False
+        try:
+            asyncio.run_coroutine_threadsafe(ws.send_str(json.dumps(payload)), loop)
+            return True
+        except RuntimeError as e:
+            logger.debug(f"No se pudo enviar por {self.thread_name}: {e}")
+            return False
+
+    async def _run_async(self):
+        delay = 0.5
+        session = aiohttp.ClientSession(headers={'User-Agent': 'CryptoBotPro/35.0'})
+        try:
+            while not self._stop_event.is_set():
+                url = self._connect_url()
+                if not url:
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 30.0)
+                    continue
+                started = time.monotonic()
+                try:
+                    async with session.ws_connect(url, heartbeat=30) as ws:
+                        self.ws = ws
+                        self._on_open(ws)
+                        async for message in ws:
+                            if message.type == aiohttp.WSMsgType.TEXT:
+                                self._on_message(ws, message.data)
+                            elif message.type == aiohttp.WSMsgType.ERROR:
+                                self._on_error(ws, ws.exception())
+                                break
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._on_error(None, e)
+                finally:
+                    self.ws = None
+                    self.connected = False
+                if self._stop_event.is_set():
+                    break
+                if time.monotonic() - started > 60:
+                    delay = 0.5  # Conexión estable: el retroceso vuelve a empezar
+                logger.warning(f"⚠️ {self.thread_name} desconectado. Reconectando en {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+        finally:
+            await session.close()
+
+
+class AsyncPriceTickStream(AsyncStreamConnection, BinancePriceTickStream):
+    """BinancePriceTickStream (aggTrade, SUBSCRIBE en caliente) sobre el event loop del runtime"""
+
+
+class AsyncKlineStream(AsyncStreamConnection):
+    """
+    Velas de un lote de símbolos por stream combinado (/stream?streams=...). Entrega solo
+    velas cerradas, con el mismo formato que RobustWebSocketManager para el callback del bot.
+    """
+    thread_name = "KlineStream"
+
+    def __init__(self, config, ws_base: str, symbols: List[str], interval: str, on_update: Callable[[dict], None]):
+        super().__init__(config)
+        self.symbols = list(symbols)
+        streams = "/".join(f"{symbol.lower()}@kline_{interval}" for symbol in self.symbols)
+        self.url = f"{ws_base.rstrip('/')}/stream?streams={streams}"
+        self.on_update = on_update
+
+    def _connect_url(self) -> Optional[str]:
+        return self.url
+
+    def _after_open(self, ws):
+        logger.info(f"📡 {self.thread_name}: {len(self.symbols)} símbolos conectados")
+
+    def _handle_event(self, ws, event):
+        kline = event.get('data', {}).get('k')
+        if kline and kline.get('x'):
+            self.on_update({'symbol': kline['s'],
+                            'kline': {key: kline[key] for key in ('t', 'o', 'h', 'l', 'c', 'v', 'i', 'x')}})
+
+
 class BinanceTestnetOrderExecutor:
     """Ejecutor de órdenes para Binance Testnet (SPOT y PERPETUALS)"""
 
     def __init__(self, config):
         self.config = config
         self.session = requests.Session() if REQUESTS_AVAILABLE else None
+        self._gateway = None
+        self._gateway_key = None
         self._update_base_url()
 
     def _update_base_url(self):
@@ -9227,59 +12361,62 @@ class BinanceTestnetOrderExecutor:
             if self.config.MARKET_TYPE == "PERPETUALS":
                 self.base_url = self.config.BINANCE_TESTNET_FUTURES_URL
                 self.api_prefix = "/fapi/v1"
+                self.ws_url = getattr(self.config, 'BINANCE_TESTNET_FUTURES_WS_URL', "wss://stream.binancefuture.com/ws")
             else:
                 self.base_url = self.config.BINANCE_TESTNET_SPOT_URL
                 self.api_prefix = "/api/v3"
+                self.ws_url = getattr(self.config, 'BINANCE_TESTNET_SPOT_WS_URL', "wss://testnet.binance.vision/ws")
         else:
             if self.config.MARKET_TYPE == "PERPETUALS":
                 self.base_url = "https://fapi.binance.com"
                 self.api_prefix = "/fapi/v1"
+                self.ws_url = "wss://fstream.binance.com/ws"
             else:
                 self.base_url = "https://api.binance.com"
                 self.api_prefix = "/api/v3"
+                self.ws_url = "wss://stream.binance.com:9443/ws"
 
-    def _generate_signature(self, params: dict) -> str:
-        """Generar firma HMAC SHA256 para autenticación"""
-        import hmac
-        import hashlib
-        query_string = '&'.join([f"{k}={v}" for k, v in sorted(params.items())])
-        signature = hmac.new(
-            self.config.binance_secret_key.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
-
-    def _make_signed_request(self, method: str, endpoint: str, params: dict = None) -> dict:
-        """Hacer petición firmada a Binance"""
-        if params is None:
-            params = {}
-
-        params['timestamp'] = int(time.time() * 1000)
-        params['recvWindow'] = 5000
-        params['signature'] = self._generate_signature(params)
-
-        url = f"{self.base_url}{self.api_prefix}{endpoint}"
-        headers = {'X-MBX-APIKEY': self.config.binance_api_key}
+    def get_gateway(self) -> Optional[BinanceOrderGateway]:
+        """Gateway caliente del endpoint/credenciales activos (se recrea si cambian)"""
+        self._update_base_url()
+        if not REQUESTS_AVAILABLE:
+            return None
+        key = (self.base_url, self.api_prefix, self.config.binance_api_key, self.config.binance_secret_key)
+        if self._gateway is None or self._gateway_key != key:
+            if self._gateway is not None:
+                self._gateway.close()
+            self._gateway = BinanceOrderGateway(self.config, self.base_url, self.api_prefix,
+                                                self.config.binance_api_key, self.config.binance_secret_key)
+            self._gateway_key = key
+            self._gateway.start_keepalive()
+        return self._gateway
+
+    def open_user_stream(self, on_event: Callable[[dict], None]) -> Optional[BinanceUserDataStream]:
+        """Inicia el stream de usuario del endpoint activo (None si no hay websocket o credenciales)"""
+        if not WEBSOCKET_AVAILABLE or not self.config.binance_api_key:
+            return None
+        gateway = self.get_gateway()
+        if gateway is None:
+            return None
+        stream = BinanceUserDataStream(self.config, gateway, self.ws_url, on_event)
+        stream.start()
+        return stream
 
-        try:
-            if self.session:
-                if method == 'GET':
-                    response = self.session.get(url, params=params, headers=headers, timeout=10)
-                elif method == 'POST':
-                    response = self.session.post(url, params=params, headers=headers, timeout=10)
-                elif method == 'DELETE':
-                    response = self.session.delete(url, params=params, headers=headers, timeout=10)
-                else:
-                    return {'success': False, 'error': f'Unknown method: {method}'}
+    def open_price_stream(self, on_tick: Callable[[str, float], None]) -> Optional[BinancePriceTickStream]:
+        """Inicia el stream de ticks (aggTrade) del mercado activo (None si no hay websocket)"""
+        if not WEBSOCKET_AVAILABLE:
+            return None
+        self._update_base_url()
+        stream = BinancePriceTickStream(self.config, self.ws_url, on_tick)
+        stream.start()
+        return stream
 
-                response.raise_for_status()
-                return {'success': True, 'data': response.json()}
-            else:
-                return {'success': False, 'error': 'No session available'}
-        except Exception as e:
-            logger.error(f"Error en petición Binance: {e}")
-            return {'success': False, 'error': str(e)}
+    def _make_signed_request(self, method: str, endpoint: str, params: dict = None) -> dict:
+        """Hacer petición firmada a Binance (sesión keep-alive y HMAC precalculado del gateway)"""
+        gateway = self.get_gateway()
+        if gateway is None:
+            return {'success': False, 'error': 'No session available'}
+        return gateway.request(method, endpoint, dynamic=params)
 
     def get_account_balance(self) -> dict:
         """Obtener balance de la cuenta"""
@@ -9290,35 +12427,53 @@ class BinanceTestnetOrderExecutor:
             result = self._make_signed_request('GET', '/account')
         return result
 
+    def get_open_orders(self) -> Optional[list]:
+        """Órdenes abiertas de todos los símbolos; None si el exchange no responde"""
+        result = self._make_signed_request('GET', '/openOrders')
+        if result.get('success') and isinstance(result.get('data'), list):
+            return result['data']
+        return None
+
+    def get_position_amounts(self) -> Optional[Dict[str, float]]:
+        """Futuros: tamaño de posición neto por símbolo (positionRisk). None en spot o si falla"""
+        if self.config.MARKET_TYPE != "PERPETUALS":
+            return None
+        gateway = self.get_gateway()
+        if gateway is None:
+            return None
+        result = gateway.request('GET', '/positionRisk', api_prefix='/fapi/v2', label='positions')
+        if not result.get('success') or not isinstance(result.get('data'), list):
+            return None
+        amounts = defaultdict(float)
+        for position in result['data']:
+            amounts[position.get('symbol')] += float(position.get('positionAmt') or 0)
+        return dict(amounts)
+
+    def metadata(self) -> ExchangeMetadataService:
+        """exchangeInfo compartido del endpoint activo (real/testnet, spot/futuros)"""
+        self._update_base_url()
+        return get_exchange_metadata(self.config, self.base_url, self.api_prefix)
+
+    def get_symbol_filters(self, symbol: str) -> Optional[SymbolFilters]:
+        return self.metadata().get(symbol)
+
     def get_symbol_precision(self, symbol: str) -> tuple:
-        """Obtener precisión de cantidad y precio para un símbolo"""
+        """Obtener precisión de cantidad y precio para un símbolo (índice en memoria, sin red)"""
         try:
-            self._update_base_url()
-            url = f"{self.base_url}{self.api_prefix}/exchangeInfo"
-            if self.session:
-                response = self.session.get(url, params={'symbol': symbol}, timeout=10)
-                data = response.json()
-                for sym in data.get('symbols', []):
-                    if sym['symbol'] == symbol:
-                        qty_precision = sym.get('quantityPrecision', 3)
-                        price_precision = sym.get('pricePrecision', 2)
-                        for f in sym.get('filters', []):
-                            if f['filterType'] == 'LOT_SIZE':
-                                step = f.get('stepSize', '0.001')
-                                qty_precision = len(step.rstrip('0').split('.')[-1]) if '.' in step else 0
-                            if f['filterType'] == 'PRICE_FILTER':
-                                tick = f.get('tickSize', '0.01')
-                                price_precision = len(tick.rstrip('0').split('.')[-1]) if '.' in tick else 0
-                        return (qty_precision, price_precision)
+            filters = self.get_symbol_filters(symbol)
+            if filters is not None:
+                return (filters.qty_precision, filters.price_precision)
         except Exception as e:
             logger.error(f"Error obteniendo precisión de {symbol}: {e}")
         return (3, 2)  # Valores por defecto
 
     def calculate_quantity(self, symbol: str, usdt_amount: float, current_price: float) -> float:
-        """Calcular cantidad basada en monto USDT y precio actual"""
-        qty_precision, _ = self.get_symbol_precision(symbol)
+        """Calcular cantidad basada en monto USDT y precio actual (ajustada a stepSize)"""
         quantity = usdt_amount / current_price
-        return round(quantity, qty_precision)
+        filters = self.get_symbol_filters(symbol)
+        if filters is not None:
+            return filters.floor_quantity(quantity)
+        return round(quantity, 3)
 
     def calculate_effective_margin(self) -> float:
         """Wrapper que usa el leverage configurado (para compatibilidad)"""
@@ -9410,32 +12565,72 @@ class BinanceTestnetOrderExecutor:
         is_testnet = mode == 'testnet'
         return f"{'🧪 TESTNET' if is_testnet else '💰 REAL'}"
 
-    def execute_market_order(self, symbol: str, side: str, quantity: float) -> dict:
-        """Ejecutar orden MARKET"""
-        self._update_base_url()
-        qty_precision, _ = self.get_symbol_precision(symbol)
-        formatted_qty = f"{quantity:.{qty_precision}f}"
+    def _market_order_params(self, symbol: str, side: str, quantity: float,
+                             reference_price: float = 0.0) -> Tuple[Optional[Tuple[dict, dict]], Optional[str]]:
+        """((estáticos, dinámicos), error) de una orden MARKET ya ajustada a los filtros del símbolo"""
+        filters = self.get_symbol_filters(symbol)
+        if filters is not None:
+            formatted_qty = filters.format_quantity(quantity)
+            # Rechazo local: sin ida y vuelta a Binance para una orden que fallaría por filtros
+            rejection = filters.check_order(float(formatted_qty), reference_price)
+            if rejection:
+                return None, rejection
+        else:
+            formatted_qty = f"{quantity:.3f}"
+        static = {'symbol': symbol, 'side': side.upper(), 'type': 'MARKET'}
+        if self.config.MARKET_TYPE == "PERPETUALS":
+            static['newOrderRespType'] = 'RESULT'  # El ack trae avgPrice de la ejecución
+        return (static, {'quantity': formatted_qty}), None
+
+    def _stop_order_params(self, symbol: str, side: str, quantity: float, stop_price: float) -> Tuple[dict, dict]:
+        """(estáticos, dinámicos) del stop protector para una posición abierta con `side`"""
+        filters = self.get_symbol_filters(symbol)
+        if filters is not None:
+            formatted_qty = filters.format_quantity(quantity)
+            formatted_price = filters.format_price(stop_price)
+        else:
+            formatted_qty = f"{quantity:.3f}"
+            formatted_price = f"{stop_price:.2f}"
 
-        params = {
-            'symbol': symbol,
-            'side': side.upper(),
-            'type': 'MARKET',
-            'quantity': formatted_qty
-        }
+        sl_side = 'SELL' if side.upper() == 'BUY' else 'BUY'
+
+        if self.config.MARKET_TYPE == "PERPETUALS":
+            # reduceOnly: al enmendar conviven dos stops un instante y ninguno puede abrir posición inversa
+            static = {'symbol': symbol, 'side': sl_side, 'type': 'STOP_MARKET', 'reduceOnly': 'true'}
+            dynamic = {'quantity': formatted_qty, 'stopPrice': formatted_price}
+        else:
+            static = {'symbol': symbol, 'side': sl_side, 'type': 'STOP_LOSS_LIMIT', 'timeInForce': 'GTC'}
+            dynamic = {'quantity': formatted_qty, 'stopPrice': formatted_price, 'price': formatted_price}
+        return static, dynamic
+
+    @staticmethod
+    def _fill_price(order_data: dict) -> float:
+        if order_data.get('fills'):
+            return float(order_data['fills'][0].get('price', 0))
+        if order_data.get('avgPrice'):
+            return float(order_data['avgPrice'])
+        return 0.0
+
+    def execute_market_order(self, symbol: str, side: str, quantity: float, reference_price: float = 0.0) -> dict:
+        """Ejecutar orden MARKET"""
+        params, rejection = self._market_order_params(symbol, side, quantity, reference_price)
+        if rejection:
+            logger.error(f"❌ Orden MARKET rechazada localmente: {rejection}")
+            return {'success': False, 'error': rejection}
+        gateway = self.get_gateway()
+        if gateway is None:
+            return {'success': False, 'error': 'No session available'}
+        formatted_qty = params[1]['quantity']
 
         logger.info(f"📤 Ejecutando MARKET {side} {formatted_qty} {symbol} en {'TESTNET' if self.config.use_testnet else 'LIVE'}")
 
-        result = self._make_signed_request('POST', '/order', params)
+        result = gateway.place_order(*params)
 
         if result['success']:
             order_data = result['data']
-            fill_price = 0.0
-            if order_data.get('fills'):
-                fill_price = float(order_data['fills'][0].get('price', 0))
-            elif order_data.get('avgPrice'):
-                fill_price = float(order_data['avgPrice'])
+            fill_price = self._fill_price(order_data)
 
-            logger.info(f"✅ Orden ejecutada: {order_data.get('orderId')} @ {fill_price}")
+            logger.info(f"✅ Orden ejecutada: {order_data.get('orderId')} @ {fill_price} ({result['latency_ms']:.0f}ms)")
             return {
                 'success': True,
                 'order_id': order_data.get('orderId'),
@@ -9449,36 +12644,14 @@ class BinanceTestnetOrderExecutor:
 
     def place_stop_loss_order(self, symbol: str, side: str, quantity: float, stop_price: float) -> dict:
         """Colocar orden Stop Loss"""
-        self._update_base_url()
-        qty_precision, price_precision = self.get_symbol_precision(symbol)
-        formatted_qty = f"{quantity:.{qty_precision}f}"
-        formatted_price = f"{stop_price:.{price_precision}f}"
-
-        sl_side = 'SELL' if side.upper() == 'BUY' else 'BUY'
-
-        if self.config.MARKET_TYPE == "PERPETUALS":
-            params = {
-                'symbol': symbol,
-                'side': sl_side,
-                'type': 'STOP_MARKET',
-                'quantity': formatted_qty,
-                'stopPrice': formatted_price,
-                'closePosition': 'false'
-            }
-        else:
-            params = {
-                'symbol': symbol,
-                'side': sl_side,
-                'type': 'STOP_LOSS_LIMIT',
-                'quantity': formatted_qty,
-                'stopPrice': formatted_price,
-                'price': formatted_price,
-                'timeInForce': 'GTC'
-            }
+        gateway = self.get_gateway()
+        if gateway is None:
+            return {'success': False, 'error': 'No session available'}
+        static, dynamic = self._stop_order_params(symbol, side, quantity, stop_price)
 
-        logger.info(f"📤 Colocando SL {sl_side} {formatted_qty} {symbol} @ {formatted_price}")
+        logger.info(f"📤 Colocando SL {static['side']} {dynamic['quantity']} {symbol} @ {dynamic['stopPrice']}")
 
-        result = self._make_signed_request('POST', '/order', params)
+        result = gateway.place_order(static, dynamic)
 
         if result['success']:
             order_data = result['data']
@@ -9486,17 +12659,68 @@ class BinanceTestnetOrderExecutor:
             return {
                 'success': True,
                 'order_id': order_data.get('orderId'),
-                'stop_price': float(formatted_price)
+                'stop_price': float(dynamic['stopPrice'])
             }
         else:
             logger.error(f"❌ Error colocando SL: {result.get('error')}")
             return result
 
+    def open_position_with_stop(self, symbol: str, side: str, quantity: float, stop_price: float,
+                                reference_price: float = 0.0) -> dict:
+        """Entrada MARKET + stop protector por el gateway (batch en futuros)"""
+        entry, rejection = self._market_order_params(symbol, side, quantity, reference_price)
+        if rejection:
+            logger.error(f"❌ Orden MARKET rechazada localmente: {rejection}")
+            return {'success': False, 'error': rejection}
+        gateway = self.get_gateway()
+        if gateway is None:
+            return {'success': False, 'error': 'No session available'}
+        if self.config.MARKET_TYPE == "PERPETUALS":
+            # Entrada y stop salen juntos: el stop va sobre el precio de referencia
+            stop = self._stop_order_params(symbol, side, quantity, stop_price)
+        else:
+            # Spot: el stop sale tras la ejecución, así que se recalcula sobre el precio real
+            # manteniendo la distancia porcentual pedida (-MILESTONE_1% en el SL inicial)
+            def stop(order_data: dict) -> Tuple[dict, dict]:
+                fill_price = self._fill_price(order_data)
+                price = stop_price
+                if fill_price > 0 and reference_price > 0:
+                    price = stop_price * fill_price / reference_price
+                return self._stop_order_params(symbol, side, quantity, price)
+        result = gateway.place_entry_with_stop(entry, stop)
+        entry_result, stop_result = result['entry'], result['stop']
+        if not entry_result['success']:
+            logger.error(f"❌ Error ejecutando orden: {entry_result.get('error')}")
+            if stop_result['success']:
+                # Futuros: el stop reduceOnly quedó vivo sin posición que proteger
+                orphan_id = stop_result['data'].get('orderId')
+                logger.warning(f"⚠️ Entrada fallida en {symbol}: cancelando stop huérfano {orphan_id}")
+                self.cancel_order(symbol, orphan_id)
+            return {'success': False, 'error': entry_result.get('error'), 'latency_ms': result['latency_ms']}
+        stop = result['stop_params']
+        order_data = entry_result['data']
+        response = {
+            'success': True,
+            'order_id': order_data.get('orderId'),
+            'fill_price': self._fill_price(order_data),
+            'quantity': float(entry[1]['quantity']),
+            'status': order_data.get('status'),
+            'sl_success': stop_result['success'],
+            'sl_order_id': stop_result['data'].get('orderId') if stop_result['success'] else None,
+            'stop_price': float(stop[1]['stopPrice']),
+            'latency_ms': result['latency_ms']
+        }
+        if not stop_result['success']:
+            logger.error(f"❌ Error colocando SL: {stop_result.get('error')}")
+        logger.info(f"⚡ Entrada + SL {symbol} en {result['latency_ms']:.0f}ms")
+        return response
+
     def cancel_order(self, symbol: str, order_id: str) -> bool:
         """Cancelar orden existente"""
-        self._update_base_url()
-        params = {'symbol': symbol, 'orderId': order_id}
-        result = self._make_signed_request('DELETE', '/order', params)
+        gateway = self.get_gateway()
+        if gateway is None:
+            return False
+        result = gateway.cancel_order(symbol, order_id)
         if result['success']:
             logger.info(f"✅ Orden {order_id} cancelada")
             return True
@@ -9504,15 +12728,23 @@ class BinanceTestnetOrderExecutor:
         return False
 
     def update_trailing_stop(self, symbol: str, trade_state: 'AutoTradeState', new_sl_price: float) -> dict:
-        """Actualizar trailing stop (cancelar anterior y crear nuevo)"""
-        if trade_state.stop_loss_order_id:
-            self.cancel_order(symbol, trade_state.stop_loss_order_id)
+        """
+        Actualizar trailing stop. Futuros: nuevo stop (reduceOnly) primero y luego se cancela el
+        anterior, sin instante desprotegido. Spot: el saldo está bloqueado por el stop anterior,
+        así que se cancela primero.
+        """
+        previous_id = trade_state.stop_loss_order_id
+        place_first = self.config.MARKET_TYPE == "PERPETUALS"
+        if previous_id and not place_first:
+            self.cancel_order(symbol, previous_id)
 
         result = self.place_stop_loss_order(
             symbol, trade_state.side, trade_state.quantity, new_sl_price
         )
 
         if result['success']:
+            if previous_id and place_first:
+                self.cancel_order(symbol, previous_id)
             trade_state.stop_loss_order_id = result['order_id']
             trade_state.current_sl = new_sl_price
             trade_state.last_sl_update = datetime.now()
@@ -9521,6 +12753,125 @@ class BinanceTestnetOrderExecutor:
         return result
 
 
+class TrailingStopEngine:
+    """
+    Trailing stop por eventos: cada tick de precio evalúa breakeven/trailing del trade activo
+    del símbolo en el hilo del stream (sin esperar a ningún ciclo de monitoreo). Un único hilo
+    aplica las enmiendas de SL en el exchange: como mucho una por símbolo cada
+    TRAILING_AMEND_MIN_INTERVAL_S (el breakeven no espera), mejorando al menos TRAILING_STEP,
+    y la enmienda pendiente más reciente reemplaza a las anteriores.
+    """
+    def __init__(self, order_manager: 'BinanceOrderManager', config):
+        self.order_manager = order_manager
+        self.config = config
+        self.min_interval = float(getattr(config, 'TRAILING_AMEND_MIN_INTERVAL_S', 5.0))
+        self.price_stream = None
+        self._pending = {}  # {symbol: (new_sl, reason, urgent)}
+        self._last_amend = {}  # {symbol: monotonic de la última enmienda}
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self.stats = {'ticks': 0, 'amendments': 0, 'coalesced': 0, 'skipped': 0, 'failed': 0}
+
+    def watch(self, symbol: str):
+        """Suscribe ticks del símbolo (arranca stream y worker la primera vez)"""
+        with self._cond:
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._amend_worker, daemon=True, name="TrailingStopEngine")
+                self._thread.start()
+        if self.price_stream is None:
+            self.price_stream = self.order_manager.testnet_executor.open_price_stream(self.on_tick)
+        if self.price_stream is not None:
+            self.price_stream.subscribe(symbol)
+
+    def unwatch(self, symbol: str):
+        if self.price_stream is not None:
+            self.price_stream.unsubscribe(symbol)
+        with self._cond:
+            self._pending.pop(symbol, None)
+            self._last_amend.pop(symbol, None)
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self.price_stream is not None:
+            self.price_stream.stop()
+            self.price_stream = None
+
+    def on_tick(self, symbol: str, price: float):
+        """Evalúa reglas sobre el precio; solo encola, nunca llama al exchange desde aquí"""
+        self.stats['ticks'] += 1
+        if price <= 0:
+            return
+        # Las reglas mutan el AutoTradeState que el journal serializa: evaluar bajo el lock
+        # del gestor (cálculo puro, sin red)
+        with self.order_manager.lock:
+            trade = self.order_manager.active_trades.get(symbol)
+            if trade is None:
+                return
+            was_breakeven = trade.breakeven_activated
+            should_update, new_sl, reason = trade.should_update_trailing_sl(price)
+            urgent = trade.breakeven_activated and not was_breakeven
+        if not (should_update and new_sl):
+            return
+        with self._cond:
+            previous = self._pending.get(symbol)
+            if previous is not None:
+                self.stats['coalesced'] += 1
+                urgent = urgent or previous[2]
+            self._pending[symbol] = (new_sl, reason, urgent)
+            self._cond.notify()
+
+    def _improves(self, trade: 'AutoTradeState', new_sl: float) -> bool:
+        min_step = trade.entry_price * trade.trailing_step / 100
+        if trade.side == 'BUY':
+            return new_sl >= trade.current_sl + min_step
+        return new_sl <= trade.current_sl - min_step
+
+    def _due_symbols(self, now: float) -> Tuple[list, Optional[float]]:
+        due, wait = [], None
+        for symbol, (_, _, urgent) in self._pending.items():
+            ready_at = self._last_amend.get(symbol, float('-inf')) + self.min_interval
+            if urgent or ready_at <= now:
+                due.append(symbol)
+            else:
+                wait = ready_at - now if wait is None else min(wait, ready_at - now)
+        return due, wait
+
+    def _amend_worker(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    due, wait = self._due_symbols(time.monotonic())
+                    if due:
+                        break
+                    self._cond.wait(wait)
+                if not self._running:
+                    return
+                batch = [(symbol, self._pending.pop(symbol)) for symbol in due]
+            for symbol, (new_sl, reason, urgent) in batch:
+                trade = self.order_manager.active_trades.get(symbol)
+                if trade is None or (not urgent and not self._improves(trade, new_sl)):
+                    self.stats['skipped'] += 1
+                    continue
+                with self._cond:
+                    self._last_amend[symbol] = time.monotonic()
+                result = self.order_manager.update_stop_loss(symbol, new_sl)
+                if result.get('success'):
+                    self.stats['amendments'] += 1
+                    logger.info(f"📊 {symbol}: {reason}")
+                else:
+                    self.stats['failed'] += 1
+
+    def get_stats(self) -> dict:
+        stats = dict(self.stats, pending=len(self._pending))
+        if self.price_stream is not None:
+            stats['stream'] = self.price_stream.get_metrics()
+        return stats
+
+
 class BinanceOrderManager:
     """Gestor de órdenes para Binance con soporte de Trailing Stop"""
 
@@ -9528,23 +12879,22 @@ class BinanceOrderManager:
         self.config = config
         self.client = binance_client
         self.active_trades = {}  # {symbol: AutoTradeState}
-        self.lock = threading.Lock()
-        self.symbol_info_cache = {}
+        self.lock = threading.RLock()  # Reentrante: monitor_trailing_stops → update_stop_loss
         self.testnet_executor = BinanceTestnetOrderExecutor(config)  # Ejecutor testnet
+        self.user_stream = None  # Stream de usuario: fills/stops/liquidaciones sin sondeo REST
+        self.closed_trades = deque(maxlen=100)
+        self.trade_listeners = []  # callback(evento, symbol, info) - 'entry_filled', 'closed', 'stop_lost'
+        self.trailing_engine = TrailingStopEngine(self, config)  # Trailing por tick, enmiendas limitadas
+        self.journal = None  # StateJournal: los trades abiertos sobreviven a un reinicio
 
     def set_client(self, client):
         """Establecer cliente Binance"""
         self.client = client
 
-    def _get_symbol_info(self, symbol: str) -> dict:
-        """Obtener información del símbolo (filtros, precisión, etc.)"""
-        if symbol in self.symbol_info_cache:
-            return self.symbol_info_cache[symbol]
+    def _get_symbol_info(self, symbol: str) -> Optional[SymbolFilters]:
+        """Filtros del símbolo desde el exchangeInfo compartido (sin petición por orden)"""
         try:
-            if self.client:
-                info = self.client.get_exchange_info(symbol)
-                self.symbol_info_cache[symbol] = info
-                return info
+            return self.testnet_executor.get_symbol_filters(symbol)
         except Exception as e:
             logger.error(f"Error obteniendo info de {symbol}: {e}")
         return None
@@ -9553,18 +12903,14 @@ class BinanceOrderManager:
         """Formatear cantidad según precisión del símbolo"""
         info = self._get_symbol_info(symbol)
         if info:
-            step_size = info.get('stepSize', '0.001')
-            precision = len(step_size.rstrip('0').split('.')[-1]) if '.' in step_size else 0
-            return f"{quantity:.{precision}f}"
+            return info.format_quantity(quantity)
         return f"{quantity:.6f}"
 
     def _format_price(self, symbol: str, price: float) -> str:
         """Formatear precio según precisión del símbolo"""
         info = self._get_symbol_info(symbol)
         if info:
-            tick_size = info.get('tickSize', '0.00001')
-            precision = len(tick_size.rstrip('0').split('.')[-1]) if '.' in tick_size else 0
-            return f"{price:.{precision}f}"
+            return info.format_price(price)
         return f"{price:.8f}"
 
     def execute_market_order(self, symbol: str, side: str, quantity: float) -> dict:
@@ -9662,20 +13008,12 @@ class BinanceOrderManager:
 
             trade = self.active_trades[symbol]
 
-            # Cancelar SL anterior
-            if trade.stop_loss_order_id:
-                self.cancel_order(symbol, trade.stop_loss_order_id)
-
-            # Crear nuevo SL
-            result = self.place_stop_loss_order(
-                symbol, trade.side, trade.quantity, new_sl_price
-            )
+            # Reemplazar SL por el gateway (futuros: nuevo primero, luego cancelar el anterior)
+            result = self.testnet_executor.update_trailing_stop(symbol, trade, new_sl_price)
 
             if result['success']:
-                trade.stop_loss_order_id = result['order_id']
-                trade.current_sl = new_sl_price
-                trade.last_sl_update = datetime.now()
-                logger.info(f"🔄 SL actualizado para {symbol}: {new_sl_price:.8f}")
+                trade.current_sl = result['stop_price']
+                self._journal_trade(trade)
 
             return result
 
@@ -9686,11 +13024,18 @@ class BinanceOrderManager:
             if symbol in self.active_trades:
                 return {'success': False, 'error': 'Trade already active for symbol'}
 
+            if not self.config.auto_trading_enabled:
+                logger.warning("⚠️ Auto-trading deshabilitado")
+                return {'success': False, 'error': 'Auto-trading disabled'}
+
             # Crear estado de trade
             trade_state = AutoTradeState(symbol, side, entry_price, quantity, self.config)
 
-            # Ejecutar orden de entrada
-            entry_result = self.execute_market_order(symbol, side, quantity)
+            # Entrada + SL inicial en un solo viaje (el SL se calcula sobre el precio de referencia:
+            # en futuros ambas órdenes salen juntas, antes de conocer el precio de ejecución)
+            entry_result = self.testnet_executor.open_position_with_stop(
+                symbol, side, quantity, trade_state.current_sl, reference_price=entry_price
+            )
 
             if not entry_result['success']:
                 return entry_result
@@ -9698,25 +13043,19 @@ class BinanceOrderManager:
             # Actualizar precio real de entrada
             if entry_result.get('fill_price'):
                 trade_state.entry_price = entry_result['fill_price']
-                # Recalcular SL con precio real
-                milestone1 = getattr(self.config, 'MILESTONE_1', 1.0)
-                if side == 'BUY':
-                    trade_state.current_sl = trade_state.entry_price * (1 - milestone1 / 100)
-                else:
-                    trade_state.current_sl = trade_state.entry_price * (1 + milestone1 / 100)
 
             trade_state.entry_order_id = entry_result['order_id']
+            trade_state.quantity = entry_result['quantity']
 
-            # Colocar Stop Loss inicial
-            sl_result = self.place_stop_loss_order(
-                symbol, side, quantity, trade_state.current_sl
-            )
-
-            if sl_result['success']:
-                trade_state.stop_loss_order_id = sl_result['order_id']
+            if entry_result['sl_success']:
+                trade_state.stop_loss_order_id = entry_result['sl_order_id']
+                trade_state.current_sl = entry_result['stop_price']
 
             # Registrar trade activo
             self.active_trades[symbol] = trade_state
+            self._journal_trade(trade_state)
+            self.ensure_user_stream()
+            self.trailing_engine.watch(symbol)
 
             logger.info(f"🚀 Auto-trade abierto: {side} {quantity} {symbol} @ {trade_state.entry_price}")
             logger.info(f"   SL: {trade_state.current_sl:.8f} | TP: {trade_state.take_profit:.8f}")
@@ -9725,7 +13064,8 @@ class BinanceOrderManager:
                 'success': True,
                 'trade_state': trade_state,
                 'entry_order_id': trade_state.entry_order_id,
-                'sl_order_id': trade_state.stop_loss_order_id
+                'sl_order_id': trade_state.stop_loss_order_id,
+                'latency_ms': entry_result.get('latency_ms')
             }
 
     def close_auto_trade(self, symbol: str, reason: str = 'manual') -> dict:
@@ -9738,35 +13078,214 @@ class BinanceOrderManager:
 
             # Cancelar órdenes pendientes
             if trade.stop_loss_order_id:
-                self.cancel_order(symbol, trade.stop_loss_order_id)
+                self.testnet_executor.cancel_order(symbol, trade.stop_loss_order_id)
             if trade.take_profit_order_id:
-                self.cancel_order(symbol, trade.take_profit_order_id)
+                self.testnet_executor.cancel_order(symbol, trade.take_profit_order_id)
 
-            # Cerrar posición (orden opuesta)
+            # Cerrar posición (orden opuesta) por el gateway, igual que la entrada
             close_side = 'SELL' if trade.side == 'BUY' else 'BUY'
-            close_result = self.execute_market_order(symbol, close_side, trade.quantity)
+            close_result = self.testnet_executor.execute_market_order(symbol, close_side, trade.quantity)
 
             if close_result['success']:
                 del self.active_trades[symbol]
+                self._journal_trade_closed(symbol)
+                self.trailing_engine.unwatch(symbol)
                 logger.info(f"✅ Auto-trade cerrado: {symbol} | Razón: {reason}")
 
-            return close_result
+            return close_result
+
+    def monitor_trailing_stops(self, price_updates: dict):
+        """Precios externos (p. ej. REST sin websocket) al motor de trailing, como si fueran ticks"""
+        for symbol, current_price in price_updates.items():
+            if current_price:
+                self.trailing_engine.on_tick(symbol, current_price)
+
+    # --- Stream de usuario -------------------------------------------------------------
+    def ensure_user_stream(self) -> Optional[BinanceUserDataStream]:
+        """Arranca el stream de usuario si está habilitado y aún no corre"""
+        if self.user_stream is None and getattr(self.config, 'USER_STREAM_ENABLED', True):
+            self.user_stream = self.testnet_executor.open_user_stream(self.handle_user_event)
+        return self.user_stream
+
+    def stop_user_stream(self):
+        if self.user_stream is not None:
+            self.user_stream.stop()
+            self.user_stream = None
+
+    def stop_streams(self):
+        """Detiene stream de usuario y motor de trailing (ticks + enmiendas)"""
+        self.stop_user_stream()
+        self.trailing_engine.stop()
+
+    def add_trade_listener(self, callback: Callable[[str, str, dict], None]):
+        self.trade_listeners.append(callback)
+
+    def _notify(self, event: str, symbol: str, info: dict):
+        for callback in list(self.trade_listeners):
+            try:
+                callback(event, symbol, info)
+            except Exception as e:
+                logger.error(f"Error en listener de trades ({event} {symbol}): {e}")
+
+    def handle_user_event(self, event: dict):
+        """Evento del stream de usuario (ORDER_TRADE_UPDATE / executionReport / ACCOUNT_UPDATE)"""
+        event_type = event.get('e')
+        if event_type == 'ACCOUNT_UPDATE':
+            self._on_account_update(event)
+            return
+        update = OrderUpdate.from_event(event)
+        if update is not None:
+            self._on_order_update(update)
 
-    def monitor_trailing_stops(self, price_updates: dict):
-        """Monitorear y actualizar Trailing Stops basado en precios actuales"""
+    def _on_account_update(self, event: dict):
         with self.lock:
-            for symbol, trade in list(self.active_trades.items()):
-                current_price = price_updates.get(symbol)
-                if not current_price:
+            for position in event.get('a', {}).get('P', []):
+                trade = self.active_trades.get(position.get('s'))
+                if trade is None:
                     continue
+                amount = float(position.get('pa') or 0)
+                trade.position_amount = amount
+                if amount:
+                    trade.quantity = abs(amount)
+                    if float(position.get('ep') or 0):
+                        trade.entry_price = float(position['ep'])
+                self._journal_trade(trade)
+
+    def _on_order_update(self, update: OrderUpdate):
+        notifications = []
+        with self.lock:
+            trade = self.active_trades.get(update.symbol)
+            if trade is None:
+                return
+            filled = update.status == 'FILLED'
+            if update.order_id == trade.entry_order_id:
+                if update.filled_qty and update.status in ('FILLED', 'PARTIALLY_FILLED'):
+                    trade.entry_price = update.avg_price or trade.entry_price
+                    trade.quantity = update.filled_qty
+                if filled and not trade.entry_confirmed:
+                    trade.entry_confirmed = True
+                    logger.info(f"✅ Entrada confirmada por el exchange: {update.symbol} "
+                                f"{trade.quantity} @ {trade.entry_price}")
+                    notifications.append(('entry_filled', {'price': trade.entry_price, 'quantity': trade.quantity}))
+                    self._journal_trade(trade)
+            elif update.order_id == trade.stop_loss_order_id:
+                if filled:
+                    notifications.append(self._finalize_trade(trade, 'stop_loss', update))
+                elif update.status in ('CANCELED', 'EXPIRED', 'REJECTED'):
+                    # Cancelación ajena (update_stop_loss reemplaza el id bajo este mismo lock)
+                    logger.warning(f"⚠️ SL de {update.symbol} {update.status} en el exchange - posición sin protección")
+                    trade.stop_loss_order_id = None
+                    self._journal_trade(trade)
+                    notifications.append(('stop_lost', {'status': update.status, 'order_id': update.order_id}))
+            elif filled and update.order_id == trade.take_profit_order_id:
+                notifications.append(self._finalize_trade(trade, 'take_profit', update))
+            elif filled and update.client_order_id.startswith(('autoclose', 'adl_autoclose')):
+                reason = 'adl' if update.client_order_id.startswith('adl') else 'liquidation'
+                notifications.append(self._finalize_trade(trade, reason, update))
+            elif filled and (update.reduce_only or trade.position_amount == 0 or
+                             (update.side != trade.side and update.filled_qty >= trade.quantity)):
+                notifications.append(self._finalize_trade(trade, 'external', update))
+        for event, info in notifications:
+            self._notify(event, update.symbol, info)
+        if any(event == 'closed' for event, _ in notifications) and trade.take_profit_order_id \
+                and update.order_id != trade.take_profit_order_id:
+            self.testnet_executor.cancel_order(update.symbol, trade.take_profit_order_id)
+
+    def _finalize_trade(self, trade: AutoTradeState, reason: str, update: OrderUpdate) -> tuple:
+        """Cierre confirmado por el exchange: sale de active_trades (llamar con self.lock)"""
+        self.active_trades.pop(trade.symbol, None)
+        self._journal_trade_closed(trade.symbol)
+        self.trailing_engine.unwatch(trade.symbol)
+        exit_price = update.avg_price
+        info = {
+            'reason': reason,
+            'exit_price': exit_price,
+            'profit_pct': trade.calculate_profit_percent(exit_price) if exit_price else None,
+            'order_id': update.order_id,
+            'latency_ms': time.time() * 1000.0 - update.event_time if update.event_time else None,
+            'trade': trade
+        }
+        self.closed_trades.append(info)
+        profit = f"{info['profit_pct']:+.2f}%" if info['profit_pct'] is not None else "n/d"
+        logger.info(f"🏁 Trade {trade.symbol} cerrado por el exchange ({reason}) @ {exit_price} | {profit}")
+        return 'closed', info
+
+    # --- Diario de estado y recuperación ------------------------------------------------
+    def set_journal(self, journal: Optional[StateJournal]):
+        self.journal = journal
 
-                should_update, new_sl, reason = trade.should_update_trailing_sl(current_price)
+    def _journal_trade(self, trade: AutoTradeState):
+        if self.journal is not None:
+            self.journal.put('trade', trade.symbol, trade.to_record())
 
-                if should_update and new_sl:
-                    # Actualizar SL en Binance
-                    result = self.update_stop_loss(symbol, new_sl)
-                    if result['success']:
-                        logger.info(f"📊 {symbol}: {reason}")
+    def _journal_trade_closed(self, symbol: str):
+        if self.journal is not None:
+            self.journal.delete('trade', symbol)
+
+    def recover_trades(self) -> dict:
+        """
+        Trades abiertos del diario, conciliados con el exchange antes de retomarlos:
+        - Futuros: posición plana (positionRisk) → el trade se cerró con el bot caído.
+        - Spot: su stop ya no está abierto → se ejecutó (o se canceló) con el bot caído.
+        - Posición viva sin stop abierto → se vuelve a colocar el stop protector.
+        Sin respuesta del exchange se confía en el diario y el stream de usuario concilia después.
+        """
+        summary = {'restored': 0, 'closed_offline': 0, 'stop_replaced': 0, 'unverified': False}
+        if self.journal is None:
+            return summary
+        records = self.journal.records('trade')
+        if not records:
+            return summary
+        open_orders = self.testnet_executor.get_open_orders()
+        positions = self.testnet_executor.get_position_amounts()
+        summary['unverified'] = open_orders is None
+        needs_stop = []
+        with self.lock:
+            for symbol, data in records.items():
+                if symbol in self.active_trades:
+                    continue
+                try:
+                    trade = AutoTradeState.from_record(data, self.config)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.error(f"❌ Trade {symbol} del diario descartado: {e}")
+                    self._journal_trade_closed(symbol)
+                    continue
+                if open_orders is not None:
+                    order_ids = {o.get('orderId') for o in open_orders if o.get('symbol') == symbol}
+                    stop_open = trade.stop_loss_order_id in order_ids
+                    amount = positions.get(symbol, 0.0) if positions is not None else None
+                    if amount == 0 or (amount is None and trade.stop_loss_order_id and not stop_open):
+                        logger.warning(f"♻️ Trade {symbol} cerrado mientras el bot estaba detenido")
+                        self._journal_trade_closed(symbol)
+                        self.closed_trades.append({'reason': 'closed_offline', 'exit_price': None,
+                                                   'profit_pct': None, 'order_id': None, 'latency_ms': None,
+                                                   'trade': trade})
+                        if trade.take_profit_order_id in order_ids:
+                            self.testnet_executor.cancel_order(symbol, trade.take_profit_order_id)
+                        summary['closed_offline'] += 1
+                        continue
+                    if amount:
+                        trade.position_amount = amount
+                        trade.quantity = abs(amount)
+                    if not stop_open:
+                        trade.stop_loss_order_id = None
+                        needs_stop.append(trade)
+                self.active_trades[symbol] = trade
+                self.trailing_engine.watch(symbol)
+                summary['restored'] += 1
+                logger.info(f"♻️ Trade restaurado: {trade.side} {trade.quantity} {symbol} @ {trade.entry_price} "
+                            f"| SL {trade.current_sl:.8f}")
+        for trade in needs_stop:
+            result = self.testnet_executor.place_stop_loss_order(trade.symbol, trade.side, trade.quantity,
+                                                                 trade.current_sl)
+            with self.lock:
+                if result.get('success') and self.active_trades.get(trade.symbol) is trade:
+                    trade.stop_loss_order_id = result['order_id']
+                    summary['stop_replaced'] += 1
+                self._journal_trade(trade)
+        if self.active_trades:
+            self.ensure_user_stream()
+        return summary
 
     def get_active_trade(self, symbol: str) -> AutoTradeState:
         """Obtener estado de trade activo"""
@@ -9804,23 +13323,35 @@ class OptimizedTradingBot:
 
         # ✅ CRÍTICO: Cargar configuración antes de inicializar módulos
         self.config.load_config()
+        # Recarga en caliente: los bucles calientes leen el snapshot vigente (config.settings)
+        self.config_watcher = None
+        if getattr(self.config, 'CONFIG_WATCH_ENABLED', True) and isinstance(self.config, AdvancedTradingConfig):
+            self.config_watcher = ConfigWatcher(self.config)
+            self.config.add_settings_listener(self._on_settings_changed)
 
         # 4️⃣ CUARTO: Inicializar módulos que DEPENDEN de `config` (orden crítico)
         self.similarity_engine = SimilarityEngine(self.config)  # ✔️ Usa config + carpetas ya creadas
         self.similarity_engine._bot_ref = self  # ✅ Referencia para auto-retrain después de 5 trades exitosos
         self.client = BinanceFIXClient(config)  # ✅ FIX API wrapper - deshabilita WebSocket si está activo
-        self.neural_trader = OptimizedNeuralTrader(config)
-        self.technical_analyzer = OptimizedTechnicalAnalyzer(config)
+        # Modelo + scaler se cargan en segundo plano mientras se inicializa el resto
+        self.model_registry = get_model_registry(config)
+        self.model_registry.start_loading()
+        self.retrain_service = BackgroundRetrainService(config, lambda: self.neural_trader)
+        self.technical_analyzer = get_shared_technical_analyzer(config)
         self.strategy_impl = OptimizedStrategyImplementation(config)
         self.telegram_client = OptimizedTelegramClient(config)
         # ✅ Pasar flag disable_websocket al chart_generator para excluir WebSocket si FIX_API activo
         self.chart_generator = SignalChartGenerator(disable_websocket=getattr(self.client, 'disable_websocket', False))
+        self.chart_generator.retention_max_mb = getattr(config, 'CHART_DIR_MAX_MB', 200)
+        self.chart_generator.retention_max_files = getattr(config, 'CHART_DIR_MAX_FILES', 500)
+        self.chart_service = ChartRenderService(config)  # Render en proceso aparte + caché
         self.data_manager = OptimizedDataManager()
         self.signal_processor = OptimizedSignalProcessor(config)
 
         self.trend_alignment_validator = TrendAlignmentValidator(self.config)
         self.signal_tracker = SignalTracker(self.config)  # ✅ Pasar config para PROFIT_MILESTONES
         self.signal_tracker.on_closed_callback = self._on_signal_closed_callback
+        self.signal_tracker.on_promoted_callback = self._on_signal_promoted
         self.signal_tracker._similarity_engine_ref = self.similarity_engine # ✅ REFERENCIA A SIMILARITY ENGINE PARA GUARDAR TRADES
         self.signal_tracker.set_bot_reference(self)  # ✅ INYECCIÓN CRÍTICA
         # ✅ INYECCI��N DEL CLIENTE
@@ -9828,6 +13359,18 @@ class OptimizedTradingBot:
         print(f"📡 [INIT] Telegram: enabled={self.config.telegram_enabled}, client={self.telegram_client is not None}")
         # ✅ GESTOR DE ÓRDENES PARA AUTO-TRADING
         self.order_manager = BinanceOrderManager(self.config, self.client)
+        # exchangeInfo: una carga masiva al arrancar (disco primero) para no pedirlo en cada orden
+        self.order_manager.testnet_executor.metadata().start_loading()
+        # Diario de estado: señales en seguimiento y trades abiertos sobreviven a un reinicio
+        self.state_journal = None
+        self._state_recovered = False
+        if getattr(self.config, 'STATE_JOURNAL_ENABLED', True):
+            self.state_journal = StateJournal(
+                getattr(self.config, 'STATE_DIR', os.path.join(DATA_ROOT, 'state')),
+                snapshot_every=getattr(self.config, 'STATE_SNAPSHOT_EVERY', 200),
+                fsync=getattr(self.config, 'STATE_JOURNAL_FSYNC', True))
+            self.signal_tracker.set_journal(self.state_journal)
+            self.order_manager.set_journal(self.state_journal)
         # Inicializar sistemas avanzados
         self.threshold_manager = None
         self.multi_exchange_manager = None
@@ -9864,8 +13407,8 @@ class OptimizedTradingBot:
             'volatility_score': 0.0,
             'processing_time_ms': 0
         }
-        # Queue para comunicación con GUI optimizada (Se asignará en la GUI)
-        self.gui_queue = queue.Queue(maxsize=100)
+        # Bus de eventos para comunicación con GUI optimizada (la GUI lo drena por frame)
+        self.gui_bus = GuiEventBus(config)
         self._current_analyzed_symbol_for_gui = None
         self.total_symbols_to_analyze = len(self.config.TRADING_SYMBOLS)
         self.symbols_analyzed_count = 0
@@ -9873,6 +13416,9 @@ class OptimizedTradingBot:
         # Gestores optimizados
         self.symbol_scanner = None
         self.ws_manager = None
+        self.signal_price_feed = None  # aggTrade de los símbolos en seguimiento (SignalTracker)
+        self.analysis_executor = AnalysisExecutor(self._analyze_symbol_optimized, self.config)
+        self.backend_runtime = None  # BackendRuntime (asyncio) cuando corre sin GUI
 
         # ✅ FILTRO DE DATOS: Blacklist para pares con datos insuficientes
         self._data_failure_blacklist = {}  # {symbol: {'failures': count, 'last_attempt': timestamp}}
@@ -9882,7 +13428,25 @@ class OptimizedTradingBot:
 
         # ✅ CRÍTICO: NO entrenar aquí - esto causa errores 451 de Binance en init
         # El entrenamiento se hace DESPUÉS de que el GUI esté listo (en startup())
-        self._neural_training_pending = not self.neural_trader.is_trained
+
+    @property
+    def neural_trader(self):
+        """
+        Trader del registro de modelos, o None si aún no está disponible. El hilo principal
+        (GUI / event loop) nunca espera; el resto espera a la carga como máximo MODEL_READY_TIMEOUT.
+        """
+        if threading.current_thread() is threading.main_thread():
+            return self.model_registry.peek_trader()
+        return self.model_registry.get_trader(timeout=getattr(self.config, 'MODEL_READY_TIMEOUT', 60))
+
+    @neural_trader.setter
+    def neural_trader(self, trader):
+        self.model_registry.set_trader(trader)
+
+    @property
+    def _neural_training_pending(self) -> bool:
+        trader = self.model_registry.peek_trader()
+        return trader is None or not trader.is_trained
 
     def _initialize_new_systems(self):
         """Inicializar sistemas de Umbrales Dinámicos y Multi-Exchange"""
@@ -9975,24 +13539,26 @@ class OptimizedTradingBot:
                     logger.error(f"Error al reanudar escaneo: {e}")
 
 
+    def _check_daily_retrain(self, last_retrain_date):
+        """Lanza el reentrenamiento diario si ya pasó RETRAIN_HOUR (UTC) hoy; devuelve la fecha del último"""
+        now = datetime.utcnow()
+        target_time = now.replace(hour=self.config.RETRAIN_HOUR, minute=0, second=0, microsecond=0)
+        if now >= target_time and (last_retrain_date is None or last_retrain_date != now.date()):
+            logger.info(f"🕐 Iniciando reentrenamiento diario programado ({self.config.RETRAIN_HOUR}:00 UTC)...")
+            try:
+                # El entrenamiento corre en el proceso worker; aquí solo se agenda
+                self.retrain_service.submit(reason='daily')
+                last_retrain_date = now.date()
+            except Exception as e:
+                logger.error(f"[ERROR] Falló reentrenamiento diario: {e}", exc_info=True)
+        return last_retrain_date
+
     def _start_daily_retrain_scheduler(self):
         """Inicia hilo que chequea cada hora si es hora de reentrenar."""
         def check_and_retrain():
             last_retrain_date = None
             while self.running:
-                now = datetime.utcnow()
-                target_time = now.replace(hour=self.config.RETRAIN_HOUR, minute=0, second=0, microsecond=0)
-                if now >= target_time and (last_retrain_date is None or last_retrain_date != now.date()):
-                    logger.info(f"🕐 Iniciando reentrenamiento diario programado ({self.config.RETRAIN_HOUR}:00 UTC)...")
-                    try:
-                        success = self.neural_trader.train_with_successful_only()
-                        if success:
-                            logger.info("✅ Reentrenamiento diario completado exitosamente.")
-                        else:
-                            logger.warning("⚠️ Reentrenamiento diario omitido: insuficientes trades exitosos.")
-                        last_retrain_date = now.date()
-                    except Exception as e:
-                        logger.error(f"[ERROR] Falló reentrenamiento diario: {e}", exc_info=True)
+                last_retrain_date = self._check_daily_retrain(last_retrain_date)
                 time.sleep(3600)  # chequear cada hora
 
         threading.Thread(target=check_and_retrain, daemon=True, name="RetrainScheduler").start()
@@ -10108,320 +13674,334 @@ class OptimizedTradingBot:
        ✅ Seguimiento por etapas: 1%, 2%, 3%, -1%, 180 min, reversión
        ✅ Promoción REAL: DESTACADA → CONFIRMADA (IA + Técnico + Alineación 15-30m)
        ✅ Cierra automáticamente y libera recursos
-       ✅ CORRECCIÓN #1: Timer de promoción integrado
+       ✅ Promoción por tiempo y timeouts: plazos del SignalTracker (_on_signal_promoted), sin sondeo
         """
-        last_promotion_check = 0
-        PROMOTION_CHECK_INTERVAL = 15  # Verificar promoción cada 15 segundos
-
         while self.running:
             try:
                 time.sleep(2)  # ciclo cada 2 segundos
                 logger.debug("🔄 [MONITOR] Ciclo de monitoreo iniciado")
+                self._monitor_pass()
 
-                # CORRECCION v35: VERIFICAR TIMER DE PROMOCION Y ENVIAR TELEGRAM
-                current_time = time.time()
-                if current_time - last_promotion_check >= PROMOTION_CHECK_INTERVAL:
-                    processed = self.signal_tracker.check_promotion_timer()
-                    for signal_hash, promo_data in processed:
-                        if promo_data.get('promoted'):
-                            symbol = promo_data.get('symbol', 'UNKNOWN')
-                            signal_data = promo_data.get('signal_data', {})
-                            logger.info(f"Timer promocion: {symbol} promovida a CONFIRMADA")
-                            
-                            # Generar grafico y enviar Telegram para CONFIRMADA
-                            try:
-                                chart_path = None
-                                if hasattr(self, 'chart_generator') and self.chart_generator:
-                                    df_chart = self.data_manager.get_data(symbol, "15m", 200, self.client)
-                                    if df_chart is not None and len(df_chart) > 20:
-                                        analysis = signal_data.get('validation_result', {})
-                                        chart_path = self.chart_generator.generate_signal_chart(
-                                            symbol, df_chart, signal_data, analysis
-                                        )
-                                        if chart_path:
-                                            signal_data['chart_path'] = chart_path
-                                            logger.info(f"Grafico generado para CONFIRMADA (timer): {chart_path}")
-                                
-                                # Enviar Telegram CONFIRMADA
-                                if self.telegram_client and self.config.telegram_enabled:
-                                    self.telegram_client.send_promotion_update(
-                                        symbol=symbol,
-                                        profit_percent=0.0,
-                                        chart_path=chart_path,
-                                        signal_data=signal_data
-                                    )
-                                    logger.info(f"Telegram CONFIRMADA enviado para {symbol} (via timer)")
-                                    
-                                # Actualizar GUI
-                                self._safe_gui_queue_put(('update_confirmed_progress', {
-                                    'symbol': symbol,
-                                    'profit_percent': 0.0
-                                }))
-                                self._safe_gui_queue_put(('log_message', f"CONFIRMADA: {symbol} promovida via timer"))
-                            except Exception as e:
-                                logger.error(f"Error enviando Telegram CONFIRMADA (timer): {e}")
-                    last_promotion_check = current_time
-
-                # ---------- 1. Obtener señal activa (thread-safe) ----------
-                tracked_signals = self.signal_tracker.get_tracked_signals()
-                if not tracked_signals:
-                    self._safe_gui_queue_put(('update_highlight_progress', 0))
-                    continue
+            except SystemExit as e:
+                logger.critical(f"🛑 SYSTEM EXIT DETECTADO: {e}")
+                raise
+            except Exception as e:
+                logger.error(f"❌ [MONITOR] Error en _monitor_tracked_signals_continuous: {e}", exc_info=True)
+                import traceback
+                logger.error(f"📋 Traceback completo:\n{traceback.format_exc()}")
+                time.sleep(5)  # Evita bucles rápidos en caso de error crítico
 
-                try:
-                    signal_hash, tracking_data = next(iter(list(tracked_signals.items())))
-                except (StopIteration, RuntimeError):
-                    self._safe_gui_queue_put(('update_highlight_progress', 0))
-                    continue
+    def _monitor_pass(self):
+        """Una pasada del monitor: señales activas (thread-safe), cada una en su propio paso"""
+        tracked_signals = self.signal_tracker.get_tracked_signals()
+        if not tracked_signals:
+            self._safe_gui_queue_put(('update_highlight_progress', 0))
+            return
 
-                symbol = tracking_data['signal_data'].get('symbol', 'N/A')
-                # ✅ CRÍTICO: Leer status ACTUAL directamente del tracker (no de la copia)
-                with self.signal_tracker.lock:
-                    live_tracking = self.signal_tracker.tracked_signals.get(signal_hash, {})
-                    status = live_tracking.get('status', tracking_data.get('status', 'DESCONOCIDA'))
-                logger.debug(f"🎯 [MONITOR] Símbolo: {symbol}, Status: {status}")
-
-                # ---------- 2. Actualizar precio y progreso ----------
-                current_price = self.client.get_ticker_price(symbol)
-                if current_price <= 1e-8:                     # 🔒 Protección contra precio inválido
-                    logger.debug(f"⚠️ Precio inválido para {symbol} - reintentando en próximo ciclo")
-                    continue  # ✅ CORREGIDO: Reintentar en lugar de cerrar señal
-
-                 # Cambiar a método privado o agregar método público
-                progress = self.signal_tracker.update_signal_progress(signal_hash, current_price)
-                if not progress:
-                    continue
+        for signal_hash, tracking_data in tracked_signals.items():
+            try:
+                self._monitor_tracked_signal(signal_hash, tracking_data)
+            except Exception as e:
+                logger.error(f"❌ [MONITOR] Error monitorizando {tracking_data.symbol}: {e}", exc_info=True)
+
+    def _on_signal_promoted(self, signal_hash: str, promo_data: dict):
+        """Plazo de promoción vencido (hilo de plazos del SignalTracker): Telegram y GUI en otro hilo"""
+        if self.backend_runtime is not None:
+            self.backend_runtime.offload(self._notify_signal_promoted, signal_hash, promo_data)
+            return
+        threading.Thread(target=self._notify_signal_promoted, args=(signal_hash, promo_data),
+                         daemon=True, name="PromotionNotify").start()
 
-                profit_percent = progress['profit_percent']
-                logger.debug(f"📈 [MONITOR] {symbol} Profit: {profit_percent:+.2f}%")
+    def _notify_signal_promoted(self, signal_hash: str, promo_data: dict):
+        symbol = promo_data.get('symbol', 'UNKNOWN')
+        signal_data = promo_data.get('signal_data', {})
+        logger.info(f"Timer promocion: {symbol} promovida a CONFIRMADA")
 
-                # ---------- 3. Barra de progreso DESTACADA (15-20 min) ----------
-                if status == 'DESTACADA':
-                    start_time = tracking_data.get('highlight_start_time') or tracking_data.get('start_time')
-                    if not start_time:
-                        logger.debug("⏭️  No hay start_time en DESTACADA – saltando barra")
-                        self._safe_gui_queue_put(('update_highlight_progress', 0))
-                    else:
-                        elapsed_seconds = (datetime.now() - start_time).total_seconds()
-                        promo_time = self.config.MIN_PROMOTION_TIME_SECONDS
-                        elapsed_percent = min(100, (elapsed_seconds / promo_time) * 100)
+        # Generar grafico (worker) y enviar Telegram para CONFIRMADA al terminar
+        try:
+            def _send_confirmed(chart_image, symbol=symbol, signal_data=signal_data):
+                if chart_image and chart_image.path:
+                    signal_data['chart_path'] = chart_image.path
+                    # promo_data trae una copia: la ruta también va a la señal seguida (milestones)
+                    record = self.signal_tracker.get_signal(signal_hash)
+                    if record is not None:
+                        record['signal_data']['chart_path'] = chart_image.path
+                    logger.info(f"Grafico generado para CONFIRMADA (timer): {chart_image.path}")
+                if self.telegram_client and self.config.telegram_enabled:
+                    self.telegram_client.send_promotion_update(
+                        symbol=symbol,
+                        profit_percent=0.0,
+                        chart_image=chart_image,
+                        signal_data=signal_data,
+                        signal_hash=signal_hash
+                    )
+                    logger.info(f"Telegram CONFIRMADA enviado para {symbol} (via timer)")
+
+            df_chart = None
+            if getattr(self, 'chart_service', None):
+                df_chart = self.data_manager.get_data(symbol, "15m", 200, self.client)
+            if df_chart is not None and len(df_chart) > 20:
+                self.chart_service.render_then(symbol, df_chart, signal_data, _send_confirmed, chain_key=signal_hash)
+            elif getattr(self, 'chart_service', None):
+                self.chart_service.deliver_after(signal_hash, _send_confirmed)
+            else:
+                _send_confirmed(None)
 
-                        # ---------- 4. Promoción: Por TIEMPO (15 min) o Por UMBRALES ----------
-                        neural = tracking_data['signal_data'].get('neural_score', 0)
-                        technical = tracking_data['signal_data'].get('technical_percentage', 0)
+            # Actualizar GUI
+            self._safe_gui_queue_put(('update_confirmed_progress', {
+                'symbol': symbol,
+                'profit_percent': 0.0
+            }))
+            self._safe_gui_queue_put(('log_message', f"CONFIRMADA: {symbol} promovida via timer"))
+        except Exception as e:
+            logger.error(f"Error enviando Telegram CONFIRMADA (timer): {e}")
+
+    def _monitor_tracked_signal(self, signal_hash: str, tracking_data: 'TrackedSignal'):
+        """Un ciclo de monitoreo de una señal: progreso GUI, promoción, avances, tendencia y reversión"""
+        symbol = tracking_data['signal_data'].get('symbol', 'N/A')
+        # ✅ CRÍTICO: Leer status ACTUAL directamente del tracker (no de la copia)
+        with self.signal_tracker.lock:
+            live_tracking = self.signal_tracker.tracked_signals.get(signal_hash, {})
+            status = live_tracking.get('status', tracking_data.get('status', 'DESCONOCIDA'))
+        logger.debug(f"🎯 [MONITOR] Símbolo: {symbol}, Status: {status}")
+
+        # ---------- 2. Precio y progreso: ticks del stream; REST solo si el stream calla ----------
+        stale_after = getattr(self.config, 'SIGNAL_TICK_STALE_S', 5.0)
+        if time.monotonic() - tracking_data.last_tick_at > stale_after:
+            current_price = self.client.get_ticker_price(symbol)
+            if current_price <= 1e-8:                     # 🔒 Protección contra precio inválido
+                logger.debug(f"⚠️ Precio inválido para {symbol} - reintentando en próximo ciclo")
+                return  # ✅ CORREGIDO: Reintentar en lugar de cerrar señal
+            # Mismo camino que un tick: progreso y cierre por TP/SL/timeout
+            if self.signal_tracker.on_price_tick(symbol, current_price):
+                return
+        if tracking_data.closed:
+            return
+        current_price = tracking_data.current_price
+        profit_percent = tracking_data.profit_percent
+        logger.debug(f"📈 [MONITOR] {symbol} Profit: {profit_percent:+.2f}%")
 
-                        df_15m = self.data_manager.get_data(symbol, "15m", 200, self.client)
-                        df_30m = self.data_manager.get_data(symbol, "30m", 200, self.client)
-                        signal_dir = "BULLISH" if tracking_data['is_buy'] else "BEARISH"
+        # ---------- 3. Barra de progreso DESTACADA (15-20 min) ----------
+        if status == 'DESTACADA':
+            start_time = tracking_data.get('highlight_start_time') or tracking_data.get('start_time')
+            if not start_time:
+                logger.debug("⏭️  No hay start_time en DESTACADA – saltando barra")
+                self._safe_gui_queue_put(('update_highlight_progress', 0))
+            else:
+                elapsed_seconds = (datetime.now() - start_time).total_seconds()
+                promo_time = self.config.MIN_PROMOTION_TIME_SECONDS
+                elapsed_percent = min(100, (elapsed_seconds / promo_time) * 100)
+
+                # ---------- 4. Promoción: Por TIEMPO (15 min) o Por UMBRALES ----------
+                neural = tracking_data['signal_data'].get('neural_score', 0)
+                technical = tracking_data['signal_data'].get('technical_percentage', 0)
+
+                time_condition = elapsed_seconds >= promo_time
+                alignment_score = 0
+                if time_condition:
+                    # Antes del plazo no hay promoción posible: sin descargar velas ni alinear
+                    df_15m = self.data_manager.get_data(symbol, "15m", 200, self.client)
+                    df_30m = self.data_manager.get_data(symbol, "30m", 200, self.client)
+                    signal_dir = "BULLISH" if tracking_data['is_buy'] else "BEARISH"
 
-                        alignment = self.trend_alignment_validator.validate_trend_alignment(
-                            df_15m, df_30m, neural, technical, signal_dir
-                        )
-                        alignment_score = alignment.get('alignment_score', 0)
+                    alignment = self.trend_alignment_validator.validate_trend_alignment(
+                        df_15m, df_30m, neural, technical, signal_dir
+                    )
+                    alignment_score = alignment.get('alignment_score', 0)
 
-                        time_condition = elapsed_seconds >= promo_time
-                        thresholds_condition = (
-                            neural >= self.config.MIN_NEURAL_CONFIRMADA and
-                            technical >= self.config.MIN_TECHNICAL_CONFIRMADA and
-                            alignment_score >= self.config.MIN_ALIGNMENT_CONFIRMADA
-                        )
+                thresholds_condition = (
+                    neural >= self.config.MIN_NEURAL_CONFIRMADA and
+                    technical >= self.config.MIN_TECHNICAL_CONFIRMADA and
+                    alignment_score >= self.config.MIN_ALIGNMENT_CONFIRMADA
+                )
 
-                        if time_condition and thresholds_condition:
-                            with self.signal_tracker.lock:
-                                already_sent = self.signal_tracker.tracked_signals.get(signal_hash, {}).get('promotion_telegram_sent', False)
+                if time_condition and thresholds_condition:
+                    with self.signal_tracker.lock:
+                        already_sent = self.signal_tracker.tracked_signals.get(signal_hash, {}).get('promotion_telegram_sent', False)
 
-                            if already_sent:
-                                continue
+                    if already_sent:
+                        return
 
-                            # ✅ Obtener precio actual para fijar entrada CONFIRMADA
-                            promo_price = current_price if current_price > 0 else tracking_data.get('current_price', tracking_data.get('entry_price', 0))
-                            promoted = self.signal_tracker.promote_to_confirmed(
-                                signal_hash, neural, technical, alignment_score=alignment_score, current_price=promo_price
-                            )
-                            logger.info(f"[v0] Promocion intentada para {symbol}: promoted={promoted}")
-                            if promoted:
-                                status = 'CONFIRMADA'
-                                promo_reason = f"Umbrales OK (IA:{neural:.0f}% Tec:{technical:.0f}% Alin:{alignment_score:.0f}%)"
-                                self._safe_gui_queue_put(('log_message', f"{symbol}: DESTACADA -> CONFIRMADA ({promo_reason})"))
-                                
-                                # ✅ GENERAR GRÁFICO Y ENVIAR A TELEGRAM
-                                try:
-                                    chart_path = None
-                                    if hasattr(self, 'chart_generator') and self.chart_generator:
-                                        df_chart = self.data_manager.get_data(symbol, "15m", 200, self.client)
-                                        if df_chart is not None and len(df_chart) > 20:
-                                            signal_data = tracking_data.get('signal_data', {})
-                                            analysis = signal_data.get('validation_result', {})
-                                            chart_path = self.chart_generator.generate_signal_chart(
-                                                symbol, df_chart, signal_data, analysis
-                                            )
-                                            if chart_path:
-                                                signal_data['chart_path'] = chart_path
-                                                logger.info(f"📊 Gráfico generado para CONFIRMADA: {chart_path}")
-                                    
-                                    # ✅ ENVIAR TELEGRAM CON GRÁFICO
-                                    if self.telegram_client and self.config.telegram_enabled:
-                                        signal_data = tracking_data.get('signal_data', {})
-                                        self.telegram_client.send_promotion_update(
-                                            symbol=symbol,
-                                            profit_percent=profit_percent,
-                                            chart_path=chart_path,
-                                            signal_data=signal_data
-                                        )
-                                        logger.info(f"📨 Telegram CONFIRMADA enviado para {symbol}")
-                                except Exception as e:
-                                    logger.error(f"❌ Error al enviar Telegram CONFIRMADA: {e}")
-                                self._safe_gui_queue_put(('update_confirmed_progress', {
-                                    'symbol': symbol,
-                                    'profit_percent': profit_percent
-                                }))
-                        else:
-                            self._safe_gui_queue_put(('update_highlight_progress', int(elapsed_percent)))
-
-                # ---------- 4B. Progreso de profit para CONFIRMADA ----------
-                elif status == 'CONFIRMADA':
-                    logger.info(f"[v0] CONFIRMADA detectada: {symbol}, profit={profit_percent:.2f}%")
-                    self._safe_gui_queue_put(('update_confirmed_progress', {
-                        'symbol': symbol,
-                        'profit_percent': profit_percent
-                    }))
-
-                    # ---------- Notificaciones de milestones a Telegram (SOLO para CONFIRMADA) ----------
-                    if getattr(self.config, 'TELEGRAM_SEND_CONFIRMED', False):
-                        milestones = self.config.PROFIT_MILESTONES
-                        with self.signal_tracker.lock:
-                            live_tracking = self.signal_tracker.tracked_signals.get(signal_hash, {})
-                            updates_sent = live_tracking.get('telegram_updates_sent', 0)
-
-                        logger.info(f"[v0] MILESTONE CHECK {symbol}: profit={profit_percent:.2f}%, milestones={milestones}, updates_sent={updates_sent}")
-
-                        # Enviar TODOS los milestones pendientes en orden
-                        for i, milestone in enumerate(milestones):
-                            # Solo enviar si: profit >= milestone Y este milestone específico no se ha enviado
-                            # Usar <= i para recuperar milestones perdidos si hay desincronización
-                            logger.info(f"[v0] Comparando: profit={profit_percent:.2f}% vs milestone={milestone}% | updates_sent={updates_sent} vs i={i}")
-                            if profit_percent >= milestone and updates_sent <= i:
-                                with self.signal_tracker.lock:
-                                    if signal_hash in self.signal_tracker.tracked_signals:
-                                        self.signal_tracker.tracked_signals[signal_hash]['telegram_updates_sent'] = i + 1
-                                        updates_sent = i + 1  # Actualizar local para siguiente iteración
-                                if self.telegram_client:
-                                    chart_path = tracking_data['signal_data'].get('chart_path')
-                                    logger.info(f"📨 Enviando milestone {milestone}% para {symbol} (profit={profit_percent:.2f}%, updates_sent={updates_sent-1}→{updates_sent})")
-                                    self.telegram_client.send_milestone_update(
+                    # ✅ Obtener precio actual para fijar entrada CONFIRMADA
+                    promo_price = current_price if current_price > 0 else tracking_data.get('current_price', tracking_data.get('entry_price', 0))
+                    promoted = self.signal_tracker.promote_to_confirmed(
+                        signal_hash, neural, technical, alignment_score=alignment_score, current_price=promo_price
+                    )
+                    logger.info(f"[v0] Promocion intentada para {symbol}: promoted={promoted}")
+                    if promoted:
+                        status = 'CONFIRMADA'
+                        promo_reason = f"Umbrales OK (IA:{neural:.0f}% Tec:{technical:.0f}% Alin:{alignment_score:.0f}%)"
+                        self._safe_gui_queue_put(('log_message', f"{symbol}: DESTACADA -> CONFIRMADA ({promo_reason})"))
+
+                        # ✅ GENERAR GRÁFICO (WORKER) Y ENVIAR A TELEGRAM AL TERMINAR
+                        try:
+                            signal_data = tracking_data.get('signal_data', {})
+
+                            def _send_confirmed(chart_image, symbol=symbol, signal_data=signal_data,
+                                                profit_percent=profit_percent):
+                                if chart_image and chart_image.path:
+                                    signal_data['chart_path'] = chart_image.path
+                                    logger.info(f"📊 Gráfico generado para CONFIRMADA: {chart_image.path}")
+                                if self.telegram_client and self.config.telegram_enabled:
+                                    self.telegram_client.send_promotion_update(
                                         symbol=symbol,
-                                        milestone=milestone,
-                                        profit=profit_percent,
-                                        chart_path=chart_path
+                                        profit_percent=profit_percent,
+                                        chart_image=chart_image,
+                                        signal_data=signal_data,
+                                        signal_hash=signal_hash
                                     )
-                                self._safe_gui_queue_put(('log_message', f"📊 {symbol} +{milestone}% (Profit: {profit_percent:+.2f}%)"))
-                # ---------- 5. Cierres automáticos ----------
-                # Objetivo (del config)
-                tp_target = self.config.PROFIT_TARGET_PERCENT
-                if profit_percent >= tp_target:
-                    report = self.signal_tracker.close_signal(signal_hash, current_price, reason='target_reached')
-                    if report:
-                        self._handle_signal_closure(report)
-                    continue
+                                    logger.info(f"📨 Telegram CONFIRMADA enviado para {symbol}")
+
+                            df_chart = None
+                            if getattr(self, 'chart_service', None):
+                                df_chart = self.data_manager.get_data(symbol, "15m", 200, self.client)
+                            if df_chart is not None and len(df_chart) > 20:
+                                self.chart_service.render_then(symbol, df_chart, signal_data, _send_confirmed,
+                                                               chain_key=signal_hash)
+                            elif getattr(self, 'chart_service', None):
+                                self.chart_service.deliver_after(signal_hash, _send_confirmed)
+                            else:
+                                _send_confirmed(None)
+                        except Exception as e:
+                            logger.error(f"❌ Error al enviar Telegram CONFIRMADA: {e}")
+                        self._safe_gui_queue_put(('update_confirmed_progress', {
+                            'symbol': symbol,
+                            'profit_percent': profit_percent
+                        }))
+                else:
+                    self._safe_gui_queue_put(('update_highlight_progress', int(elapsed_percent)))
 
-                # Stop (del config)
-                sl_target = self.config.DEFAULT_STOP_LOSS_PERCENT * 100
-                if profit_percent <= -sl_target:
-                    report = self.signal_tracker.close_signal(signal_hash, current_price, reason='stop_loss_hit')
-                    if report:
-                        self._handle_signal_closure(report)
-                    continue
+        # ---------- 4B. Progreso de profit para CONFIRMADA ----------
+        elif status == 'CONFIRMADA':
+            logger.info(f"[v0] CONFIRMADA detectada: {symbol}, profit={profit_percent:.2f}%")
+            self._safe_gui_queue_put(('update_confirmed_progress', {
+                'symbol': symbol,
+                'profit_percent': profit_percent
+            }))
 
-                # ✅ CONFIRMADAS: Sin timeout - continúan hasta TP (3%), SL (-1%) o cambio de tendencia
-                # DESTACADAS: Tienen su propio timeout de 20 minutos en la lógica de promoción
-
-                # ---------- 5B. Detección de cambio de tendencia en PROFIT (Cierre Parcial) ----------
-                m1 = getattr(self.config, 'MILESTONE_1', 0.5)
-                m3 = getattr(self.config, 'MILESTONE_3', 1.5)
-                if status == 'CONFIRMADA' and m1 <= profit_percent < m3:
-                    now_ts = time.time()
-                    last_check = tracking_data.get('last_profit_trend_check', 0)
-                    if now_ts - last_check > 180:
-                        tracking_data['last_profit_trend_check'] = now_ts
-                        try:
-                            df_15m = self.data_manager.get_data(symbol, "15m", 120, self.client)
-                            if df_15m is not None and len(df_15m) >= 60:
-                                cycle = self.technical_analyzer.analyze_market_cycles(df_15m)
-                                cycle_type = (cycle.get('cycle') or 'NEUTRAL').upper()
-                                cycle_strength = float(cycle.get('strength', 0)) * 100
-
-                                is_buy = tracking_data.get('is_buy', True)
-                                adverse = False
-                                if is_buy and cycle_type in ['DOWNTREND', 'DISTRIBUTION']:
-                                    adverse = True
-                                elif (not is_buy) and cycle_type in ['UPTREND', 'ACCUMULATION']:
-                                    adverse = True
-
-                                if adverse and cycle_strength >= 70:
-                                    logger.info(f"⚠️ {symbol}: Cambio de tendencia en PROFIT ({profit_percent:.2f}%) - Cierre Parcial")
-                                    self._safe_gui_queue_put(('log_message', f"⚠️ {symbol}: Tendencia invertida en profit -> Cierre Parcial"))
-                                    report = self.signal_tracker.close_signal(signal_hash, current_price, reason='TREND_CHANGE_PARTIAL')
-                                    if report:
-                                        self._handle_signal_closure(report)
-                                    continue
-                        except Exception as e:
-                            logger.debug(f"Error checking profit trend change: {e}")
+            # ---------- Notificaciones de milestones a Telegram (SOLO para CONFIRMADA) ----------
+            if getattr(self.config, 'TELEGRAM_SEND_CONFIRMED', False):
+                milestones = self.config.PROFIT_MILESTONES
+                with self.signal_tracker.lock:
+                    live_tracking = self.signal_tracker.tracked_signals.get(signal_hash, {})
+                    updates_sent = live_tracking.get('telegram_updates_sent', 0)
+
+                logger.info(f"[v0] MILESTONE CHECK {symbol}: profit={profit_percent:.2f}%, milestones={milestones}, updates_sent={updates_sent}")
 
-                # ---------- 6. Detección de reversión ROBUSTA (validación multi-timeframe) ----------
+                # Enviar TODOS los milestones pendientes en orden
+                for i, milestone in enumerate(milestones):
+                    # Solo enviar si: profit >= milestone Y este milestone específico no se ha enviado
+                    # Usar <= i para recuperar milestones perdidos si hay desincronización
+                    logger.info(f"[v0] Comparando: profit={profit_percent:.2f}% vs milestone={milestone}% | updates_sent={updates_sent} vs i={i}")
+                    if profit_percent >= milestone and updates_sent <= i:
+                        with self.signal_tracker.lock:
+                            if signal_hash in self.signal_tracker.tracked_signals:
+                                self.signal_tracker.tracked_signals[signal_hash]['telegram_updates_sent'] = i + 1
+                                updates_sent = i + 1  # Actualizar local para siguiente iteración
+                        self.signal_tracker.checkpoint(signal_hash)  # Sin avances repetidos tras un reinicio
+                        if self.telegram_client:
+                            logger.info(f"📨 Enviando milestone {milestone}% para {symbol} (profit={profit_percent:.2f}%, updates_sent={updates_sent-1}→{updates_sent})")
+
+                            def _send_milestone(_, milestone=milestone, profit=profit_percent):
+                                # La ruta se lee al enviar: la promoción encolada delante ya la ha guardado
+                                chart_path = tracking_data['signal_data'].get('chart_path')
+                                self.telegram_client.send_milestone_update(
+                                    symbol=symbol,
+                                    milestone=milestone,
+                                    profit=profit,
+                                    chart_image=chart_path,
+                                    signal_hash=signal_hash
+                                )
+                            # Detrás de la promoción (u otro milestone) aún en render para esta señal
+                            if getattr(self, 'chart_service', None):
+                                self.chart_service.deliver_after(signal_hash, _send_milestone)
+                            else:
+                                _send_milestone(None)
+                        self._safe_gui_queue_put(('log_message', f"📊 {symbol} +{milestone}% (Profit: {profit_percent:+.2f}%)"))
+        # ---------- 5. Cierres automáticos ----------
+        # Objetivo y stop (del config) se evalúan en cada tick: SignalTracker.on_price_tick
+
+        # ✅ CONFIRMADAS: Sin timeout - continúan hasta TP (3%), SL (-1%) o cambio de tendencia
+        # DESTACADAS: Tienen su propio timeout de 20 minutos en la lógica de promoción
+
+        # ---------- 5B. Detección de cambio de tendencia en PROFIT (Cierre Parcial) ----------
+        m1 = getattr(self.config, 'MILESTONE_1', 0.5)
+        m3 = getattr(self.config, 'MILESTONE_3', 1.5)
+        if status == 'CONFIRMADA' and m1 <= profit_percent < m3:
+            now_ts = time.time()
+            last_check = tracking_data.get('last_profit_trend_check', 0)
+            if now_ts - last_check > 180:
+                tracking_data['last_profit_trend_check'] = now_ts
                 try:
-                    # ✅ Solo verificar reversión después de 10 minutos y si profit es negativo
-                    start_time = tracking_data.get('confirmed_start_time') or tracking_data.get('start_time')
-                    if start_time and profit_percent < -0.3:  # Solo si perdiendo más de 0.3%
-                        elapsed_minutes = (datetime.now() - start_time).total_seconds() / 60
-                        if elapsed_minutes >= 10:  # Mínimo 10 minutos antes de considerar reversión
-                            # ✅ VALIDACIÓN COMPLETA: Usar 15m + 30m + IA + Técnico + Alineación
-                            df_15m = self.data_manager.get_data(symbol, "15m", 200, self.client)
-                            df_30m = self.data_manager.get_data(symbol, "30m", 200, self.client)
-
-                            if df_15m is not None and df_30m is not None and len(df_15m) >= 50:
-                                original_is_buy = tracking_data['is_buy']
-                                original_direction = "BULLISH" if original_is_buy else "BEARISH"
-                                opposite_direction = "BEARISH" if original_is_buy else "BULLISH"
-
-                                # Validar alineación actual con dirección OPUESTA
-                                current_analysis = self._analyze_async_with_timeout(symbol, 3)
-                                if current_analysis:
-                                    current_neural = current_analysis.get('neural_score', 0)
-                                    current_technical = current_analysis.get('technical_percentage', 0)
-
-                                    alignment = self.trend_alignment_validator.validate_trend_alignment(
-                                        df_15m, df_30m, current_neural, current_technical, opposite_direction
-                                    )
+                    df_15m = self.data_manager.get_data(symbol, "15m", 120, self.client)
+                    if df_15m is not None and len(df_15m) >= 60:
+                        cycle = self.technical_analyzer.analyze_market_cycles(df_15m)
+                        cycle_type = (cycle.get('cycle') or 'NEUTRAL').upper()
+                        cycle_strength = float(cycle.get('strength', 0)) * 100
+
+                        is_buy = tracking_data.get('is_buy', True)
+                        adverse = False
+                        if is_buy and cycle_type in ['DOWNTREND', 'DISTRIBUTION']:
+                            adverse = True
+                        elif (not is_buy) and cycle_type in ['UPTREND', 'ACCUMULATION']:
+                            adverse = True
+
+                        if adverse and cycle_strength >= 70:
+                            logger.info(f"⚠️ {symbol}: Cambio de tendencia en PROFIT ({profit_percent:.2f}%) - Cierre Parcial")
+                            self._safe_gui_queue_put(('log_message', f"⚠️ {symbol}: Tendencia invertida en profit -> Cierre Parcial"))
+                            report = self.signal_tracker.close_signal(signal_hash, current_price, reason='TREND_CHANGE_PARTIAL')
+                            if report:
+                                self._handle_signal_closure(report)
+                            return
+                except Exception as e:
+                    logger.debug(f"Error checking profit trend change: {e}")
 
-                                    # ✅ CIERRE POR REVERSIÓN SOLO SI:
-                                    # 1. Alineación con dirección opuesta >= 70%
-                                    # 2. IA confirma dirección opuesta >= 75%
-                                    # 3. Técnico confirma >= 70%
-                                    reversal_confirmed = (
-                                        alignment.get('alignment_score', 0) >= 70 and
-                                        alignment.get('is_aligned', False) and
-                                        current_neural >= 75 and
-                                        current_technical >= 70
-                                    )
+        # ---------- 6. Detección de reversión ROBUSTA (validación multi-timeframe) ----------
+        try:
+            # ✅ Solo verificar reversión después de 10 minutos y si profit es negativo
+            start_time = tracking_data.get('confirmed_start_time') or tracking_data.get('start_time')
+            if start_time and profit_percent < -0.3:  # Solo si perdiendo más de 0.3%
+                elapsed_minutes = (datetime.now() - start_time).total_seconds() / 60
+                if elapsed_minutes >= 10:  # Mínimo 10 minutos antes de considerar reversión
+                    # ✅ VALIDACIÓN COMPLETA: Usar 15m + 30m + IA + Técnico + Alineación
+                    df_15m = self.data_manager.get_data(symbol, "15m", 200, self.client)
+                    df_30m = self.data_manager.get_data(symbol, "30m", 200, self.client)
+
+                    if df_15m is not None and df_30m is not None and len(df_15m) >= 50:
+                        original_is_buy = tracking_data['is_buy']
+                        original_direction = "BULLISH" if original_is_buy else "BEARISH"
+                        opposite_direction = "BEARISH" if original_is_buy else "BULLISH"
+
+                        # Validar alineación actual con dirección OPUESTA
+                        current_analysis = self._analyze_async_with_timeout(symbol, 3)
+                        if current_analysis:
+                            current_neural = current_analysis.get('neural_score', 0)
+                            current_technical = current_analysis.get('technical_percentage', 0)
+
+                            alignment = self.trend_alignment_validator.validate_trend_alignment(
+                                df_15m, df_30m, current_neural, current_technical, opposite_direction
+                            )
 
-                                    if reversal_confirmed:
-                                        logger.info(f"🔄 {symbol}: REVERSIÓN CONFIRMADA después de {elapsed_minutes:.1f} min | "
-                                                   f"Profit: {profit_percent:+.2f}% | Alineación opuesta: {alignment.get('alignment_score', 0):.1f}%")
-                                        report = self.signal_tracker.close_signal(signal_hash, current_price, reason='trend_reversal_detected')
-                                        if report:
-                                            self._handle_signal_closure(report)
-                                        continue
-                except Exception as e:
-                    logger.debug(f"⚠️ Análisis de reversión falló para {symbol}: {e}")
+                            # ✅ CIERRE POR REVERSIÓN SOLO SI:
+                            # 1. Alineación con dirección opuesta >= 70%
+                            # 2. IA confirma dirección opuesta >= 75%
+                            # 3. Técnico confirma >= 70%
+                            reversal_confirmed = (
+                                alignment.get('alignment_score', 0) >= 70 and
+                                alignment.get('is_aligned', False) and
+                                current_neural >= 75 and
+                                current_technical >= 70
+                            )
 
-            except SystemExit as e:
-                logger.critical(f"🛑 SYSTEM EXIT DETECTADO: {e}")
-                raise
-            except Exception as e:
-                logger.error(f"❌ [MONITOR] Error en _monitor_tracked_signals_continuous: {e}", exc_info=True)
-                import traceback
-                logger.error(f"📋 Traceback completo:\n{traceback.format_exc()}")
-                time.sleep(5)  # Evita bucles rápidos en caso de error crítico
+                            if reversal_confirmed:
+                                logger.info(f"🔄 {symbol}: REVERSIÓN CONFIRMADA después de {elapsed_minutes:.1f} min | "
+                                           f"Profit: {profit_percent:+.2f}% | Alineación opuesta: {alignment.get('alignment_score', 0):.1f}%")
+                                report = self.signal_tracker.close_signal(signal_hash, current_price, reason='trend_reversal_detected')
+                                if report:
+                                    self._handle_signal_closure(report)
+                                return
+        except Exception as e:
+            logger.debug(f"⚠️ Análisis de reversión falló para {symbol}: {e}")
 
     def _handle_signal_closure(self, report: dict):
         """Manejar cierre de señal: limpieza, GUI, Telegram"""
@@ -10462,28 +14042,34 @@ class OptimizedTradingBot:
 
             if self.config.telegram_enabled:
                 try:
-                    chart_path = None
+                    def _send_closure(chart_image):
+                        self.telegram_client.send_closure_update(
+                            symbol=symbol,
+                            reason=reason,
+                            profit_percent=profit,
+                            duration_minutes=report.get('duration_minutes', 0),
+                            max_profit=report.get('max_profit_reached', report.get('max_profit', 0.0)),
+                            chart_image=chart_image,
+                            signal_hash=sig_hash
+                        )
+
+                    chart_queued = False
                     if reason in ['target_reached', 'stop_loss_hit'] and PLOTTING_AVAILABLE:
-                        tracking = self.signal_tracker.tracked_signals.get(next(iter(self.signal_tracker.tracked_signals), None))
-                        if tracking:
+                        signal_data = report.get('signal_data')
+                        if signal_data:
                             try:
-                                chart_path = self.chart_generator.generate_signal_chart(
-                                    tracking['signal_data']['symbol'],
-                                    tracking['signal_data'].get('dataframe_entry'),
-                                    tracking['signal_data'],
-                                    {}
+                                self.chart_service.render_then(
+                                    symbol,
+                                    signal_data.get('dataframe_entry'),
+                                    signal_data,
+                                    _send_closure,
+                                    chain_key=sig_hash
                                 )
+                                chart_queued = True
                             except Exception as chart_err:
                                 logger.debug(f"[DEBUG] Error generando gráfico: {chart_err}")
-
-                    self.telegram_client.send_closure_update(
-                        symbol=symbol,
-                        reason=reason,
-                        profit_percent=profit,
-                        duration_minutes=report.get('duration_minutes', 0),
-                        max_profit=report.get('max_profit_reached', report.get('max_profit', 0.0)),
-                        chart_path=chart_path
-                    )
+                    if not chart_queued:
+                        self.chart_service.deliver_after(sig_hash or symbol, _send_closure)
                 except Exception as tg_err:
                     logger.debug(f"[DEBUG] Error enviando cierre a Telegram: {tg_err}")
         except Exception as e:
@@ -10555,7 +14141,8 @@ class OptimizedTradingBot:
                 try:
                     self.telegram_client.send_highlight_expired_notification(
                         symbol=symbol,
-                        duration_minutes=report['duration_minutes']
+                        duration_minutes=report['duration_minutes'],
+                        signal_hash=sig_hash
                     )
                 except Exception as e:
                     logger.error(f"Error enviando notificación HIGHLIGHT_TIMEOUT: {e}")
@@ -10563,29 +14150,35 @@ class OptimizedTradingBot:
 
         # ✅ Enviar notificación de cierre a Telegram solo para señales CONFIRMADAS
         if self.config.telegram_enabled:
-            chart_path = None
+            # ✅ Enviar notificación solo para señales CONFIRMADAS cerradas
+            def _send_closure(chart_image):
+                self.telegram_client.send_closure_update(
+                    symbol=symbol,
+                    reason=reason,
+                    profit_percent=report['final_profit_percent'],
+                    duration_minutes=report['duration_minutes'],
+                    max_profit=report['max_profit_reached'],
+                    chart_image=chart_image,
+                    signal_hash=sig_hash
+                )
+
+            chart_queued = False
             # Solo generar gráfico si es un cierre "importante" y plotting disponible
             if reason in ['PROFIT_TARGET', 'STOP_LOSS', 'target_reached', 'stop_loss_hit', 'trend_reversal_detected'] and PLOTTING_AVAILABLE:
-                tracking = self.signal_tracker.tracked_signals.get(next(iter(self.signal_tracker.tracked_signals), None))
-                if tracking:
+                signal_data = report.get('signal_data')
+                if signal_data:
                     try:
-                        chart_path = self.chart_generator.generate_signal_chart(
-                            tracking['signal_data']['symbol'],
-                            tracking['signal_data'].get('dataframe_entry'),
-                            tracking['signal_data'], {}
+                        self.chart_service.render_then(
+                            symbol,
+                            signal_data.get('dataframe_entry'),
+                            signal_data, _send_closure,
+                            chain_key=sig_hash
                         )
+                        chart_queued = True
                     except Exception as e:
                         logger.debug(f"⚠️ No se pudo generar gráfico para cierre ({reason}): {e}")
-
-            # ✅ Enviar notificación solo para señales CONFIRMADAS cerradas
-            self.telegram_client.send_closure_update(
-                symbol=symbol,
-                reason=reason,
-                profit_percent=report['final_profit_percent'],
-                duration_minutes=report['duration_minutes'],
-                max_profit=report['max_profit_reached'],
-                chart_path=chart_path
-            )
+            if not chart_queued:
+                self.chart_service.deliver_after(sig_hash or symbol, _send_closure)
 
     def _release_exclusive_mode(self):
         """Libera el modo exclusivo, limpia GUI y notifica"""
@@ -10610,9 +14203,8 @@ class OptimizedTradingBot:
         """
         try:
             # ========== 1. Limpiar caché técnica (con lock implícito en analyzer) ==========
-            if hasattr(self.strategy_impl.technical_analyzer, 'indicator_cache'):
-                self.strategy_impl.technical_analyzer.indicator_cache.clear()
-                self.strategy_impl.technical_analyzer.cache_access_times.clear()
+            if hasattr(self.strategy_impl.technical_analyzer, 'clear_cache'):
+                self.strategy_impl.technical_analyzer.clear_cache()
                 logger.debug("🧹 Caché técnica limpiada")
 
             # ========== 2. Limpiar caché de datos (DataManager) ==========
@@ -10763,7 +14355,23 @@ class OptimizedTradingBot:
             }
         else:
             diagnostics['components']['websocket'] = {'connected': False}
-        
+
+        # 4.1 Pool de análisis por cierre de vela
+        if getattr(self, 'analysis_executor', None):
+            executor_metrics = self.analysis_executor.get_metrics()
+            diagnostics['components']['analysis_executor'] = {
+                'queue_depth': executor_metrics['queue_depth'],
+                'max_queue_depth': executor_metrics['max_queue_depth'],
+                'in_flight': executor_metrics['in_flight'],
+                'coalesced': executor_metrics['coalesced'],
+                'dropped': executor_metrics['dropped'],
+                'dispatch_p95': f"{executor_metrics.get('dispatch_p95_ms', 0):.1f}ms"
+            }
+
+        # 4.2 Bus de eventos GUI (tasa, fusionados y descartados por canal)
+        if getattr(self, 'gui_bus', None):
+            diagnostics['components']['gui_bus'] = self.gui_bus.get_metrics()
+
         # 5. Estado de Cache
         if hasattr(self, 'data_manager') and self.data_manager:
             cache_stats = self.data_manager.get_cache_stats()
@@ -10844,23 +14452,7 @@ class OptimizedTradingBot:
         try:
             self.running = True
             logger.info("Bot Optimizado v35.0.0.0 iniciando...")
-
-            # === 1. Reinicializar contadores y estado ===
-            self.total_symbols_to_analyze = len(self.config.TRADING_SYMBOLS)
-            self.symbols_analyzed_count = 0
-            self.symbol_analysis_counts = {symbol: 0 for symbol in self.config.TRADING_SYMBOLS}
-
-            # Reiniciar estado de seguimiento exclusivo (crítico para señales)
-            self.exclusive_tracking_mode = False
-            self.tracked_symbol = None
-            self.tracked_signal_hash = None
-            self.single_active_signal_hash = None
-
-            # === 2. Enviar estado inicial a GUI ===
-            self._safe_gui_queue_put(('update_pair_scan_progress', 0))
-            self._safe_gui_queue_put(('log_message', "Bot Avanzado Optimizado v35.0.0.0 iniciando sistema..."))
-            self._safe_gui_queue_put(('update_current_analyzed_symbol', None))
-            self._safe_gui_queue_put(('update_highlight_progress', 0))  # Reiniciar barra DESTACADA
+            self._reset_run_state()
 
             # === 3. Iniciar monitoreo continuo de senales (ES CLAVE PARA TIMEOUT Y PROMOCION) ===
             signal_monitor_thread = threading.Thread(
@@ -10870,6 +14462,11 @@ class OptimizedTradingBot:
             )
             signal_monitor_thread.start()
             logger.info("Sistema de monitoreo continuo de senales iniciado")
+            self._start_signal_price_feed()
+            if self.config_watcher is not None:
+                self.config_watcher.start()
+            if getattr(self.config, 'DAILY_RETRAIN_ENABLED', False):
+                self._start_daily_retrain_scheduler()
             
             # === 3.1 Programar diagnostico inicial con delay para permitir conexion WebSocket ===
             def delayed_diagnostics():
@@ -10880,36 +14477,9 @@ class OptimizedTradingBot:
             diag_thread.start()
 
             # === 4. Iniciar WebSocket (datos en tiempo real) ===
-            # 4. Iniciar WebSocket (datos en tiempo real) — CON FILTRO ANTI-N/A
-            # ============================================================================
-            if WEBSOCKET_AVAILABLE and not getattr(self.client, 'disable_websocket', False):
-                if self.ws_manager:
-                    self.ws_manager.detener()
-
-            # ✅ FILTRAR SÍMBOLOS VÁLIDOS ANTES DE PASARLOS AL WEBSOCKET
-            valid_symbols = [s for s in self.config.TRADING_SYMBOLS if s and str(s).strip() != "N/A"]
-            if not valid_symbols:
-                logger.warning("No hay símbolos válidos para WebSocket; se usará sólo REST.")
-            else:
-                try:
-                    self.ws_manager = RobustWebSocketManager(
-                        symbols=valid_symbols,
-                        intervalo=self.config.ENTRY_TIMEFRAME,
-                        callback=self._process_websocket_data_optimized
-                    )
-                    self.ws_manager.iniciar()
-                    logger.info(f"📡 WebSocket iniciado para {len(valid_symbols)} símbolos")
-
-                    # ✅ ESPERAR UN MOMENTO PARA VER SI OCURRE ERROR 451
-                    time.sleep(1)
-                    if hasattr(self.ws_manager, '_error_451_detected') and self.ws_manager._error_451_detected:
-                        logger.critical("❌ ERROR 451 DETECTADO: Bot no puede conectarse a Binance desde esta ubicación")
-                        self._safe_gui_queue_put(('log_message', "❌ ERROR 451: Binance bloquea desde esta ubicación. Solución: Usar VPN o cambiar de exchange"))
-                        # ✅ NO CERRAR EL BOT - Continuar en modo espera
-                        logger.warning("⚠️ Bot continuará ejecutándose sin datos de Binance. Intenta usar VPN o proxy.")
-                except Exception as e:
-                    logger.error(f"[ERROR] Falló inicio de WebSocket: {e}")
-                    self._safe_gui_queue_put(('log_message', "⚠️ WebSocket no disponible. Usando polling..."))
+            self.analysis_executor.start()
+            self.chart_service.start()
+            self._start_market_stream()
 
             # === 5. Iniciar escáner de símbolos (ANÁLISIS ACTIVO) ===
             try:
@@ -10942,16 +14512,124 @@ class OptimizedTradingBot:
             self.running = False
             raise
 
+    def _reset_run_state(self):
+        """Contadores, seguimiento exclusivo y estado recuperado del diario al arrancar un ciclo de ejecución"""
+        # === 1. Reinicializar contadores y estado ===
+        self.total_symbols_to_analyze = len(self.config.TRADING_SYMBOLS)
+        self.symbols_analyzed_count = 0
+        self.symbol_analysis_counts = {symbol: 0 for symbol in self.config.TRADING_SYMBOLS}
+
+        # Reiniciar estado de seguimiento exclusivo (crítico para señales)
+        self.exclusive_tracking_mode = False
+        self.tracked_symbol = None
+        self.tracked_signal_hash = None
+        self.single_active_signal_hash = None
+        self._recover_state()
+
+        # === 2. Enviar estado inicial a GUI ===
+        self._safe_gui_queue_put(('update_pair_scan_progress', 0))
+        self._safe_gui_queue_put(('log_message', "Bot Avanzado Optimizado v35.0.0.0 iniciando sistema..."))
+        self._safe_gui_queue_put(('update_current_analyzed_symbol', None))
+        self._safe_gui_queue_put(('update_highlight_progress', 0))  # Reiniciar barra DESTACADA
+
+    def _start_market_stream(self):
+        """Velas en tiempo real (RobustWebSocketManager, con respaldo REST) — CON FILTRO ANTI-N/A"""
+        if WEBSOCKET_AVAILABLE and not getattr(self.client, 'disable_websocket', False):
+            if self.ws_manager:
+                self.ws_manager.detener()
+
+        # ✅ FILTRAR SÍMBOLOS VÁLIDOS ANTES DE PASARLOS AL WEBSOCKET
+        valid_symbols = [s for s in self.config.TRADING_SYMBOLS if s and str(s).strip() != "N/A"]
+        if not valid_symbols:
+            logger.warning("No hay símbolos válidos para WebSocket; se usará sólo REST.")
+            return
+        try:
+            self.ws_manager = RobustWebSocketManager(
+                symbols=valid_symbols,
+                intervalo=self.config.ENTRY_TIMEFRAME,
+                callback=self._process_websocket_data_optimized
+            )
+            self.ws_manager.iniciar()
+            logger.info(f"📡 WebSocket iniciado para {len(valid_symbols)} símbolos")
+
+            # ✅ ESPERAR UN MOMENTO PARA VER SI OCURRE ERROR 451
+            time.sleep(1)
+            if hasattr(self.ws_manager, '_error_451_detected') and self.ws_manager._error_451_detected:
+                logger.critical("❌ ERROR 451 DETECTADO: Bot no puede conectarse a Binance desde esta ubicación")
+                self._safe_gui_queue_put(('log_message', "❌ ERROR 451: Binance bloquea desde esta ubicación. Solución: Usar VPN o cambiar de exchange"))
+                # ✅ NO CERRAR EL BOT - Continuar en modo espera
+                logger.warning("⚠️ Bot continuará ejecutándose sin datos de Binance. Intenta usar VPN o proxy.")
+        except Exception as e:
+            logger.error(f"[ERROR] Falló inicio de WebSocket: {e}")
+            self._safe_gui_queue_put(('log_message', "⚠️ WebSocket no disponible. Usando polling..."))
+
+    def _start_signal_price_feed(self):
+        """Ticks de mercado para las señales en seguimiento: TP/SL/avances por tick, no por ciclo de 2s"""
+        if not WEBSOCKET_AVAILABLE or getattr(self.client, 'disable_websocket', False):
+            logger.info("📡 Ticks de señales por REST (WebSocket no disponible)")
+            return
+        if self.signal_price_feed is None:
+            ws_url = ("wss://fstream.binance.com/ws" if self.config.MARKET_TYPE == "PERPETUALS"
+                      else "wss://stream.binance.com:9443/ws")
+            self.signal_price_feed = BinancePriceTickStream(self.config, ws_url, self.signal_tracker.on_price_tick)
+        self.signal_tracker.set_price_feed(self.signal_price_feed)
+        self.signal_price_feed.start()
+        logger.info("📡 Stream de ticks de señales iniciado")
+
+    def _stop_signal_price_feed(self):
+        self.signal_tracker.set_price_feed(None)
+        if self.signal_price_feed is not None:
+            self.signal_price_feed.stop()
+            self.signal_price_feed = None
+
+    def _on_settings_changed(self, previous: TradingSettings, settings: TradingSettings):
+        """Snapshot de ajustes nuevo (JSON editado o GUI): aviso en el log de la GUI"""
+        summary = ", ".join(f"{name}={new}" for name, (_, new) in settings.changes(previous).items())
+        self._safe_gui_queue_put(('log_message', f"🔄 Ajustes v{settings.version}: {summary}"))
+
+    def _recover_state(self):
+        """Una vez por proceso: reanudar señales y trades del diario tras un cierre o caída"""
+        if self.state_journal is None or self._state_recovered:
+            return
+        self._state_recovered = True
+        started = time.perf_counter()
+        try:
+            self.state_journal.load()
+            signals = self.signal_tracker.restore_from_journal()
+            trades = self.order_manager.recover_trades()
+        except Exception as e:
+            logger.error(f"❌ Error recuperando estado persistido: {e}")
+            return
+        if signals:
+            self.exclusive_tracking_mode = self.signal_tracker.is_full()
+            self.tracked_symbol = next((r.symbol for r in list(self.signal_tracker.tracked_signals.values())), None)
+        if signals or trades['restored'] or trades['closed_offline']:
+            message = (f"♻️ Estado recuperado en {(time.perf_counter() - started) * 1000:.0f}ms: "
+                       f"{signals} señales, {trades['restored']} trades "
+                       f"({trades['closed_offline']} cerrados offline, {trades['stop_replaced']} SL repuestos)")
+            logger.info(message)
+            self._safe_gui_queue_put(('log_message', message))
+
     def stop_optimized(self):
         """Detener bot optimizado"""
         self.running = False
         if self.ws_manager:
             self.ws_manager.detener()
+        self.order_manager.stop_streams()
+        self._stop_signal_price_feed()
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+        if self.state_journal is not None:
+            self.state_journal.snapshot()
+        if getattr(self, 'retrain_service', None):
+            self.retrain_service.shutdown()
         if self.symbol_scanner:
             self.symbol_scanner.stop()
+        self.analysis_executor.stop()
+        self.chart_service.shutdown()
         # Limpiar caches
-        if hasattr(self.strategy_impl.technical_analyzer, 'indicator_cache'):
-            self.strategy_impl.technical_analyzer.indicator_cache.clear()
+        if hasattr(self.strategy_impl.technical_analyzer, 'clear_cache'):
+            self.strategy_impl.technical_analyzer.clear_cache()
         if hasattr(self.signal_processor, 'signal_quality_cache'):
             self.signal_processor.signal_quality_cache.clear()
         logger.info("⏹️ Bot Optimizado detenido")
@@ -10965,19 +14643,12 @@ class OptimizedTradingBot:
         logger.info(f"📊 Par cambiado a: {pair}")
 
     def _safe_gui_queue_put(self, item):
-        """Enviar elementos a la cola GUI de forma segura y robusta"""
+        """Publicar (tipo, datos) en el bus GUI: nunca bloquea al hilo que llama"""
         try:
-            self.gui_queue.put(item, timeout=0.05)  # ✅ MÁS ESTRICTO (50ms)
-        except queue.Full:
-            # ✅ MITIGACIÓN 3: LIMPIEZA AGRESIVA Y FORZAR ÚLTIMO MENSAJE
-            try:
-                with self.gui_queue.mutex:
-                    self.gui_queue.queue.clear()  # Limpiar todos los mensajes antiguos
-                # Intentar insertar el nuevo mensaje una vez más
-                self.gui_queue.put_nowait(item)
-            except (queue.Full, ValueError):
-                # ValueError: si la cola está cerrada
-                pass  # Descartar silenciosamente si aún fallo
+            msg_type, data = item
+            self.gui_bus.publish(msg_type, data)
+        except Exception as e:
+            logger.debug(f"Error publicando evento GUI {item!r}: {e}")
 
     def _process_websocket_data_optimized(self, ws_update):
         """Procesar datos WebSocket con optimizaciones"""
@@ -11003,17 +14674,8 @@ class OptimizedTradingBot:
                 # Log optimizado
                 cycle_info = f"(Ciclo {self.symbol_analysis_counts[symbol]})"
                 self._safe_gui_queue_put(('log_message', f"🔍 Análisis optimizado: {symbol} {cycle_info}"))
-                # ✅ En Replit: análisis síncrono para evitar "can't start new thread"
-                if IN_REPLIT:
-                    self._analyze_symbol_optimized(symbol)
-                else:
-                    # Lanzar análisis en hilo optimizado
-                    threading.Thread(
-                        target=self._analyze_symbol_optimized,
-                        args=(symbol,),
-                        daemon=True,
-                        name=f"AnalyzeThread-{symbol}"
-                    ).start()
+                # Pool acotado con cola deduplicada por símbolo (en Replit: 1 hilo)
+                self.analysis_executor.submit(symbol)
         except Exception as e:
             logger.error(f"Error en procesamiento WebSocket optimizado: {e}")
 
@@ -11030,10 +14692,10 @@ class OptimizedTradingBot:
                 logger.debug(f"⏭️ {symbol} - Saltado: en blacklist por datos insuficientes")
                 return
 
-            # ========== 🔒 MODO EXCLUSIVO: SOLO ANALIZAR SÍMBOLO EN SEGUIMIENTO ==========
+            # ========== 🔒 MODO EXCLUSIVO (TRACKER LLENO): SOLO ANALIZAR SÍMBOLOS EN SEGUIMIENTO ==========
             if self.exclusive_tracking_mode:
-                if symbol != self.tracked_symbol:
-                    logger.info(f"⏭️ {symbol} - Ignorado: señal activa en {self.tracked_symbol}")
+                if not self.signal_tracker.is_tracking(symbol):
+                    logger.info(f"⏭️ {symbol} - Ignorado: {len(self.signal_tracker.tracked_signals)} señales activas (máximo)")
                     return
                 logger.debug(f"🎯 Modo exclusivo: Analizando {symbol}")
 
@@ -11134,8 +14796,8 @@ class OptimizedTradingBot:
             )
 
             if is_premium:
-                if self.exclusive_tracking_mode:
-                    logger.info(f"⏭️ {symbol} - Señal premium ignorada: ya hay señal activa ({self.tracked_symbol})")
+                if self.exclusive_tracking_mode or self.signal_tracker.is_tracking(symbol):
+                    logger.info(f"⏭️ {symbol} - Señal premium ignorada: tracker lleno o {symbol} ya en seguimiento")
                     return
 
                 try:
@@ -11440,7 +15102,8 @@ class OptimizedTradingBot:
     def _analyze_async_with_timeout(self, symbol: str, timeout_sec: int = 3) -> Optional[dict]:
         """Ejecutar análisis - En Replit sin threads para evitar límites"""
         # ✅ En Replit: análisis síncrono para evitar "can't start new thread"
-        if IN_REPLIT:
+        # Runtime backend: ya corremos en su executor acotado, sin hilo extra por análisis
+        if IN_REPLIT or self.backend_runtime is not None:
             try:
                 df_primary = self.data_manager.get_data(symbol, self.config.PRIMARY_TIMEFRAME, self.config.MIN_NN_DATA_REQUIRED, self.client)
                 df_entry = self.data_manager.get_data(symbol, self.config.ENTRY_TIMEFRAME, self.config.MIN_NN_DATA_REQUIRED, self.client)
@@ -11475,12 +15138,10 @@ class OptimizedTradingBot:
                 logger.debug(f"[BLACKLIST] {symbol}: Saltando análisis (en blacklist temporal)")
                 return None
 
-            # ✅ CORRECCIÓN #7: VERIFICAR EXCLUSIVIDAD - Solo 1 par activo
-            if self.exclusive_tracking_mode:
-                active_symbol = getattr(self, 'tracked_symbol', None)
-                if active_symbol and active_symbol != symbol:
-                    logger.debug(f"[EXCLUSIVO] {symbol}: Saltando (señal activa en {active_symbol})")
-                    return None
+            # ✅ CORRECCIÓN #7: VERIFICAR EXCLUSIVIDAD - Con el tracker lleno solo se analizan sus símbolos
+            if self.exclusive_tracking_mode and not self.signal_tracker.is_tracking(symbol):
+                logger.debug(f"[EXCLUSIVO] {symbol}: Saltando (tracker lleno)")
+                return None
 
             # ✅ VALIDACIÓN RÁPIDA — salir si falta data
             data_id = f"{symbol}_{int(time.time() * 1000)}"  # único por llamada
@@ -11513,7 +15174,11 @@ class OptimizedTradingBot:
                     logger.debug(f"Error validando ATR: {e}")
 
             # ✅ Predicción neural — usar df_primary (más largo)
-            neural_pred = self.neural_trader.predict_optimized(df_primary)
+            neural_trader = self.neural_trader
+            if neural_trader is None:
+                logger.debug(f"⏳ {symbol}: modelo neuronal aún no disponible - análisis omitido")
+                return None
+            neural_pred = neural_trader.predict_optimized(df_primary)
 
             # ✅ Análisis técnico — construir dict con indicadores básicos
             ema50 = self.technical_analyzer.calculate_ema(df_primary['close'], 50)
@@ -11763,20 +15428,6 @@ class OptimizedTradingBot:
                         calc_stop_loss = entry_price * (1 + sl_pct)  # SL ARRIBA para VENTA
                         calc_take_profit = entry_price * (1 - tp_pct)  # TP ABAJO para VENTA
 
-                    # ✅ GENERAR GRÁFICO PARA SEÑAL PREMIUM
-                    chart_path = None
-                    try:
-                        if hasattr(self, 'chart_generator') and self.chart_generator and not df_entry.empty:
-                            chart_path = self.chart_generator.generate_signal_chart(
-                                symbol,
-                                df_entry,
-                                {'status': status, 'neural_score': neural_score, 'technical_percentage': technical_percentage, 'entry_price': entry_price, 'stop_loss': calc_stop_loss, 'take_profit': calc_take_profit},
-                                technical_analysis
-                            )
-                            logger.debug(f"📊 Gráfico generado para {symbol}: {chart_path}")
-                    except Exception as e:
-                        logger.debug(f"⚠️ No se pudo generar gráfico para {symbol}: {e}")
-
                     signal_data.update({
                         'combined_signal': signal_type,
                         'combined_confidence': alignment_percentage,
@@ -11791,7 +15442,7 @@ class OptimizedTradingBot:
                         'risk_reward_ratio': validation_result.get('risk_reward_ratio', 1.71),
                         'conditions_met': validation_result.get('conditions_met', [f"IA={neural_score:.1f}%", f"Técnico={technical_percentage:.1f}%", f"Patrón={pattern_name}"]),
                         'is_premium_signal': True,
-                        'chart_path': chart_path,
+                        'chart_path': None,  # DESTACADA va sin gráfico; CONFIRMADA lo renderiza al enviarse
                         'candle_pattern': pattern_name,
                         'volatility_percent': volatility_pct
                     })
@@ -11968,21 +15619,16 @@ class OptimizedTradingBot:
     def _process_high_quality_signal(self, symbol: str, df_primary: pd.DataFrame, df_entry: pd.DataFrame, analysis_result: dict):
         """
         ✅ PROCESAMIENTO UNIFICADO — USA SOLO _prepare_signal_package()
-        - Verifica exclusividad (1 señal)
+        - Verifica capacidad (MAX_TRACKED_SIGNALS, una señal por símbolo)
         - Prepara paquete
         - Envía a SignalTracker
         - Genera gráfico (solo CONFIRMADA)
         - Notifica Telegram (solo 1 foto en CONFIRMADA)
         """
-        # ✅ CORRECCIÓN #7: VERIFICACIÓN ESTRICTA DE EXCLUSIVIDAD
-        if self.exclusive_tracking_mode:
-            logger.info(f"⏭️ {symbol} - Ignorado: señal activa en {self.tracked_symbol}")
-            return
-
-        # ✅ DOBLE VERIFICACIÓN: SignalTracker también tiene señal activa?
-        if self.signal_tracker.has_active_signal():
-            active_sym = self.signal_tracker.get_active_signal_symbol()
-            logger.info(f"⏭️ {symbol} - Ignorado: SignalTracker tiene señal activa en {active_sym}")
+        # ✅ CORRECCIÓN #7: CAPACIDAD DEL SIGNALTRACKER Y UNA SEÑAL POR SÍMBOLO
+        if self.signal_tracker.is_full() or self.signal_tracker.is_tracking(symbol):
+            logger.info(f"⏭️ {symbol} - Ignorado: tracker lleno o {symbol} ya en seguimiento "
+                        f"({len(self.signal_tracker.tracked_signals)}/{self.signal_tracker.max_signals()})")
             return
 
         # === 1. Preparar paquete ÚNICO ===
@@ -12008,22 +15654,21 @@ class OptimizedTradingBot:
             logger.debug(f"❌ {symbol} - No cumple umbrales DESTACADA: IA={neural_score:.1f}%, Tec={technical_pct:.1f}%, Ali={alignment_pct:.1f}%")
             return
 
-        # === 3. Activar modo exclusivo ===
-        self.exclusive_tracking_mode = True
-        self.tracked_symbol = symbol
-        self.tracked_signal_hash = signal_package['signal_hash']
-
-        # === 4. NO generar gráfico aquí - se generará solo al promocionar a CONFIRMADA ===
+        # === 3. NO generar gráfico aquí - se generará solo al promocionar a CONFIRMADA ===
         # Todas las señales empiezan como DESTACADA
         chart_path = None
         signal_package['status'] = 'DESTACADA'  # Asegurar que inicia como DESTACADA
 
-        # === 5. Agregar al SignalTracker ===
+        # === 4. Agregar al SignalTracker ===
         if not self.signal_tracker.add_highlighted_signal(signal_package):
             logger.error(f"❌ {symbol} - Rechazado por SignalTracker (validación interna falló)")
-            self._release_exclusive_mode()
             return
 
+        # === 5. Modo exclusivo solo con el tracker lleno ===
+        self.tracked_symbol = symbol
+        self.tracked_signal_hash = signal_package['signal_hash']
+        self.exclusive_tracking_mode = self.signal_tracker.is_full()
+
         # === 6. Notificar Telegram - SOLO TEXTO para DESTACADA (sin gráfico) ===
         if self.telegram_client and self.config.telegram_enabled:
             try:
@@ -12114,30 +15759,269 @@ class OptimizedTradingBot:
 
 logger = logging.getLogger('CryptoBotOptimized')
 
+class DeadlineScheduler:
+    """
+    Plazos one-shot por clave en un heap servido por un único hilo.
+    - Cada plazo se registra una vez; el hilo duerme hasta el siguiente vencimiento.
+      Coste O(log n) por alta y por vencimiento, sin sondear todas las claves.
+    - Reprogramar una clave sustituye su plazo; cancelar la marca y la entrada
+      obsoleta se descarta al llegar a la cima del heap.
+    - Los callbacks corren en el hilo del scheduler: deben ser cortos o delegar.
+    - Métricas: retraso de disparo respecto al plazo (un hilo bloqueado se ve aquí).
+    """
+    def __init__(self, name="DeadlineScheduler"):
+        self.name = name
+        self._cond = threading.Condition()
+        self._heap = []  # (deadline_monotonic, seq, key)
+        self._entries = {}  # {key: (deadline, seq, callback, args)}
+        self._seq = 0
+        self._thread = None
+        self.running = False
+        self.stats = {'scheduled': 0, 'fired': 0, 'cancelled': 0, 'errors': 0, 'max_late_ms': 0.0}
+
+    def schedule(self, key, delay_s: float, callback: Callable, *args):
+        """Programa (o reprograma) el plazo `key` para dentro de delay_s segundos"""
+        deadline = time.monotonic() + max(0.0, float(delay_s))
+        with self._cond:
+            self._seq += 1
+            self._entries[key] = (deadline, self._seq, callback, args)
+            heapq.heappush(self._heap, (deadline, self._seq, key))
+            self.stats['scheduled'] += 1
+            if len(self._heap) > 2 * len(self._entries) + 64:
+                # Demasiadas entradas obsoletas (reprogramaciones/cancelaciones): compactar
+                self._heap = [(d, seq, k) for k, (d, seq, _, _) in self._entries.items()]
+                heapq.heapify(self._heap)
+            if not self.running:
+                self.running = True
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+                    self._thread.start()
+            if self._heap[0][1] == self._seq:
+                self._cond.notify()  # Nuevo plazo más próximo: despertar antes
+
+    def cancel(self, key) -> bool:
+        with self._cond:
+            if self._entries.pop(key, None) is None:
+                return False
+            self.stats['cancelled'] += 1
+            return True
+
+    def remaining(self, key) -> Optional[float]:
+        """Segundos hasta el plazo de `key` (None si no está programado)"""
+        with self._cond:
+            entry = self._entries.get(key)
+        return None if entry is None else max(0.0, entry[0] - time.monotonic())
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+    def stop(self):
+        with self._cond:
+            self.running = False
+            self._entries.clear()
+            self._heap = []
+            self._cond.notify_all()
+
+    def _next_due(self):
+        with self._cond:
+            while self.running:
+                while self._heap:
+                    deadline, seq, key = self._heap[0]
+                    entry = self._entries.get(key)
+                    if entry is not None and entry[1] == seq:
+                        break
+                    heapq.heappop(self._heap)  # Cancelado o reprogramado
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                wait_s = self._heap[0][0] - time.monotonic()
+                if wait_s > 0:
+                    self._cond.wait(wait_s)
+                    continue
+                deadline, seq, key = heapq.heappop(self._heap)
+                _, _, callback, args = self._entries.pop(key)
+                return deadline, key, callback, args
+            return None
+
+    def _run(self):
+        while True:
+            due = self._next_due()
+            if due is None:
+                return
+            self._invoke(*due)
+
+    def _invoke(self, deadline, key, callback, args):
+        late_ms = (time.monotonic() - deadline) * 1000.0
+        self.stats['fired'] += 1
+        self.stats['max_late_ms'] = max(self.stats['max_late_ms'], late_ms)
+        try:
+            callback(*args)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"❌ Error en plazo {key} de {self.name}: {e}", exc_info=True)
+
+    def handover(self, other: 'DeadlineScheduler') -> int:
+        """Traspasa los plazos pendientes a `other` (mismo vencimiento) y detiene este scheduler"""
+        with self._cond:
+            entries = list(self._entries.items())
+        self.stop()
+        now = time.monotonic()
+        for key, (deadline, _, callback, args) in entries:
+            other.schedule(key, deadline - now, callback, *args)
+        return len(entries)
+
+
+class AsyncDeadlineScheduler(DeadlineScheduler):
+    """
+    DeadlineScheduler sobre el event loop del runtime backend: cada plazo es un
+    loop.call_later, sin hilo propio. Los callbacks corren en el executor del runtime,
+    así que pueden bloquear (diario con fsync, Telegram) sin frenar el loop.
+    Misma interfaz y métricas; schedule()/cancel() son thread-safe.
+    """
+    def __init__(self, loop, executor, name="DeadlineScheduler"):
+        super().__init__(name)
+        self.loop = loop
+        self.executor = executor
+        self.running = True
+
+    def schedule(self, key, delay_s: float, callback: Callable, *args):
+        deadline = time.monotonic() + max(0.0, float(delay_s))
+        with self._cond:
+            self._seq += 1
+            seq = self._seq
+            self._entries[key] = (deadline, seq, callback, args)
+            self.stats['scheduled'] += 1
+        try:
+            self.loop.call_soon_threadsafe(self._arm, key, seq, deadline)
+        except RuntimeError:
+            logger.warning(f"⚠️ {self.name}: event loop cerrado, plazo {key} sin programar")
+
+    def _arm(self, key, seq: int, deadline: float):
+        # loop.time() es time.monotonic(): el plazo absoluto se conserva tal cual
+        self.loop.call_at(deadline, self._fire, key, seq)
+
+    def _fire(self, key, seq: int):
+        with self._cond:
+            entry = self._entries.get(key)
+            if not self.running or entry is None or entry[1] != seq:
+                return  # Cancelado o reprogramado
+            del self._entries[key]
+        deadline, _, callback, args = entry
+        self.loop.run_in_executor(self.executor, self._invoke, deadline, key, callback, args)
+
+
+class TrackedSignal:
+    """
+    Estado de una señal en seguimiento. __slots__ evita un dict por instancia en el camino por
+    tick; conserva la interfaz de dict (tracking['status'], .get, .copy) que usan bot y GUI.
+    Las claves no previstas van a `extra`.
+    """
+    __slots__ = ('signal_hash', 'symbol', 'signal_data', 'status', 'start_time', 'entry_price',
+                 'reference_price_destacada', 'entry_price_confirmada', 'current_price', 'profit_percent',
+                 'max_profit', 'is_buy', 'telegram_updates_sent', 'promotion_telegram_sent',
+                 'highlight_start_time', 'confirmed_start_time', 'last_tick_at', 'closed', 'extra')
+    _FIELDS = frozenset(__slots__) - {'extra'}
+
+    def __init__(self, signal_hash: str, signal_data: dict, status: str, entry_price: float, is_buy: bool):
+        now = datetime.now()
+        self.signal_hash = signal_hash
+        self.symbol = signal_data.get('symbol')
+        self.signal_data = signal_data
+        self.status = status
+        self.start_time = now
+        self.entry_price = entry_price
+        self.reference_price_destacada = entry_price
+        self.entry_price_confirmada = entry_price if status == 'CONFIRMADA' else None
+        self.current_price = entry_price
+        self.profit_percent = 0.0
+        self.max_profit = 0.0
+        self.is_buy = is_buy
+        self.telegram_updates_sent = 0
+        self.promotion_telegram_sent = False
+        self.highlight_start_time = now if status == 'DESTACADA' else None
+        self.confirmed_start_time = now if status == 'CONFIRMADA' else None
+        self.last_tick_at = 0.0  # time.monotonic() del último precio aplicado
+        self.closed = False
+        self.extra = {}
+
+    def __getitem__(self, key):
+        if key in self._FIELDS:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self._FIELDS:
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in self._FIELDS or key in self.extra
+
+    def get(self, key, default=None):
+        value = getattr(self, key) if key in self._FIELDS else self.extra.get(key)
+        return default if value is None else value
+
+    def copy(self) -> dict:
+        snapshot = {key: getattr(self, key) for key in self._FIELDS}
+        snapshot.update(self.extra)
+        return snapshot
+
+    _TIME_FIELDS = ('start_time', 'highlight_start_time', 'confirmed_start_time')
+
+    def to_record(self) -> dict:
+        """Registro para el diario de estado (sin DataFrames ni estado de ejecución)"""
+        record = {key: getattr(self, key) for key in self._FIELDS - {'last_tick_at', 'closed'}}
+        record['extra'] = self.extra
+        return _journal_safe(record)
+
+    @classmethod
+    def from_record(cls, record: dict) -> 'TrackedSignal':
+        signal = cls(record['signal_hash'], record['signal_data'], record['status'],
+                     float(record['entry_price']), bool(record.get('is_buy', True)))
+        for key in cls._FIELDS - {'last_tick_at', 'closed'}:
+            if key in record:
+                setattr(signal, key, record[key])
+        for key in cls._TIME_FIELDS:
+            if isinstance(getattr(signal, key), str):
+                setattr(signal, key, datetime.fromisoformat(getattr(signal, key)))
+        signal.extra = dict(record.get('extra') or {})
+        return signal
+
+
 class SignalTracker:
     """
     Sistema robusto y seguro de seguimiento de señales DESTACADAS y CONFIRMADAS.
     ✅ CARACTERÍSTICAS CLAVE:
-    - Gestión centralizada de señales activas (máximo 1)
+    - Hasta MAX_TRACKED_SIGNALS señales simultáneas (una por símbolo), indexadas por hash y símbolo
     - Validación mejorada de coherencia
     - Control de uso de CPU para evitar 100%
     - Promoción automática: DESTACADA → CONFIRMADA
-    - Cierre automático por profit/loss/timeout
-    - Thread safety completo con locks
+    - Cierre automático por profit/loss/timeout evaluado en cada tick de precio (on_price_tick)
+    - Locks por franjas de símbolo: los ticks de señales distintas no compiten; el lock del
+      registro solo cubre altas/bajas (orden de adquisición: franja → registro)
     - Métricas de rendimiento integradas
     """
+    LOCK_STRIPES = 16
 
     def __init__(self, config=None):
         # ========== ATRIBUTOS PRINCIPALES ==========
         self.config = config  # ✅ Referencia a configuración para PROFIT_MILESTONES
-        self.tracked_signals = {}  # {signal_hash: tracking_data}
+        self.tracked_signals = {}  # {signal_hash: TrackedSignal}
+        self._by_symbol = {}  # {symbol: signal_hash}
+        self.price_feed = None  # Stream de ticks (subscribe/unsubscribe) de los símbolos en seguimiento
+        self.journal = None  # StateJournal: altas, promociones, avances y bajas sobreviven a un reinicio
         self.on_closed_callback = None
         self._similarity_engine_ref = None
         self.bot = None
         self._bot_ref = None
+        self._telegram_client = None
+        self.on_promoted_callback = None  # (signal_hash, promotion_data) al promover por plazo
 
         # ========== THREAD SAFETY ==========
-        self.lock = threading.Lock()
+        self.lock = threading.RLock()  # Registro: altas/bajas e índices (secciones cortas)
+        self._stripes = tuple(threading.RLock() for _ in range(self.LOCK_STRIPES))  # Estado por señal
         self.processing_lock = threading.Lock()  # Lock adicional para procesamiento
 
         # ========== CONTROL DE CPU ==========
@@ -12176,6 +16060,9 @@ class SignalTracker:
         self.price_cache = {}
         self.price_cache_timeout = 30  # segundos
         self.last_cache_cleanup = time.time()
+
+        # ========== PLAZOS (promoción y timeouts) ==========
+        self.timers = DeadlineScheduler("SignalTimers")
         logger.info("✅ SignalTracker inicializado con control de CPU y validación mejorada")
 
     def _validate_signal_coherence(self, signal_data: dict) -> Tuple[bool, str]:
@@ -12224,33 +16111,35 @@ class SignalTracker:
 
     def add_highlighted_signal(self, signal_data: dict) -> bool:
         """Añade una señal premium (DESTACADA o CONFIRMADA) de forma segura."""
-        with self.lock:
-            # Validación básica
-            symbol = signal_data.get('symbol')
-            entry_price = signal_data.get('entry_price', 0)
-            if not symbol or entry_price <= 0:
-                logger.warning(f"❌ Señal inválida para {symbol}: entry_price={entry_price}")
-                return False
-            
-            # Validación de coherencia con umbrales del sistema
-            try:
-                ok, reason_msg = self._validate_signal_coherence(signal_data)
-                if not ok:
-                    logger.warning(f"❌ Señal rechazada por coherencia: {reason_msg}")
-                    return False
-            except Exception as e:
-                logger.error(f"Error validando coherencia de señal: {e}")
+        # Validación básica
+        symbol = signal_data.get('symbol')
+        entry_price = signal_data.get('entry_price', 0)
+        if not symbol or entry_price <= 0:
+            logger.warning(f"❌ Señal inválida para {symbol}: entry_price={entry_price}")
+            return False
+
+        # Validación de coherencia con umbrales del sistema
+        try:
+            ok, reason_msg = self._validate_signal_coherence(signal_data)
+            if not ok:
+                logger.warning(f"❌ Señal rechazada por coherencia: {reason_msg}")
                 return False
+        except Exception as e:
+            logger.error(f"Error validando coherencia de señal: {e}")
+            return False
 
-            # Enforce single active signal (replace any existing)
-            if self.tracked_signals:
-                try:
-                    for existing_hash, existing_tracking in list(self.tracked_signals.items()):
-                        self.cancel_signal(existing_hash, "REPLACED_BY_NEW_SIGNAL")
-                    logger.info("🧹 Señal previa reemplazada por nueva DESTACADA/CONFIRMADA")
-                except Exception as e:
-                    logger.error(f"Error reemplazando señal previa: {e}")
+        signal_hash = signal_data.get('signal_hash')
+        if not signal_hash:
+            logger.error("❌ Señal sin hash único")
+            return False
+
+        # Una señal por símbolo: la nueva reemplaza a la anterior del mismo símbolo
+        previous_hash = self._by_symbol.get(symbol)
+        if previous_hash and previous_hash != signal_hash:
+            self.cancel_signal(previous_hash, "REPLACED_BY_NEW_SIGNAL")
+            logger.info(f"🧹 Señal previa de {symbol} reemplazada por nueva DESTACADA/CONFIRMADA")
 
+        with self.lock:
             # Verificar límite diario
             today = datetime.now().date()
             if today != self.daily_signal_date:
@@ -12261,47 +16150,33 @@ class SignalTracker:
                 logger.warning(f"❌ Límite diario alcanzado ({self.daily_signal_count})")
                 return False
 
-            # Generar hash único
-            signal_hash = signal_data.get('signal_hash')
-            if not signal_hash:
-                logger.error("❌ Señal sin hash único")
-                return False
             if signal_hash in self.tracked_signals:
                 logger.warning(f"⚠️ Señal duplicada ignorada: {signal_hash[:8]}")
                 return False
 
-            # Determinar dirección
+            if len(self.tracked_signals) >= self.max_signals():
+                logger.warning(f"❌ {symbol} rechazada: {len(self.tracked_signals)} señales en seguimiento "
+                               f"(máximo {self.max_signals()})")
+                self.performance_metrics['rejected_signals'] += 1
+                self.performance_metrics['rejected_reasons']['capacity'] += 1
+                return False
+
+            # Determinar dirección y crear registro de seguimiento
             is_buy = signal_data.get('is_buy', True)
             status = signal_data.get('status', 'DESTACADA')
-
-            # Crear paquete de seguimiento
-            tracking_entry = {
-                'signal_data': signal_data,
-                'status': status,
-                'start_time': datetime.now(),
-                'entry_price': entry_price,
-                'reference_price_destacada': entry_price,
-                'entry_price_confirmada': None,
-                'current_price': entry_price,
-                'max_profit': 0.0,
-                'is_buy': is_buy,
-                'telegram_updates_sent': 0,
-                'promotion_telegram_sent': False
-            }
-
-            # Establecer tiempos específicos
-            if status == 'DESTACADA':
-                tracking_entry['highlight_start_time'] = datetime.now()
-            elif status == 'CONFIRMADA':
-                tracking_entry['confirmed_start_time'] = datetime.now()
-                tracking_entry['entry_price_confirmada'] = entry_price
-
-            # Almacenar
-            self.tracked_signals[signal_hash] = tracking_entry
+            record = TrackedSignal(signal_hash, signal_data, status, entry_price, is_buy)
+            self.tracked_signals[signal_hash] = record
+            self._by_symbol[symbol] = signal_hash
             self.daily_signal_count += 1
             self.performance_metrics['total_signals'] += 1
-            logger.info(f"✅ Señal agregada: {signal_hash[:8]} | Estado: {status} | Precio ref: ${entry_price:.6f}")
-            return True
+            logger.info(f"✅ Señal agregada: {signal_hash[:8]} | Estado: {status} | Precio ref: ${entry_price:.6f} "
+                        f"| Activas: {len(self.tracked_signals)}/{self.max_signals()}")
+
+        self._schedule_deadlines(record)
+        self._journal_put(record)
+        if self.price_feed is not None:
+            self.price_feed.subscribe(symbol)
+        return True
 
     def has_active_signal(self) -> bool:
         """Verifica si hay alguna señal activa (DESTACADA o CONFIRMADA)."""
@@ -12309,22 +16184,201 @@ class SignalTracker:
             return len(self.tracked_signals) > 0
 
     def get_active_signal_symbol(self) -> Optional[str]:
-        """Obtiene el símbolo de la señal activa actual, si existe."""
+        """Obtiene el símbolo de la señal activa más antigua, si existe."""
         with self.lock:
             if self.tracked_signals:
-                first_key = next(iter(self.tracked_signals))
-                return self.tracked_signals[first_key]['signal_data'].get('symbol')
+                return next(iter(self.tracked_signals.values())).symbol
+            return None
+
+    def max_signals(self) -> int:
+        return max(1, int(getattr(self.config, 'MAX_TRACKED_SIGNALS', 3)))
+
+    def is_full(self) -> bool:
+        return len(self.tracked_signals) >= self.max_signals()
+
+    def is_tracking(self, symbol: str) -> bool:
+        return symbol in self._by_symbol
+
+    def get_signal(self, signal_hash: str) -> Optional[TrackedSignal]:
+        return self.tracked_signals.get(signal_hash)
+
+    def set_price_feed(self, price_feed):
+        """Stream de ticks con subscribe/unsubscribe; se suscriben las señales ya activas"""
+        self.price_feed = price_feed
+        if price_feed is not None:
+            for symbol in list(self._by_symbol):
+                price_feed.subscribe(symbol)
+
+    def set_timers(self, timers: DeadlineScheduler):
+        """Sustituye el scheduler de plazos (runtime backend) sin perder los ya programados"""
+        previous, self.timers = self.timers, timers
+        previous.handover(timers)
+
+    def clear(self):
+        """Descarta todas las señales sin reportes de cierre (reinicio desde la GUI)"""
+        with self.lock:
+            records = list(self.tracked_signals.values())
+            self.tracked_signals.clear()
+            self._by_symbol.clear()
+        if self.journal is not None:
+            self.journal.reset('signal')
+        for record in records:
+            record.closed = True
+            self._cancel_deadlines(record.signal_hash)
+            if self.price_feed is not None:
+                self.price_feed.unsubscribe(record.symbol)
+
+    def _stripe(self, symbol: str):
+        return self._stripes[hash(symbol) % len(self._stripes)]
+
+    def _unregister(self, record: TrackedSignal):
+        """Baja del registro y del índice por símbolo (llamar con la franja del símbolo tomada)"""
+        record.closed = True
+        self._cancel_deadlines(record.signal_hash)
+        with self.lock:
+            self.tracked_signals.pop(record.signal_hash, None)
+            if self._by_symbol.get(record.symbol) == record.signal_hash:
+                del self._by_symbol[record.symbol]
+        if self.journal is not None:
+            self.journal.delete('signal', record.signal_hash)
+
+    # ========== DIARIO DE ESTADO ==========
+    def set_journal(self, journal: Optional[StateJournal]):
+        self.journal = journal
+
+    def checkpoint(self, signal_hash: str):
+        """Persiste el estado actual de la señal (p. ej. tras notificar un avance)"""
+        record = self.tracked_signals.get(signal_hash)
+        if record is not None and not record.closed:
+            self._journal_put(record)
+
+    def _journal_put(self, record: TrackedSignal):
+        if self.journal is None:
+            return
+        data = record.to_record()
+        sent = getattr(self._telegram_client, 'sent_milestones', None)
+        if isinstance(sent, dict) and sent.get(record.symbol):
+            data['sent_milestones'] = sorted(sent[record.symbol])
+        self.journal.put('signal', record.signal_hash, data)
+
+    def restore_from_journal(self) -> int:
+        """
+        Reconstruye las señales del diario tras un reinicio: índices, plazos (con el tiempo ya
+        transcurrido), avances ya notificados y suscripción a ticks. Sin re-análisis ni alertas.
+        """
+        if self.journal is None:
+            return 0
+        restored = 0
+        for signal_hash, data in self.journal.records('signal').items():
+            if signal_hash in self.tracked_signals:
+                continue
+            try:
+                record = TrackedSignal.from_record(data)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"❌ Señal {signal_hash[:8]} del diario descartada: {e}")
+                self.journal.delete('signal', signal_hash)
+                continue
+            with self.lock:
+                if record.symbol in self._by_symbol:
+                    continue
+                self.tracked_signals[signal_hash] = record
+                self._by_symbol[record.symbol] = signal_hash
+            sent = data.get('sent_milestones')
+            if sent and self._telegram_client is not None:
+                if not hasattr(self._telegram_client, 'sent_milestones'):
+                    self._telegram_client.sent_milestones = {}
+                self._telegram_client.sent_milestones[record.symbol] = set(sent)
+            self._schedule_deadlines(record)
+            if self.price_feed is not None:
+                self.price_feed.subscribe(record.symbol)
+            restored += 1
+            logger.info(f"♻️ Señal restaurada: {record.symbol} ({signal_hash[:8]}) | {record.status}")
+        return restored
+
+    def on_price_tick(self, symbol: str, price: float) -> Optional[Dict]:
+        """
+        Tick de precio: progreso, avances y cierre por TP/SL de la señal del símbolo.
+        O(1) por índice de símbolo y bajo el lock de su franja. Devuelve el reporte si cerró.
+        Los timeouts no dependen de ticks: son plazos del scheduler (_schedule_deadlines).
+        """
+        signal_hash = self._by_symbol.get(symbol)
+        if signal_hash is None or price <= 1e-8:
+            return None
+        progress = self.update_signal_progress(signal_hash, price)
+        if not progress:
             return None
+        record = self.tracked_signals.get(signal_hash)
+        reason = self._exit_reason(progress['profit_percent'])
+        if reason:
+            return self.close_signal(signal_hash, price, reason)
+        return None
+
+    def _exit_reason(self, profit_percent: float) -> Optional[str]:
+        if profit_percent >= getattr(self.config, 'PROFIT_TARGET_PERCENT', 3.0):
+            return 'target_reached'
+        if profit_percent <= -getattr(self.config, 'DEFAULT_STOP_LOSS_PERCENT', 0.01) * 100:
+            return 'stop_loss_hit'
+        return None
+
+    # ========== PLAZOS: REGISTRADOS UNA VEZ POR SEÑAL, DISPARADOS AL VENCER ==========
+    def _schedule_deadlines(self, record: TrackedSignal):
+        """
+        DESTACADA: revisión de promoción + timeout 'highlight_timeout_min'. CONFIRMADA: timeout
+        'confirmed_timeout_min' (validation_config, sin valores fijos en código).
+        Los plazos se cuentan desde el inicio de la fase (una señal restaurada conserva el suyo).
+        """
+        now = datetime.now()
+        if record.status == 'DESTACADA':
+            elapsed = (now - (record.highlight_start_time or record.start_time)).total_seconds()
+            promo_s = getattr(self.config, 'MIN_PROMOTION_TIME_SECONDS', 3 * 60)
+            self.timers.schedule((record.signal_hash, 'promotion'), promo_s - elapsed,
+                                 self._on_promotion_deadline, record.signal_hash)
+            timeout_s = self.validation_config['highlight_timeout_min'] * 60
+        else:
+            elapsed = (now - (record.confirmed_start_time or record.start_time)).total_seconds()
+            self.timers.cancel((record.signal_hash, 'promotion'))
+            timeout_s = self.validation_config['confirmed_timeout_min'] * 60
+        self.timers.schedule((record.signal_hash, 'timeout'), timeout_s - elapsed,
+                             self._on_timeout_deadline, record.signal_hash)
+
+    def _cancel_deadlines(self, signal_hash: str):
+        self.timers.cancel((signal_hash, 'promotion'))
+        self.timers.cancel((signal_hash, 'timeout'))
+
+    def _on_timeout_deadline(self, signal_hash: str):
+        """
+        Timeout vencido. close_signal dispara los callbacks del bot (GUI, Telegram, gráficos),
+        así que no corre en el hilo de plazos: se pasa a otro hilo. Con AsyncDeadlineScheduler
+        (runtime backend) el callback ya corre en el executor del runtime.
+        """
+        record = self.tracked_signals.get(signal_hash)
+        if record is None:
+            return
+        if isinstance(self.timers, AsyncDeadlineScheduler):
+            self._close_on_timeout(signal_hash, record.status)
+            return
+        threading.Thread(target=self._close_on_timeout, args=(signal_hash, record.status),
+                         daemon=True, name="SignalTimeoutClose").start()
+
+    def _close_on_timeout(self, signal_hash: str, status: str):
+        record = self.tracked_signals.get(signal_hash)
+        if record is None or record.status != status:
+            return  # Cerrada o promovida entretanto: su nuevo plazo ya está programado
+        reason = 'HIGHLIGHT_TIMEOUT' if status == 'DESTACADA' else 'CONFIRMED_TIMEOUT'
+        logger.warning(f"⏱️ {reason}: {record.symbol} ({signal_hash[:8]})")
+        self.close_signal(signal_hash, record.current_price or record.entry_price, reason)
 
     def promote_to_confirmed(self, signal_hash: str, current_neural_conf: float = None,
                            current_technical_pct: float = None, market_data: dict = None,
                            alignment_score: float = None, current_price: float = None) -> bool:
         """Promueve una señal DESTACADA a CONFIRMADA."""
-        with self.lock:
-            if signal_hash not in self.tracked_signals:
+        tracking = self.tracked_signals.get(signal_hash)
+        if tracking is None:
+            return False
+        with self._stripe(tracking.symbol):
+            if tracking.closed:
                 return False
 
-            tracking = self.tracked_signals[signal_hash]
             if tracking['status'] != 'DESTACADA':
                 return False
 
@@ -12351,17 +16405,22 @@ class SignalTracker:
             tracking['status'] = 'CONFIRMADA'
             tracking['confirmed_start_time'] = datetime.now()
             tracking['promotion_telegram_sent'] = True
-            self.performance_metrics['promotion_count'] += 1
+            self._schedule_deadlines(tracking)
+            self._journal_put(tracking)
+            with self.lock:
+                self.performance_metrics['promotion_count'] += 1
             logger.info(f"🎉 Señal promovida a CONFIRMADA: {signal_hash[:8]}")
             return True
 
     def close_signal(self, signal_hash: str, current_price: float, reason: str = "MANUAL") -> Optional[Dict]:
-        """Cierra una señal y genera reporte."""
-        with self.lock:
-            if signal_hash not in self.tracked_signals:
+        """Cierra una señal y genera reporte. Callbacks (bot, GUI) fuera de los locks."""
+        tracking = self.tracked_signals.get(signal_hash)
+        if tracking is None:
+            return None
+        with self._stripe(tracking.symbol):
+            if tracking.closed:
                 return None
 
-            tracking = self.tracked_signals[signal_hash]
             signal_data = tracking['signal_data']
             symbol = signal_data.get('symbol', 'UNKNOWN')
             entry_price = tracking['entry_price']
@@ -12394,18 +16453,19 @@ class SignalTracker:
             # Éxito si alcanzó objetivo o cierre parcial con profit positivo
             success_threshold = getattr(self.config, 'MILESTONE_3', 3.0)
             is_success = (normalized_reason in ("PROFIT_TARGET", "PARTIAL_TARGET")) or (profit_percent >= success_threshold)
-            if is_success:
-                self.performance_metrics['successful_signals'] += 1
-            elif profit_percent > 0 and "PARTIAL" in normalized_reason:
-                self.performance_metrics['successful_signals'] += 1
-            
-            self.performance_metrics['closure_reasons'][normalized_reason] += 1
-            total_signals = self.performance_metrics['total_signals']
-            if total_signals > 0:
-                current_avg = self.performance_metrics['avg_profit_loss']
-                self.performance_metrics['avg_profit_loss'] = (
-                    (current_avg * (total_signals - 1) + profit_percent) / total_signals
-                )
+            with self.lock:
+                if is_success:
+                    self.performance_metrics['successful_signals'] += 1
+                elif profit_percent > 0 and "PARTIAL" in normalized_reason:
+                    self.performance_metrics['successful_signals'] += 1
+
+                self.performance_metrics['closure_reasons'][normalized_reason] += 1
+                total_signals = self.performance_metrics['total_signals']
+                if total_signals > 0:
+                    current_avg = self.performance_metrics['avg_profit_loss']
+                    self.performance_metrics['avg_profit_loss'] = (
+                        (current_avg * (total_signals - 1) + profit_percent) / total_signals
+                    )
 
             # Generar reporte
             report = {
@@ -12415,7 +16475,8 @@ class SignalTracker:
                 'profit_percent': profit_percent,
                 'final_profit_percent': profit_percent,
                 'duration_minutes': (datetime.now() - tracking['start_time']).total_seconds() / 60,
-                'signal_hash': signal_hash
+                'signal_hash': signal_hash,
+                'signal_data': signal_data
             }
 
             try:
@@ -12441,40 +16502,50 @@ class SignalTracker:
                 logger.error(f"[ERROR] Error guardando trade exitoso para entrenamiento: {e}")
 
             # Limpiar
-            del self.tracked_signals[signal_hash]
+            self._unregister(tracking)
             logger.info(f"Senal {symbol} ({signal_hash[:8]}) cerrada: {reason} | Profit: {profit_percent:+.2f}%")
 
-            # Notificar al bot para liberar modo exclusivo
-            if hasattr(self, '_bot_ref') and self._bot_ref:
-                self._bot_ref._release_exclusive_mode()
-            
-            # CORREGIDO v35: Llamar al callback para limpiar GUI
-            if hasattr(self, 'on_closed_callback') and self.on_closed_callback:
-                try:
-                    full_report = {
-                        'symbol': symbol,
-                        'reason': reason,
-                        'final_profit_percent': profit_percent,
-                        'duration_minutes': report['duration_minutes'],
-                        'max_profit_reached': tracking.get('max_profit', profit_percent),
-                        'entry_price': entry_price,
-                        'exit_price': current_price,
-                        'signal_hash': signal_hash
-                    }
-                    self.on_closed_callback(symbol, full_report)
-                    logger.info(f"Callback de cierre ejecutado para {symbol}")
-                except Exception as e:
-                    logger.error(f"Error ejecutando callback de cierre: {e}")
+        full_report = {
+            'symbol': symbol,
+            'reason': reason,
+            'final_profit_percent': profit_percent,
+            'duration_minutes': report['duration_minutes'],
+            'max_profit_reached': tracking.get('max_profit', profit_percent),
+            'entry_price': entry_price,
+            'exit_price': current_price,
+            'signal_hash': signal_hash,
+            'signal_data': signal_data
+        }
+        self._after_removal(symbol, full_report, "cierre")
+        return report
 
-            return report
+    def _after_removal(self, symbol: str, report: dict, kind: str):
+        """Baja del stream de ticks, liberación de modo exclusivo y callback de GUI (sin locks tomados)"""
+        if self.price_feed is not None and not self.is_tracking(symbol):
+            self.price_feed.unsubscribe(symbol)
+
+        # Notificar al bot para liberar modo exclusivo
+        if hasattr(self, '_bot_ref') and self._bot_ref:
+            self._bot_ref._release_exclusive_mode()
+
+        # CORREGIDO v35: Llamar al callback para limpiar GUI
+        if hasattr(self, 'on_closed_callback') and self.on_closed_callback:
+            try:
+                self.on_closed_callback(symbol, report)
+                logger.info(f"Callback de {kind} ejecutado para {symbol}")
+            except Exception as e:
+                logger.error(f"Error ejecutando callback de {kind}: {e}")
 
     def update_signal_progress(self, signal_hash: str, current_price: float) -> Optional[Dict]:
         """Actualiza el progreso de una señal con el precio actual. Sincronizado con GUI."""
-        with self.lock:
-            if signal_hash not in self.tracked_signals:
+        tracking = self.tracked_signals.get(signal_hash)
+        if tracking is None:
+            return None
+        with self._stripe(tracking.symbol):
+            if tracking.closed:
                 return None
 
-            tracking = self.tracked_signals[signal_hash]
+            tracking.last_tick_at = time.monotonic()
             status = tracking.get('status', 'UNKNOWN')
             is_buy = tracking.get('is_buy', True)
             
@@ -12562,6 +16633,7 @@ class SignalTracker:
                             # Usar send_message del cliente (ya es async/queue based)
                             self._telegram_client.send_message(msg)
                             self._telegram_client.sent_milestones[symbol].add(ms)
+                            self._journal_put(tracking)
                             logger.info(f"🚀 Milestone {ms}% notificado para {symbol}")
                 except Exception as e:
                     logger.error(f"Error verificando milestones: {e}")
@@ -12587,11 +16659,13 @@ class SignalTracker:
 
     def cancel_signal(self, signal_hash: str, reason: str = "Cancelada por sistema"):
         """Cancelación explícita de señales."""
-        with self.lock:
-            if signal_hash not in self.tracked_signals:
+        tracking = self.tracked_signals.get(signal_hash)
+        if tracking is None:
+            return
+        with self._stripe(tracking.symbol):
+            if tracking.closed:
                 return
 
-            tracking = self.tracked_signals[signal_hash]
             symbol = tracking.get('signal_data', {}).get('symbol', 'UNKNOWN')
             status = tracking.get('status')
             highlight_start_time = tracking.get('highlight_start_time') or tracking.get('start_time')
@@ -12603,88 +16677,60 @@ class SignalTracker:
                 except Exception:
                     duration_minutes = None
 
-            del self.tracked_signals[signal_hash]
-            self.performance_metrics['closure_reasons']['cancelled'] += 1
+            self._unregister(tracking)
+            with self.lock:
+                self.performance_metrics['closure_reasons']['cancelled'] += 1
             logger.info(f"Senal {symbol} ({signal_hash[:8]}) cancelada: {reason}")
 
-            # Notificar al bot para liberar modo exclusivo
-            if hasattr(self, '_bot_ref') and self._bot_ref:
-                self._bot_ref._release_exclusive_mode()
-            
-            # CORREGIDO v35: Llamar al callback para limpiar GUI
-            if hasattr(self, 'on_closed_callback') and self.on_closed_callback:
-                try:
-                    report = {
-                        'symbol': symbol,
-                        'reason': reason,
-                        'final_profit_percent': 0.0,
-                        'duration_minutes': duration_minutes or 0,
-                        'max_profit_reached': 0.0,
-                        'signal_hash': signal_hash
-                    }
-                    self.on_closed_callback(symbol, report)
-                    logger.info(f"Callback de cancelacion ejecutado para {symbol}")
-                except Exception as e:
-                    logger.error(f"Error ejecutando callback de cancelacion: {e}")
+        report = {
+            'symbol': symbol,
+            'reason': reason,
+            'final_profit_percent': 0.0,
+            'duration_minutes': duration_minutes or 0,
+            'max_profit_reached': 0.0,
+            'signal_hash': signal_hash,
+            'signal_data': tracking.signal_data
+        }
+        self._after_removal(symbol, report, "cancelacion")
 
     # METODO CRITICO: PROMOCION AUTOMATICA CON CALLBACK TELEGRAM
-    def check_promotion_timer(self) -> List[Tuple[str, dict]]:
+    def _on_promotion_deadline(self, signal_hash: str):
         """
-        Verifica senales DESTACADA para promocion o cancelacion.
-        CORREGIDO v35: Retorna datos completos para que el bot envie Telegram
-        
-        Returns:
-            List[Tuple[str, dict]]: Lista de (signal_hash, promotion_data) procesados
+        Plazo MIN_PROMOTION_TIME_SECONDS de una DESTACADA: promueve si cumple umbrales y entrega
+        los datos completos a on_promoted_callback para que el bot envíe Telegram.
         """
-        processed = []
-        promo_timeout_seconds = self.validation_config.get('highlight_timeout_min', 20) * 60
-        min_promo_time_seconds = 3 * 60
-
-        with self.lock:
-            signals_copy = list(self.tracked_signals.items())
-
-        for signal_hash, tracking in signals_copy:
-            if tracking.get('status') != 'DESTACADA':
-                continue
-
-            start_time = tracking.get('highlight_start_time')
-            if not start_time:
-                continue
-
-            elapsed = (datetime.now() - start_time).total_seconds()
+        tracking = self.tracked_signals.get(signal_hash)
+        if tracking is None or tracking.get('status') != 'DESTACADA':
+            return
 
-            if elapsed >= promo_timeout_seconds:
-                logger.warning(f"TIMEOUT DESTACADA: {signal_hash[:8]}")
-                self.cancel_signal(signal_hash, "Timeout de promocion")
-                processed.append((signal_hash, {'promoted': False, 'reason': 'TIMEOUT'}))
-                continue
+        neural = tracking['signal_data'].get('neural_score', 0)
+        technical = tracking['signal_data'].get('technical_percentage', 0)
+        alignment = tracking['signal_data'].get('alignment_percentage', 0)
 
-            if elapsed >= min_promo_time_seconds:
-                neural = tracking['signal_data'].get('neural_score', 0)
-                technical = tracking['signal_data'].get('technical_percentage', 0)
-                alignment = tracking['signal_data'].get('alignment_percentage', 0)
-
-                min_neural = getattr(self.config, 'MIN_NEURAL_DESTACADA', 50.0)
-                min_tech = getattr(self.config, 'MIN_TECHNICAL_DESTACADA', 40.0)
-                min_align = getattr(self.config, 'MIN_ALIGNMENT_DESTACADA', 33.0)
-
-                if neural >= min_neural and technical >= min_tech and alignment >= min_align:
-                    current_price = tracking.get('current_price', tracking.get('entry_price', 0))
-                    if self.promote_to_confirmed(signal_hash, current_price=current_price):
-                        # Retornar datos completos para Telegram
-                        promotion_data = {
-                            'promoted': True,
-                            'symbol': tracking['signal_data'].get('symbol', 'UNKNOWN'),
-                            'signal_data': tracking['signal_data'].copy(),
-                            'current_price': current_price,
-                            'neural': neural,
-                            'technical': technical,
-                            'alignment': alignment
-                        }
-                        processed.append((signal_hash, promotion_data))
-                        logger.info(f"Senal {signal_hash[:8]} promovida a CONFIRMADA @ ${current_price:.6f}")
+        min_neural = getattr(self.config, 'MIN_NEURAL_DESTACADA', 50.0)
+        min_tech = getattr(self.config, 'MIN_TECHNICAL_DESTACADA', 40.0)
+        min_align = getattr(self.config, 'MIN_ALIGNMENT_DESTACADA', 33.0)
 
-        return processed
+        if not (neural >= min_neural and technical >= min_tech and alignment >= min_align):
+            return  # Sigue DESTACADA hasta su timeout o la promoción por alineación del bot
+        current_price = tracking.get('current_price', tracking.get('entry_price', 0))
+        if not self.promote_to_confirmed(signal_hash, current_price=current_price):
+            return
+        logger.info(f"Senal {signal_hash[:8]} promovida a CONFIRMADA @ ${current_price:.6f}")
+        if self.on_promoted_callback:
+            promotion_data = {
+                'promoted': True,
+                'symbol': tracking['signal_data'].get('symbol', 'UNKNOWN'),
+                'signal_data': tracking['signal_data'].copy(),
+                'current_price': current_price,
+                'neural': neural,
+                'technical': technical,
+                'alignment': alignment
+            }
+            try:
+                self.on_promoted_callback(signal_hash, promotion_data)
+            except Exception as e:
+                logger.error(f"Error ejecutando callback de promocion: {e}")
 
     def get_tracked_signals(self) -> dict:
         """Retorna copia del diccionario de señales trackeadas (thread-safe)."""
@@ -12695,64 +16741,390 @@ class SignalTracker:
         """Retorna métricas de rendimiento."""
         with self.lock:
             return self.performance_metrics.copy()
+# ========== BUS DE EVENTOS BOT → GUI ==========
+class GuiEventBus:
+    """
+    Canales tipados entre el bot (hilos de trabajo) y la GUI (hilo principal).
+    - state: último valor por tipo (precio, progreso, símbolo actual); se fusionan.
+    - log: líneas acotadas, entregadas en un solo lote por frame.
+    - critical: señales, cierres y limpiezas; FIFO y nunca se descartan con GUI conectada.
+    Cada evento lleva un número de secuencia para respetar el orden relativo al drenar.
+    """
+    STATE_TYPES = frozenset({
+        'update_pair_scan_progress', 'update_highlight_progress', 'update_confirmed_progress',
+        'update_pending_promotion', 'update_current_analyzed_symbol', 'update_gui_realtime_price',
+        'update_gui', 'update_analysis_tab',
+    })
+    LOG_TYPES = frozenset({'log_message'})
+    CHANNELS = ('state', 'log', 'critical')
 
-    def start_monitoring(self):
-        """Inicia el monitoreo continuo."""
-        self.tracker_running = True
-        self.monitor_thread = threading.Thread(
-            target=self._monitor_tracked_signals_continuous,
-            daemon=True,
-            name="SignalTrackerMonitor"
-        )
-        self.monitor_thread.start()
-        logger.info("✅ SignalTracker: Monitoreo iniciado")
+    def __init__(self, config=None):
+        self.log_maxlen = int(getattr(config, 'GUI_BUS_LOG_MAXLEN', 1000) or 1000)
+        self.detached_backlog = int(getattr(config, 'GUI_BUS_DETACHED_BACKLOG', 200) or 200)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._state = {}  # {msg_type: (seq, data)}
+        self._logs = deque()  # (timestamp, message)
+        self._critical = deque()  # (seq, msg_type, data)
+        self._consumer_attached = False
+        self._started = time.time()
+        self.stats = {channel: {'published': 0, 'delivered': 0, 'coalesced': 0, 'dropped': 0}
+                      for channel in self.CHANNELS}
+
+    def channel_for(self, msg_type: str) -> str:
+        if msg_type in self.STATE_TYPES:
+            return 'state'
+        if msg_type in self.LOG_TYPES:
+            return 'log'
+        return 'critical'
+
+    def attach_consumer(self):
+        """La GUI drena el bus: a partir de aquí los eventos críticos no se acotan"""
+        with self._lock:
+            self._consumer_attached = True
+
+    def publish(self, msg_type: str, data=None):
+        channel = self.channel_for(msg_type)
+        with self._lock:
+            self._seq += 1
+            stats = self.stats[channel]
+            stats['published'] += 1
+            if channel == 'state':
+                if msg_type in self._state:
+                    stats['coalesced'] += 1
+                self._state[msg_type] = (self._seq, data)
+            elif channel == 'log':
+                self._logs.append((datetime.now(), data))
+                if len(self._logs) > self.log_maxlen:
+                    self._logs.popleft()
+                    stats['dropped'] += 1
+            else:
+                self._critical.append((self._seq, msg_type, data))
+                # Sin GUI (modo consola) nadie drena: conservar solo los más recientes
+                if not self._consumer_attached and len(self._critical) > self.detached_backlog:
+                    self._critical.popleft()
+                    stats['dropped'] += 1
+
+    def drain(self):
+        """Devuelve (eventos [(tipo, datos)] en orden de publicación, líneas de log [(ts, msg)])"""
+        with self._lock:
+            critical, self._critical = self._critical, deque()
+            state, self._state = self._state, {}
+            logs, self._logs = self._logs, deque()
+            self.stats['critical']['delivered'] += len(critical)
+            self.stats['state']['delivered'] += len(state)
+            self.stats['log']['delivered'] += len(logs)
+        events = [(seq, msg_type, data) for seq, msg_type, data in critical]
+        events.extend((seq, msg_type, data) for msg_type, (seq, data) in state.items())
+        events.sort(key=lambda event: event[0])
+        return [(msg_type, data) for _, msg_type, data in events], list(logs)
+
+    def get_metrics(self) -> dict:
+        """Tasas por canal (eventos/s desde el inicio), fusionados, descartados y pendientes"""
+        with self._lock:
+            elapsed = max(time.time() - self._started, 1e-9)
+            pending = {'state': len(self._state), 'log': len(self._logs), 'critical': len(self._critical)}
+            return {channel: dict(stats, rate_per_sec=round(stats['published'] / elapsed, 2),
+                                  pending=pending[channel])
+                    for channel, stats in self.stats.items()}
+
+
+# ========== MODELOS DE TABLA (MODEL/VIEW CON DIFFS POR SÍMBOLO) ==========
+class TableCell(NamedTuple):
+    """Contenido y estilo de una celda; la igualdad de tuplas detecta cambios"""
+    text: str
+    background: Optional[str] = None
+    foreground: Optional[str] = None
+    font: Optional[Tuple[str, int, bool]] = None  # (familia, tamaño, negrita)
+    sort_value: Any = None
+
+
+class SymbolTableModel(QtCore.QAbstractTableModel):
+    """
+    Modelo de tabla indexado por símbolo.
+    apply_rows() inserta, actualiza y elimina filas por símbolo y emite dataChanged
+    solo para las celdas que cambiaron: el coste escala con los cambios, no con la tabla.
+    """
+    SORT_ROLE = QtCore.Qt.UserRole
 
-    def stop_monitoring(self):
-        """Detiene el monitoreo continuo."""
-        self.tracker_running = False
-        if hasattr(self, 'monitor_thread') and self.monitor_thread:
-            self.monitor_thread.join(timeout=2)
-        logger.info("✅ SignalTracker: Monitoreo detenido")
+    def __init__(self, headers: List[str], parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._symbols: List[str] = []
+        self._rows: List[List[TableCell]] = []
+        self._row_index: Dict[str, int] = {}
+        # QColor/QFont compartidos: no se crean objetos por celda en cada refresco
+        self._colors: Dict[str, Any] = {}
+        self._fonts: Dict[Tuple[str, int, bool], Any] = {}
+        self.stats = {'inserted': 0, 'updated_cells': 0, 'removed': 0}
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._symbols)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        cell = self._rows[index.row()][index.column()]
+        if role == QtCore.Qt.DisplayRole:
+            return cell.text
+        if role == QtCore.Qt.BackgroundRole and cell.background:
+            return self._color(cell.background)
+        if role == QtCore.Qt.ForegroundRole and cell.foreground:
+            return self._color(cell.foreground)
+        if role == QtCore.Qt.FontRole and cell.font:
+            return self._font(cell.font)
+        if role == self.SORT_ROLE:
+            return cell.text if cell.sort_value is None else cell.sort_value
+        return None
 
-    def _monitor_tracked_signals_continuous(self):
-        """Monitoreo continuo de señales activas."""
-        while getattr(self, 'tracker_running', False):
-            try:
-                time.sleep(self.monitor_interval)
-                self._check_timeouts_and_close()
-            except Exception as e:
-                logger.error(f"❌ Error en monitoreo continuo: {e}", exc_info=True)
+    def _color(self, name: str):
+        color = self._colors.get(name)
+        if color is None:
+            color = self._colors[name] = QtGui.QColor(name)
+        return color
+
+    def _font(self, spec: Tuple[str, int, bool]):
+        font = self._fonts.get(spec)
+        if font is None:
+            family, size, bold = spec
+            font = QtGui.QFont(family, size)
+            font.setBold(bold)
+            self._fonts[spec] = font
+        return font
+
+    def symbol_at(self, row: int) -> Optional[str]:
+        return self._symbols[row] if 0 <= row < len(self._symbols) else None
+
+    def cell(self, row: int, column: int) -> TableCell:
+        return self._rows[row][column]
+
+    def apply_rows(self, rows: Dict[str, List[TableCell]]) -> Dict[str, int]:
+        """Aplica el estado deseado {símbolo: celdas} como diff y devuelve los cambios realizados"""
+        changes = {'inserted': 0, 'updated_cells': 0, 'removed': 0}
+
+        # 1. Eliminar símbolos que ya no están (de abajo hacia arriba, agrupando filas contiguas)
+        stale = sorted((self._row_index[s] for s in self._symbols if s not in rows), reverse=True)
+        while stale:
+            last = first = stale.pop(0)
+            while stale and stale[0] == first - 1:
+                first = stale.pop(0)
+            self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+            del self._symbols[first:last + 1]
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+            changes['removed'] += last - first + 1
+        if changes['removed']:
+            self._row_index = {symbol: row for row, symbol in enumerate(self._symbols)}
+
+        # 2. Actualizar celdas cambiadas (dataChanged por tramo contiguo de columnas)
+        new_symbols = []
+        for symbol, cells in rows.items():
+            row = self._row_index.get(symbol)
+            if row is None:
+                new_symbols.append(symbol)
+                continue
+            current = self._rows[row]
+            changed = [col for col, cell in enumerate(cells) if current[col] != cell]
+            if not changed:
+                continue
+            self._rows[row] = list(cells)
+            start = prev = changed[0]
+            for col in changed[1:] + [None]:
+                if col is not None and col == prev + 1:
+                    prev = col
+                    continue
+                self.dataChanged.emit(self.index(row, start), self.index(row, prev))
+                if col is not None:
+                    start = prev = col
+            changes['updated_cells'] += len(changed)
+
+        # 3. Insertar símbolos nuevos en un solo bloque al final
+        if new_symbols:
+            first = len(self._symbols)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(new_symbols) - 1)
+            for offset, symbol in enumerate(new_symbols):
+                self._symbols.append(symbol)
+                self._rows.append(list(rows[symbol]))
+                self._row_index[symbol] = first + offset
+            self.endInsertRows()
+            changes['inserted'] = len(new_symbols)
+
+        for key, value in changes.items():
+            self.stats[key] += value
+        return changes
+
+    def remove_symbol(self, symbol: str) -> bool:
+        row = self._row_index.get(symbol)
+        if row is None:
+            return False
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        del self._symbols[row]
+        del self._rows[row]
+        self.endRemoveRows()
+        self._row_index = {s: r for r, s in enumerate(self._symbols)}
+        self.stats['removed'] += 1
+        return True
+
+    def clear(self):
+        self.beginResetModel()
+        self._symbols, self._rows, self._row_index = [], [], {}
+        self.endResetModel()
+
+
+class SymbolFilterProxyModel(QtCore.QSortFilterProxyModel):
+    """Proxy de orden/filtro: ordena por SORT_ROLE y filtra filas con un predicado (modelo, fila)"""
+    def __init__(self, source_model: SymbolTableModel, parent=None):
+        super().__init__(parent)
+        self._row_filter = None
+        self.setSourceModel(source_model)
+        self.setSortRole(SymbolTableModel.SORT_ROLE)
+        self.setDynamicSortFilter(True)
+
+    def set_row_filter(self, row_filter: Optional[Callable[[SymbolTableModel, int], bool]]):
+        self._row_filter = row_filter
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._row_filter is None:
+            return True
+        return self._row_filter(self.sourceModel(), source_row)
+
+    def symbol_at(self, proxy_row: int) -> Optional[str]:
+        source_index = self.mapToSource(self.index(proxy_row, 0))
+        return self.sourceModel().symbol_at(source_index.row())
+
+
+class LogEntry(NamedTuple):
+    timestamp: str
+    level: str
+    symbol: Optional[str]
+    text: str
+
+
+class LogRingModel(QtCore.QAbstractListModel):
+    """
+    Log de la terminal en un buffer circular acotado.
+    append() es thread-safe y solo encola; flush() (hilo GUI, a ritmo fijo) mueve el lote
+    pendiente al anillo con un único insert/remove, así la memoria no crece en sesiones largas.
+    """
+    LEVEL_ROLE = QtCore.Qt.UserRole
+    SYMBOL_ROLE = QtCore.Qt.UserRole + 1
+    LEVELS = ('INFO', 'WARNING', 'ERROR')
+    LEVEL_COLORS = {'INFO': '#00d4aa', 'WARNING': '#ffd60a', 'ERROR': '#ff6b6b'}
+    _SYMBOL_RE = re.compile(r'\b([A-Z0-9]{2,}(?:USDT|BUSD|USDC|BTC))\b')
+
+    def __init__(self, capacity: int = 5000, parent=None):
+        super().__init__(parent)
+        self.capacity = max(1, int(capacity))
+        self._entries = deque()
+        self._pending = deque(maxlen=self.capacity)  # Entre flushes nunca hace falta más que el anillo
+        self._pending_lock = threading.Lock()
+        self._colors = {}
+        self.stats = {'appended': 0, 'evicted': 0, 'flushes': 0}
+
+    @classmethod
+    def classify(cls, message: str) -> Tuple[str, Optional[str]]:
+        """Nivel (por marcadores del mensaje) y símbolo mencionado, para filtrar"""
+        upper = message.upper()
+        if '❌' in message or 'ERROR' in upper:
+            level = 'ERROR'
+        elif '⚠️' in message or 'WARNING' in upper:
+            level = 'WARNING'
+        else:
+            level = 'INFO'
+        match = cls._SYMBOL_RE.search(message)
+        return level, match.group(1) if match else None
+
+    def append(self, message: str, timestamp: Optional[datetime] = None):
+        ts = (timestamp or datetime.now()).strftime('%H:%M:%S.%f')[:-3]
+        level, symbol = self.classify(str(message))
+        with self._pending_lock:
+            self._pending.append(LogEntry(ts, level, symbol, str(message)))
+
+    def flush(self) -> int:
+        """Aplica el lote pendiente al anillo; devuelve las líneas añadidas"""
+        with self._pending_lock:
+            if not self._pending:
+                return 0
+            batch = list(self._pending)
+            self._pending.clear()
+        batch = batch[-self.capacity:]
+        overflow = len(self._entries) + len(batch) - self.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._entries.popleft()
+            self.endRemoveRows()
+            self.stats['evicted'] += overflow
+        first = len(self._entries)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(batch) - 1)
+        self._entries.extend(batch)
+        self.endInsertRows()
+        self.stats['appended'] += len(batch)
+        self.stats['flushes'] += 1
+        return len(batch)
+
+    def clear(self):
+        with self._pending_lock:
+            self._pending.clear()
+        self.beginResetModel()
+        self._entries.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return f"[{entry.timestamp}] {entry.text}"
+        if role == QtCore.Qt.ForegroundRole:
+            color = self._colors.get(entry.level)
+            if color is None:
+                color = self._colors[entry.level] = QtGui.QColor(self.LEVEL_COLORS[entry.level])
+            return color
+        if role == self.LEVEL_ROLE:
+            return entry.level
+        if role == self.SYMBOL_ROLE:
+            return entry.symbol
+        return None
+
+
+class LogFilterProxyModel(QtCore.QSortFilterProxyModel):
+    """Filtro de la terminal por nivel mínimo y símbolo"""
+    def __init__(self, source_model: LogRingModel, parent=None):
+        super().__init__(parent)
+        self.min_level = 'INFO'
+        self.symbol = ''
+        self.setSourceModel(source_model)
+
+    def set_filters(self, min_level: str = 'INFO', symbol: str = ''):
+        self.min_level = min_level if min_level in LogRingModel.LEVELS else 'INFO'
+        self.symbol = (symbol or '').strip().upper()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.min_level == 'INFO' and not self.symbol:
+            return True
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        level = index.data(LogRingModel.LEVEL_ROLE)
+        if LogRingModel.LEVELS.index(level) < LogRingModel.LEVELS.index(self.min_level):
+            return False
+        if self.symbol:
+            return self.symbol in (index.data(LogRingModel.SYMBOL_ROLE) or '')
+        return True
 
-    def _check_timeouts_and_close(self):
-        """Verifica timeouts y cierra señales según reglas."""
-        current_time = datetime.now()
-        signals_to_close = []
 
-        with self.lock:
-            for signal_hash, tracking in list(self.tracked_signals.items()):
-                safe_price = tracking.get('current_price') or tracking.get('entry_price', 0)
-
-                # Timeout DESTACADA (20 minutos)
-                if tracking.get('status') == 'DESTACADA':
-                    start_time = tracking.get('highlight_start_time')
-                    if start_time:
-                        elapsed = (current_time - start_time).total_seconds()
-                        timeout_seconds = self.validation_config['highlight_timeout_min'] * 60
-                        if elapsed > timeout_seconds:
-                            signals_to_close.append((signal_hash, safe_price, "HIGHLIGHT_TIMEOUT"))
-
-                # Timeout CONFIRMADA (3 horas)
-                elif tracking.get('status') == 'CONFIRMADA':
-                    start_time = tracking.get('confirmed_start_time')
-                    if start_time:
-                        elapsed = (current_time - start_time).total_seconds()
-                        elapsed_hours = elapsed / 3600
-                        if elapsed_hours >= 3:
-                            signals_to_close.append((signal_hash, safe_price, "CONFIRMED_TIMEOUT"))
-
-        # Cerrar señales fuera del lock
-        for signal_hash, price, reason in signals_to_close:
-            self.close_signal(signal_hash, price, reason)
 # ========== INTERFAZ GRÁFICA OPTIMIZADA ==========
 class OptimizedCryptoBotGUI(QtWidgets.QMainWindow):
     def __init__(self, config_instance):
@@ -12763,7 +17135,8 @@ class OptimizedCryptoBotGUI(QtWidgets.QMainWindow):
             self.setStyleSheet("background-color: #0f0f23; color: white;")
             self.config = config_instance
             self.bot = OptimizedTradingBot(self.config)
-            self.bot.gui_queue = self.gui_queue = queue.Queue()
+            self.gui_bus = self.bot.gui_bus
+            self.gui_bus.attach_consumer()
             self.live_chart_window = None
             self.last_table_update = 0
             self.central_widget = QtWidgets.QWidget()
@@ -12792,7 +17165,7 @@ class OptimizedCryptoBotGUI(QtWidgets.QMainWindow):
             # Iniciar procesador de mensajes
             self.message_processor = QtCore.QTimer(self)
             self.message_processor.timeout.connect(self._process_gui_messages)
-            self.message_processor.start(50)  # Procesar mensajes cada 50ms
+            self.message_processor.start(getattr(self.config, 'GUI_FRAME_MS', 50))  # Drenar el bus una vez por frame
             self.show()
             self.raise_()
         except Exception as e:
@@ -13199,14 +17572,14 @@ analizando datos en tiempo real cada 2 segundos.</p>
     def _process_high_quality_signal(self, symbol: str, df_primary: pd.DataFrame, df_entry: pd.DataFrame, analysis_result: dict):
         """
         ✅ PROCESAMIENTO UNIFICADO — USA SOLO _prepare_signal_package()
-        - Verifica exclusividad (1 señal)
+        - Verifica capacidad (MAX_TRACKED_SIGNALS, una señal por símbolo)
         - Prepara paquete
         - Envía a SignalTracker
         - Genera gráfico (solo CONFIRMADA)
         - Notifica Telegram (solo 1 foto en CONFIRMADA)
         """
-        if self.exclusive_tracking_mode:
-            logger.info(f"⏭️ {symbol} - Ignorado: señal activa en {self.tracked_symbol}")
+        if self.signal_tracker.is_full() or self.signal_tracker.is_tracking(symbol):
+            logger.info(f"⏭️ {symbol} - Ignorado: tracker lleno o {symbol} ya en seguimiento")
             return
 
         # === 1. Preparar paquete ÚNICO ===
@@ -13229,25 +17602,18 @@ analizando datos en tiempo real cada 2 segundos.</p>
             )
             return
 
-        # === 3. Activar modo exclusivo ===
-        self.exclusive_tracking_mode = True
+        # === 3. Símbolo en seguimiento; modo exclusivo solo con el tracker lleno (tras el alta) ===
         self.tracked_symbol          = symbol
         self.tracked_signal_hash     = signal_package['signal_hash']
 
         # === 4. Generar gráfico SOLO para CONFIRMADA ===
         chart_path = None
         is_confirmed = (neural_score >= self.config.MIN_NEURAL_CONFIRMADA and technical_pct >= self.config.MIN_TECHNICAL_CONFIRMADA and alignment_pct >= self.config.MIN_ALIGNMENT_CONFIRMADA)
-        if is_confirmed and PLOTTING_AVAILABLE and hasattr(self, 'chart_generator') and self.chart_generator:
+        # El render corre en el worker mientras se registra la señal; se recoge antes de Telegram
+        chart_future = None
+        if is_confirmed and PLOTTING_AVAILABLE and getattr(self, 'chart_service', None):
             try:
-                chart_path = self.chart_generator.generate_signal_chart(
-                    symbol=symbol,
-                    df=df_entry,
-                    signal_data=signal_package,
-                    analysis_result=analysis_result
-                )
-                if chart_path:
-                    signal_package['chart_path'] = chart_path
-                    logger.info(f"✅ Gráfico generado para CONFIRMADA: {chart_path}")
+                chart_future = self.chart_service.submit(symbol, df_entry, signal_package)
             except Exception as e:
                 logger.error(f"❌ Error generando gráfico para {symbol}: {e}")
 
@@ -13256,6 +17622,17 @@ analizando datos en tiempo real cada 2 segundos.</p>
             logger.error(f"❌ {symbol} - Rechazado por SignalTracker (validación interna falló)")
             self._release_exclusive_mode()
             return
+        self.exclusive_tracking_mode = self.signal_tracker.is_full()
+
+        chart_image = None
+        if chart_future is not None:
+            try:
+                chart_image = chart_future.result(timeout=getattr(self.config, 'CHART_RENDER_TIMEOUT', 20))
+                if chart_image and chart_image.path:
+                    signal_package['chart_path'] = chart_image.path
+                    logger.info(f"✅ Gráfico generado para CONFIRMADA: {chart_image.path}")
+            except Exception as e:
+                logger.error(f"❌ Error generando gráfico para {symbol}: {e}")
 
         # === 6. Notificar Telegram ===
         if self.telegram_client and self.config.telegram_enabled:
@@ -13266,7 +17643,8 @@ analizando datos en tiempo real cada 2 segundos.</p>
                     symbol=symbol,
                     neural_prediction=signal_package['neural_prediction'],
                     technical_confidence=technical_pct,
-                    send_photo=is_confirmed  # ✅ Solo foto si CONFIRMADA
+                    send_photo=is_confirmed,  # ✅ Solo foto si CONFIRMADA
+                    chart_image=chart_image
                 )
                 if text_sent:
                     logger.info(f"✅ Telegram: señal {'CONFIRMADA' if is_confirmed else 'DESTACADA'} enviada — {symbol}")
@@ -13440,16 +17818,23 @@ analizando datos en tiempo real cada 2 segundos.</p>
         center_layout.addWidget(details_frame)
         # Panel de señales activas
         signals_frame, signals_layout = self._create_titled_frame("🚨 Señales Optimizadas Recientes", center_panel)
-        self.signals_tree = QtWidgets.QTableWidget(0, 6)  # IA y Técnico fusionados
-        self.signals_tree.setHorizontalHeaderLabels([
+        # Model/view: filas por símbolo con diffs en vez de reconstruir items
+        self.signals_model = SymbolTableModel([
             'Símbolo', 'Señal', 'Prob', 'IA%', 'TEC%', 'Hora'
-        ])
+        ], self)  # IA y Técnico fusionados
+        self.signals_proxy = SymbolFilterProxyModel(self.signals_model, self)
+        self.signals_tree = QtWidgets.QTableView()
+        self.signals_tree.setModel(self.signals_proxy)
+        self.signals_tree.setSortingEnabled(True)
+        self.signals_tree.sortByColumn(5, QtCore.Qt.DescendingOrder)  # Más recientes primero
+        self.signals_tree.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.signals_tree.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.signals_tree.setStyleSheet(
             "background-color: #0f0f23; color: Black; selection-background-color: #00d4aa; "
             "border: 1px solid #1a2a4c;"
         )
         self.signals_tree.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
-        self.signals_tree.cellDoubleClicked.connect(self._on_signal_cell_clicked)
+        self.signals_tree.doubleClicked.connect(lambda index: self._on_signal_cell_clicked(index.row(), index.column()))
         signals_layout.addWidget(self.signals_tree)
         center_layout.addWidget(signals_frame)
         # Panel derecho - Terminal optimizado
@@ -13526,11 +17911,32 @@ analizando datos en tiempo real cada 2 segundos.</p>
         clean_data_btn.clicked.connect(self.clean_all_data)
         terminal_layout.addWidget(clean_data_btn)
 
-        # Terminal de logs
-        self.terminal_text = QtWidgets.QTextEdit()
-        self.terminal_text.setReadOnly(True)
-        self.terminal_text.setStyleSheet("background-color: #0f0f23; color: #00d4aa; border: 1px solid #1a2a4c;")
-        terminal_layout.addWidget(self.terminal_text)
+        # Filtros de la terminal (nivel mínimo y símbolo)
+        log_filter_layout = QtWidgets.QHBoxLayout()
+        self.log_level_combo = QtWidgets.QComboBox()
+        self.log_level_combo.addItems(list(LogRingModel.LEVELS))
+        self.log_level_combo.setStyleSheet("background-color: #16213e; color: white;")
+        self.log_symbol_filter = QtWidgets.QLineEdit()
+        self.log_symbol_filter.setPlaceholderText("Filtrar símbolo...")
+        self.log_symbol_filter.setStyleSheet("background-color: #16213e; color: white; border: 1px solid #1a2a4c;")
+        self.log_level_combo.currentTextChanged.connect(self._apply_log_filters)
+        self.log_symbol_filter.textChanged.connect(self._apply_log_filters)
+        log_filter_layout.addWidget(self.log_level_combo)
+        log_filter_layout.addWidget(self.log_symbol_filter)
+        terminal_layout.addLayout(log_filter_layout)
+
+        # Terminal de logs: buffer circular acotado + vista con filas uniformes
+        self.log_model = LogRingModel(getattr(self.config, 'GUI_LOG_CAPACITY', 5000), self)
+        self.log_proxy = LogFilterProxyModel(self.log_model, self)
+        self.terminal_view = QtWidgets.QListView()
+        self.terminal_view.setModel(self.log_proxy)
+        self.terminal_view.setUniformItemSizes(True)
+        self.terminal_view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.terminal_view.setStyleSheet("background-color: #0f0f23; color: #00d4aa; border: 1px solid #1a2a4c;")
+        terminal_layout.addWidget(self.terminal_view)
+        self.log_flush_timer = QtCore.QTimer(self)
+        self.log_flush_timer.timeout.connect(self._flush_log_view)
+        self.log_flush_timer.start(getattr(self.config, 'GUI_LOG_FLUSH_MS', 100))
         right_layout.addWidget(terminal_frame)
         return tab_widget
 
@@ -13638,20 +18044,25 @@ analizando datos en tiempo real cada 2 segundos.</p>
         control_layout.addWidget(self.pairs_progress_bar)
         tab_layout.addWidget(control_frame)
         # Tabla optimizada
-        self.pairs_analysis_table = QtWidgets.QTableWidget()
-        self.pairs_analysis_table.setColumnCount(8)  # Columna adicional
-        self.pairs_analysis_table.setHorizontalHeaderLabels([
+        self.pairs_model = SymbolTableModel([
             'Símbolo', 'Precio', 'Señal', 'Prob.', 'IA%', 'TEC%', 'Actualización', 'Acciones'
-        ])
+        ], self)  # Columna adicional
+        self.pairs_proxy = SymbolFilterProxyModel(self.pairs_model, self)
+        self.pairs_analysis_table = QtWidgets.QTableView()
+        self.pairs_analysis_table.setModel(self.pairs_proxy)
+        self.pairs_analysis_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.pairs_analysis_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.pairs_analysis_table.setStyleSheet(
-            "QTableWidget { background-color: #0f0f23; color: white; selection-background-color: #00d4aa; "
+            "QTableView { background-color: #0f0f23; color: white; selection-background-color: #00d4aa; "
             "border: 2px solid #1a2a4c; gridline-color: #1a2a4c; }"
-            "QTableWidget::item { padding: 8px; }"
+            "QTableView::item { padding: 8px; }"
             "QHeaderView::section { background-color: #16213e; color: #00d4aa; font-weight: bold; "
             "border: 1px solid #1a2a4c; padding: 8px; }"
         )
         self.pairs_analysis_table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         self.pairs_analysis_table.setSortingEnabled(True)
+        self.pairs_analysis_table.sortByColumn(3, QtCore.Qt.DescendingOrder)  # Ordenar por confianza
+        self.pairs_analysis_table.clicked.connect(self._on_pairs_table_clicked)
         tab_layout.addWidget(self.pairs_analysis_table)
         # Estado optimizado
         self.pairs_status_label = QtWidgets.QLabel("Presione 'Análisis Optimizado' para cargar datos mejorados")
@@ -14113,11 +18524,11 @@ analizando datos en tiempo real cada 2 segundos.</p>
                 self.telegram_client.reset_signal_tracking()
             if hasattr(self, 'bot') and hasattr(self.bot, 'signal_tracker'):
                 try:
-                    self.bot.signal_tracker.tracked_signals.clear()
+                    # Las señales no se vacían: las recuperadas del diario siguen su curso
                     self.bot.signal_tracker.price_cache.clear()
                 except Exception:
                     pass
-            self.signals_tree.setRowCount(0)
+            self.signals_model.clear()
             self.signals_count_label.setText("Señales: 0")
         except Exception:
             pass
@@ -14152,7 +18563,7 @@ analizando datos en tiempo real cada 2 segundos.</p>
                 self.telegram_client.reset_signal_tracking()
             if hasattr(self, 'bot') and hasattr(self.bot, 'signal_tracker'):
                 try:
-                    self.bot.signal_tracker.tracked_signals.clear()
+                    self.bot.signal_tracker.clear()
                     self.bot.signal_tracker.price_cache.clear()
                 except Exception:
                     pass
@@ -14164,7 +18575,7 @@ analizando datos en tiempo real cada 2 segundos.</p>
         self.highlight_progress_bar.setValue(0)
         self.highlight_progress_bar.setFormat("Esperando señal DESTACADA...")
         try:
-            self.signals_tree.setRowCount(0)
+            self.signals_model.clear()
             self.signals_count_label.setText("Señales: 0")
         except Exception:
             pass
@@ -14199,10 +18610,9 @@ analizando datos en tiempo real cada 2 segundos.</p>
         """Manejar doble click en celda de señal para mostrar gráfico"""
         try:
             # Obtener símbolo de la fila clickeada
-            symbol_item = self.signals_tree.item(row, 0)
-            if not symbol_item:
+            symbol = self.signals_proxy.symbol_at(row)
+            if not symbol:
                 return
-            symbol = symbol_item.text()
             # Buscar la señal correspondiente en active_signals
             matching_signals = [
                 sig for sig in self.bot.active_signals 
@@ -14277,8 +18687,10 @@ analizando datos en tiempo real cada 2 segundos.</p>
         if reply == QtWidgets.QMessageBox.Yes:
             self.train_btn.setEnabled(False)
             self.quick_train_btn.setEnabled(False)
-            # Forzar limpieza de archivos corruptos antes de entrenar
-            self.bot.neural_trader._clear_corrupted_model_files()
+            # Forzar limpieza de archivos corruptos antes de entrenar (sin esperar a la carga en la GUI)
+            trader = self.bot.model_registry.peek_trader()
+            if trader is not None:
+                trader._clear_corrupted_model_files()
             threading.Thread(target=self._train_neural_thread_optimized, daemon=True).start()
 
     def quick_train_neural_network(self):
@@ -14319,9 +18731,12 @@ analizando datos en tiempo real cada 2 segundos.</p>
         try:
             self.log_message("🔄 Iniciando reentrenamiento forzado de la IA...")
             # Forzar la limpieza de archivos del modelo
-            self.bot.neural_trader._clear_model_files()
+            trader = self.bot.neural_trader
+            if trader is not None:
+                trader._clear_model_files()
             # Crear una nueva instancia del trader con force_retrain=True
-            self.bot.neural_trader = OptimizedNeuralTrader(self.config, force_retrain=True)
+            trader = OptimizedNeuralTrader(self.config, force_retrain=True)
+            self.bot.neural_trader = trader
             def progress_callback(value):
                 QMetaObject.invokeMethod(
                     self.progress_bar, "setValue", 
@@ -14329,7 +18744,7 @@ analizando datos en tiempo real cada 2 segundos.</p>
                     Q_ARG(int, value)
                 )
             # Entrenar con todos los símbolos para un modelo completo
-            success = self.bot.neural_trader.train_with_optimized_data(
+            success = trader.train_with_optimized_data(
                 progress_callback=progress_callback
             )
             if success:
@@ -14373,10 +18788,15 @@ analizando datos en tiempo real cada 2 segundos.</p>
             )
         # Usar TODOS los símbolos para entrenamiento completo
         training_symbols = self.config.TRADING_SYMBOLS  # TODOS los símbolos disponibles
-        success = self.bot.neural_trader.train_with_optimized_data(
-            symbols=training_symbols,
-            progress_callback=progress_callback
-        )
+        trader = self.bot.neural_trader
+        if trader is None:
+            self.log_message("❌ Modelo neuronal no disponible (carga en curso o fallida)")
+            success = False
+        else:
+            success = trader.train_with_optimized_data(
+                symbols=training_symbols,
+                progress_callback=progress_callback
+            )
         if success:
             self.log_message("✅ Entrenamiento IA optimizada completado exitosamente")
             QMetaObject.invokeMethod(
@@ -14412,11 +18832,16 @@ analizando datos en tiempo real cada 2 segundos.</p>
         # Temporalmente reducir épocas para entrenamiento rápido
         original_epochs = self.config.NEURAL_EPOCHS
         self.config.NEURAL_EPOCHS = 30  # Entrenamiento ultra rápido
-        success = self.bot.neural_trader.train_with_optimized_data(
-            symbols=training_symbols,
-            days=30,  # 30 días para rapidez
-            progress_callback=progress_callback
-        )
+        trader = self.bot.neural_trader
+        if trader is None:
+            self.log_message("❌ Modelo neuronal no disponible (carga en curso o fallida)")
+            success = False
+        else:
+            success = trader.train_with_optimized_data(
+                symbols=training_symbols,
+                days=30,  # 30 días para rapidez
+                progress_callback=progress_callback
+            )
         # Restaurar configuración original
         self.config.NEURAL_EPOCHS = original_epochs
         if success:
@@ -14706,7 +19131,7 @@ analizando datos en tiempo real cada 2 segundos.</p>
                 logger.info(f"🧹 Limpieza: {count} imágenes eliminadas")
 
             try:
-                self.signals_tree.setRowCount(0)
+                self.signals_model.clear()
                 if hasattr(self, 'signals_count_label'):
                     self.signals_count_label.setText("Señales: 0")
             except Exception:
@@ -14888,16 +19313,13 @@ analizando datos en tiempo real cada 2 segundos.</p>
                         QtCore.Qt.QueuedConnection, Q_ARG(str, "📊 Obteniendo información de exchange...")
                     )
 
-                    exchange_info_url = "https://data-api.binance.vision/api/v3/exchangeInfo"
-                    resp_info = requests.get(exchange_info_url, timeout=15)
-                    if resp_info.status_code != 200:
-                        raise Exception(f"Error obteniendo exchangeInfo: {resp_info.status_code}")
-
-                    exchange_data = resp_info.json()
+                    metadata = get_exchange_metadata(self.config, "https://data-api.binance.vision", "/api/v3")
+                    tradable_usdt = metadata.tradable_symbols(quote_asset='USDT')
+                    if not tradable_usdt:
+                        raise Exception("Error obteniendo exchangeInfo")
                     usdt_symbols = [
-                        s['symbol'] for s in exchange_data.get('symbols', [])
-                        if s['quoteAsset'] == 'USDT' and s['status'] == 'TRADING'
-                        and not any(x in s['symbol'] for x in ['UP', 'DOWN', 'BEAR', 'BULL'])
+                        symbol for symbol in sorted(tradable_usdt)
+                        if not any(x in symbol for x in ['UP', 'DOWN', 'BEAR', 'BULL'])
                     ]
 
                     QMetaObject.invokeMethod(
@@ -15014,7 +19436,6 @@ analizando datos en tiempo real cada 2 segundos.</p>
             self.pairs_progress_bar.setValue(0)
             symbols = self.config.TRADING_SYMBOLS
             total_symbols = len(symbols)
-            self.pairs_analysis_table.setRowCount(0)
             def analyze_pairs_thread_optimized():
                 results = []
                 for i, symbol in enumerate(symbols):
@@ -15038,77 +19459,49 @@ analizando datos en tiempo real cada 2 segundos.</p>
             logger.error(f"Error en análisis optimizado de pares: {e}")
             self.pairs_status_label.setText(f"❌ Error: {str(e)}")
 
+    def _build_pair_row(self, analysis) -> List[TableCell]:
+        """Celdas de una fila de la tabla de pares (texto, colores y valor de orden)"""
+        cs_val = getattr(analysis.get('combined_signal', SignalType.NEUTRAL), 'value', str(analysis.get('combined_signal', 'NEUTRAL')))
+        # Señal con colores optimizados
+        if "COMPRA" in cs_val:
+            signal_bg = '#00d4aa'
+        elif "VENTA" in cs_val:
+            signal_bg = '#ff6b6b'
+        else:
+            signal_bg = '#6c757d'
+        # Probabilidad con colores
+        confidence = analysis.get('confidence', 0)
+        if confidence >= self.config.MIN_NEURAL_CONFIRMADA: # CONFIRMADA
+            conf_bg, conf_fg = '#00ff88', 'black'
+        elif confidence >= self.config.MIN_NEURAL_DESTACADA: # DESTACADA
+            conf_bg, conf_fg = '#ffd700', 'black'
+        elif confidence >= 65:
+            conf_bg, conf_fg = '#ff9500', 'white'
+        else:
+            conf_bg, conf_fg = '#ff6b6b', 'white'
+        neural_conf = analysis.get('neural_prediction', {}).get('confidence', 0)
+        tech_conf = analysis.get('technical_percentage', 0)  # Porcentaje Técnico (dinámico)
+        timestamp = analysis.get('timestamp', datetime.now())
+        return [
+            TableCell(analysis['symbol'], font=('Arial', 10, True)),
+            TableCell(f"${analysis['price']:.6f}", sort_value=float(analysis['price'])),
+            TableCell(cs_val, background=signal_bg, foreground='white'),
+            TableCell(f"{confidence:.1f}%", background=conf_bg, foreground=conf_fg,
+                      font=('Arial', 9, True), sort_value=float(confidence)),
+            TableCell(f"{neural_conf:.1f}%", foreground='#00d4aa', sort_value=float(neural_conf)),
+            TableCell(f"{tech_conf:.1f}%", foreground='#ffd60a', sort_value=float(tech_conf)),
+            TableCell(timestamp.strftime('%H:%M:%S'), sort_value=timestamp.timestamp()),
+            # Acciones: click en la celda abre los detalles del par
+            TableCell("📊 Ver", background='#2196F3', foreground='white', font=('Arial', 9, True)),
+        ]
+
     def update_pairs_table_optimized(self, results):
-        """Actualizar tabla de pares optimizada"""
+        """Actualizar tabla de pares optimizada (diff por símbolo sobre el modelo)"""
         try:
-            # Ordenar por confianza
-            results.sort(key=lambda x: x.get('confidence', 0), reverse=True)
-            self.pairs_analysis_table.setRowCount(len(results))
-            for row, analysis in enumerate(results):
-                # Símbolo
-                symbol_item = QtWidgets.QTableWidgetItem(analysis['symbol'])
-                symbol_item.setFont(QtGui.QFont("Arial", 10, QtGui.QFont.Bold))
-                self.pairs_analysis_table.setItem(row, 0, symbol_item)
-                # Precio
-                price_item = QtWidgets.QTableWidgetItem(f"${analysis['price']:.6f}")
-                self.pairs_analysis_table.setItem(row, 1, price_item)
-                # Señal con colores optimizados
-                cs_val = getattr(analysis.get('combined_signal', SignalType.NEUTRAL), 'value', str(analysis.get('combined_signal', 'NEUTRAL')))
-                signal_item = QtWidgets.QTableWidgetItem(cs_val)
-                if "COMPRA" in cs_val:
-                    signal_item.setBackground(QtGui.QColor('#00d4aa'))
-                    signal_item.setForeground(QtGui.QColor('white'))
-                elif "VENTA" in cs_val:
-                    signal_item.setBackground(QtGui.QColor('#ff6b6b'))
-                    signal_item.setForeground(QtGui.QColor('white'))
-                else:
-                    signal_item.setBackground(QtGui.QColor('#6c757d'))
-                    signal_item.setForeground(QtGui.QColor('white'))
-                self.pairs_analysis_table.setItem(row, 2, signal_item)
-                # Probabilidad con colores
-                confidence = analysis.get('confidence', 0)
-                confidence_item = QtWidgets.QTableWidgetItem(f"{confidence:.1f}%")
-                if confidence >= self.config.MIN_NEURAL_CONFIRMADA: # CONFIRMADA
-                    confidence_item.setBackground(QtGui.QColor('#00ff88'))
-                    confidence_item.setForeground(QtGui.QColor('black'))
-                elif confidence >= self.config.MIN_NEURAL_DESTACADA: # DESTACADA
-                    confidence_item.setBackground(QtGui.QColor('#ffd700'))
-                    confidence_item.setForeground(QtGui.QColor('black'))
-                elif confidence >= 65:
-                    confidence_item.setBackground(QtGui.QColor('#ff9500'))
-                    confidence_item.setForeground(QtGui.QColor('white'))
-                else:
-                    confidence_item.setBackground(QtGui.QColor('#ff6b6b'))
-                    confidence_item.setForeground(QtGui.QColor('white'))
-                confidence_item.setFont(QtGui.QFont("Arial", 9, QtGui.QFont.Bold))
-                self.pairs_analysis_table.setItem(row, 3, confidence_item)
-                # Métricas IA y Técnicas
-                neural_pred = analysis.get('neural_prediction', {})
-                neural_conf = neural_pred.get('confidence', 0)
-                neural_item = QtWidgets.QTableWidgetItem(f"{neural_conf:.1f}%")
-                neural_item.setForeground(QtGui.QColor('#00d4aa'))
-                self.pairs_analysis_table.setItem(row, 4, neural_item)
-                # Porcentaje Técnico (dinámico)
-                tech_conf = analysis.get('technical_percentage', 0)
-                tech_item = QtWidgets.QTableWidgetItem(f"{tech_conf:.1f}%")
-                tech_item.setForeground(QtGui.QColor('#ffd60a'))
-                self.pairs_analysis_table.setItem(row, 5, tech_item)
-                # Timestamp
-                timestamp = analysis.get('timestamp', datetime.now())
-                time_item = QtWidgets.QTableWidgetItem(timestamp.strftime('%H:%M:%S'))
-                self.pairs_analysis_table.setItem(row, 6, time_item)
-                # Botón de acciones
-                actions_widget = QtWidgets.QWidget()
-                actions_layout = QtWidgets.QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(2, 2, 2, 2)
-                details_btn = QtWidgets.QPushButton("📊 Ver")
-                details_btn.setStyleSheet(
-                    "background-color: #2196F3; color: white; padding: 4px 8px; "
-                    "border-radius: 4px; font-size: 10px; font-weight: bold;"
-                )
-                details_btn.clicked.connect(lambda checked, s=analysis['symbol']: self.view_pair_details_optimized(s))
-                actions_layout.addWidget(details_btn)
-                self.pairs_analysis_table.setCellWidget(row, 7, actions_widget)
+            rows = {analysis['symbol']: self._build_pair_row(analysis) for analysis in results}
+            changes = self.pairs_model.apply_rows(rows)
+            logger.debug(f"📋 Tabla de pares: +{changes['inserted']} -{changes['removed']} "
+                         f"~{changes['updated_cells']} celdas")
             # Aplicar filtros
             self.filter_pairs_table_optimized()
             # Actualizar estado
@@ -15125,27 +19518,32 @@ analizando datos en tiempo real cada 2 segundos.</p>
         """Filtrar tabla de pares optimizada"""
         try:
             filter_text = self.signal_filter_combo.currentText()
-            for row in range(self.pairs_analysis_table.rowCount()):
-                signal_item = self.pairs_analysis_table.item(row, 2)
-                confidence_item = self.pairs_analysis_table.item(row, 3)
-                if signal_item and confidence_item:
-                    signal_text = signal_item.text()
-                    confidence_text = confidence_item.text()
-                    confidence_val = float(confidence_text.replace('%', ''))
-                    should_show = True
-                    if filter_text == "COMPRA":
-                        should_show = "COMPRA" in signal_text
-                    elif filter_text == "VENTA":
-                        should_show = "VENTA" in signal_text
-                    elif filter_text == "ALTA_PROB":
-                        should_show = confidence_val >= 80
-                    elif filter_text == "NEUTRAL":
-                        should_show = "COMPRA" not in signal_text and "VENTA" not in signal_text
-                    # "Todas" muestra todo
-                    self.pairs_analysis_table.setRowHidden(row, not should_show)
+
+            def should_show(model, row):
+                signal_text = model.cell(row, 2).text
+                confidence_val = model.cell(row, 3).sort_value
+                if filter_text == "COMPRA":
+                    return "COMPRA" in signal_text
+                elif filter_text == "VENTA":
+                    return "VENTA" in signal_text
+                elif filter_text == "ALTA_PROB":
+                    return confidence_val >= 80
+                elif filter_text == "NEUTRAL":
+                    return "COMPRA" not in signal_text and "VENTA" not in signal_text
+                # "Todas" muestra todo
+                return True
+
+            self.pairs_proxy.set_row_filter(None if filter_text == "Todas" else should_show)
         except Exception as e:
             logger.error(f"Error aplicando filtro optimizado: {e}")
 
+    def _on_pairs_table_clicked(self, index):
+        """Click en la columna 'Acciones' abre los detalles del par"""
+        if index.column() == 7:
+            symbol = self.pairs_proxy.symbol_at(index.row())
+            if symbol:
+                self.view_pair_details_optimized(symbol)
+
     def view_pair_details_optimized(self, symbol):
         """Ver detalles optimizados de par"""
         try:
@@ -15182,36 +19580,25 @@ analizando datos en tiempo real cada 2 segundos.</p>
             self.log_message(f"❌ Error al actualizar análisis: {str(e)}")
 
     def log_message(self, message):
-        """Log con timestamp optimizado - THREAD SAFE"""
-        # ✅ USAR QTimer.singleShot() PARA THREAD SAFETY EN PyQt5
-        def _safe_log():
-            timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
-            log_entry = f"[{timestamp}] {message}"
-            self.terminal_text.append(log_entry)
-            # Mantener solo las últimas 200 líneas para eficiencia
-            document = self.terminal_text.document()
-            if document.blockCount() > 200:
-                cursor = self.terminal_text.textCursor()
-                cursor.movePosition(QtGui.QTextCursor.Start)
-                cursor.movePosition(QtGui.QTextCursor.Down, QtGui.QTextCursor.KeepAnchor, 50)
-                cursor.removeSelectedText()
-            self.terminal_text.verticalScrollBar().setValue(
-                self.terminal_text.verticalScrollBar().maximum()
-            )
+        """Log con timestamp optimizado - THREAD SAFE (solo encola; la vista se vuelca por lotes)"""
+        self.log_model.append(message)
 
-        # Si ya estamos en el hilo principal, ejecutar directamente
-        # Si no, usar QTimer.singleShot para garantizar thread safety
+    def _flush_log_view(self):
+        """Volcado periódico del lote pendiente; mantiene el scroll al final si ya estaba ahí"""
         try:
-            if QtCore.QThread.currentThread() == QtCore.QCoreApplication.instance().thread():
-                _safe_log()  # Ya en hilo principal
-            else:
-                QtCore.QTimer.singleShot(0, _safe_log)  # Encolar en hilo principal
-        except:
-            QtCore.QTimer.singleShot(0, _safe_log)  # Fallback seguro
+            scrollbar = self.terminal_view.verticalScrollBar()
+            at_bottom = scrollbar.value() >= scrollbar.maximum()
+            if self.log_model.flush() and at_bottom:
+                self.terminal_view.scrollToBottom()
+        except Exception as e:
+            logger.debug(f"Error volcando logs a la terminal: {e}")
+
+    def _apply_log_filters(self, *_):
+        self.log_proxy.set_filters(self.log_level_combo.currentText(), self.log_symbol_filter.text())
 
     def clear_logs(self):
         """Limpiar todos los logs de la terminal"""
-        self.terminal_text.clear()
+        self.log_model.clear()
         self.log_message("🗑️ Logs limpiados")
 
     def update_pair_scan_progress(self, value):
@@ -15232,6 +19619,44 @@ analizando datos en tiempo real cada 2 segundos.</p>
         except:
             QtCore.QTimer.singleShot(0, _safe_update)
 
+    def _build_signal_row(self, signal_data) -> List[TableCell]:
+        """Celdas de una fila de la tabla de señales premium"""
+        # Datos optimizados (IA + Técnico fusionados)
+        neural_pred = signal_data.get('neural_prediction', {})
+        processing_details = signal_data.get('processing_details', {})
+        # Métricas optimizadas
+        neural_conf = neural_pred.get('confidence', 0) or signal_data.get('neural_score', 0)
+        # Usar technical_percentage de processing_details si está disponible
+        technical_percentage = processing_details.get('technical_percentage', signal_data.get('technical_percentage', 0))
+        # Calcular probabilidad real: promedio de IA + Técnico o combined_confidence
+        prob_value = signal_data.get('combined_confidence', 0)
+        if prob_value == 0:
+            prob_value = (neural_conf + technical_percentage) / 2 if (neural_conf + technical_percentage) > 0 else 0
+        # Colorear TODA LA FILA según tipo de señal - SOLO PREMIUM
+        signal_type = signal_data.get('combined_signal', SignalType.NEUTRAL)
+        signal_name = signal_type.name if hasattr(signal_type, 'name') else str(signal_type)
+        signal_value = getattr(signal_type, 'value', '')
+        row_color = None
+        if 'CONFIRMED' in signal_name or 'CONFIRMADA' in signal_value:
+            row_color = '#00ff88'  # CONFIRMADA: Verde brillante
+        elif 'HIGHLIGHTED' in signal_name or 'DESTACADA' in signal_value:
+            row_color = '#ffd700'  # DESTACADA: Amarillo/Dorado brillante
+        text_color = 'black' if row_color else None
+        # Font bold para señales premium
+        font = ('Arial', 9, 'CONFIRMED' in signal_name or 'HIGHLIGHTED' in signal_name)
+        timestamp = signal_data['timestamp']
+        # Poblar tabla (6 columnas: sin Estrategia)
+        values = [
+            (signal_data['symbol'], None),
+            (getattr(signal_type, 'value', str(signal_type))[:15], None),  # Truncar
+            (f"{prob_value:.1f}%", float(prob_value)),
+            (f"{neural_conf:.1f}%", float(neural_conf)),
+            (f"{technical_percentage:.1f}%", float(technical_percentage)),
+            (timestamp.strftime('%H:%M:%S'), timestamp.timestamp()),
+        ]
+        return [TableCell(text, background=row_color, foreground=text_color, font=font, sort_value=sort_value)
+                for text, sort_value in values]
+
     def update_signals_table_optimized(self):
         """Actualizar tabla de señales optimizada - SOLO DESTACADAS y CONFIRMADAS - THREAD SAFE"""
         # ✅ THROTTLE: Evitar actualización demasiado frecuente (máx cada 2 segundos)
@@ -15243,7 +19668,6 @@ analizando datos en tiempo real cada 2 segundos.</p>
         # ✅ USAR QTimer.singleShot() PARA THREAD SAFETY
         def _safe_table_update():
             try:
-                self.signals_tree.setRowCount(0)
                 # Filtrar SOLO señales premium (DESTACADAS y CONFIRMADAS)
                 all_signals = sorted(self.bot.active_signals, key=lambda x: x['timestamp'], reverse=True)
                 premium_signals = [
@@ -15253,58 +19677,18 @@ analizando datos en tiempo real cada 2 segundos.</p>
                        'DESTACADA' in getattr(sig.get('combined_signal', ''), 'value', '') or
                        'CONFIRMADA' in getattr(sig.get('combined_signal', ''), 'value', '')
                 ][:20]  # Solo últimas 20 señales premium
+                # Una fila por símbolo: la señal más reciente
+                rows = {}
+                for signal_data in premium_signals:
+                    if signal_data['symbol'] not in rows:
+                        rows[signal_data['symbol']] = self._build_signal_row(signal_data)
+                changes = self.signals_model.apply_rows(rows)
                 # ✅ LOG: Solo DEBUG (no INFO) para evitar spam
                 if len(premium_signals) > 0:
-                    logger.debug(f"📋 Tabla actualizada: {len(premium_signals)} PREMIUM | Total: {len(self.bot.active_signals)}")
+                    logger.debug(f"📋 Tabla actualizada: {len(premium_signals)} PREMIUM | Total: {len(self.bot.active_signals)} | "
+                                 f"+{changes['inserted']} -{changes['removed']} ~{changes['updated_cells']} celdas")
                 else:
                     logger.debug("📋 Tabla vacía - esperando señales DESTACADAS/CONFIRMADAS...")
-                for row, signal_data in enumerate(premium_signals):
-                    self.signals_tree.insertRow(row)
-                    # Datos optimizados (IA + Técnico fusionados)
-                    neural_pred = signal_data.get('neural_prediction', {})
-                    processing_details = signal_data.get('processing_details', {})
-                    # Métricas optimizadas
-                    neural_conf = neural_pred.get('confidence', 0) or signal_data.get('neural_score', 0)
-                    # Usar technical_percentage de processing_details si está disponible
-                    technical_percentage = processing_details.get('technical_percentage', signal_data.get('technical_percentage', 0))
-                    # Calcular probabilidad real: promedio de IA + Técnico o combined_confidence
-                    prob_value = signal_data.get('combined_confidence', 0)
-                    if prob_value == 0:
-                        prob_value = (neural_conf + technical_percentage) / 2 if (neural_conf + technical_percentage) > 0 else 0
-                    # Poblar tabla (6 columnas: sin Estrategia)
-                    items = [
-                        QtWidgets.QTableWidgetItem(signal_data['symbol']),
-                        QtWidgets.QTableWidgetItem(getattr(signal_data.get('combined_signal', SignalType.NEUTRAL), 'value', str(signal_data.get('combined_signal', 'NEUTRAL')))[:15]),  # Truncar
-                        QtWidgets.QTableWidgetItem(f"{prob_value:.1f}%"),
-                        QtWidgets.QTableWidgetItem(f"{neural_conf:.1f}%"),
-                        QtWidgets.QTableWidgetItem(f"{technical_percentage:.1f}%"),
-                        QtWidgets.QTableWidgetItem(signal_data['timestamp'].strftime('%H:%M:%S'))
-                    ]
-                    # Colorear TODA LA FILA según tipo de señal - SOLO PREMIUM
-                    signal_type = signal_data.get('combined_signal', SignalType.NEUTRAL)
-                    signal_name = signal_type.name if hasattr(signal_type, 'name') else str(signal_type)
-                    # Colores distintivos para señales premium SOLAMENTE
-                    row_color = None
-                    text_color = QtGui.QColor('black')
-                    if 'CONFIRMED' in signal_name or 'CONFIRMADA' in getattr(signal_data.get('combined_signal', ''), 'value', ''):
-                        # CONFIRMADA: Verde brillante
-                        row_color = QtGui.QColor('#00ff88')  # Verde brillante
-                        text_color = QtGui.QColor('black')
-                    elif 'HIGHLIGHTED' in signal_name or 'DESTACADA' in getattr(signal_data.get('combined_signal', ''), 'value', ''):
-                        # DESTACADA: Amarillo/Dorado brillante
-                        row_color = QtGui.QColor('#ffd700')  # Dorado
-                        text_color = QtGui.QColor('black')
-                    for col, item in enumerate(items):
-                        # Aplicar color de fila
-                        if row_color:
-                            item.setBackground(row_color)
-                            item.setForeground(text_color)
-                        # Font bold para señales premium
-                        font = QtGui.QFont("Arial", 9)
-                        if 'CONFIRMED' in signal_name or 'HIGHLIGHTED' in signal_name:
-                            font.setBold(True)
-                        item.setFont(font)
-                        self.signals_tree.setItem(row, col, item)
             except Exception as e:
                 logger.error(f"Error actualizando tabla de señales: {e}")
 
@@ -15317,26 +19701,31 @@ analizando datos en tiempo real cada 2 segundos.</p>
         except:
             QtCore.QTimer.singleShot(0, _safe_table_update)
 
+    def _append_log_batch(self, log_lines):
+        """Encola las líneas de log del frame; _flush_log_view las vuelca en un solo lote"""
+        for ts, message in log_lines:
+            self.log_model.append(message, timestamp=ts)
+
     def _process_gui_messages(self):
-        """Procesar mensajes de la cola de forma COMPLETAMENTE THREAD-SAFE con QTimer"""
-        messages_processed = 0
-        max_messages_per_batch = 5  # Limitar para no bloquear GUI
-        while messages_processed < max_messages_per_batch:
+        """Drenar el bus GUI una vez por frame: estado fusionado, logs en lote y eventos críticos completos"""
+        try:
+            events, log_lines = self.gui_bus.drain()
+        except Exception as e:
+            logger.error(f"Error drenando bus GUI: {e}")
+            return
+        try:
+            self._append_log_batch(log_lines)
+        except Exception as e:
+            logger.error(f"Error añadiendo logs a la terminal: {e}")
+        for msg_type, data in events:
             try:
-                msg = self.gui_queue.get_nowait()
-                messages_processed += 1
-                msg_type, data = msg
-
-                if msg_type == 'log_message':
-                    self.log_message(data)
-
-                elif msg_type == 'signal_found':
+                if msg_type == 'signal_found':
                     self.update_signals_table_optimized()
 
                 elif msg_type == 'clear_signals_table':
                     def _clear_tbl():
                         try:
-                            self.signals_tree.setRowCount(0)
+                            self.signals_model.clear()
                             if hasattr(self, 'signals_count_label'):
                                 self.signals_count_label.setText("Señales: 0")
                         except Exception as e:
@@ -15568,11 +19957,7 @@ analizando datos en tiempo real cada 2 segundos.</p>
                 elif msg_type == 'remove_signal_from_table':
                     def _remove_signal():
                         try:
-                            rows = self.signals_tree.rowCount()
-                            for row in reversed(range(rows)):
-                                item = self.signals_tree.item(row, 0)
-                                if item and item.text() == data:
-                                    self.signals_tree.removeRow(row)
+                            self.signals_model.remove_symbol(data)
                             logger.info(f"🗑️ Señal de {data} eliminada de la interfaz.")
                         except Exception as e:
                             logger.error(f"[ERROR] Error eliminando señal de GUI: {e}")
@@ -15702,19 +20087,13 @@ analizando datos en tiempo real cada 2 segundos.</p>
                             logger.error(f"Error reseteando panel principal: {e}")
                     QtCore.QTimer.singleShot(0, _reset_main_panel)
 
-            except queue.Empty:
-                break
             except Exception as e:
-                logger.error(f"Error procesando mensaje GUI: {e}")
+                logger.error(f"Error procesando mensaje GUI {msg_type}: {e}")
 
     def _remove_signal_from_table(self, symbol):
         """Eliminar todas las filas de un símbolo de la tabla de señales."""
         try:
-            rows = self.signals_tree.rowCount()
-            for row in reversed(range(rows)):
-                item = self.signals_tree.item(row, 0)
-                if item and item.text() == symbol:
-                    self.signals_tree.removeRow(row)
+            self.signals_model.remove_symbol(symbol)
             logger.info(f"🗑️ Señal de {symbol} eliminada de la interfaz.")
         except Exception as e:
             logger.error(f"[ERROR] Error eliminando señal de GUI: {e}")
@@ -15858,17 +20237,18 @@ analizando datos en tiempo real cada 2 segundos.</p>
 🎯 ESTRATEGIA ACTIVA:
 {strategy_text if len(strategy_text) < 200 else strategy_text[:200] + '...'}"""
             self.signal_text.setPlainText(details_text)
-            # Actualizar información de IA
-            if self.bot.neural_trader.training_history:
-                last_training = self.bot.neural_trader.training_history[-1]
+            # Actualizar información de IA (sin bloquear la GUI si el modelo aún carga)
+            neural_trader = self.bot.model_registry.peek_trader()
+            if neural_trader is not None and neural_trader.training_history:
+                last_training = neural_trader.training_history[-1]
                 accuracy = last_training.get('accuracy', 0) * 100
                 loss = last_training.get('loss', 0)
             else:
                 accuracy = 0
                 loss = 0
             # Métricas de rendimiento
-            if hasattr(self.bot.neural_trader, 'performance_metrics') and self.bot.neural_trader.performance_metrics:
-                perf_metrics = self.bot.neural_trader.performance_metrics
+            if getattr(neural_trader, 'performance_metrics', None):
+                perf_metrics = neural_trader.performance_metrics
                 precision_buy = perf_metrics.get('precision_buy', 0) * 100
                 precision_sell = perf_metrics.get('precision_sell', 0) * 100
                 overall_acc = perf_metrics.get('overall_accuracy', 0) * 100
@@ -15889,7 +20269,7 @@ analizando datos en tiempo real cada 2 segundos.</p>
 • Learning Rate: {self.config.NEURAL_LEARNING_RATE} (optimizado)
 • Batch Size: {self.config.NEURAL_BATCH_SIZE} (procesamiento eficiente)
 <b>📊 RENDIMIENTO OPTIMIZADO:</b>
-• Estado IA: {'✅ Entrenada y Optimizada' if self.bot.neural_trader.is_trained else '❌ No entrenada'}
+• Estado IA: {'⏳ Cargando modelo' if neural_trader is None else '✅ Entrenada y Optimizada' if neural_trader.is_trained else '❌ No entrenada'}
 • Precisión General: {overall_acc:.1f}%
 • Precisión Compras: {precision_buy:.1f}%
 • Precisión Ventas: {precision_sell:.1f}%
@@ -15921,6 +20301,300 @@ analizando datos en tiempo real cada 2 segundos.</p>
             logger.error(f"Error en actualización optimizada de GUI: {e}")
 
 
+# ========== MODO BACKEND: RUNTIME ASYNCIO ==========
+def print_backend_status(bot, analysis_cycle: int) -> int:
+    """Estado por consola del modo backend; devuelve cuántas señales activas se mostraron"""
+    # ✅ v32.0.22.4: Mostrar progreso de análisis cada ciclo
+    analyzed = getattr(bot, 'symbols_analyzed_count', 0)
+    total = getattr(bot, 'total_symbols_to_analyze', 50)
+    current_sym = getattr(bot, '_current_analyzed_symbol_for_gui', 'N/A')
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 📊 Ciclo #{analysis_cycle}: Analizados {analyzed}/{total} | "
+          f"Actual: {current_sym} | Hilos: {threading.active_count()}")
+
+    # ✅ Verificar si hay análisis en market_data
+    if getattr(bot, 'market_data', None) and analysis_cycle % 6 == 0:  # Cada minuto mostrar resumen
+        with bot.market_data_lock:
+            market_data = list(bot.market_data.items())
+        best_scores = []
+        for sym, data in market_data:
+            analysis = data.get('analysis', {})
+            neural = analysis.get('neural_score', 0)
+            tech = analysis.get('technical_percentage', 0)
+            if neural > 40 or tech > 40:  # v32.0.22.4: Umbral más bajo para diagnóstico
+                best_scores.append((sym, neural, tech))
+        print(f"\n📈 RESUMEN MINUTO #{analysis_cycle//6}: {len(best_scores)} pares con IA>40% o Tec>40%")
+        if best_scores:
+            print(f"🔥 TOP 5 CANDIDATOS:")
+            for sym, neural, tech in sorted(best_scores, key=lambda x: x[1]+x[2], reverse=True)[:5]:
+                print(f"   • {sym}: IA={neural:.1f}% Tec={tech:.1f}%")
+        else:
+            print(f"   ⚠️ Ningún par alcanza umbrales mínimos. Verificar red neuronal y datos.")
+        print()
+
+    # Mostrar estado del tracker de señales
+    shown = 0
+    if getattr(bot, 'signal_tracker', None):
+        tracked = bot.signal_tracker.get_tracked_signals()
+        if tracked:
+            print(f"\n🎯 SEÑALES ACTIVAS: {len(tracked)}")
+            for sig_hash, sig_data in tracked.items():
+                status = sig_data.get('status', 'DESCONOCIDA')
+                signal_info = sig_data.get('signal_data', {})
+                if 'symbol' in signal_info:
+                    symbol = signal_info['symbol']
+                    ia = signal_info.get('neural_score', 0)
+                    tech = signal_info.get('technical_percentage', 0)
+                    align = signal_info.get('alignment_percentage', 0)
+
+                    if status == 'DESTACADA':
+                        print(f"  ⭐ DESTACADA: {symbol} | IA={ia:.1f}% | Técnico={tech:.0f}% | Alineación={align:.0f}%")
+                    elif status == 'CONFIRMADA':
+                        print(f"  ✨ CONFIRMADA: {symbol} | IA={ia:.1f}% | Técnico={tech:.0f}% | Alineación={align:.0f}%")
+                    shown += 1
+            print("="*80)
+    return shown
+
+
+class BackendRuntime:
+    """
+    Runtime del modo backend sobre un único event loop asyncio:
+    - Ingesta de mercado: velas (streams combinados) y ticks de señales como corrutinas aiohttp.
+    - Escaneo programado, monitor de señales, recarga de config, reentrenamiento diario y
+      estado por consola: corrutinas con asyncio.sleep, sin un hilo por servicio.
+    - Plazos del SignalTracker (loop.call_at) y envíos de Telegram en el mismo loop.
+    - Trabajo CPU o bloqueante (análisis, monitor con REST, diario) en un executor acotado
+      (BACKEND_EXECUTOR_WORKERS), que también es el executor por defecto del loop.
+    run() bloquea hasta stop(), SIGINT/SIGTERM o Ctrl+C.
+    """
+    def __init__(self, bot: 'OptimizedTradingBot'):
+        import concurrent.futures
+        self.bot = bot
+        self.config = bot.config
+        workers = 2 if IN_REPLIT else int(getattr(self.config, 'BACKEND_EXECUTOR_WORKERS', 6) or 6)
+        self.workers = max(2, workers)
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers,
+                                                              thread_name_prefix="BackendWorker")
+        self.loop = None
+        self.streams = []  # AsyncKlineStream por lote de símbolos
+        self._tasks = []
+        self._stop = None
+        self.stats = {'status_cycles': 0, 'monitor_passes': 0, 'scheduled': 0, 'offloaded': 0,
+                      'offload_errors': 0, 'signals_shown': 0}
+
+    # --- Ciclo de vida ---------------------------------------------------------
+    def run(self) -> bool:
+        try:
+            asyncio.run(self._main())
+        except KeyboardInterrupt:
+            pass  # Windows: sin add_signal_handler, Ctrl+C llega aquí tras la limpieza de asyncio.run
+        return True
+
+    def stop(self):
+        """Thread-safe"""
+        loop, stop = self.loop, self._stop
+        if loop is not None and stop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(stop.set)
+            except RuntimeError:
+                pass
+
+    def offload(self, fn: Callable, *args):
+        """Trabajo bloqueante fuera del loop (thread-safe); los errores se registran"""
+        self.stats['offloaded'] += 1
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    def _log_failure(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self.stats['offload_errors'] += 1
+            logger.error(f"❌ Error en tarea del runtime backend: {future.exception()}")
+
+    def _active(self) -> bool:
+        return not self._stop.is_set() and self.bot.running
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self.loop.set_default_executor(self.executor)  # run_in_executor(None) y to_thread → mismo pool
+        self._stop = asyncio.Event()
+        self._install_signal_handlers()
+        bot = self.bot
+        bot.backend_runtime = self
+        if hasattr(bot.client, 'inline_requests'):
+            bot.client.inline_requests = True
+        # Servicios que pasan al loop antes de arrancar (el diario puede reprogramar plazos)
+        bot.analysis_executor = AsyncAnalysisExecutor(self._analyze, self.executor, self.config)
+        bot.signal_tracker.set_timers(AsyncDeadlineScheduler(self.loop, self.executor, "SignalTimers"))
+        sender = getattr(bot.telegram_client, 'sender', None)
+        if sender is not None:
+            sender.attach_loop(self.loop)
+        try:
+            await self.loop.run_in_executor(None, self._start_bot)
+            bot.analysis_executor.start()
+            await self._start_streams()
+            self._spawn(self._scan_loop(), "Scanner")
+            self._spawn(self._monitor_loop(), "SignalMonitor")
+            self._spawn(self._status_loop(), "Status")
+            if bot.config_watcher is not None:
+                self._spawn(self._config_loop(), "ConfigWatcher")
+            if getattr(self.config, 'DAILY_RETRAIN_ENABLED', False):
+                self._spawn(self._retrain_loop(), "RetrainScheduler")
+            # Diagnóstico inicial con margen para que conecten los streams
+            self.loop.call_later(5, self.offload, bot.print_system_diagnostics)
+            logger.info(f"✅ Runtime backend asyncio en marcha: {len(self._tasks)} corrutinas, "
+                        f"{len(self.streams)} streams de velas, executor de {self.workers} hilos")
+            await self._stop.wait()
+        finally:
+            logger.info("🛑 Deteniendo runtime backend...")
+            self._stop.set()
+            for task in self._tasks:
+                task.cancel()
+            for stream in self.streams:
+                stream.stop()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            await self.loop.run_in_executor(None, bot.stop_optimized)
+            if sender is not None:
+                await sender.detach()
+            bot.backend_runtime = None
+
+    def _install_signal_handlers(self):
+        import signal
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self.loop.add_signal_handler(sig, self._stop.set)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # Windows o hilo secundario: queda KeyboardInterrupt
+
+    def _spawn(self, coro, name: str):
+        self._tasks.append(self.loop.create_task(self._guard(coro, name), name=name))
+
+    async def _guard(self, coro, name: str):
+        """Una corrutina que cae se registra y detiene el runtime en lugar de morir en silencio"""
+        try:
+            await coro
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.critical(f"🔥 Corrutina {name} del runtime backend falló: {e}", exc_info=True)
+            self._stop.set()
+
+    def _start_bot(self):
+        """Parte bloqueante del arranque (diario, REST): en el executor"""
+        bot = self.bot
+        bot.running = True
+        logger.info("Bot Optimizado v35.0.0.0 iniciando (runtime asyncio)...")
+        bot._reset_run_state()
+        bot.chart_service.start()
+        # Estado de escaneo (intervalos, rescan tras cierre); lo programa _scan_loop, sin hilos propios
+        bot.symbol_scanner = SymbolScanner(bot=bot, symbols=self.config.TRADING_SYMBOLS,
+                                           scan_interval=self.config.SCAN_INTERVAL)
+        bot.symbol_scanner.running = True
+        try:
+            bot.load_pair_data_optimized()  # Carga datos iniciales para self.current_pair
+        except Exception as e:
+            logger.warning(f"[WARN] Falló carga inicial de datos: {e}")
+
+    def _analyze(self, symbol: str):
+        self.bot.analyze_and_process_symbol(symbol)
+        registry = getattr(self.bot, 'model_registry', None)
+        if registry is not None:
+            registry.record_first_analysis()
+
+    # --- Ingesta de mercado ------------------------------------------------------
+    async def _start_streams(self):
+        bot = self.bot
+        if getattr(bot.client, 'disable_websocket', False):
+            logger.info("📡 WebSocket deshabilitado por el cliente: velas y ticks por REST")
+            return
+        if not AIOHTTP_AVAILABLE:
+            # Sin aiohttp: streams con hilo propio (websocket-client), el resto sigue en el loop
+            logger.warning("⚠️ aiohttp no disponible - streams de mercado en hilos (websocket-client)")
+            await self.loop.run_in_executor(None, bot._start_market_stream)
+            await self.loop.run_in_executor(None, bot._start_signal_price_feed)
+            return
+        ws_base = ("wss://fstream.binance.com" if self.config.MARKET_TYPE == "PERPETUALS"
+                   else "wss://stream.binance.com:9443")
+        symbols = [s.strip().upper() for s in self.config.TRADING_SYMBOLS if s and str(s).strip() != "N/A"]
+        per_connection = max(1, int(getattr(self.config, 'BACKEND_STREAMS_PER_CONNECTION', 200) or 200))
+        for i in range(0, len(symbols), per_connection):
+            stream = AsyncKlineStream(self.config, ws_base, symbols[i:i + per_connection],
+                                      self.config.ENTRY_TIMEFRAME, bot._process_websocket_data_optimized)
+            stream.start()
+            self.streams.append(stream)
+        bot.signal_price_feed = AsyncPriceTickStream(self.config, f"{ws_base}/ws", bot.signal_tracker.on_price_tick)
+        bot.signal_tracker.set_price_feed(bot.signal_price_feed)
+        bot.signal_price_feed.start()
+        logger.info(f"📡 Streams asyncio: {len(symbols)} símbolos en {len(self.streams)} conexiones + ticks de señales")
+
+    # --- Corrutinas de servicio --------------------------------------------------
+    async def _scan_loop(self):
+        """Escaneo periódico: programa en el pool deduplicado los símbolos cuyo intervalo venció"""
+        scanner = self.bot.symbol_scanner
+        await self._wait_for_model()
+        while self._active():
+            scan_interval, batch_size, batch_delay = scanner.scan_params()
+            now = time.time()
+            due = [symbol for symbol in scanner.symbols if now - scanner.last_scan_time.get(symbol, 0) >= scan_interval]
+            if due:
+                scanner.begin_cycle()
+                for count, symbol in enumerate(due, 1):
+                    scanner.last_scan_time[symbol] = now
+                    self.bot.analysis_executor.submit(symbol)
+                    if count % max(1, batch_size) == 0 and count < len(due):
+                        await asyncio.sleep(batch_delay)
+                self.stats['scheduled'] += len(due)
+                self.bot._safe_gui_queue_put(('log_message', f"🔍 Programados {len(due)} símbolos para análisis"))
+            await asyncio.sleep(1)
+
+    async def _wait_for_model(self):
+        """Sin análisis hasta que el modelo esté cargado y caliente (o venza MODEL_READY_TIMEOUT)"""
+        registry = getattr(self.bot, 'model_registry', None)
+        if registry is None:
+            return
+        deadline = self.loop.time() + getattr(self.config, 'MODEL_READY_TIMEOUT', 60)
+        while not registry.is_ready and self._active():
+            if self.loop.time() >= deadline:
+                logger.warning("⚠️ Modelo no listo a tiempo - el escáner continúa sin esperar")
+                return
+            await asyncio.sleep(0.5)
+
+    async def _monitor_loop(self):
+        """Monitor de señales cada 2s; la pasada (REST, análisis) va al executor solo si hay señales"""
+        while self._active():
+            await asyncio.sleep(2)
+            if not self.bot.signal_tracker.tracked_signals:
+                continue
+            try:
+                await self.loop.run_in_executor(None, self.bot._monitor_pass)
+                self.stats['monitor_passes'] += 1
+            except Exception as e:
+                logger.error(f"❌ [MONITOR] Error en pasada del runtime backend: {e}", exc_info=True)
+
+    async def _config_loop(self):
+        watcher = self.bot.config_watcher
+        logger.info(f"👁️ Recarga en caliente de configuración activa (cada {watcher.interval:.1f}s)")
+        while self._active():
+            await asyncio.sleep(watcher.interval)
+            try:
+                await self.loop.run_in_executor(None, watcher.check)
+            except Exception as e:
+                logger.error(f"❌ Error vigilando la configuración: {e}")
+
+    async def _retrain_loop(self):
+        last_retrain_date = None
+        while self._active():
+            last_retrain_date = await self.loop.run_in_executor(None, self.bot._check_daily_retrain,
+                                                                last_retrain_date)
+            await asyncio.sleep(3600)  # chequear cada hora
+
+    async def _status_loop(self):
+        interval = float(getattr(self.config, 'BACKEND_STATUS_INTERVAL_S', 10))
+        while self._active():
+            await asyncio.sleep(interval)
+            self.stats['status_cycles'] += 1
+            self.stats['signals_shown'] += print_backend_status(self.bot, self.stats['status_cycles'])
+
+
 # ========== FUNCIÓN PRINCIPAL OPTIMIZADA CON SOPORTE CLI ==========
 def main_backend():
     """MODO BACKEND: Bot funcional SIN interfaz gráfica (para Replit/Servidores)"""
@@ -15980,7 +20654,18 @@ def main_backend():
         print("🎯 Bot ejecutándose en BACKGROUND - Análisis en tiempo real...")
         print("="*80)
 
-        # ✅ EJECUTAR LOOP PRINCIPAL 
+        # ✅ EJECUTAR LOOP PRINCIPAL
+        if getattr(config, 'BACKEND_ASYNC_RUNTIME', True):
+            # Un event loop asyncio + executor acotado en lugar de un hilo por servicio
+            runtime = BackendRuntime(bot)
+            print("\n✅ Bot corriendo (runtime asyncio) - Monitoreando señales en tiempo real...")
+            print("\n📡 MONITOREO DE SEÑALES:")
+            print("="*80)
+            runtime.run()
+            print("\n🛑 Bot detenido")
+            logger.info(f"Bot detenido - Total señales detectadas: {runtime.stats['signals_shown']}")
+            return True
+
         bot.start_optimized()
         print("\n✅ Bot corriendo - Monitoreando señales en tiempo real...")
         print("\n📡 MONITOREO DE SEÑALES:")
@@ -15994,59 +20679,10 @@ def main_backend():
                 # Verificar si hay nuevas señales cada 10 segundos
                 time.sleep(10)
                 analysis_cycle += 1
-
-                # ✅ v32.0.22.4: Mostrar progreso de análisis cada ciclo
-                analyzed = getattr(bot, 'symbols_analyzed_count', 0)
-                total = getattr(bot, 'total_symbols_to_analyze', 50)
-                current_sym = getattr(bot, '_current_analyzed_symbol_for_gui', 'N/A')
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] 📊 Ciclo #{analysis_cycle}: Analizados {analyzed}/{total} | Actual: {current_sym}")
-
-                # ✅ Verificar si hay análisis en market_data
-                if hasattr(bot, 'market_data') and bot.market_data:
-                    if analysis_cycle % 6 == 0:  # Cada minuto mostrar resumen
-                        best_scores = []
-                        for sym, data in bot.market_data.items():
-                            analysis = data.get('analysis', {})
-                            neural = analysis.get('neural_score', 0)
-                            tech = analysis.get('technical_percentage', 0)
-                            if neural > 40 or tech > 40:  # v32.0.22.4: Umbral más bajo para diagnóstico
-                                best_scores.append((sym, neural, tech))
-                        print(f"\n📈 RESUMEN MINUTO #{analysis_cycle//6}: {len(best_scores)} pares con IA>40% o Tec>40%")
-                        if best_scores:
-                            print(f"🔥 TOP 5 CANDIDATOS:")
-                            for sym, neural, tech in sorted(best_scores, key=lambda x: x[1]+x[2], reverse=True)[:5]:
-                                print(f"   • {sym}: IA={neural:.1f}% Tec={tech:.1f}%")
-                        else:
-                            print(f"   ⚠️ Ningún par alcanza umbrales mínimos. Verificar red neuronal y datos.")
-                        print()
-
-                # Mostrar estado del tracker de señales
-                if hasattr(bot, 'signal_tracker') and bot.signal_tracker:
-                    tracked = bot.signal_tracker.tracked_signals
-                    active_signals = len(tracked)
-                    if active_signals > 0:
-                        print(f"\n🎯 SEÑALES ACTIVAS: {active_signals}")
-
-                        # Iterar sobre todas las señales trackeadas
-                        for sig_hash, sig_data in tracked.items():
-                            status = sig_data.get('status', 'DESCONOCIDA')
-                            signal_info = sig_data.get('signal_data', {})
-                            if 'symbol' in signal_info:
-                                symbol = signal_info['symbol']
-                                ia = signal_info.get('neural_score', 0)
-                                tech = signal_info.get('technical_percentage', 0)
-                                align = signal_info.get('alignment_percentage', 0)
-
-                                if status == 'DESTACADA':
-                                    print(f"  ⭐ DESTACADA: {symbol} | IA={ia:.1f}% | Técnico={tech:.0f}% | Alineación={align:.0f}%")
-                                elif status == 'CONFIRMADA':
-                                    print(f"  ✨ CONFIRMADA: {symbol} | IA={ia:.1f}% | Técnico={tech:.0f}% | Alineación={align:.0f}%")
-                                signal_count += 1
-
-                        print("="*80)
+                signal_count += print_backend_status(bot, analysis_cycle)
         except KeyboardInterrupt:
             print("\n🛑 Deteniendo bot...")
-            bot.stop()
+            bot.stop_optimized()
             logger.info(f"Bot detenido - Total señales detectadas: {signal_count}")
             return True
     except Exception as e:
@@ -16400,6 +21036,22 @@ def check_production_readiness():
         logger.info("ℹ️ Algunas variables de entorno opcionales no están configuradas (PYTHONIOENCODING/QT_LOGGING_RULES). Esto es normal en entornos locales.")
     return True # Permitir continuar siempre que los directorios sean escribibles
 
+# Stacks opcionales pesados: en modo backend deben seguir sin cargar hasta su primer uso
+HEAVY_OPTIONAL_MODULES = ('torch', 'sklearn', 'scipy', 'matplotlib', 'mplfinance', 'aiohttp', 'PyQt5')
+
+
+def import_profile_summary(top: int = 5) -> str:
+    """Resumen estilo -X importtime: etapas más caras del import y stacks aún diferidos"""
+    stages = sorted(((stage, ms) for stage, ms in IMPORT_PROFILE.items()
+                     if stage != 'total' and not stage.startswith('lazy:')), key=lambda item: item[1], reverse=True)
+    lazy = [f"{stage[5:]} {ms:.0f}ms" for stage, ms in IMPORT_PROFILE.items() if stage.startswith('lazy:')]
+    deferred = [name for name in HEAVY_OPTIONAL_MODULES if name not in sys.modules]
+    return (f"import {IMPORT_PROFILE.get('total', 0.0):.0f}ms "
+            f"({', '.join(f'{stage} {ms:.0f}ms' for stage, ms in stages[:top])}) | "
+            f"diferidos: {', '.join(deferred) or 'ninguno'} | "
+            f"cargados al usarse: {', '.join(lazy) or 'ninguno'}")
+
+
 class SmokeTest:
     """Pruebas rápidas de encendido para validar componentes críticos."""
 
@@ -16428,13 +21080,19 @@ class SmokeTest:
             return True, "Directorios críticos existen"
         return False, f"Faltan directorios: {missing}"
 
+    @staticmethod
+    def test_import_profile():
+        """Informativo: nunca bloquea el arranque"""
+        return True, import_profile_summary()
+
     @classmethod
     def run_all(cls):
         logger.info("🚀 Iniciando Smoke Tests...")
         tests = [
             ("Configuración", cls.test_config),
             ("Logging", cls.test_logging),
-            ("Directorios", cls.test_directories)
+            ("Directorios", cls.test_directories),
+            ("Import", cls.test_import_profile)
         ]
 
         passed_count = 0
@@ -16453,11 +21111,17 @@ class SmokeTest:
             logger.error("🔥 Fallaron algunos Smoke Tests. Revise la configuración.")
             return False
 
+_import_mark('definiciones')
+IMPORT_PROFILE['total'] = (time.perf_counter() - _IMPORT_STARTED) * 1000.0
+
 # ==============================================================================
 # BLOQUE DE EJECUCIÓN PRINCIPAL
 # ==============================================================================
 
 if __name__ == "__main__":
+    # ✅ Necesario para el proceso de reentrenamiento (spawn) en el .exe congelado
+    import multiprocessing
+    multiprocessing.freeze_support()
     # ✅ Verificaciones de Inicio
     check_production_readiness()
     if not SmokeTest.run_all():
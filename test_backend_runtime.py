@@ -0,0 +1,188 @@
+import unittest
+import os
+import sys
+import asyncio
+import threading
+import time
+import concurrent.futures
+from types import SimpleNamespace
+
+# Setup path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto_bot_pro_v35 import (AnalysisExecutor, AsyncDeadlineScheduler, AsyncAnalysisExecutor, AsyncKlineStream,
+                                BackendRuntime, DeadlineScheduler, SymbolScanner)
+
+
+class LoopTestCase(unittest.TestCase):
+    def setUp(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="BackendTest")
+
+    def tearDown(self):
+        self.executor.shutdown(wait=True)
+
+
+class TestAsyncDeadlineScheduler(LoopTestCase):
+    def test_fire_cancel_and_reschedule_on_loop(self):
+        fired = []
+
+        def record(name):
+            fired.append((name, threading.current_thread().name))
+
+        async def scenario():
+            timers = AsyncDeadlineScheduler(asyncio.get_running_loop(), self.executor, "TestTimers")
+            timers.schedule('a', 0.02, record, 'a')
+            timers.schedule('b', 0.02, record, 'b')
+            timers.cancel('b')
+            timers.schedule('c', 60, record, 'c-viejo')
+            timers.schedule('c', 0.05, record, 'c')  # Reprogramar sustituye el plazo anterior
+            self.assertAlmostEqual(timers.remaining('c'), 0.05, delta=0.04)
+            await asyncio.sleep(0.3)
+            return timers
+
+        timers = asyncio.run(scenario())
+        self.assertEqual([name for name, _ in fired], ['a', 'c'])
+        self.assertTrue(all(thread.startswith("BackendTest") for _, thread in fired))  # Fuera del loop
+        self.assertEqual((timers.pending(), timers.stats['fired'], timers.stats['cancelled']), (0, 2, 1))
+
+    def test_handover_keeps_deadlines(self):
+        threaded = DeadlineScheduler("Threaded")
+        threaded.schedule(('h1', 'timeout'), 600, lambda: None)
+
+        async def scenario():
+            timers = AsyncDeadlineScheduler(asyncio.get_running_loop(), self.executor, "TestTimers")
+            self.assertEqual(threaded.handover(timers), 1)
+            return timers.remaining(('h1', 'timeout'))
+
+        self.assertAlmostEqual(asyncio.run(scenario()), 600, delta=1)
+        self.assertEqual(threaded.pending(), 0)
+        self.assertFalse(threaded.running)
+
+
+class TestAsyncAnalysisExecutor(LoopTestCase):
+    def test_bounded_dedup_and_rerun(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+        runs = []
+
+        def analyze(symbol):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            runs.append((symbol, threading.current_thread().name))
+            time.sleep(0.05)
+            with lock:
+                state['active'] -= 1
+
+        async def scenario():
+            pool = AsyncAnalysisExecutor(analyze, self.executor, SimpleNamespace(ANALYSIS_WORKERS=2))
+            pool.start()
+            for symbol in ('BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'SOLUSDT'):
+                pool.submit(symbol)
+            await asyncio.sleep(0.01)
+            # Cierre de vela durante el análisis (desde otro hilo): una sola re-ejecución
+            await asyncio.get_running_loop().run_in_executor(None, pool.submit, 'BTCUSDT')
+            pool.submit('BTCUSDT')
+            deadline = time.monotonic() + 3
+            while pool.stats['completed'] < 4 and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            metrics = pool.get_metrics()
+            pool.stop()
+            return metrics
+
+        metrics = asyncio.run(scenario())
+        self.assertEqual(sorted(symbol for symbol, _ in runs), ['BTCUSDT', 'BTCUSDT', 'ETHUSDT', 'SOLUSDT'])
+        self.assertLessEqual(state['peak'], 2)
+        self.assertTrue(all(thread.startswith("BackendTest") for _, thread in runs))
+        self.assertEqual((metrics['coalesced'], metrics['queue_depth'], metrics['in_flight']), (2, 0, 0))
+
+
+class TestAnalysisExecutor(unittest.TestCase):
+    def test_scanner_runs_share_in_flight_guard_and_stop_joins(self):
+        started, release = threading.Event(), threading.Event()
+        runs = []
+
+        def analyze(symbol):
+            runs.append(('worker', symbol))
+            started.set()
+            release.wait(2)
+
+        pool = AnalysisExecutor(analyze, SimpleNamespace(ANALYSIS_WORKERS=2))
+        pool.start()
+        pool.submit('BTCUSDT')
+        self.assertTrue(started.wait(2))
+        # El escáner no duplica un análisis en curso; otro símbolo sí corre en su hilo
+        self.assertFalse(pool.run_inline('BTCUSDT', lambda symbol: runs.append(('scanner', symbol))))
+        self.assertTrue(pool.run_inline('ETHUSDT', lambda symbol: runs.append(('scanner', symbol))))
+        release.set()
+        threads = list(pool._threads)
+        pool.stop(wait=True)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(runs, [('worker', 'BTCUSDT'), ('scanner', 'ETHUSDT')])
+        self.assertEqual((pool.stats['completed'], pool.stats['coalesced']), (2, 1))
+
+    def test_default_stop_does_not_wait_for_running_analysis(self):
+        started, release = threading.Event(), threading.Event()
+        pool = AnalysisExecutor(lambda symbol: (started.set(), release.wait(2)), SimpleNamespace(ANALYSIS_WORKERS=1))
+        pool.start()
+        pool.submit('BTCUSDT')
+        self.assertTrue(started.wait(2))
+        threads = list(pool._threads)
+        began = time.monotonic()
+        pool.stop()  # Botón Stop de la GUI: no congela el event loop de Qt
+        self.assertLess(time.monotonic() - began, 0.5)
+        self.assertTrue(threads[0].is_alive())
+        release.set()
+        threads[0].join(2)
+        self.assertFalse(threads[0].is_alive())
+
+
+class TestKlineStream(unittest.TestCase):
+    def test_combined_stream_url_and_closed_candles_only(self):
+        updates = []
+        stream = AsyncKlineStream(SimpleNamespace(), "wss://fstream.binance.com", ['BTCUSDT', 'ETHUSDT'], '15m',
+                                  updates.append)
+        self.assertEqual(stream.url, "wss://fstream.binance.com/stream?streams=btcusdt@kline_15m/ethusdt@kline_15m")
+        kline = {'t': 1, 'o': '1', 'h': '2', 'l': '0.5', 'c': '1.5', 'v': '10', 'i': '15m', 'x': False, 's': 'BTCUSDT'}
+        stream._handle_event(None, {'stream': 'btcusdt@kline_15m', 'data': {'e': 'kline', 'k': kline}})
+        stream._handle_event(None, {'stream': 'btcusdt@kline_15m', 'data': {'e': 'kline', 'k': dict(kline, x=True)}})
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updates[0]['symbol'], 'BTCUSDT')
+        self.assertEqual(updates[0]['kline']['c'], '1.5')
+        self.assertTrue(updates[0]['kline']['x'])
+
+
+class TestScanCoroutine(unittest.TestCase):
+    def test_due_symbols_are_submitted_once_per_interval(self):
+        submitted = []
+        config = SimpleNamespace(SCAN_INTERVAL=60, SCAN_BATCH_SIZE=2, SCAN_BATCH_DELAY=0.01,
+                                 BACKEND_EXECUTOR_WORKERS=2)
+        bot = SimpleNamespace(config=config, running=True, model_registry=None,
+                              analysis_executor=SimpleNamespace(submit=submitted.append),
+                              _safe_gui_queue_put=lambda item: None)
+        symbols = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT']
+        bot.symbol_scanner = SymbolScanner(bot, symbols, scan_interval=60)
+        runtime = BackendRuntime(bot)
+
+        async def scenario():
+            runtime.loop = asyncio.get_running_loop()
+            runtime._stop = asyncio.Event()
+            task = runtime.loop.create_task(runtime._scan_loop())
+            await asyncio.sleep(0.1)
+            self.assertEqual(submitted, symbols)
+            bot.symbol_scanner.rescan_symbol('ETHUSDT')  # Cierre de señal: re-escaneo inmediato
+            await asyncio.sleep(1.2)
+            runtime._stop.set()
+            await asyncio.wait_for(task, timeout=2)
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            runtime.executor.shutdown(wait=False)
+        self.assertEqual(submitted, symbols + ['ETHUSDT'])
+        self.assertEqual(bot.symbol_analysis_counts, {'ETHUSDT': 0, 'BTCUSDT': 0, 'SOLUSDT': 0})
+        self.assertEqual(runtime.stats['scheduled'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import os
+import sys
+import json
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Setup path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto_bot_pro_v35 import AdvancedTradingConfig, ConfigWatcher, TradingSettings, current_settings
+
+
+class TestConfigReload(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'config_v20_optimized.json')
+        self.config = AdvancedTradingConfig()
+        self.config.config_path = lambda: self.path
+        self.config.save_config()
+        self.watcher = ConfigWatcher(self.config)
+        self.changes = []
+        self.config.add_settings_listener(lambda old, new: self.changes.append(new.changes(old)))
+
+    def tearDown(self):
+        self.watcher.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _edit(self, **values):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data.update(values)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    def test_own_save_does_not_trigger_reload(self):
+        self.assertFalse(self.watcher.check())
+        self.config.MIN_SIGNAL_ROBUSTNESS = 81.0
+        self.config.save_config()
+        self.assertEqual(self.config.settings.MIN_SIGNAL_ROBUSTNESS, 81.0)  # GUI: snapshot al guardar
+        self.assertFalse(self.watcher.check())
+
+    def test_external_edit_swaps_snapshot(self):
+        before = self.config.settings
+        self._edit(MIN_SIGNAL_ROBUSTNESS=80, MIN_STOP_LOSS_PERCENT=0.5, SCAN_BATCH_SIZE=4)
+        self.assertTrue(self.watcher.check())
+        settings = self.config.settings
+        self.assertIsNot(settings, before)
+        self.assertEqual(settings.version, before.version + 1)
+        self.assertIsInstance(settings.MIN_SIGNAL_ROBUSTNESS, float)
+        self.assertEqual((settings.MIN_SIGNAL_ROBUSTNESS, settings.SCAN_BATCH_SIZE), (80.0, 4))
+        self.assertAlmostEqual(settings.min_sl_fraction, 0.005)
+        self.assertEqual(before.MIN_SIGNAL_ROBUSTNESS, 76.0)  # El snapshot anterior no se muta
+        self.assertEqual(set(self.changes[-1]), {'MIN_SIGNAL_ROBUSTNESS', 'MIN_STOP_LOSS_PERCENT', 'SCAN_BATCH_SIZE'})
+
+    def test_invalid_file_keeps_current_settings(self):
+        before = self.config.settings
+        self._edit(MIN_RISK_REWARD_RATIO="mucho", MIN_SIGNAL_ROBUSTNESS=90)
+        self.assertFalse(self.watcher.check())
+        self.assertIs(self.config.settings, before)
+        self.assertEqual(self.config.MIN_SIGNAL_ROBUSTNESS, 76.0)  # Atributos restaurados
+        self.assertEqual(self.watcher.stats['rejected'], 1)
+        self.assertFalse(self.watcher.check())  # El mismo archivo inválido no se reintenta
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{"MIN_SIGNAL_ROBUSTNESS": 9')  # JSON a medias
+        self.assertFalse(self.watcher.check())
+        self.assertIs(self.config.settings, before)
+
+    def test_restart_only_keys_are_not_hot_applied(self):
+        self._edit(MARKET_TYPE="SPOT", MIN_VOLUME_RATIO=2.0)
+        self.assertTrue(self.watcher.check())
+        self.assertEqual(self.config.MARKET_TYPE, "PERPETUALS")
+        self.assertEqual(self.config.settings.MIN_VOLUME_RATIO, 2.0)
+
+    def test_watcher_thread_picks_up_change(self):
+        self.config.CONFIG_WATCH_INTERVAL_S = 0.05
+        self.watcher = ConfigWatcher(self.config)
+        self.watcher.start()
+        self._edit(SCAN_INTERVAL=15)
+        deadline = time.time() + 3
+        while self.config.settings.SCAN_INTERVAL != 15.0 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.config.settings.SCAN_INTERVAL, 15.0)
+
+    def test_current_settings_without_snapshot(self):
+        settings = current_settings(SimpleNamespace(MIN_SIGNAL_ROBUSTNESS="70", REQUIRE_CANDLE_PATTERN=True))
+        self.assertEqual(settings.MIN_SIGNAL_ROBUSTNESS, 70.0)
+        self.assertTrue(settings.entry_required)
+        self.assertEqual(settings.MIN_RISK_REWARD_RATIO, TradingSettings().MIN_RISK_REWARD_RATIO)
+
+
+if __name__ == '__main__':
+    unittest.main()
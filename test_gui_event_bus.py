@@ -0,0 +1,88 @@
+import unittest
+import os
+import sys
+import threading
+
+# Setup path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto_bot_pro_v35 import GuiEventBus
+from testutil import config_factory
+
+
+make_config = config_factory(GUI_BUS_LOG_MAXLEN=1000, GUI_BUS_DETACHED_BACKLOG=200)
+
+
+def make_bus(**overrides):
+    return GuiEventBus(make_config(**overrides))
+
+
+class TestGuiEventBus(unittest.TestCase):
+    def test_state_events_keep_latest_value_per_type(self):
+        bus = make_bus()
+        for progress in range(10):
+            bus.publish('update_pair_scan_progress', progress)
+        bus.publish('update_current_analyzed_symbol', 'BTCUSDT')
+
+        events, logs = bus.drain()
+        self.assertEqual(sorted(events), [('update_current_analyzed_symbol', 'BTCUSDT'),
+                                          ('update_pair_scan_progress', 9)])
+        self.assertEqual(logs, [])
+        stats = bus.stats['state']
+        self.assertEqual((stats['published'], stats['coalesced'], stats['delivered']), (11, 9, 2))
+        self.assertEqual(bus.drain(), ([], []))
+
+    def test_drain_keeps_publish_order_between_state_and_critical(self):
+        bus = make_bus()
+        bus.publish('update_pair_scan_progress', 10)
+        bus.publish('new_signal', 'A')
+        bus.publish('update_gui_realtime_price', 100.0)
+        bus.publish('trade_closed', 'B')
+        bus.publish('update_pair_scan_progress', 20)  # Fusionado: ocupa la posición de su última publicación
+
+        events, _ = bus.drain()
+        self.assertEqual(events, [('new_signal', 'A'), ('update_gui_realtime_price', 100.0),
+                                  ('trade_closed', 'B'), ('update_pair_scan_progress', 20)])
+
+    def test_critical_events_are_never_dropped_with_consumer_attached(self):
+        bus = make_bus(GUI_BUS_DETACHED_BACKLOG=5)
+        bus.attach_consumer()
+        publishers = [threading.Thread(target=lambda worker=worker: [bus.publish('new_signal', (worker, i))
+                                                                     for i in range(250)])
+                      for worker in range(4)]
+        for thread in publishers:
+            thread.start()
+        for thread in publishers:
+            thread.join()
+
+        events, _ = bus.drain()
+        self.assertEqual(len(events), 1000)
+        for worker in range(4):  # FIFO por productor
+            self.assertEqual([data[1] for _, data in events if data[0] == worker], list(range(250)))
+        self.assertEqual(bus.stats['critical']['dropped'], 0)
+
+    def test_detached_bus_keeps_only_recent_critical_backlog(self):
+        bus = make_bus(GUI_BUS_DETACHED_BACKLOG=5)
+        for i in range(12):
+            bus.publish('new_signal', i)
+
+        self.assertEqual(bus.get_metrics()['critical']['pending'], 5)
+        events, _ = bus.drain()
+        self.assertEqual([data for _, data in events], [7, 8, 9, 10, 11])
+        self.assertEqual(bus.stats['critical']['dropped'], 7)
+
+    def test_log_channel_is_capped_and_counts_drops(self):
+        bus = make_bus(GUI_BUS_LOG_MAXLEN=3)
+        bus.attach_consumer()  # El tope de logs no depende de la GUI
+        for i in range(8):
+            bus.publish('log_message', f"línea {i}")
+
+        events, logs = bus.drain()
+        self.assertEqual(events, [])
+        self.assertEqual([message for _, message in logs], ["línea 5", "línea 6", "línea 7"])
+        stats = bus.stats['log']
+        self.assertEqual((stats['published'], stats['dropped'], stats['delivered']), (8, 5, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import json, sys
+import crypto_bot_pro_v35 as bot
+before = {name: name in sys.modules for name in bot.HEAVY_OPTIONAL_MODULES}
+scaler = bot.MinMaxScaler()
+print(json.dumps({'before': before, 'pyqt': bot.PYQT_AVAILABLE, 'scaler': type(scaler).__name__,
+                  'sklearn_after': 'sklearn' in sys.modules, 'profile': bot.IMPORT_PROFILE,
+                  'summary': bot.import_profile_summary()}))
+"""
+
+BROKEN_TORCH_PROBE = """
+import importlib.abc, importlib.util, json, sys
+
+class BrokenTorch(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, name, path=None, target=None):
+        return importlib.util.spec_from_loader(name, self) if name.split('.')[0] == 'torch' else None
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        raise OSError('[WinError 126] No se puede encontrar el módulo especificado (c10.dll)')
+
+sys.meta_path.insert(0, BrokenTorch())
+import crypto_bot_pro_v35 as bot
+before = bot.TORCH_AVAILABLE
+print(json.dumps({'before': before, 'ensure': bot.ensure_torch(), 'after': bot.TORCH_AVAILABLE,
+                  'torch_is_none': bot.torch is None}))
+"""
+
+
+def run_probe(probe):
+    env = dict(os.environ, CRYPTOBOT_HEADLESS='1')
+    result = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, env=env, capture_output=True,
+                            text=True, encoding='utf-8', timeout=300)
+    if result.returncode != 0:
+        raise AssertionError(result.stderr[-2000:])
+    return result.stdout, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestLazyImports(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        _, cls.report = run_probe(PROBE)
+
+    def test_backend_import_defers_heavy_stacks(self):
+        self.assertFalse(self.report['pyqt'])
+        self.assertEqual({name for name, loaded in self.report['before'].items() if loaded}, set())
+
+    def test_lazy_name_imports_on_first_use(self):
+        self.assertEqual(self.report['scaler'], 'MinMaxScaler')
+        self.assertTrue(self.report['sklearn_after'])
+        self.assertIn('lazy:sklearn', self.report['profile'])
+
+    def test_import_profile_summary(self):
+        profile = self.report['profile']
+        self.assertGreater(profile['total'], 0)
+        self.assertIn('numpy/pandas', profile)
+        self.assertIn('diferidos:', self.report['summary'])
+
+
+class TestBrokenTorch(unittest.TestCase):
+    def test_failed_torch_import_disables_ai(self):
+        stdout, report = run_probe(BROKEN_TORCH_PROBE)
+        self.assertEqual(report, {'before': True, 'ensure': False, 'after': False, 'torch_is_none': True})
+        self.assertIn("PyTorch no disponible: [WinError 126]", stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,401 @@
+import unittest
+import os
+import sys
+import json
+import hmac
+import hashlib
+import shutil
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Setup path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto_bot_pro_v35 import (BinanceOrderGateway, BinanceTestnetOrderExecutor, BinanceOrderManager,
+                                 ExchangeMetadataService, get_exchange_metadata)
+from testutil import config_factory
+
+API_KEY = "test-key"
+SECRET = "test-secret"
+
+
+class FakeExchange(ThreadingHTTPServer):
+    """Exchange local: valida la firma HMAC y responde como la API REST de Binance"""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeExchangeHandler)
+        self.calls = []  # (t_inicio, t_fin, metodo, ruta, params, puerto_cliente)
+        self.lock = threading.Lock()
+        self.order_delay = 0.0
+        self.next_order_id = 1000
+        self.reject_market = False
+        self.exchange_info = {'symbols': []}  # Respuesta pública de /exchangeInfo
+        self.exchange_info_status = 200
+        self.exchange_info_delay = 0.0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeExchangeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, payload):
+        raw = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _order_ack(self, params):
+        if params['type'] == 'MARKET' and self.server.reject_market:
+            return {'code': -2019, 'msg': 'Margin is insufficient.'}
+        with self.server.lock:
+            self.server.next_order_id += 1
+            order_id = self.server.next_order_id
+        ack = {'orderId': order_id, 'symbol': params['symbol'], 'status': 'NEW', 'type': params['type']}
+        if params['type'] == 'MARKET':
+            ack.update(status='FILLED', avgPrice='100.50')
+        return ack
+
+    def _handle(self, method):
+        started = time.monotonic()
+        parsed = urllib.parse.urlsplit(self.path)
+        path = parsed.path
+        if path.endswith('/ping'):
+            return self._reply(200, {})
+        if path.endswith('/exchangeInfo'):  # Endpoint público: sin firma
+            time.sleep(self.server.exchange_info_delay)
+            with self.server.lock:
+                self.server.calls.append((started, time.monotonic(), method, path, {}, self.client_address[1]))
+            return self._reply(self.server.exchange_info_status, self.server.exchange_info)
+        query, _, signature = parsed.query.rpartition('&signature=')
+        expected = hmac.new(SECRET.encode(), query.encode(), hashlib.sha256).hexdigest()
+        params = dict(urllib.parse.parse_qsl(query))
+        if self.headers.get('X-MBX-APIKEY') != API_KEY or signature != expected:
+            return self._reply(400, {'code': -1022, 'msg': 'Signature for this request is not valid.'})
+        time.sleep(self.server.order_delay)
+        if path.endswith('/batchOrders'):
+            payload = [self._order_ack(order) for order in json.loads(params['batchOrders'])]
+        elif path.endswith('/order') and method == 'POST':
+            if float(params.get('quantity', 0)) <= 0:
+                payload = None
+            else:
+                payload = self._order_ack(params)
+                if 'code' in payload:
+                    payload = None
+        elif path.endswith('/order') and method == 'DELETE':
+            payload = {'orderId': int(params['orderId']), 'status': 'CANCELED'}
+        else:
+            payload = None
+        with self.server.lock:
+            self.server.calls.append((started, time.monotonic(), method, path, params, self.client_address[1]))
+        if payload is None:
+            return self._reply(400, {'code': -1100, 'msg': 'Illegal characters found in parameter.'})
+        self._reply(200, payload)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+make_config = config_factory(MARKET_TYPE="PERPETUALS", use_testnet=True, binance_api_key=API_KEY,
+                             binance_secret_key=SECRET, ORDER_GATEWAY_POOL=4, ORDER_GATEWAY_KEEPALIVE_S=60,
+                             ORDER_GATEWAY_FUTURES_BATCH=True, auto_trading_enabled=True,
+                             MILESTONE_1=1.0, MILESTONE_3=3.0)
+
+
+class TestBinanceOrderGateway(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeExchange()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.gateways = []
+
+    def tearDown(self):
+        for gateway in self.gateways:
+            gateway.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _gateway(self, api_prefix='/fapi/v1', **overrides):
+        gateway = BinanceOrderGateway(make_config(**overrides), self.server.base_url, api_prefix, API_KEY, SECRET)
+        self.gateways.append(gateway)
+        return gateway
+
+    def _executor(self, **overrides):
+        config = make_config(BINANCE_TESTNET_FUTURES_URL=self.server.base_url,
+                             BINANCE_TESTNET_SPOT_URL=self.server.base_url, **overrides)
+        executor = BinanceTestnetOrderExecutor(config)
+        executor.get_symbol_filters = lambda symbol: None  # Sin exchangeInfo en el exchange falso
+        self.gateways.append(executor.get_gateway())
+        return executor
+
+    def test_template_signature_is_valid_and_reused(self):
+        gateway = self._gateway()
+        static = {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET'}
+        first = gateway.place_order(static, {'quantity': '0.010'})
+        second = gateway.place_order(static, {'quantity': '0.020'})
+        self.assertTrue(first['success'], first)
+        self.assertTrue(second['success'], second)
+        self.assertEqual(len(gateway._templates), 1)
+        self.assertEqual([call[4]['quantity'] for call in self.server.calls], ['0.010', '0.020'])
+
+    def test_bad_secret_is_rejected(self):
+        gateway = BinanceOrderGateway(make_config(), self.server.base_url, '/fapi/v1', API_KEY, 'otro')
+        self.gateways.append(gateway)
+        result = gateway.place_order({'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET'}, {'quantity': '1'})
+        self.assertFalse(result['success'])
+        self.assertIn('-1022', result['error'])
+
+    def test_futures_entry_and_stop_in_one_batch(self):
+        executor = self._executor()
+        result = executor.open_position_with_stop('BTCUSDT', 'BUY', 0.01, 99.0)
+        self.assertTrue(result['success'], result)
+        self.assertTrue(result['sl_success'])
+        self.assertEqual(result['fill_price'], 100.5)
+        self.assertEqual(len(self.server.calls), 1)
+        self.assertTrue(self.server.calls[0][3].endswith('/batchOrders'))
+        orders = json.loads(self.server.calls[0][4]['batchOrders'])
+        self.assertEqual([o['type'] for o in orders], ['MARKET', 'STOP_MARKET'])
+        self.assertEqual(orders[1]['side'], 'SELL')
+
+    def test_futures_entry_and_stop_concurrent_without_batch(self):
+        executor = self._executor(ORDER_GATEWAY_FUTURES_BATCH=False)
+        self.server.order_delay = 0.3
+        result = executor.open_position_with_stop('BTCUSDT', 'SELL', 0.01, 101.0)
+        self.assertTrue(result['success'] and result['sl_success'], result)
+        (s1, e1, *_), (s2, e2, *_) = self.server.calls
+        # Las dos órdenes se solapan en el servidor: latencia total ≈ una orden, no dos
+        self.assertLess(max(s1, s2), min(e1, e2))
+        self.assertLess(result['latency_ms'], 550)
+
+    def test_spot_places_stop_after_entry(self):
+        executor = self._executor(MARKET_TYPE="SPOT")
+        result = executor.open_position_with_stop('BTCUSDT', 'BUY', 0.01, 99.0)
+        self.assertTrue(result['success'] and result['sl_success'], result)
+        self.assertEqual([call[4]['type'] for call in self.server.calls], ['MARKET', 'STOP_LOSS_LIMIT'])
+        self.assertTrue(all(call[3] == '/api/v3/order' for call in self.server.calls))
+
+    def test_spot_stop_is_recomputed_from_fill(self):
+        executor = self._executor(MARKET_TYPE="SPOT")
+        result = executor.open_position_with_stop('BTCUSDT', 'BUY', 0.01, 99.0, reference_price=100.0)
+        self.assertTrue(result['success'] and result['sl_success'], result)
+        # Ejecución a 100.50: el SL mantiene el -1% sobre el precio real
+        self.assertAlmostEqual(result['stop_price'], 99.50, places=2)
+        self.assertEqual(self.server.calls[1][4]['stopPrice'], '99.50')
+
+    def test_failed_futures_entry_cancels_orphan_stop(self):
+        executor = self._executor()
+        self.server.reject_market = True
+        result = executor.open_position_with_stop('BTCUSDT', 'BUY', 0.01, 99.0)
+        self.assertFalse(result['success'])
+        self.assertIn('-2019', result['error'])
+        self.assertEqual([call[2] for call in self.server.calls], ['POST', 'DELETE'])
+        self.assertEqual(self.server.calls[1][4]['orderId'], '1001')
+
+    def test_failed_entry_skips_spot_stop(self):
+        executor = self._executor(MARKET_TYPE="SPOT")
+        result = executor.open_position_with_stop('BTCUSDT', 'BUY', 0.0, 99.0)
+        self.assertFalse(result['success'])
+        self.assertEqual(len(self.server.calls), 1)
+
+    def test_warm_session_reuses_connections(self):
+        gateway = self._gateway()
+        self.assertEqual(gateway.warm(2), 2)
+        static = {'symbol': 'ETHUSDT', 'side': 'BUY', 'type': 'MARKET'}
+        for i in range(5):
+            self.assertTrue(gateway.place_order(static, {'quantity': f'0.{i + 1}'})['success'])
+        ports = {call[5] for call in self.server.calls}
+        self.assertLessEqual(len(ports), 2)
+
+    def test_latency_histogram_per_request_type(self):
+        gateway = self._gateway()
+        static = {'symbol': 'BTCUSDT', 'side': 'BUY', 'type': 'MARKET'}
+        for _ in range(3):
+            gateway.place_order(static, {'quantity': '0.01'})
+        gateway.cancel_order('BTCUSDT', 1001)
+        metrics = gateway.get_metrics()
+        self.assertEqual(metrics['order']['count'], 3)
+        self.assertEqual(sum(metrics['order']['buckets'].values()), 3)
+        self.assertEqual(metrics['cancel']['count'], 1)
+        self.assertIn('p95_ms', metrics['order'])
+
+    def test_order_manager_opens_trade_through_gateway(self):
+        config = make_config(BINANCE_TESTNET_FUTURES_URL=self.server.base_url)
+        manager = BinanceOrderManager(config)
+        manager.testnet_executor.get_symbol_filters = lambda symbol: None
+        self.gateways.append(manager.testnet_executor.get_gateway())
+        result = manager.open_auto_trade('BTCUSDT', 'BUY', 100.0, 0.01)
+        self.assertTrue(result['success'], result)
+        trade = manager.get_active_trade('BTCUSDT')
+        self.assertEqual(trade.entry_price, 100.5)
+        self.assertIsNotNone(trade.stop_loss_order_id)
+        self.assertEqual(len(self.server.calls), 1)
+
+        result = manager.close_auto_trade('BTCUSDT')
+        self.assertTrue(result['success'], result)
+        self.assertIsNone(manager.get_active_trade('BTCUSDT'))
+        # Cancelar SL + cierre MARKET por el mismo gateway firmado
+        self.assertEqual([(call[2], call[4].get('type')) for call in self.server.calls[1:]],
+                         [('DELETE', None), ('POST', 'MARKET')])
+
+
+SPOT_EXCHANGE_INFO = {'symbols': [
+    {'symbol': 'BTCUSDT', 'status': 'TRADING', 'baseAsset': 'BTC', 'quoteAsset': 'USDT', 'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '0.01', 'maxPrice': '1000000.00', 'tickSize': '0.01'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.00001', 'maxQty': '9000.00000', 'stepSize': '0.00001'},
+        {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'maxNotional': '9000000.00000000'}]},
+    {'symbol': 'ETHBTC', 'status': 'BREAK', 'baseAsset': 'ETH', 'quoteAsset': 'BTC', 'filters': []},
+]}
+
+
+def futures_exchange_info(min_notional='100'):
+    return {'symbols': [
+        {'symbol': 'BTCUSDT', 'status': 'TRADING', 'baseAsset': 'BTC', 'quoteAsset': 'USDT',
+         'pricePrecision': 2, 'quantityPrecision': 3, 'filters': [
+             {'filterType': 'PRICE_FILTER', 'minPrice': '556.80', 'tickSize': '0.10'},
+             {'filterType': 'LOT_SIZE', 'minQty': '0.001', 'maxQty': '1000', 'stepSize': '0.001'},
+             {'filterType': 'MIN_NOTIONAL', 'notional': min_notional}]},
+        {'symbol': 'XRPUSDT', 'contractStatus': 'TRADING', 'baseAsset': 'XRP', 'quoteAsset': 'USDT',
+         'pricePrecision': 4, 'quantityPrecision': 1, 'filters': [
+             {'filterType': 'MIN_NOTIONAL', 'notional': '5'}]},
+    ]}
+
+
+class TestExchangeMetadataService(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeExchange()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _service(self, api_prefix='/fapi/v1', **overrides):
+        service = ExchangeMetadataService(make_config(**overrides), self.server.base_url, api_prefix)
+        service.cache_path = os.path.join(self.directory, 'exchange_info.json')
+        return service
+
+    def _exchange_info_calls(self):
+        with self.server.lock:
+            return sum(1 for call in self.server.calls if call[3].endswith('/exchangeInfo'))
+
+    def _make_stale(self, service):
+        service._loaded_at = time.time() - service.ttl - 1
+
+    def test_spot_index_reads_notional_filter(self):
+        self.server.exchange_info = SPOT_EXCHANGE_INFO
+        service = self._service('/api/v3')
+        self.assertTrue(service.load())
+
+        btc = service.get('BTCUSDT')
+        self.assertEqual((btc.base_asset, btc.quote_asset, btc.status), ('BTC', 'USDT', 'TRADING'))
+        self.assertEqual((btc.step_size, btc.min_qty, btc.max_qty), (0.00001, 0.00001, 9000.0))
+        self.assertEqual((btc.tick_size, btc.min_price, btc.min_notional), (0.01, 0.01, 5.0))
+        self.assertEqual((btc.qty_precision, btc.price_precision), (5, 2))
+        self.assertIsNone(service.get('DOGEUSDT'))
+        self.assertEqual(service.tradable_symbols('USDT'), {'BTCUSDT'})
+        self.assertEqual((service.stats['lookups'], service.stats['misses']), (2, 1))
+        self.assertEqual(self._exchange_info_calls(), 1)
+
+    def test_futures_index_reads_min_notional_and_precision_fields(self):
+        self.server.exchange_info = futures_exchange_info()
+        service = self._service()
+        self.assertTrue(service.load())
+
+        btc = service.get('BTCUSDT')
+        self.assertEqual(btc.min_notional, 100.0)
+        self.assertEqual((btc.qty_precision, btc.price_precision), (3, 1))  # Derivadas de stepSize/tickSize
+        xrp = service.get('XRPUSDT')
+        self.assertEqual(xrp.status, 'TRADING')  # contractStatus
+        self.assertEqual(xrp.min_notional, 5.0)
+        self.assertEqual((xrp.qty_precision, xrp.price_precision), (1, 4))  # quantityPrecision/pricePrecision
+        self.assertIn('mínimo 100.0', btc.check_order(0.001, 60000.0))
+        self.assertIsNone(btc.check_order(0.002, 60000.0))
+
+    def test_disk_copy_round_trip_avoids_network(self):
+        self.server.exchange_info = futures_exchange_info()
+        first = self._service()
+        self.assertTrue(first.load())
+        self.assertTrue(os.path.exists(first.cache_path))
+
+        second = self._service()
+        self.assertTrue(second.load())
+        self.assertEqual(second.stats['disk_loads'], 1)
+        self.assertEqual(second.stats['network_loads'], 0)
+        self.assertEqual(self._exchange_info_calls(), 1)
+        self.assertAlmostEqual(second._loaded_at, first._loaded_at)
+        self.assertFalse(second.is_stale())
+        for symbol in ('BTCUSDT', 'XRPUSDT'):
+            self.assertEqual(second.get(symbol), first.get(symbol))
+
+    def test_stale_index_is_served_while_one_background_refresh_runs(self):
+        self.server.exchange_info = futures_exchange_info('100')
+        service = self._service()
+        self.assertTrue(service.load())
+        self.server.exchange_info = futures_exchange_info('50')
+        self.server.exchange_info_delay = 0.3
+        self._make_stale(service)
+
+        started = time.monotonic()
+        notionals = [service.get('BTCUSDT').min_notional for _ in range(20)]
+        self.assertLess(time.monotonic() - started, 0.2)  # Ninguna consulta espera a la red
+        self.assertEqual(set(notionals), {100.0})
+
+        service._refresh_thread.join(timeout=5)
+        self.assertEqual(self._exchange_info_calls(), 2)  # Un único refresco para las 20 consultas
+        self.assertEqual(service.stats['network_loads'], 2)
+        self.assertFalse(service.is_stale())
+        self.assertEqual(service.get('BTCUSDT').min_notional, 50.0)
+
+    def test_failed_refresh_keeps_index_and_backs_off(self):
+        self.server.exchange_info = futures_exchange_info('100')
+        service = self._service()
+        self.assertTrue(service.load())
+        self.server.exchange_info_status = 500
+        self._make_stale(service)
+
+        self.assertEqual(service.get('BTCUSDT').min_notional, 100.0)
+        service._refresh_thread.join(timeout=5)
+        self.assertEqual(service.stats['refresh_errors'], 1)
+        self.assertGreater(service._retry_at, time.time())
+
+        for _ in range(5):  # Dentro de la ventana de espera no se vuelve a pedir exchangeInfo
+            self.assertEqual(service.get('BTCUSDT').min_notional, 100.0)
+        self.assertFalse(service._refresh_thread.is_alive())
+        self.assertEqual(self._exchange_info_calls(), 2)
+
+        self.server.exchange_info_status = 200
+        self.server.exchange_info = futures_exchange_info('50')
+        service._retry_at = 0.0  # Vence la espera
+        service.get('BTCUSDT')
+        service._refresh_thread.join(timeout=5)
+        self.assertEqual(self._exchange_info_calls(), 3)
+        self.assertEqual(service.get('BTCUSDT').min_notional, 50.0)
+
+    def test_factory_shares_one_service_per_endpoint(self):
+        config = make_config()
+        futures = get_exchange_metadata(config, self.server.base_url + '/', '/fapi/v1')
+        self.assertIs(get_exchange_metadata(config, self.server.base_url, '/fapi/v1'), futures)
+        self.assertIsNot(get_exchange_metadata(config, self.server.base_url, '/api/v3'), futures)
+        self.assertEqual(futures.url, f"{self.server.base_url}/fapi/v1/exchangeInfo")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+import threading
+import concurrent.futures
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# Setup path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto_bot_pro_v35 import ChartRenderService, SignalChartGenerator, SignalType, PLOTTING_AVAILABLE
+
+# Referencia generada con el renderizado por vela anterior (bucle plot/bar)
+REFERENCE_PNG = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'test_fixtures', 'signal_chart_reference.png')
+
+
+def make_df(seed=42, rows=120):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=rows, freq='15min'),
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.random(rows),
+        'low': np.minimum(open_, close) - rng.random(rows),
+        'close': close,
+        'volume': rng.integers(1_000, 5_000_000, rows).astype(float)
+    })
+
+
+def make_signal(df):
+    last = float(df['close'].iloc[-1])
+    return {
+        'entry_price': last * 0.995,
+        'stop_loss': last * 0.98,
+        'take_profit': last * 1.02,
+        'combined_signal': SignalType.STRONG_BUY,
+        'status': 'DESTACADA'
+    }
+
+
+@unittest.skipUnless(PLOTTING_AVAILABLE, "Matplotlib no disponible")
+class TestSignalChartRender(unittest.TestCase):
+    def setUp(self):
+        from matplotlib.testing.compare import compare_images
+        self.compare_images = compare_images
+        self.tmpdir = tempfile.mkdtemp()
+        self.generator = SignalChartGenerator(disable_websocket=True)
+        self.generator.directorio_graficos = self.tmpdir
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _render(self, df, name):
+        path = self.generator.generate_signal_chart('TESTUSDT', df, make_signal(df), {})
+        self.assertIsNotNone(path)
+        target = os.path.join(self.tmpdir, name)
+        shutil.copy(path, target)
+        return target
+
+    def test_matches_reference_render(self):
+        df = make_df()
+        rendered = self._render(df, 'chart.png')
+        self.assertIsNone(self.compare_images(REFERENCE_PNG, rendered, tol=2))
+
+    def test_reused_figure_does_not_leak_previous_chart(self):
+        # Un render intermedio con otros datos no debe dejar artistas en la figura reutilizada
+        self._render(make_df(seed=7, rows=60), 'other.png')
+        rendered = self._render(make_df(), 'chart.png')
+        self.assertIsNone(self.compare_images(REFERENCE_PNG, rendered, tol=2))
+
+
+class TestChartDeliveryOrder(unittest.TestCase):
+    def test_deliveries_are_serialized_per_signal(self):
+        service = ChartRenderService(SimpleNamespace())
+        renders = {}
+        service.submit = lambda symbol, df, signal_data: renders.setdefault(symbol, concurrent.futures.Future())
+        delivered = []
+        done = threading.Event()
+
+        def record(name):
+            def _callback(chart_image):
+                delivered.append((name, chart_image))
+                if len(delivered) == 3:
+                    done.set()
+            return _callback
+
+        try:
+            service.render_then('BTCUSDT', None, {}, record('promocion'), chain_key='hash1')
+            service.deliver_after('hash1', record('milestone'))  # Sin gráfico, pero detrás de la promoción
+            service.render_then('ETHUSDT', None, {}, record('otra-senal'), chain_key='hash2')
+            renders['ETHUSDT'].set_result('eth.png')
+            time.sleep(0.1)
+            # La otra señal no espera; la de hash1 sigue retenida por su render pendiente
+            self.assertEqual(delivered, [('otra-senal', 'eth.png')])
+            renders['BTCUSDT'].set_result('btc.png')
+            self.assertTrue(done.wait(2))
+            self.assertEqual(delivered[1:], [('promocion', 'btc.png'), ('milestone', None)])
+            deadline = time.monotonic() + 2
+            while service._delivery_tails and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(service._delivery_tails, {})  # Cadenas terminadas no se acumulan
+        finally:
+            service.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Setup path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto_bot_pro_v35 import SignalTracker, DeadlineScheduler
+from testutil import config_factory, PollingMixin
+
+
+make_config = config_factory(MAX_TRACKED_SIGNALS=3, PROFIT_TARGET_PERCENT=3.0, DEFAULT_STOP_LOSS_PERCENT=0.01,
+                             MILESTONE_3=3.0, MIN_NEURAL_DESTACADA=50.0, MIN_TECHNICAL_DESTACADA=40.0,
+                             MIN_ALIGNMENT_DESTACADA=33.0)
+
+
+def make_signal(symbol, price=100.0, is_buy=True):
+    return {'symbol': symbol, 'entry_price': price, 'signal_hash': f"{symbol}-{time.monotonic_ns()}",
+            'is_buy': is_buy, 'status': 'DESTACADA', 'neural_score': 80.0, 'technical_percentage': 70.0,
+            'alignment_percentage': 60.0}
+
+
+class FakePriceFeed:
+    def __init__(self):
+        self.symbols = set()
+
+    def subscribe(self, symbol):
+        self.symbols.add(symbol)
+
+    def unsubscribe(self, symbol):
+        self.symbols.discard(symbol)
+
+
+class TestSignalTracker(PollingMixin, unittest.TestCase):
+    def setUp(self):
+        self.tracker = SignalTracker(make_config())
+        self.feed = FakePriceFeed()
+        self.tracker.set_price_feed(self.feed)
+        self.closed = []
+        self.tracker.on_closed_callback = lambda symbol, report: self.closed.append((symbol, report))
+
+    def tearDown(self):
+        self.tracker.timers.stop()
+
+    def test_tracks_several_symbols_up_to_capacity(self):
+        for symbol in ('BTCUSDT', 'ETHUSDT', 'SOLUSDT'):
+            self.assertTrue(self.tracker.add_highlighted_signal(make_signal(symbol)))
+        self.assertTrue(self.tracker.is_full())
+        self.assertFalse(self.tracker.add_highlighted_signal(make_signal('XRPUSDT')))
+        self.assertEqual(self.feed.symbols, {'BTCUSDT', 'ETHUSDT', 'SOLUSDT'})
+        self.assertEqual(self.tracker.performance_metrics['rejected_reasons']['capacity'], 1)
+
+    def test_tick_closes_only_its_signal(self):
+        btc, eth = make_signal('BTCUSDT'), make_signal('ETHUSDT', price=10.0, is_buy=False)
+        self.tracker.add_highlighted_signal(btc)
+        self.tracker.add_highlighted_signal(eth)
+        self.assertIsNone(self.tracker.on_price_tick('BTCUSDT', 101.0))
+        report = self.tracker.on_price_tick('ETHUSDT', 9.6)  # Venta: +4% ≥ objetivo
+        self.assertEqual(report['reason'], 'target_reached')
+        self.assertEqual(report['signal_data']['symbol'], 'ETHUSDT')
+        self.assertEqual([symbol for symbol, _ in self.closed], ['ETHUSDT'])
+        self.assertTrue(self.tracker.is_tracking('BTCUSDT'))
+        self.assertFalse(self.tracker.is_tracking('ETHUSDT'))
+        self.assertEqual(self.feed.symbols, {'BTCUSDT'})
+        self.assertAlmostEqual(self.tracker.get_signal(btc['signal_hash'])['profit_percent'], 1.0)
+
+    def test_stop_loss_on_tick(self):
+        self.tracker.add_highlighted_signal(make_signal('BTCUSDT'))
+        self.assertEqual(self.tracker.on_price_tick('BTCUSDT', 98.9)['reason'], 'stop_loss_hit')
+        self.assertEqual(self.tracker.timers.pending(), 0)
+
+    def test_highlight_timeout_fires_without_ticks(self):
+        self.tracker.config.MIN_PROMOTION_TIME_SECONDS = 60
+        self.tracker.validation_config['highlight_timeout_min'] = 0.1 / 60
+        closing_threads = []
+        self.tracker.on_closed_callback = lambda symbol, report: (
+            self.closed.append((symbol, report)), closing_threads.append(threading.current_thread().name))
+        self.tracker.add_highlighted_signal(make_signal('BTCUSDT'))
+        self._wait_for(lambda: self.closed)
+        self.assertEqual(self.closed[0][1]['reason'], 'HIGHLIGHT_TIMEOUT')
+        self.assertEqual(closing_threads, ['SignalTimeoutClose'])  # Nunca en el hilo de plazos
+        self.assertEqual(self.tracker.timers.pending(), 0)
+        self.assertLess(self.tracker.timers.stats['max_late_ms'], 100)
+
+    def test_promotion_deadline_promotes_and_reschedules_timeout(self):
+        promoted = []
+        self.tracker.on_promoted_callback = lambda signal_hash, data: promoted.append(data)
+        self.tracker.config.MIN_PROMOTION_TIME_SECONDS = 0.05
+        signal = make_signal('BTCUSDT')
+        self.tracker.add_highlighted_signal(signal)
+        self._wait_for(lambda: promoted)
+        record = self.tracker.get_signal(signal['signal_hash'])
+        self.assertEqual((record.status, promoted[0]['symbol']), ('CONFIRMADA', 'BTCUSDT'))
+        remaining = self.tracker.timers.remaining((signal['signal_hash'], 'timeout'))
+        self.assertGreater(remaining, 179 * 60)  # Timeout CONFIRMADA (180 min) sustituye al de DESTACADA
+
+    def test_confirmed_timeout_uses_validation_config(self):
+        self.tracker.config.MIN_PROMOTION_TIME_SECONDS = 0.05
+        self.tracker.validation_config['confirmed_timeout_min'] = 0.2 / 60
+        self.tracker.add_highlighted_signal(make_signal('BTCUSDT'))
+        self._wait_for(lambda: self.closed)
+        self.assertEqual(self.closed[0][1]['reason'], 'CONFIRMED_TIMEOUT')
+        self.assertEqual(self.tracker.timers.pending(), 0)
+
+    def test_new_signal_replaces_same_symbol_without_deadlock(self):
+        first = make_signal('BTCUSDT')
+        self.tracker.add_highlighted_signal(first)
+        done = []
+        worker = threading.Thread(target=lambda: done.append(self.tracker.add_highlighted_signal(make_signal('BTCUSDT'))))
+        worker.start()
+        worker.join(timeout=2)
+        self.assertEqual(done, [True])
+        self.assertIsNone(self.tracker.get_signal(first['signal_hash']))
+        self.assertEqual(self.closed[0][1]['reason'], 'REPLACED_BY_NEW_SIGNAL')
+        self.assertEqual(len(self.tracker.tracked_signals), 1)
+
+    def test_records_keep_dict_interface(self):
+        signal = make_signal('BTCUSDT')
+        self.tracker.add_highlighted_signal(signal)
+        record = self.tracker.get_tracked_signals()[signal['signal_hash']]
+        record['last_profit_trend_check'] = 5
+        self.assertEqual(record.get('last_profit_trend_check', 0), 5)
+        self.assertEqual(record.get('entry_price_confirmada', 'n/a'), 'n/a')
+        snapshot = record.copy()
+        self.assertEqual((snapshot['status'], snapshot['signal_data']['symbol']), ('DESTACADA', 'BTCUSDT'))
+
+    def test_concurrent_ticks_across_symbols(self):
+        symbols = ('BTCUSDT', 'ETHUSDT', 'SOLUSDT')
+        for symbol in symbols:
+            self.tracker.add_highlighted_signal(make_signal(symbol))
+
+        def feed(symbol):
+            for i in range(500):
+                self.tracker.on_price_tick(symbol, 100.0 + (i % 20) * 0.1)
+
+        threads = [threading.Thread(target=feed, args=(symbol,)) for symbol in symbols]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        self.assertEqual(self.closed, [])
+        for record in self.tracker.get_tracked_signals().values():
+            self.assertAlmostEqual(record.max_profit, 1.9)
+
+
+class TestDeadlineScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = DeadlineScheduler("TestTimers")
+        self.fired = []
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_fires_in_deadline_order_and_skips_cancelled(self):
+        for key, delay in (('c', 0.15), ('a', 0.05), ('b', 0.1), ('x', 0.08)):
+            self.scheduler.schedule(key, delay, self.fired.append, key)
+        self.assertTrue(self.scheduler.cancel('x'))
+        time.sleep(0.3)
+        self.assertEqual(self.fired, ['a', 'b', 'c'])
+        self.assertEqual(self.scheduler.stats['fired'], 3)
+
+    def test_reschedule_replaces_deadline(self):
+        self.scheduler.schedule('k', 5.0, self.fired.append, 'late')
+        self.scheduler.schedule('k', 0.05, self.fired.append, 'early')
+        time.sleep(0.2)
+        self.assertEqual(self.fired, ['early'])
+        self.assertEqual(self.scheduler.pending(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Setup path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto_bot_pro_v35 import StateJournal, SignalTracker, BinanceOrderManager, AutoTradeState
+from testutil import config_factory
+
+
+make_config = config_factory(MAX_TRACKED_SIGNALS=3, PROFIT_TARGET_PERCENT=3.0, DEFAULT_STOP_LOSS_PERCENT=0.01,
+                             MILESTONE_1=1.0, MILESTONE_2=2.0, MILESTONE_3=3.0, MIN_PROMOTION_TIME_SECONDS=180,
+                             MARKET_TYPE="PERPETUALS", use_testnet=True, binance_api_key="", binance_secret_key="",
+                             BINANCE_TESTNET_FUTURES_URL="http://127.0.0.1:9", auto_trading_enabled=True)
+
+
+class TestStateJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_replay_after_restart_and_compaction(self):
+        journal = StateJournal(self.directory, snapshot_every=3, fsync=False)
+        journal.put('trade', 'BTCUSDT', {'current_sl': 99.0})
+        journal.put('trade', 'ETHUSDT', {'current_sl': 10.0})
+        journal.put('trade', 'BTCUSDT', {'current_sl': 100.0})  # 3ª entrada → snapshot
+        journal.delete('trade', 'ETHUSDT')
+        self.assertEqual(journal.stats['snapshots'], 1)
+
+        # Sin close(): la caída deja el snapshot y una línea de WAL
+        reloaded = StateJournal(self.directory, fsync=False)
+        self.assertEqual(reloaded.records('trade'), {'BTCUSDT': {'current_sl': 100.0}})
+        self.assertEqual(reloaded.stats['replayed'], 1)  # solo el delete posterior al snapshot
+        reloaded.close()
+        journal._wal.close()
+
+    def test_truncated_last_line_is_discarded(self):
+        journal = StateJournal(self.directory, fsync=False)
+        journal.put('signal', 'abc', {'symbol': 'BTCUSDT'})
+        journal.close()
+        with open(journal.wal_path, 'a', encoding='utf-8') as f:
+            f.write('{"seq": 2, "op": "put", "kind": "sig')  # caída a mitad de escritura
+
+        reloaded = StateJournal(self.directory, fsync=False)
+        self.assertEqual(list(reloaded.records('signal')), ['abc'])
+        self.assertEqual(reloaded.stats['corrupt_lines'], 1)
+        reloaded.put('signal', 'def', {'symbol': 'ETHUSDT'})
+        reloaded.close()
+        self.assertEqual(set(StateJournal(self.directory).records('signal')), {'abc', 'def'})
+
+    def test_tracker_restore_keeps_remaining_deadline_and_milestones(self):
+        journal = StateJournal(self.directory, fsync=False)
+        tracker = SignalTracker(make_config(MIN_PROMOTION_TIME_SECONDS=600))
+        tracker.set_journal(journal)
+        tracker.set_telegram_client(SimpleNamespace(sent_milestones={'BTCUSDT': {1}}))
+        signal = {'symbol': 'BTCUSDT', 'entry_price': 100.0, 'signal_hash': 'h1', 'is_buy': True,
+                  'status': 'DESTACADA', 'neural_score': 80.0, 'technical_percentage': 70.0,
+                  'alignment_percentage': 60.0}
+        self.assertTrue(tracker.add_highlighted_signal(signal))
+        record = tracker.get_signal('h1')
+        record.highlight_start_time = record.start_time = datetime.now() - timedelta(minutes=5)
+        tracker.checkpoint('h1')
+        tracker.timers.stop()
+        journal.close()
+
+        restored = SignalTracker(make_config(MIN_PROMOTION_TIME_SECONDS=600))
+        telegram = SimpleNamespace()
+        restored.set_telegram_client(telegram)
+        restored.set_journal(StateJournal(self.directory, fsync=False))
+        try:
+            self.assertEqual(restored.restore_from_journal(), 1)
+            self.assertTrue(restored.is_tracking('BTCUSDT'))
+            self.assertEqual(telegram.sent_milestones, {'BTCUSDT': {1}})
+            self.assertAlmostEqual(restored.timers.remaining(('h1', 'timeout')), 15 * 60, delta=5)
+            self.assertAlmostEqual(restored.timers.remaining(('h1', 'promotion')), 5 * 60, delta=5)
+        finally:
+            restored.timers.stop()
+
+
+class TestTradeRecovery(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        journal = StateJournal(self.directory, fsync=False)
+        config = make_config()
+        for symbol, sl_id in (('BTCUSDT', 11), ('ETHUSDT', 21)):
+            trade = AutoTradeState(symbol, 'BUY', 100.0, 0.01, config)
+            trade.entry_order_id, trade.stop_loss_order_id = sl_id - 1, sl_id
+            trade.current_sl = 100.0
+            trade.breakeven_activated = True
+            journal.put('trade', symbol, trade.to_record())
+        journal.close()
+
+        self.manager = BinanceOrderManager(config)
+        self.manager.set_journal(StateJournal(self.directory, fsync=False))
+        self.manager.ensure_user_stream = lambda: None
+        self.executor = self.manager.testnet_executor
+        self.placed = []
+        self.cancelled = []
+
+        def place_stop(symbol, side, quantity, stop_price):
+            self.placed.append((symbol, side, quantity, stop_price))
+            return {'success': True, 'order_id': 99}
+
+        self.executor.place_stop_loss_order = place_stop
+        self.executor.cancel_order = lambda symbol, order_id: self.cancelled.append((symbol, order_id))
+
+    def tearDown(self):
+        self.manager.stop_streams()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_closed_offline_and_missing_stop(self):
+        # BTC: posición plana con el TP aún abierto. ETH: posición viva pero su stop desapareció
+        self.executor.get_open_orders = lambda: [{'symbol': 'BTCUSDT', 'orderId': 12}]
+        self.executor.get_position_amounts = lambda: {'BTCUSDT': 0.0, 'ETHUSDT': 0.02}
+        btc_record = self.manager.journal.records('trade')['BTCUSDT']
+        btc_record['take_profit_order_id'] = 12
+        self.manager.journal.put('trade', 'BTCUSDT', btc_record)
+
+        summary = self.manager.recover_trades()
+        self.assertEqual((summary['restored'], summary['closed_offline'], summary['stop_replaced']), (1, 1, 1))
+        self.assertFalse(self.manager.has_active_trade('BTCUSDT'))
+        self.assertEqual(self.cancelled, [('BTCUSDT', 12)])
+        trade = self.manager.get_active_trade('ETHUSDT')
+        self.assertTrue(trade.breakeven_activated)
+        self.assertEqual((trade.quantity, trade.stop_loss_order_id), (0.02, 99))
+        self.assertEqual(self.placed, [('ETHUSDT', 'BUY', 0.02, 100.0)])
+        self.assertEqual(set(self.manager.journal.records('trade')), {'ETHUSDT'})
+        self.assertEqual(self.manager.journal.records('trade')['ETHUSDT']['stop_loss_order_id'], 99)
+
+    def test_unreachable_exchange_trusts_journal(self):
+        self.executor.get_open_orders = lambda: None
+        self.executor.get_position_amounts = lambda: None
+        summary = self.manager.recover_trades()
+        self.assertTrue(summary['unverified'])
+        self.assertEqual(summary['restored'], 2)
+        self.assertEqual(self.placed, [])
+        self.assertEqual(self.manager.get_active_trade('BTCUSDT').stop_loss_order_id, 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,272 @@
+import unittest
+import os
+import sys
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Setup path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto_bot_pro_v35 import (
+    TelegramAsyncSender, OptimizedTelegramClient, AdvancedTradingConfig, ChartImage
+)
+from testutil import config_factory, PollingMixin
+
+TOKEN = "123:TEST"
+
+
+class FakeBotAPI(ThreadingHTTPServer):
+    """Bot API local: registra las llamadas y permite simular latencia y 429"""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeBotHandler)
+        self.calls = []  # (t_recepcion, t_respuesta, metodo, chat_id, texto, status, datos)
+        self.lock = threading.Lock()
+        self.delays = {}  # texto/caption -> segundos de latencia
+        self.rate_limited = {}  # texto -> retry_after (solo la primera vez)
+        self.received = threading.Event()
+        self.rejected_edits = set()  # message_id que responden 400 al editar
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeBotHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        received_at = time.monotonic()
+        match = re.match(r'^/bot([^/]+)/(\w+)$', self.path)
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if 'json' in self.headers.get('Content-Type', ''):
+            data = json.loads(body)
+        else:
+            # multipart: solo interesan los campos de texto
+            data = dict(re.findall(rb'name="(\w+)"\r\n\r\n(.*?)\r\n', body, re.S))
+            data = {k.decode(): v.decode() for k, v in data.items()}
+        method = match.group(2)
+        if 'media' in data:
+            data['caption'] = json.loads(data['media']).get('caption', '')
+        text = data.get('text', data.get('caption', ''))
+        server = self.server
+        self.server.received.set()
+        time.sleep(server.delays.get(text, 0))
+        with server.lock:
+            retry_after = server.rate_limited.pop(text, None)
+        if match.group(1) != TOKEN:
+            status, payload = 401, {'ok': False, 'error_code': 401, 'description': 'Unauthorized'}
+        elif method.startswith('edit') and int(data.get('message_id', 0)) in server.rejected_edits:
+            status, payload = 400, {'ok': False, 'error_code': 400,
+                                    'description': 'Bad Request: message to edit not found'}
+        elif retry_after is not None:
+            status, payload = 429, {'ok': False, 'error_code': 429, 'description': 'Too Many Requests',
+                                    'parameters': {'retry_after': retry_after}}
+        else:
+            with server.lock:
+                message_id = len(server.calls) + 1
+            status, payload = 200, {'ok': True, 'result': {'message_id': message_id}}
+        with server.lock:
+            server.calls.append((received_at, time.monotonic(), method, str(data.get('chat_id')), text, status, data))
+        raw = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+make_config = config_factory(TELEGRAM_GLOBAL_RATE=100.0, TELEGRAM_GLOBAL_BURST=100, TELEGRAM_CHAT_RATE=50.0,
+                             TELEGRAM_CHAT_BURST=10, TELEGRAM_MAX_IN_FLIGHT=4, TELEGRAM_REQUEST_TIMEOUT=5,
+                             TELEGRAM_PHOTO_TIMEOUT=5)
+
+
+class TestTelegramAsyncSender(PollingMixin, unittest.TestCase):
+    WAIT_TIMEOUT = 5.0
+
+    def setUp(self):
+        self.server = FakeBotAPI()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.senders = []
+
+    def tearDown(self):
+        for sender in self.senders:
+            sender.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _sender(self, **overrides):
+        sender = TelegramAsyncSender(make_config(**overrides), f"{self.server.base_url}/bot{TOKEN}")
+        self.senders.append(sender)
+        return sender
+
+    def _texts(self, status=200):
+        return [call[4] for call in self.server.calls if call[5] == status]
+
+    def test_slow_photo_does_not_block_text(self):
+        sender = self._sender()
+        self.server.delays['chart'] = 1.0
+        photo = sender.submit('sendPhoto', {'chat_id': '1', 'caption': 'chart'},
+                              files={'photo': ('chart.png', b'\x89PNG', 'image/png')})
+        text = sender.submit('sendMessage', {'chat_id': '1', 'text': 'cierre'})
+        self.assertEqual(text.result(timeout=5)['message_id'], 1)
+        self.assertFalse(photo.done())
+        self.assertIsNotNone(photo.result(timeout=5))
+        self.assertEqual(self._texts(), ['cierre', 'chart'])
+
+    def test_concurrent_first_submits_see_started_loop(self):
+        sender = self._sender()
+        barrier = threading.Barrier(8)
+        futures, errors = [], []
+
+        def submit(i):
+            barrier.wait()
+            try:
+                futures.append(sender.submit('sendMessage', {'chat_id': str(i), 'text': f'm{i}'}))
+            except Exception as e:  # Antes: _loop aún a None en el segundo llamante
+                errors.append(e)
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(errors, [])
+        self.assertTrue(all(future.result(timeout=5) is not None for future in futures))
+        self.assertEqual(len(futures), 8)
+
+    def test_critical_jumps_queued_backlog(self):
+        sender = self._sender(TELEGRAM_MAX_IN_FLIGHT=1)
+        self.server.delays['ocupado'] = 0.5
+        first = sender.submit('sendMessage', {'chat_id': '1', 'text': 'ocupado'})
+        self.assertTrue(self.server.received.wait(5))
+        normal = [sender.submit('sendMessage', {'chat_id': '1', 'text': f'milestone {i}'},
+                                priority=TelegramAsyncSender.PRIORITY_NORMAL) for i in range(3)]
+        critical = sender.submit('sendMessage', {'chat_id': '1', 'text': 'stop loss'},
+                                 priority=TelegramAsyncSender.PRIORITY_CRITICAL)
+        for future in [first, critical] + normal:
+            self.assertIsNotNone(future.result(timeout=5))
+        self.assertEqual(self._texts(), ['ocupado', 'stop loss', 'milestone 0', 'milestone 1', 'milestone 2'])
+
+    def test_per_chat_bucket_spaces_requests(self):
+        sender = self._sender(TELEGRAM_CHAT_RATE=10.0, TELEGRAM_CHAT_BURST=1)
+        futures = [sender.submit('sendMessage', {'chat_id': '1', 'text': f'm{i}'}) for i in range(4)]
+        other = sender.submit('sendMessage', {'chat_id': '2', 'text': 'otro chat'})
+        for future in futures + [other]:
+            self.assertIsNotNone(future.result(timeout=5))
+        chat1 = sorted(call[0] for call in self.server.calls if call[3] == '1')
+        # 4 mensajes a 10/s con ráfaga 1: al menos 3 intervalos de 0.1s (margen por latencia de conexión)
+        self.assertGreaterEqual(chat1[-1] - chat1[0], 0.25)
+        # El otro chat tiene su propio bucket y no espera a la ráfaga del primero
+        chat2 = [call[0] for call in self.server.calls if call[3] == '2'][0]
+        self.assertLess(chat2, chat1[-1])
+
+    def test_retry_after_is_honored_without_blocking_other_chats(self):
+        sender = self._sender()
+        self.server.rate_limited['limitado'] = 1
+        limited = sender.submit('sendMessage', {'chat_id': '1', 'text': 'limitado'})
+        self.assertTrue(self.server.received.wait(5))
+        time.sleep(0.1)
+        other = sender.submit('sendMessage', {'chat_id': '2', 'text': 'libre'})
+        self.assertIsNotNone(other.result(timeout=0.8))
+        self.assertIsNotNone(limited.result(timeout=5))
+        attempts = [call for call in self.server.calls if call[4] == 'limitado']
+        self.assertEqual([call[5] for call in attempts], [429, 200])
+        self.assertGreaterEqual(attempts[1][0] - attempts[0][1], 0.95)
+        self.assertEqual(sender.get_metrics()['rate_limit_hits'], 1)
+
+    def test_client_error_fails_without_retry(self):
+        sender = TelegramAsyncSender(make_config(), f"{self.server.base_url}/botBAD")
+        self.senders.append(sender)
+        self.assertIsNone(sender.submit('sendMessage', {'chat_id': '1', 'text': 'x'}).result(timeout=5))
+        self.assertEqual(len(self.server.calls), 1)
+
+    def _client(self, **overrides):
+        config = AdvancedTradingConfig()
+        config.telegram_bot_token, config.telegram_chat_id = TOKEN, '42'
+        config.telegram_enabled = True
+        config.TELEGRAM_API_BASE = self.server.base_url
+        for name, value in overrides.items():
+            setattr(config, name, value)
+        client = OptimizedTelegramClient(config)
+        self.senders.append(client.sender)
+        return client
+
+    def test_client_sends_through_sender(self):
+        client = self._client()
+        self.assertTrue(client._send_message_direct("<b>señal</b>"))
+        self.assertTrue(client.send_photo(ChartImage(b'\x89PNG', 'chart.png', None), 'grafico',
+                                          priority=TelegramAsyncSender.PRIORITY_CRITICAL))
+        self._wait_for(lambda: client.stats['photos_sent'] == 1)
+        self.assertEqual(client.stats['messages_sent'], 1)
+        self.assertEqual(client.stats['photos_sent'], 1)
+        self.assertEqual(self._texts(), ['&lt;b&gt;señal&lt;/b&gt;', 'grafico'])
+        self.assertEqual({call[3] for call in self.server.calls}, {'42'})
+
+    def test_connection_check_uses_sender(self):
+        client = self._client()
+        self.assertTrue(client.test_connection())
+        self.assertEqual([call[2] for call in self.server.calls], ['getMe'])
+
+    def test_edit_in_place_coalesces_milestones(self):
+        client = self._client(TELEGRAM_EDIT_IN_PLACE=True, TELEGRAM_EDIT_MIN_INTERVAL=0.5)
+        self.assertTrue(client._send_message_direct("señal", live_post=('hash1', 'BTCUSDT')))
+        self._wait_for(lambda: 'hash1' in client.live_posts)
+        for milestone in (0.5, 0.7, 0.9):
+            self.assertTrue(client.send_milestone_update('BTCUSDT', milestone, milestone + 0.1))
+        self._wait_for(lambda: client.stats['edits_sent'] == 1)
+        self.assertTrue(client.send_closure_update('BTCUSDT', 'stop_loss_hit', -1.0, 30, 1.0,
+                                                   signal_hash='hash1'))
+        self._wait_for(lambda: 'hash1' not in client.live_posts and len(self.server.calls) >= 4)
+        methods = [call[2] for call in self.server.calls]
+        self.assertEqual(methods, ['sendMessage', 'editMessageText', 'editMessageText', 'sendMessage'])
+        # Los tres avances llegan dentro del intervalo: solo se aplica el último
+        self.assertIn('Avance +0.9%', self.server.calls[1][4])
+        self.assertIn('STOP LOSS', self.server.calls[2][4])
+        self.assertEqual(self.server.calls[3][6]['reply_to_message_id'], 1)
+        self.assertEqual({call[6].get('message_id') for call in self.server.calls[1:3]}, {1})
+        self.assertEqual(client.stats['edits_coalesced'], 2)
+
+    def test_closure_preempts_pending_milestone(self):
+        client = self._client(TELEGRAM_EDIT_IN_PLACE=True, TELEGRAM_EDIT_MIN_INTERVAL=5.0)
+        self.assertTrue(client._send_message_direct("señal", live_post=('hash4', 'XRPUSDT')))
+        self._wait_for(lambda: 'hash4' in client.live_posts)
+        client.send_milestone_update('XRPUSDT', 0.5, 0.6, signal_hash='hash4')
+        client.send_closure_update('XRPUSDT', 'target_reached', 2.0, 10, 2.0, signal_hash='hash4')
+        # El cierre absorbe el avance pendiente y no espera el intervalo de 5s
+        self._wait_for(lambda: len(self.server.calls) == 3, timeout=2)
+        self.assertEqual([call[2] for call in self.server.calls], ['sendMessage', 'editMessageText', 'sendMessage'])
+        self.assertIn('OBJETIVO ALCANZADO', self.server.calls[1][4])
+
+    def test_photo_post_edits_caption_or_media(self):
+        client = self._client(TELEGRAM_EDIT_IN_PLACE=True, TELEGRAM_EDIT_MIN_INTERVAL=0.0)
+        chart = ChartImage(b'\x89PNG-1', 'chart.png', None)
+        self.assertTrue(client.send_promotion_update('ETHUSDT', 0.0, chart_image=chart, signal_hash='hash2'))
+        self._wait_for(lambda: 'hash2' in client.live_posts)
+        client.send_milestone_update('ETHUSDT', 0.5, 0.6, chart_image=chart)
+        self._wait_for(lambda: client.stats['edits_sent'] == 1)
+        client.send_milestone_update('ETHUSDT', 1.0, 1.1, chart_image=ChartImage(b'\x89PNG-2', 'chart.png', None))
+        self._wait_for(lambda: client.stats['edits_sent'] == 2)
+        self.assertEqual([call[2] for call in self.server.calls],
+                         ['sendPhoto', 'editMessageCaption', 'editMessageMedia'])
+        self.assertIn('Avance +1.0%', self.server.calls[2][4])
+
+    def test_failed_edit_falls_back_to_new_message(self):
+        client = self._client(TELEGRAM_EDIT_IN_PLACE=True, TELEGRAM_EDIT_MIN_INTERVAL=0.0)
+        self.assertTrue(client._send_message_direct("señal", live_post=('hash3', 'SOLUSDT')))
+        self._wait_for(lambda: 'hash3' in client.live_posts)
+        client.live_posts['hash3'].message_id = 999  # Post borrado en el chat
+        self.server.rejected_edits = {999}
+        client.send_milestone_update('SOLUSDT', 0.5, 0.6)
+        self._wait_for(lambda: len(self.server.calls) == 3)
+        self.assertEqual([call[2] for call in self.server.calls], ['sendMessage', 'editMessageText', 'sendMessage'])
+        self.assertNotIn('hash3', client.live_posts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import os
+import sys
+import threading
+import time
+
+# Setup path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto_bot_pro_v35 import BinanceOrderManager, AutoTradeState
+from testutil import config_factory, PollingMixin
+
+
+make_config = config_factory(MARKET_TYPE="PERPETUALS", use_testnet=True, binance_api_key="", binance_secret_key="",
+                             BINANCE_TESTNET_FUTURES_URL="http://127.0.0.1:9", auto_trading_enabled=True,
+                             MILESTONE_1=1.0, MILESTONE_2=2.0, MILESTONE_3=3.0,
+                             TRAILING_DISTANCE=0.3, TRAILING_STEP=0.1, TRAILING_AMEND_MIN_INTERVAL_S=0.3)
+
+
+class TestTrailingStopEngine(PollingMixin, unittest.TestCase):
+    def setUp(self):
+        self.manager = BinanceOrderManager(make_config())
+        self.amendments = []  # (t, stop_price)
+        executor = self.manager.testnet_executor
+        executor.open_price_stream = lambda on_tick: None  # Ticks inyectados a mano
+
+        def fake_update(symbol, trade, new_sl):
+            self.amendments.append((time.monotonic(), new_sl))
+            trade.current_sl = new_sl
+            return {'success': True, 'order_id': len(self.amendments), 'stop_price': new_sl}
+
+        executor.update_trailing_stop = fake_update
+        self.trade = AutoTradeState('BTCUSDT', 'BUY', 100.0, 0.01, self.manager.config)
+        self.manager.active_trades['BTCUSDT'] = self.trade
+        self.engine = self.manager.trailing_engine
+        self.engine.watch('BTCUSDT')
+
+    def tearDown(self):
+        self.manager.stop_streams()
+
+    def test_breakeven_is_amended_immediately(self):
+        self.engine.on_tick('BTCUSDT', 100.5)
+        self.assertEqual(self.amendments, [])
+        started = time.monotonic()
+        self.engine.on_tick('BTCUSDT', 102.0)
+        self._wait_for(lambda: self.amendments)
+        self.assertEqual(self.amendments[0][1], 100.0)
+        self.assertLess(self.amendments[0][0] - started, 0.1)
+
+    def test_tick_burst_is_rate_limited_and_coalesced(self):
+        self.engine.on_tick('BTCUSDT', 102.0)  # breakeven
+        self._wait_for(lambda: self.amendments)
+        for i in range(200):
+            self.engine.on_tick('BTCUSDT', 102.5 + i * 0.01)
+        self._wait_for(lambda: len(self.amendments) == 2)
+        time.sleep(0.4)
+        self.assertEqual(len(self.amendments), 2)
+        self.assertGreaterEqual(self.amendments[1][0] - self.amendments[0][0], 0.3)
+        # Se aplica el último SL calculado, no uno intermedio
+        self.assertAlmostEqual(self.amendments[1][1], (102.5 + 199 * 0.01) * 0.997)
+        self.assertGreater(self.engine.stats['coalesced'], 100)
+
+    def test_sub_step_improvement_is_skipped(self):
+        self.engine.on_tick('BTCUSDT', 102.0)
+        self._wait_for(lambda: self.amendments)
+        self.trade.current_sl = 102.0 * 0.997
+        self.engine.on_tick('BTCUSDT', 102.05)  # mejora < TRAILING_STEP (0.1% de la entrada)
+        time.sleep(0.4)
+        self.assertEqual(len(self.amendments), 1)
+
+    def test_rules_are_evaluated_under_manager_lock(self):
+        tick = threading.Thread(target=self.engine.on_tick, args=('BTCUSDT', 102.0))
+        with self.manager.lock:  # p. ej. el journal serializando los trades
+            tick.start()
+            time.sleep(0.1)
+            self.assertFalse(self.trade.breakeven_activated)
+        tick.join(timeout=1)
+        self.assertTrue(self.trade.breakeven_activated)
+        self._wait_for(lambda: self.amendments)
+
+    def test_closed_trade_stops_evaluation(self):
+        self.manager.active_trades.pop('BTCUSDT')
+        self.engine.unwatch('BTCUSDT')
+        self.engine.on_tick('BTCUSDT', 105.0)
+        time.sleep(0.1)
+        self.assertEqual(self.amendments, [])
+
+    def test_monitor_trailing_stops_feeds_engine(self):
+        self.manager.monitor_trailing_stops({'BTCUSDT': 102.0, 'ETHUSDT': 0})
+        self._wait_for(lambda: self.amendments)
+        self.assertEqual(self.trade.current_sl, 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,239 @@
+import unittest
+import os
+import sys
+import json
+import base64
+import hashlib
+import queue
+import select
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Setup path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crypto_bot_pro_v35 import BinanceOrderManager, AutoTradeState, WEBSOCKET_AVAILABLE
+from testutil import config_factory, PollingMixin
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class ReplayExchange(ThreadingHTTPServer):
+    """Stub local del stream de usuario: listenKey por REST y eventos reproducidos por WebSocket"""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), ReplayHandler)
+        self.events = queue.Queue()
+        self.rest_calls = []  # (metodo, ruta)
+        self.ws_connections = []  # listenKey de cada conexión
+        self.issued_keys = 0
+        self.lock = threading.Lock()
+        self.closing = threading.Event()
+
+    @property
+    def http_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def ws_url(self):
+        return f"ws://127.0.0.1:{self.server_address[1]}/ws"
+
+    def replay(self, *events):
+        for event in events:
+            self.events.put(event)
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, payload):
+        raw = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _listen_key(self, method):
+        with self.server.lock:
+            self.server.rest_calls.append((method, self.path.split('?')[0]))
+            if method == 'POST':
+                self.server.issued_keys += 1
+                return self._reply({'listenKey': f"key{self.server.issued_keys}"})
+        self._reply({})
+
+    def do_POST(self):
+        self._listen_key('POST')
+
+    def do_PUT(self):
+        self._listen_key('PUT')
+
+    def do_DELETE(self):
+        self._listen_key('DELETE')
+
+    def do_GET(self):
+        if self.headers.get('Upgrade', '').lower() != 'websocket':
+            self.send_error(404)
+            return
+        accept = base64.b64encode(hashlib.sha1((self.headers['Sec-WebSocket-Key'] + WS_GUID).encode()).digest())
+        self.send_response(101)
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', accept.decode())
+        self.end_headers()
+        with self.server.lock:
+            self.server.ws_connections.append(self.path.rsplit('/', 1)[-1])
+        self._serve_frames()
+        self.close_connection = True
+
+    def _send_frame(self, payload: bytes, opcode=0x1):
+        header = bytes([0x80 | opcode])
+        if len(payload) < 126:
+            header += bytes([len(payload)])
+        else:
+            header += bytes([126]) + struct.pack('!H', len(payload))
+        self.wfile.write(header + payload)
+        self.wfile.flush()
+
+    def _read_frame(self):
+        first, second = self.rfile.read(2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', self.rfile.read(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', self.rfile.read(8))[0]
+        mask = self.rfile.read(4) if second & 0x80 else b'\0\0\0\0'
+        data = bytes(b ^ mask[i % 4] for i, b in enumerate(self.rfile.read(length)))
+        return first & 0x0F, data
+
+    def _serve_frames(self):
+        while not self.server.closing.is_set():
+            readable, _, _ = select.select([self.connection], [], [], 0.02)
+            if readable:
+                opcode, data = self._read_frame()
+                if opcode == 0x8:
+                    self._send_frame(data[:2], opcode=0x8)
+                    return
+                continue
+            try:
+                event = self.server.events.get_nowait()
+            except queue.Empty:
+                continue
+            self._send_frame(json.dumps(event).encode())
+            if event.get('e') == 'listenKeyExpired':
+                return
+
+
+_base_config = config_factory(MARKET_TYPE="PERPETUALS", use_testnet=True, binance_api_key="test-key",
+                              binance_secret_key="test-secret", auto_trading_enabled=True,
+                              USER_STREAM_KEEPALIVE_S=1800, ORDER_GATEWAY_KEEPALIVE_S=60,
+                              MILESTONE_1=1.0, MILESTONE_3=3.0)
+
+
+def make_config(server, **overrides):
+    overrides.setdefault('BINANCE_TESTNET_FUTURES_URL', server.http_url)
+    overrides.setdefault('BINANCE_TESTNET_FUTURES_WS_URL', server.ws_url)
+    return _base_config(**overrides)
+
+
+def order_update(symbol, order_id, status, side='SELL', order_type='STOP_MARKET', qty='0.010',
+                 price='99.00', client_id='web_x', reduce_only=False):
+    return {'e': 'ORDER_TRADE_UPDATE', 'E': int(time.time() * 1000),
+            'o': {'s': symbol, 'c': client_id, 'S': side, 'o': 'MARKET', 'ot': order_type, 'X': status,
+                  'i': order_id, 'z': qty, 'ap': price, 'L': price, 'R': reduce_only}}
+
+
+def account_update(symbol, amount, entry='100.5'):
+    return {'e': 'ACCOUNT_UPDATE', 'E': int(time.time() * 1000),
+            'a': {'m': 'ORDER', 'B': [], 'P': [{'s': symbol, 'pa': amount, 'ep': entry, 'ps': 'BOTH'}]}}
+
+
+@unittest.skipUnless(WEBSOCKET_AVAILABLE, "websocket-client no disponible")
+class TestUserDataStream(PollingMixin, unittest.TestCase):
+    WAIT_TIMEOUT = 5.0
+
+    def setUp(self):
+        self.server = ReplayExchange()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.events = []
+        self.manager = None
+
+    def tearDown(self):
+        if self.manager is not None:
+            self.manager.stop_user_stream()
+            self.manager.testnet_executor.get_gateway().close()
+        self.server.closing.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _manager(self, **overrides):
+        self.manager = BinanceOrderManager(make_config(self.server, **overrides))
+        self.manager.add_trade_listener(lambda event, symbol, info: self.events.append((event, symbol, info)))
+        trade = AutoTradeState('BTCUSDT', 'BUY', 100.0, 0.01, self.manager.config)
+        trade.entry_order_id, trade.stop_loss_order_id = 1001, 1002
+        self.manager.active_trades['BTCUSDT'] = trade
+        self.manager.ensure_user_stream()
+        self._wait_for(lambda: self.manager.user_stream.connected)
+        return trade
+
+    def test_entry_fill_and_account_update_sync_state(self):
+        trade = self._manager()
+        self.server.replay(account_update('BTCUSDT', '0.012', entry='100.4'),
+                           order_update('BTCUSDT', 1001, 'FILLED', side='BUY', order_type='MARKET',
+                                        qty='0.012', price='100.45'))
+        self._wait_for(lambda: trade.entry_confirmed)
+        self.assertEqual(trade.entry_price, 100.45)
+        self.assertEqual(trade.quantity, 0.012)
+        self.assertEqual(trade.position_amount, 0.012)
+        self.assertEqual(self.events[0][0], 'entry_filled')
+        self.assertEqual(self.server.rest_calls[0], ('POST', '/fapi/v1/listenKey'))
+
+    def test_stop_fill_closes_trade(self):
+        self._manager()
+        self.server.replay(order_update('BTCUSDT', 1002, 'NEW'), order_update('BTCUSDT', 1002, 'FILLED'))
+        self._wait_for(lambda: not self.manager.has_active_trade('BTCUSDT'))
+        event, symbol, info = self.events[-1]
+        self.assertEqual((event, symbol, info['reason'], info['exit_price']), ('closed', 'BTCUSDT', 'stop_loss', 99.0))
+        self.assertAlmostEqual(info['profit_pct'], -1.0)
+        self.assertLess(info['latency_ms'], 1000)
+
+    def test_liquidation_and_cancelled_stop(self):
+        trade = self._manager()
+        self.server.replay(order_update('BTCUSDT', 1002, 'CANCELED'))
+        self._wait_for(lambda: trade.stop_loss_order_id is None)
+        self.assertEqual(self.events[-1][0], 'stop_lost')
+        self.server.replay(order_update('BTCUSDT', 5555, 'FILLED', client_id='autoclose-1700000000'))
+        self._wait_for(lambda: not self.manager.has_active_trade('BTCUSDT'))
+        self.assertEqual(self.events[-1][2]['reason'], 'liquidation')
+
+    def test_unrelated_symbol_is_ignored(self):
+        self._manager()
+        self.server.replay(order_update('ETHUSDT', 1002, 'FILLED'), order_update('BTCUSDT', 1001, 'NEW'))
+        self._wait_for(lambda: self.manager.user_stream.metrics['events'] == 2)
+        self.assertTrue(self.manager.has_active_trade('BTCUSDT'))
+        self.assertEqual(self.events, [])
+
+    def test_expired_listen_key_reconnects_with_new_key(self):
+        self._manager()
+        self.server.replay({'e': 'listenKeyExpired', 'E': int(time.time() * 1000)})
+        self._wait_for(lambda: len(self.server.ws_connections) == 2)
+        self.assertEqual(self.server.ws_connections, ['key1', 'key2'])
+        self._wait_for(lambda: self.manager.user_stream.connected)
+        self.server.replay(order_update('BTCUSDT', 1002, 'FILLED'))
+        self._wait_for(lambda: not self.manager.has_active_trade('BTCUSDT'))
+
+    def test_keepalive_and_close_listen_key(self):
+        self._manager(USER_STREAM_KEEPALIVE_S=0.1)
+        self._wait_for(lambda: ('PUT', '/fapi/v1/listenKey') in self.server.rest_calls)
+        self.manager.stop_user_stream()
+        self.assertEqual(self.server.rest_calls[-1], ('DELETE', '/fapi/v1/listenKey'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+"""Utilidades compartidas por los tests: configuración simulada y espera acotada a hilos de fondo"""
+import time
+from types import SimpleNamespace
+
+
+def config_factory(**defaults):
+    """Devuelve make_config(**overrides): SimpleNamespace con los valores por defecto del módulo de test"""
+    def make_config(**overrides):
+        values = dict(defaults)
+        values.update(overrides)
+        return SimpleNamespace(**values)
+    return make_config
+
+
+def wait_for(predicate, timeout=3.0, interval=0.005) -> bool:
+    """Sondea predicate() hasta que sea cierto o venza el plazo; devuelve el último resultado"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return bool(predicate())
+
+
+class PollingMixin:
+    """Para unittest.TestCase: _wait_for falla el test si la condición no llega a tiempo"""
+    WAIT_TIMEOUT = 3.0
+
+    def _wait_for(self, predicate, timeout=None):
+        if not wait_for(predicate, self.WAIT_TIMEOUT if timeout is None else timeout):
+            self.fail("Condición no alcanzada a tiempo")